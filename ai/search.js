@@ -0,0 +1,134 @@
+/**
+ * Handout Search
+ * Searches the ai/ handouts and downloads using the prebuilt index from build_search_index.py
+ */
+
+class HandoutSearch {
+    constructor(indexUrl = 'search-index.json') {
+        this.indexUrl = indexUrl;
+        this.docs = [];
+        this.terms = {};
+        this.termList = [];
+        this.loading = null;
+    }
+
+    load() {
+        if (!this.loading) {
+            this.loading = fetch(this.indexUrl)
+                .then(response => response.json())
+                .then(index => {
+                    this.docs = index.docs.map(([url, title, excerpt, length]) => ({ url, title, excerpt, length }));
+                    this.terms = index.terms;
+                    this.termList = Object.keys(index.terms).sort();
+                });
+        }
+        return this.loading;
+    }
+
+    tokenize(text) {
+        return text.toLowerCase().match(/[\p{L}\p{N}]+/gu) || [];
+    }
+
+    // Rows are [doc, firstPosition, delta, delta, ...]
+    postings(term) {
+        const result = new Map();
+        (this.terms[term] || []).forEach(row => {
+            const positions = [];
+            let position = 0;
+            for (let i = 1; i < row.length; i++) {
+                position += row[i];
+                positions.push(position);
+            }
+            result.set(row[0], positions);
+        });
+        return result;
+    }
+
+    expandPrefix(prefix) {
+        // Binary search for the first term starting with the prefix
+        let low = 0;
+        let high = this.termList.length;
+        while (low < high) {
+            const mid = (low + high) >> 1;
+            if (this.termList[mid] < prefix) low = mid + 1;
+            else high = mid;
+        }
+        const matches = [];
+        for (let i = low; i < this.termList.length && this.termList[i].startsWith(prefix); i++) {
+            matches.push(this.termList[i]);
+            if (matches.length >= 20) break;
+        }
+        return matches;
+    }
+
+    // Merge the postings of every term the last query word may complete to
+    prefixPostings(prefix) {
+        const merged = new Map();
+        this.expandPrefix(prefix).forEach(term => {
+            this.postings(term).forEach((positions, doc) => {
+                merged.set(doc, (merged.get(doc) || []).concat(positions).sort((a, b) => a - b));
+            });
+        });
+        return merged;
+    }
+
+    search(query, limit = 10) {
+        const tokens = this.tokenize(query);
+        if (tokens.length === 0) return [];
+
+        const lists = tokens.map((token, i) =>
+            i === tokens.length - 1 ? this.prefixPostings(token) : this.postings(token));
+        if (lists.some(list => list.size === 0)) return [];
+
+        // Documents containing every query term
+        const candidates = [...lists[0].keys()].filter(doc => lists.every(list => list.has(doc)));
+
+        return candidates
+            .map(doc => {
+                let score = 0;
+                lists.forEach(list => {
+                    const idf = Math.log(1 + this.docs.length / list.size);
+                    score += (list.get(doc).length / Math.sqrt(this.docs[doc].length || 1)) * idf;
+                });
+                if (tokens.length > 1 && this.hasPhrase(lists, doc)) score *= 2;
+                return { ...this.docs[doc], score };
+            })
+            .sort((a, b) => b.score - a.score)
+            .slice(0, limit);
+    }
+
+    hasPhrase(lists, doc) {
+        const following = lists.slice(1).map(list => new Set(list.get(doc)));
+        return lists[0].get(doc).some(start =>
+            following.every((positions, i) => positions.has(start + i + 1)));
+    }
+}
+
+if (typeof module !== 'undefined' && module.exports) {
+    module.exports = HandoutSearch;
+} else {
+    window.HandoutSearch = HandoutSearch;
+
+    document.addEventListener('DOMContentLoaded', () => {
+        const input = document.getElementById('handout-search');
+        const results = document.getElementById('handout-search-results');
+        if (!input || !results) return;
+
+        const search = new HandoutSearch();
+        const escape = text => text.replace(/[&<>"]/g, c => ({ '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;' }[c]));
+
+        input.addEventListener('focus', () => search.load(), { once: true });
+        input.addEventListener('input', () => {
+            search.load().then(() => {
+                const matches = search.search(input.value);
+                results.innerHTML = matches.map(match => `
+                    <a class="resource-link" href="${escape(match.url)}">
+                        <div class="title">${escape(match.title)}</div>
+                        <div class="description">${escape(match.excerpt)}</div>
+                        <div class="meta">${escape(match.url.split('.').pop().toUpperCase())}</div>
+                    </a>
+                `).join('');
+            });
+        });
+    });
+}
@@ -0,0 +1,3 @@
+// Generated by build_service_worker.py - do not edit by hand
+// The build the cached pages belong to, reported with their timings by rum.js
+window.SITE_BUILD = '5b1d4be7925f367b';
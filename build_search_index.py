@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Search Index Builder
+Extracts text from the ai/ handouts and their downloads and writes a positional inverted index
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+from xml.etree.ElementTree import iterparse
+
+from build_site import FileHasher
+from site_paths import ROOT
+
+CHUNK_SIZE = 64 * 1024
+EXCERPT_LENGTH = 200
+TOKEN_PATTERN = re.compile(r'[^\W_]+')
+
+# OOXML namespaces holding the visible text runs
+WORD_TEXT = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}t'
+WORD_PARAGRAPH = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}p'
+DRAWING_TEXT = '{http://schemas.openxmlformats.org/drawingml/2006/main}t'
+DRAWING_PARAGRAPH = '{http://schemas.openxmlformats.org/drawingml/2006/main}p'
+
+DEFAULT_SOURCES = [
+    'ai/*.html',
+    'ai/downloads/*.docx',
+    'ai/downloads/*.pptx',
+    'ai/downloads/*.txt',
+]
+# Landing pages link to the handouts rather than holding content of their own
+EXCLUDED_SOURCES = {'ai/index.html'}
+
+
+class _HTMLTextExtractor(HTMLParser):
+    """Collects visible text and the page heading from incrementally fed HTML"""
+
+    SKIPPED_TAGS = {'script', 'style', 'noscript', 'svg', 'nav', 'template'}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.title = ''
+        self.heading = ''
+        self.pieces: List[str] = []
+        self._skip_depth = 0
+        self._in_title = False
+        self._in_heading = False
+        self._seen_heading = False
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIPPED_TAGS:
+            self._skip_depth += 1
+        elif tag == 'title':
+            self._in_title = True
+        elif tag == 'h1' and not self._seen_heading:
+            self._in_heading = True
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIPPED_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+        elif tag == 'title':
+            self._in_title = False
+        elif tag == 'h1' and self._in_heading:
+            self._in_heading = False
+            self._seen_heading = True
+
+    def handle_data(self, data):
+        if self._in_title:
+            self.title += data
+        elif not self._skip_depth:
+            if self._in_heading:
+                self.heading += data
+            self.pieces.append(data)
+
+    def drain(self) -> str:
+        """Return and forget the text collected so far"""
+        text = ' '.join(self.pieces)
+        self.pieces = []
+        return text
+
+
+def iter_html_text(path: Path, meta: Dict[str, str]) -> Iterator[str]:
+    """Yield visible text from an HTML file, feeding the parser in fixed-size chunks"""
+    parser = _HTMLTextExtractor()
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), ''):
+            parser.feed(chunk)
+            yield parser.drain()
+    parser.close()
+    yield parser.drain()
+    # Quarto titles are often just the source file name, so prefer the first heading
+    meta['title'] = ' '.join((parser.heading or parser.title).split())
+
+
+def _iter_xml_text(stream, text_tag: str, paragraph_tag: str, meta: Dict[str, str]) -> Iterator[str]:
+    paragraph = ''
+    for _, elem in iterparse(stream, events=('end',)):
+        if elem.tag == text_tag:
+            if elem.text:
+                paragraph += elem.text
+                yield elem.text
+        elif elem.tag == paragraph_tag:
+            if 'title' not in meta and paragraph.strip():
+                meta['title'] = paragraph.strip()
+            paragraph = ''
+            yield '\n'
+            # Paragraph subtrees are finished with, so keep memory flat
+            elem.clear()
+
+
+def _slide_number(member: str) -> int:
+    match = re.search(r'(\d+)\.xml$', member)
+    return int(match.group(1)) if match else 0
+
+
+def iter_ooxml_text(path: Path, meta: Dict[str, str]) -> Iterator[str]:
+    """Yield text from a .docx or .pptx, streaming each XML part out of the zip"""
+    with zipfile.ZipFile(path) as archive:
+        names = archive.namelist()
+        if path.suffix == '.docx':
+            parts = [name for name in names if name == 'word/document.xml']
+            text_tag, paragraph_tag = WORD_TEXT, WORD_PARAGRAPH
+        else:
+            parts = sorted((name for name in names
+                            if re.match(r'ppt/slides/slide\d+\.xml$', name)), key=_slide_number)
+            text_tag, paragraph_tag = DRAWING_TEXT, DRAWING_PARAGRAPH
+
+        if 'docProps/core.xml' in names:
+            with archive.open('docProps/core.xml') as core:
+                for _, elem in iterparse(core):
+                    if elem.tag.endswith('}title') and elem.text:
+                        meta['title'] = elem.text.strip()
+
+        for part in parts:
+            with archive.open(part) as stream:
+                yield from _iter_xml_text(stream, text_tag, paragraph_tag, meta)
+
+
+def iter_plain_text(path: Path, meta: Dict[str, str]) -> Iterator[str]:
+    """Yield a text file line by line, taking its front matter title or first line as the title"""
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        for line in f:
+            stripped = line.strip()
+            if 'title' not in meta and stripped and stripped != '---':
+                if stripped.startswith('title:'):
+                    stripped = stripped[len('title:'):].strip().strip('"\'')
+                meta['title'] = stripped.lstrip('#').strip()
+            yield line
+
+
+EXTRACTORS = {
+    '.html': iter_html_text,
+    '.docx': iter_ooxml_text,
+    '.pptx': iter_ooxml_text,
+    '.txt': iter_plain_text,
+}
+
+
+def index_document(path: str) -> Dict[str, Any]:
+    """Tokenize one document into term positions plus display metadata"""
+    full_path = ROOT / path
+    meta: Dict[str, str] = {}
+    postings: Dict[str, List[int]] = {}
+    excerpt = ''
+    position = 0
+
+    for text in EXTRACTORS[full_path.suffix](full_path, meta):
+        if len(excerpt) < EXCERPT_LENGTH:
+            excerpt += ' ' + ' '.join(text.split())
+        for token in TOKEN_PATTERN.findall(text.lower()):
+            postings.setdefault(token, []).append(position)
+            position += 1
+
+    return {
+        'title': meta.get('title') or full_path.stem.replace('_', ' ').title(),
+        'excerpt': excerpt.strip()[:EXCERPT_LENGTH],
+        'length': position,
+        'postings': postings,
+    }
+
+
+class SearchIndexBuilder:
+    def __init__(self, sources: List[str] = None, output_file: str = 'ai/search-index.json',
+                 cache_file: Path = ROOT / '.build' / 'search_cache.json', jobs: int = 0):
+        self.sources = sources or DEFAULT_SOURCES
+        self.output_file = ROOT / output_file
+        self.cache_file = cache_file
+        self.jobs = jobs or os.cpu_count() or 1
+
+    def discover(self) -> List[str]:
+        """Find the documents to index, relative to the site root"""
+        paths = set()
+        for pattern in self.sources:
+            paths.update(p.relative_to(ROOT).as_posix() for p in ROOT.glob(pattern) if p.is_file())
+        return sorted(paths - EXCLUDED_SOURCES)
+
+    def _load_cache(self) -> Dict[str, Any]:
+        if self.cache_file.exists():
+            try:
+                return json.loads(self.cache_file.read_text(encoding='utf-8'))
+            except json.JSONDecodeError:
+                pass
+        return {'files': {}, 'documents': {}}
+
+    def build(self) -> Dict[str, int]:
+        """Re-extract changed documents in parallel and write the merged index"""
+        cache = self._load_cache()
+        hasher = FileHasher(cache['files'])
+        paths = self.discover()
+
+        digests = {path: hasher.digest(path) for path in paths}
+        stale = [path for path in paths
+                 if cache['documents'].get(path, {}).get('digest') != digests[path]]
+
+        if stale:
+            with ProcessPoolExecutor(max_workers=min(self.jobs, len(stale))) as executor:
+                for path, document in zip(stale, executor.map(index_document, stale)):
+                    document['digest'] = digests[path]
+                    cache['documents'][path] = document
+
+        cache['documents'] = {path: cache['documents'][path] for path in paths}
+        self._write_index(paths, cache['documents'])
+
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        self.cache_file.write_text(json.dumps(cache), encoding='utf-8')
+        return {'documents': len(paths), 'reindexed': len(stale)}
+
+    def _write_index(self, paths: List[str], documents: Dict[str, Dict[str, Any]]) -> None:
+        """Write the compact index: per term, [doc, first position, deltas...] rows"""
+        output_dir = self.output_file.parent
+        docs = []
+        terms: Dict[str, List[List[int]]] = {}
+
+        for doc_id, path in enumerate(paths):
+            document = documents[path]
+            docs.append([
+                os.path.relpath(ROOT / path, output_dir).replace(os.sep, '/'),
+                document['title'],
+                document['excerpt'],
+                document['length'],
+            ])
+            for term, positions in document['postings'].items():
+                deltas = [positions[0]] + [b - a for a, b in zip(positions, positions[1:])]
+                terms.setdefault(term, []).append([doc_id] + deltas)
+
+        index = {
+            'version': 1,
+            'docs': docs,
+            'terms': {term: terms[term] for term in sorted(terms)},
+        }
+        self.output_file.write_text(json.dumps(index, separators=(',', ':'), ensure_ascii=False),
+                                    encoding='utf-8')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build the full-text search index for the ai/ handouts')
+    parser.add_argument('--output', default='ai/search-index.json',
+                       help='Path to index file relative to the site root (default: ai/search-index.json)')
+    parser.add_argument('--jobs', type=int, default=0,
+                       help='Worker processes for text extraction (default: CPU count)')
+
+    args = parser.parse_args()
+
+    try:
+        builder = SearchIndexBuilder(output_file=args.output, jobs=args.jobs)
+        stats = builder.build()
+    except Exception as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+
+    print(f"✅ Indexed {stats['documents']} documents ({stats['reindexed']} re-extracted) into {args.output}")
+
+
+if __name__ == '__main__':
+    main()
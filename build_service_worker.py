@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Service Worker Builder
+Generates sw.js and precache-manifest.json from the content hashes of the site's assets,
+and build-info.js naming the build for the pages' timing beacons
+"""
+
+import argparse
+import hashlib
+import json
+import sys
+from typing import Dict, List
+
+from build_site import FileHasher
+from site_paths import ROOT
+
+# Fetched on install so repeat visits and the quiz never wait on the network
+PRECACHE_ASSETS = [
+    'index.html',
+    'educational-tools-quiz.html',
+    'recommendation_engine.js',
+    'rum.js',
+    'ai/index.html',
+    'ai/*.js',
+    'ai/search-index.json',
+]
+# Megabyte-scale handouts and downloads, and the quiz's tool shards (only the ones a
+# result needs are fetched), are cached the first time they are requested, then served
+# from cache until their hash changes
+RUNTIME_ASSETS = [
+    'ai/*.html',
+    'ai/presentation/index.html',
+    'ai/presentation/slides/*.html',
+    'ai/presentation/assets/*',
+    'ai/downloads/*',
+    'quiz-data/*.json',
+]
+
+BUILD_INFO_TEMPLATE = '''// Generated by build_service_worker.py - do not edit by hand
+// The build the cached pages belong to, reported with their timings by rum.js
+window.SITE_BUILD = '__VERSION__';
+'''
+
+SERVICE_WORKER_TEMPLATE = '''/**
+ * Generated by build_service_worker.py - do not edit by hand
+ * Serves site assets cache-first and refetches only files whose content hash changed
+ */
+
+const MANIFEST_VERSION = '__VERSION__';
+const CACHE_NAME = 'site-assets';
+const MANIFEST = __MANIFEST__;
+
+const scopeUrl = new URL(self.registration.scope);
+const entries = new Map(MANIFEST.map(entry => [new URL(entry.url, scopeUrl).href, entry]));
+
+// Cache keys carry the revision, so a changed file simply misses the cache
+function cacheKey(href, entry) {
+    return `${href}?__rev=${entry.revision}`;
+}
+
+self.addEventListener('install', event => {
+    event.waitUntil((async () => {
+        const cache = await caches.open(CACHE_NAME);
+        await Promise.all([...entries]
+            .filter(([_, entry]) => entry.precache)
+            .map(async ([href, entry]) => {
+                const key = cacheKey(href, entry);
+                if (await cache.match(key)) return;
+                const response = await fetch(href, { cache: 'no-cache' });
+                if (!response.ok) throw new Error(`Precache failed for ${entry.url}: ${response.status}`);
+                await cache.put(key, response);
+            }));
+        await self.skipWaiting();
+    })());
+});
+
+self.addEventListener('activate', event => {
+    event.waitUntil((async () => {
+        const cache = await caches.open(CACHE_NAME);
+        const current = new Set([...entries].map(([href, entry]) => cacheKey(href, entry)));
+
+        // Drop files that left the site or changed since they were cached
+        for (const request of await cache.keys()) {
+            if (!current.has(request.url)) await cache.delete(request);
+        }
+        await self.clients.claim();
+    })());
+});
+
+function manifestHref(request) {
+    const url = new URL(request.url);
+    url.search = '';
+    url.hash = '';
+    if (url.pathname.endsWith('/')) url.pathname += 'index.html';
+    return url.href;
+}
+
+self.addEventListener('fetch', event => {
+    if (event.request.method !== 'GET' || event.request.headers.has('range')) return;
+
+    const href = manifestHref(event.request);
+    const entry = entries.get(href);
+    if (!entry) return;
+
+    event.respondWith((async () => {
+        const cache = await caches.open(CACHE_NAME);
+        const key = cacheKey(href, entry);
+        const cached = await cache.match(key);
+        if (cached) return cached;
+
+        const response = await fetch(href);
+        if (response.status === 200) await cache.put(key, response.clone());
+        return response;
+    })());
+});
+'''
+
+
+class ServiceWorkerBuilder:
+    def __init__(self, sw_file: str = 'sw.js', manifest_file: str = 'precache-manifest.json',
+                 build_info_file: str = 'build-info.js'):
+        self.sw_file = ROOT / sw_file
+        self.manifest_file = ROOT / manifest_file
+        self.build_info_file = ROOT / build_info_file
+
+    def _expand(self, patterns: List[str]) -> List[str]:
+        paths = set()
+        for pattern in patterns:
+            paths.update(p.relative_to(ROOT).as_posix() for p in ROOT.glob(pattern) if p.is_file())
+        return sorted(paths)
+
+    def manifest(self) -> List[Dict]:
+        """One entry per asset, with a short content hash as its revision"""
+        hasher = FileHasher()
+        entries, seen = [], set()
+        for precache, patterns in ((True, PRECACHE_ASSETS), (False, RUNTIME_ASSETS)):
+            for path in self._expand(patterns):
+                if path in seen:
+                    continue
+                seen.add(path)
+                entries.append({
+                    'url': path,
+                    'revision': hasher.digest(path)[:16],
+                    'size': (ROOT / path).stat().st_size,
+                    'precache': precache,
+                })
+        return entries
+
+    def build(self) -> Dict[str, int]:
+        """Write the manifest and a service worker that embeds it"""
+        entries = self.manifest()
+        version = hashlib.sha256(json.dumps(entries, indent=2).encode('utf-8')).hexdigest()[:16]
+
+        # Precached with the build so it always names the build the pages came from; its
+        # revision is the version it carries, which keeps it out of its own hash
+        build_info = BUILD_INFO_TEMPLATE.replace('__VERSION__', version)
+        self.build_info_file.write_text(build_info, encoding='utf-8')
+        entries.append({
+            'url': self.build_info_file.relative_to(ROOT).as_posix(),
+            'revision': version,
+            'size': len(build_info.encode('utf-8')),
+            'precache': True,
+        })
+        manifest_json = json.dumps(entries, indent=2)
+        self.manifest_file.write_text(manifest_json + '\n', encoding='utf-8')
+
+        compact = json.dumps([{key: entry[key] for key in ('url', 'revision', 'precache')}
+                              for entry in entries], separators=(',', ':'))
+        service_worker = (SERVICE_WORKER_TEMPLATE
+                          .replace('__VERSION__', version)
+                          .replace('__MANIFEST__', compact))
+        self.sw_file.write_text(service_worker, encoding='utf-8')
+
+        precached = [entry for entry in entries if entry['precache']]
+        return {
+            'entries': len(entries),
+            'precached': len(precached),
+            'precache_bytes': sum(entry['size'] for entry in precached),
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate the service worker and precache manifest')
+    parser.parse_args()
+
+    try:
+        stats = ServiceWorkerBuilder().build()
+    except Exception as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+
+    print(f"✅ sw.js: {stats['entries']} assets, {stats['precached']} precached "
+          f"({stats['precache_bytes']:,} bytes)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+"""
+Site Build Script
+Runs each generation stage only when its declared inputs or outputs have changed
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from site_paths import ROOT
+
+STATE_FILE = ROOT / '.build' / 'state.json'
+
+
+class Stage:
+    """A build step with declared input and output files"""
+
+    def __init__(self, name: str, inputs: List[str], outputs: List[str],
+                 action: Callable[[], None], description: str = ''):
+        self.name = name
+        self.inputs = inputs
+        self.outputs = outputs
+        self.action = action
+        self.description = description
+
+    def __repr__(self) -> str:
+        return f"Stage({self.name!r})"
+
+
+def run_script(*args: str) -> Callable[[], None]:
+    """Build a stage action that runs a Python script from the site root"""
+    def action() -> None:
+        subprocess.run([sys.executable, *args], cwd=ROOT, check=True,
+                       stdout=subprocess.DEVNULL)
+    return action
+
+
+def update_quiz_tools() -> None:
+    """Regenerate the recommendation engine, its tool shards and the repo cards from index.html
+    and the ingested repository exports"""
+    from update_quiz_tools import QuizToolUpdater
+
+    from ingest_repos import DEFAULT_EXPORT_DIR, export_files
+
+    updater = QuizToolUpdater(str(ROOT / 'index.html'), str(ROOT / 'recommendation_engine.js'),
+                              cache_classifier=True, export_files=export_files(str(ROOT / DEFAULT_EXPORT_DIR)))
+    updater.write_outputs(updater.pipeline(*updater.read_sources()), str(ROOT / 'catalogue.db'))
+
+
+def optimize_images() -> None:
+    """Losslessly recompress the PNGs in the ai/ handouts and their downloads"""
+    from optimize_images import DEFAULT_TARGETS, ImageOptimizer, expand_targets
+
+    ImageOptimizer().run(expand_targets(DEFAULT_TARGETS))
+
+
+def split_presentation() -> None:
+    """Split the presentation into a shell page, lazily loaded slides and cached assets"""
+    from split_presentation import PresentationSplitter
+
+    PresentationSplitter().run()
+
+
+def build_search_index() -> None:
+    """Rebuild the handout search index, re-extracting only changed documents"""
+    from build_search_index import SearchIndexBuilder
+
+    SearchIndexBuilder().build()
+
+
+def build_service_worker() -> None:
+    """Regenerate sw.js and its precache manifest from current asset hashes"""
+    from build_service_worker import ServiceWorkerBuilder
+
+    ServiceWorkerBuilder().build()
+
+
+def minify_site() -> None:
+    """Build the minified, deployable copy of the site with source maps"""
+    from minify import SiteMinifier
+
+    SiteMinifier().run()
+
+
+def check_budgets() -> None:
+    """Fail the build when any page in dist/ exceeds its limits in budgets.json"""
+    from check_budgets import BUDGET_FILE, BudgetChecker, format_report, over_budget
+    from minify import DEFAULT_OUTPUT_DIR
+
+    results = BudgetChecker(BUDGET_FILE, ROOT / DEFAULT_OUTPUT_DIR).check()
+    if any(over_budget(metrics, limits) for _, metrics, limits in results):
+        raise RuntimeError(f"pages over budget\n{format_report(results)}")
+
+
+def default_stages() -> List[Stage]:
+    """The stages that make up the site build"""
+    return [
+        Stage('quiz-tools',
+              inputs=['index.html', 'repo-exports/*.json', 'repo-exports/*.jsonl', 'update_quiz_tools.py',
+                      'ingest_repos.py', 'catalogue_db.py', 'near_duplicates.py', 'render_cards.py',
+                      'classifier_rules.json', 'tool_classifier.py', 'file_transaction.py'],
+              outputs=['recommendation_engine.js', 'quiz-data/*.json', 'index.html', 'catalogue.db'],
+              action=update_quiz_tools,
+              description='Quiz recommendation engine, role filters and catalogue database'),
+        Stage('dev-analysis',
+              inputs=['index.html', 'dev/analyze_tools.py', 'classifier_rules.json', 'tool_classifier.py'],
+              outputs=['dev/tool_analysis.json'],
+              action=run_script('dev/analyze_tools.py', '--html-file', 'index.html',
+                                '--output', 'dev/tool_analysis.json'),
+              description='Development regex analysis'),
+        Stage('dev-comprehensive-analysis',
+              inputs=['dev/extract_tools_simple.py', 'classifier_rules.json', 'tool_classifier.py'],
+              outputs=['dev/comprehensive_tool_analysis.json'],
+              action=run_script('dev/extract_tools_simple.py',
+                                '--output', 'dev/comprehensive_tool_analysis.json'),
+              description='Development teaching context analysis'),
+        Stage('images',
+              inputs=['ai/*.html', 'ai/downloads/*.docx', 'ai/downloads/*.pptx', 'optimize_images.py',
+                      'html_stream.py'],
+              outputs=['ai/*.html', 'ai/downloads/*.docx', 'ai/downloads/*.pptx'],
+              action=optimize_images,
+              description='Lossless PNG optimization of the ai/ handouts and downloads'),
+        Stage('presentation-slides',
+              inputs=['ai/presentation.html', 'split_presentation.py', 'html_stream.py'],
+              outputs=['ai/presentation/index.html', 'ai/presentation/slides/*.html',
+                       'ai/presentation/assets/*'],
+              action=split_presentation,
+              description='Presentation shell with per-slide fragments loaded on demand'),
+        Stage('search-index',
+              inputs=['ai/*.html', 'ai/downloads/*.docx', 'ai/downloads/*.pptx',
+                      'ai/downloads/*.txt', 'build_search_index.py'],
+              outputs=['ai/search-index.json'],
+              action=build_search_index,
+              description='Full-text search index for the ai/ handouts'),
+        Stage('service-worker',
+              inputs=['index.html', 'educational-tools-quiz.html', 'recommendation_engine.js',
+                      'quiz-data/*.json', 'ai/*.html', 'ai/*.js', 'ai/search-index.json', 'ai/downloads/*',
+                      'ai/presentation/index.html', 'ai/presentation/slides/*.html', 'ai/presentation/assets/*',
+                      'rum.js', 'build_service_worker.py'],
+              outputs=['sw.js', 'precache-manifest.json', 'build-info.js'],
+              action=build_service_worker,
+              description='Service worker and precache manifest'),
+        Stage('minify',
+              inputs=['index.html', 'educational-tools-quiz.html', 'recommendation_engine.js',
+                      'quiz-data/*.json', 'ai/*.html', 'ai/*.js', 'ai/search-index.json', 'ai/downloads/*',
+                      'ai/presentation/index.html', 'ai/presentation/slides/*.html', 'ai/presentation/assets/*',
+                      'rum.js', 'sw.js', 'precache-manifest.json', 'build-info.js', 'minify.py', 'html_stream.py'],
+              outputs=['dist/index.html', 'dist/educational-tools-quiz.html', 'dist/recommendation_engine.js',
+                       'dist/rum.js', 'dist/*.map', 'dist/ai/*.html', 'dist/ai/presentation/index.html'],
+              action=minify_site,
+              description='Minified deployable site in dist/ with source maps'),
+        Stage('budgets',
+              inputs=['dist/index.html', 'dist/educational-tools-quiz.html', 'dist/ai/*.html',
+                      'dist/ai/presentation/index.html', 'budgets.json', 'check_budgets.py'],
+              outputs=[],
+              action=check_budgets,
+              description='Performance budgets for the pages in dist/'),
+    ]
+
+
+class FileHasher:
+    """Content hashes for files, reusing stored digests while size and mtime match"""
+
+    def __init__(self, cache: Optional[Dict[str, List]] = None):
+        self.cache = cache or {}
+
+    def digest(self, path: str) -> Optional[str]:
+        """Return the SHA-256 of a file relative to the site root, or None if missing"""
+        full_path = ROOT / path
+        try:
+            stat = full_path.stat()
+        except FileNotFoundError:
+            self.cache.pop(path, None)
+            return None
+
+        cached = self.cache.get(path)
+        if cached and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+            return cached[2]
+
+        sha = hashlib.sha256()
+        with open(full_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                sha.update(chunk)
+        digest = sha.hexdigest()
+        self.cache[path] = [stat.st_size, stat.st_mtime_ns, digest]
+        return digest
+
+
+class SiteBuilder:
+    def __init__(self, stages: List[Stage], state_file: Path = STATE_FILE, jobs: int = 0):
+        self.stages = {stage.name: stage for stage in stages}
+        self.state_file = state_file
+        self.jobs = jobs or os.cpu_count() or 1
+        self.state = self._load_state()
+        self.hasher = FileHasher(self.state.setdefault('files', {}))
+
+    def _load_state(self) -> Dict:
+        if self.state_file.exists():
+            try:
+                return json.loads(self.state_file.read_text(encoding='utf-8'))
+            except json.JSONDecodeError:
+                pass
+        return {'stages': {}, 'files': {}}
+
+    def _save_state(self) -> None:
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.state_file.with_suffix('.tmp')
+        tmp_file.write_text(json.dumps(self.state, indent=2, sort_keys=True), encoding='utf-8')
+        os.replace(tmp_file, self.state_file)
+
+    def expand(self, patterns: List[str]) -> List[str]:
+        """Expand glob patterns into sorted paths relative to the site root"""
+        paths = set()
+        for pattern in patterns:
+            if any(char in pattern for char in '*?['):
+                paths.update(p.relative_to(ROOT).as_posix() for p in ROOT.glob(pattern) if p.is_file())
+            else:
+                paths.add(pattern)
+        return sorted(paths)
+
+    def dependencies(self) -> Dict[str, set]:
+        """Map each stage to the stages producing its inputs"""
+        producers = {}
+        for stage in self.stages.values():
+            for output in self.expand(stage.outputs):
+                producers.setdefault(output, set()).add(stage.name)
+
+        deps = {}
+        for stage in self.stages.values():
+            upstream = set()
+            for path in self.expand(stage.inputs):
+                upstream.update(producers.get(path, ()))
+            upstream.discard(stage.name)
+            deps[stage.name] = upstream
+        return deps
+
+    def _snapshot(self, stage: Stage) -> Dict[str, Dict[str, Optional[str]]]:
+        return {
+            'inputs': {path: self.hasher.digest(path) for path in self.expand(stage.inputs)},
+            'outputs': {path: self.hasher.digest(path) for path in self.expand(stage.outputs)},
+        }
+
+    def is_stale(self, stage: Stage) -> bool:
+        """A stage is stale when any input or output differs from its last recorded build"""
+        recorded = self.state['stages'].get(stage.name)
+        if not recorded:
+            return True
+        snapshot = self._snapshot(stage)
+        if any(digest is None for digest in snapshot['outputs'].values()):
+            return True
+        return snapshot != recorded
+
+    def _selected(self, targets: Optional[List[str]], deps: Dict[str, set]) -> List[str]:
+        if not targets:
+            return list(self.stages)
+        unknown = [name for name in targets if name not in self.stages]
+        if unknown:
+            raise ValueError(f"Unknown stage(s): {', '.join(unknown)}")
+        # Include everything upstream of the requested stages
+        selected, pending = set(), list(targets)
+        while pending:
+            name = pending.pop()
+            if name not in selected:
+                selected.add(name)
+                pending.extend(deps[name])
+        return [name for name in self.stages if name in selected]
+
+    def build(self, targets: Optional[List[str]] = None, force: bool = False,
+              dry_run: bool = False) -> Dict[str, str]:
+        """Build stale stages, running independent ones in parallel.
+
+        Returns the outcome of each selected stage: 'built', 'fresh' or 'stale' (dry run).
+        """
+        deps = self.dependencies()
+        selected = self._selected(targets, deps)
+        self._check_acyclic(selected, deps)
+
+        results: Dict[str, str] = {}
+        remaining = {name: deps[name] & set(selected) for name in selected}
+        running = {}
+
+        with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+            while remaining or running:
+                ready = [name for name, upstream in remaining.items() if not upstream]
+                for name in ready:
+                    del remaining[name]
+                    stage = self.stages[name]
+                    if force or self.is_stale(stage):
+                        if dry_run:
+                            results[name] = 'stale'
+                            self._finish(name, remaining)
+                        else:
+                            print(f"🔨 {name}: {stage.description or 'building'}")
+                            running[executor.submit(stage.action)] = name
+                    else:
+                        results[name] = 'fresh'
+                        self._finish(name, remaining)
+
+                if not running:
+                    continue
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        future.result()
+                    except Exception as e:
+                        self._save_state()
+                        raise RuntimeError(f"Stage '{name}' failed: {e}") from e
+                    self.state['stages'][name] = self._snapshot(self.stages[name])
+                    results[name] = 'built'
+                    self._finish(name, remaining)
+
+        if not dry_run:
+            self._save_state()
+        return results
+
+    def _finish(self, name: str, remaining: Dict[str, set]) -> None:
+        for upstream in remaining.values():
+            upstream.discard(name)
+
+    def _check_acyclic(self, selected: List[str], deps: Dict[str, set]) -> None:
+        visiting, visited = set(), set()
+
+        def visit(name: str) -> None:
+            if name in visited:
+                return
+            if name in visiting:
+                raise ValueError(f"Dependency cycle through stage '{name}'")
+            visiting.add(name)
+            for upstream in deps[name]:
+                visit(upstream)
+            visiting.discard(name)
+            visited.add(name)
+
+        for name in selected:
+            visit(name)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build the site, rebuilding only stale stages')
+    parser.add_argument('stages', nargs='*',
+                       help='Stages to build along with their upstream stages (default: all)')
+    parser.add_argument('--force', action='store_true',
+                       help='Rebuild every selected stage regardless of content hashes')
+    parser.add_argument('--dry-run', action='store_true',
+                       help='List stale stages without building them')
+    parser.add_argument('--jobs', type=int, default=0,
+                       help='Maximum stages to run in parallel (default: CPU count)')
+    parser.add_argument('--list', action='store_true',
+                       help='List the available stages and exit')
+
+    args = parser.parse_args()
+
+    try:
+        builder = SiteBuilder(default_stages(), jobs=args.jobs)
+        if args.list:
+            for stage in builder.stages.values():
+                print(f"{stage.name}: {stage.description}")
+            return
+
+        start = time.perf_counter()
+        results = builder.build(args.stages, force=args.force, dry_run=args.dry_run)
+        elapsed = time.perf_counter() - start
+    except Exception as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+
+    for name, outcome in results.items():
+        symbol = {'built': '✅', 'fresh': '✔️', 'stale': '🔍'}[outcome]
+        print(f"{symbol} {name}: {outcome}")
+    print(f"Build finished in {elapsed:.3f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Tool Catalogue Database
+SQLite copy of the categorized tool catalogue with roles, categories and an FTS5
+search index, kept in sync by update_quiz_tools.py
+"""
+
+import argparse
+import hashlib
+import json
+import sqlite3
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+DEFAULT_DB = 'catalogue.db'
+# data-category values of the repo cards in index.html, which exports must use too
+ORIGINAL_CATEGORIES = ['desktop-application', 'web-application', 'python-package',
+                       'learning-resource', 'infrastructure-tool', 'command-line-tool']
+FACETS = ['category', 'primary_role', 'tech_level', 'priority', 'original_category']
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS tools (
+    rowid INTEGER PRIMARY KEY,
+    id TEXT NOT NULL UNIQUE,
+    name TEXT NOT NULL,
+    display_name TEXT NOT NULL,
+    category TEXT NOT NULL,
+    description TEXT NOT NULL,
+    topics TEXT NOT NULL,
+    priority TEXT NOT NULL,
+    tech_level TEXT NOT NULL,
+    contexts TEXT NOT NULL,
+    subjects TEXT NOT NULL,
+    original_category TEXT NOT NULL,
+    primary_role TEXT NOT NULL,
+    content_hash TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tools_category ON tools (category);
+
+CREATE TABLE IF NOT EXISTS tool_roles (
+    tool_id TEXT NOT NULL REFERENCES tools (id) ON DELETE CASCADE,
+    role TEXT NOT NULL,
+    confidence TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    PRIMARY KEY (tool_id, role)
+);
+CREATE INDEX IF NOT EXISTS tool_roles_role ON tool_roles (role, confidence);
+
+CREATE TABLE IF NOT EXISTS categories (
+    name TEXT PRIMARY KEY,
+    label TEXT NOT NULL
+);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS tools_fts USING fts5 (
+    name, description, topics, content='tools', content_rowid='rowid'
+);
+
+-- Keep the external-content FTS index in step with the tools table
+CREATE TRIGGER IF NOT EXISTS tools_ai AFTER INSERT ON tools BEGIN
+    INSERT INTO tools_fts (rowid, name, description, topics)
+    VALUES (new.rowid, new.display_name, new.description, new.topics);
+END;
+CREATE TRIGGER IF NOT EXISTS tools_ad AFTER DELETE ON tools BEGIN
+    INSERT INTO tools_fts (tools_fts, rowid, name, description, topics)
+    VALUES ('delete', old.rowid, old.display_name, old.description, old.topics);
+END;
+CREATE TRIGGER IF NOT EXISTS tools_au AFTER UPDATE ON tools BEGIN
+    INSERT INTO tools_fts (tools_fts, rowid, name, description, topics)
+    VALUES ('delete', old.rowid, old.display_name, old.description, old.topics);
+    INSERT INTO tools_fts (rowid, name, description, topics)
+    VALUES (new.rowid, new.display_name, new.description, new.topics);
+END;
+'''
+
+TOOL_COLUMNS = ['id', 'name', 'display_name', 'category', 'description', 'topics', 'priority',
+                'tech_level', 'contexts', 'subjects', 'original_category', 'primary_role']
+# Optional repository details shown on rendered cards, with their column types: the card
+# name and text as written, links, counts, license, languages and release downloads
+CARD_COLUMNS = {'slug': 'TEXT', 'summary': 'TEXT', 'url': 'TEXT', 'homepage': 'TEXT', 'docs': 'TEXT',
+                'stars': 'INTEGER', 'forks': 'INTEGER', 'license': 'TEXT', 'languages': 'TEXT',
+                'release': 'TEXT'}
+
+
+def tool_id(tool: Dict[str, Any]) -> str:
+    """Same id the recommendation engine uses for the tool"""
+    return tool['name'].lower().replace(' ', '')
+
+
+def _tool_row(tool: Dict[str, Any]) -> Dict[str, Any]:
+    row = {
+        'id': tool_id(tool),
+        'name': tool['name'],
+        'display_name': tool['display_name'],
+        'category': tool['category'],
+        'description': tool['description'],
+        'topics': tool.get('topics', ''),
+        'priority': tool['priority'],
+        'tech_level': tool['techLevel'],
+        'contexts': json.dumps(tool['contexts']),
+        'subjects': json.dumps(tool['subjects']),
+        'original_category': tool['original_category'],
+        'primary_role': tool['primary_role'],
+        **{column: tool.get(column) for column in CARD_COLUMNS},
+    }
+    for column in ('languages', 'release'):
+        if row[column] is not None:
+            row[column] = json.dumps(row[column])
+    # Roles are part of the hash so a confidence change alone still rewrites the tool
+    hashed = json.dumps([row, tool['roles']], sort_keys=True).encode('utf-8')
+    row['content_hash'] = hashlib.sha256(hashed).hexdigest()
+    return row
+
+
+class CatalogueDatabase:
+    def __init__(self, db_file: str = DEFAULT_DB):
+        self.db_file = Path(db_file)
+        self.conn = sqlite3.connect(str(self.db_file))
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA foreign_keys=ON')
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.executescript(SCHEMA)
+        self._add_card_columns()
+
+    def _add_card_columns(self) -> None:
+        """Bring databases created before the card columns existed up to date"""
+        existing = {row['name'] for row in self.conn.execute('PRAGMA table_info(tools)')}
+        for column, column_type in CARD_COLUMNS.items():
+            if column not in existing:
+                self.conn.execute(f'ALTER TABLE tools ADD COLUMN {column} {column_type}')
+        self.conn.commit()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> 'CatalogueDatabase':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def sync(self, tools: Iterable[Dict[str, Any]],
+             categories: Optional[Dict[str, str]] = None) -> Dict[str, int]:
+        """Upsert changed tools and their roles and drop tools no longer in the catalogue"""
+        stats = {'inserted': 0, 'updated': 0, 'deleted': 0, 'unchanged': 0}
+        columns = TOOL_COLUMNS + list(CARD_COLUMNS) + ['content_hash']
+        upsert = (f"INSERT INTO tools ({', '.join(columns)}) "
+                  f"VALUES ({', '.join(':' + column for column in columns)}) "
+                  f"ON CONFLICT (id) DO UPDATE SET "
+                  f"{', '.join(f'{column} = excluded.{column}' for column in columns[1:])}")
+
+        with self.conn:
+            known = dict(self.conn.execute('SELECT id, content_hash FROM tools').fetchall())
+            seen = set()
+            for tool in tools:
+                row = _tool_row(tool)
+                seen.add(row['id'])
+                previous = known.get(row['id'])
+                if previous == row['content_hash']:
+                    stats['unchanged'] += 1
+                    continue
+
+                self.conn.execute(upsert, row)
+                self.conn.execute('DELETE FROM tool_roles WHERE tool_id = ?', (row['id'],))
+                self.conn.executemany(
+                    'INSERT INTO tool_roles (tool_id, role, confidence, score) VALUES (?, ?, ?, ?)',
+                    [(row['id'], role['role'], role['confidence'], role['score']) for role in tool['roles']])
+                stats['inserted' if previous is None else 'updated'] += 1
+
+            removed = [(tool_id,) for tool_id in known if tool_id not in seen]
+            self.conn.executemany('DELETE FROM tools WHERE id = ?', removed)
+            stats['deleted'] = len(removed)
+
+            if categories:
+                self.conn.execute('DELETE FROM categories WHERE name NOT IN (%s)'
+                                  % ', '.join('?' * len(categories)), list(categories))
+                self.conn.executemany('INSERT INTO categories (name, label) VALUES (?, ?) '
+                                      'ON CONFLICT (name) DO UPDATE SET label = excluded.label '
+                                      'WHERE label != excluded.label', categories.items())
+        return stats
+
+    def cards(self, category_order: List[str]) -> Iterator[sqlite3.Row]:
+        """Stream every tool with its roles in classification order, grouped by original category in
+        the given order"""
+        order = ' '.join(f'WHEN ? THEN {i}' for i in range(len(category_order)))
+        return self.conn.execute(
+            'SELECT tools.*, '
+            "(SELECT group_concat(role, ' ') FROM (SELECT role FROM tool_roles "
+            ' WHERE tool_id = tools.id ORDER BY rowid)) AS roles, '
+            "(SELECT group_concat(role || ':' || confidence, ' ') FROM (SELECT role, confidence FROM tool_roles "
+            ' WHERE tool_id = tools.id ORDER BY rowid)) AS role_confidence '
+            f'FROM tools ORDER BY CASE original_category {order} ELSE {len(category_order)} END, '
+            'original_category, rowid', category_order)
+
+    def search(self, query: str, limit: int = 10) -> List[sqlite3.Row]:
+        """Tools matching an FTS5 query, best match first"""
+        return self.conn.execute(
+            'SELECT tools.id, tools.display_name, tools.category, tools.primary_role, '
+            "snippet(tools_fts, 1, '[', ']', '...', 12) AS excerpt "
+            'FROM tools_fts JOIN tools ON tools.rowid = tools_fts.rowid '
+            'WHERE tools_fts MATCH ? ORDER BY bm25(tools_fts) LIMIT ?', (query, limit)).fetchall()
+
+    def facets(self, query: Optional[str] = None) -> Dict[str, List[Tuple[str, int]]]:
+        """Tool counts per value of each facet, optionally restricted to an FTS5 query"""
+        scope = 'SELECT * FROM tools'
+        if query:
+            scope += ' WHERE rowid IN (SELECT rowid FROM tools_fts WHERE tools_fts MATCH :query)'
+        params = {'query': query}
+
+        facets = {}
+        for facet in FACETS:
+            facets[facet] = [tuple(row) for row in self.conn.execute(
+                f'WITH scope AS ({scope}) SELECT {facet}, COUNT(*) FROM scope '
+                f'GROUP BY {facet} ORDER BY COUNT(*) DESC, {facet}', params)]
+        facets['role'] = [tuple(row) for row in self.conn.execute(
+            f'WITH scope AS ({scope}) SELECT role, COUNT(*) FROM tool_roles '
+            f'JOIN scope ON scope.id = tool_roles.tool_id GROUP BY role ORDER BY COUNT(*) DESC, role',
+            params)]
+        return facets
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Query the tool catalogue database')
+    parser.add_argument('--db', default=DEFAULT_DB,
+                       help=f'Catalogue database (default: {DEFAULT_DB})')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    search_parser = subparsers.add_parser('search', help='Full-text search over name, description and topics')
+    search_parser.add_argument('query', help='FTS5 query, e.g. "python OR tutor*"')
+    search_parser.add_argument('--limit', type=int, default=10,
+                              help='Maximum results (default: 10)')
+    facets_parser = subparsers.add_parser('facets', help='Tool counts per category, role, level and priority')
+    facets_parser.add_argument('query', nargs='?',
+                              help='Only count tools matching this FTS5 query')
+    subparsers.add_parser('sql', help='Run a read-only SQL statement from stdin')
+
+    args = parser.parse_args()
+
+    if not Path(args.db).exists():
+        print(f"ERROR: {args.db} not found - run update_quiz_tools.py first")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    try:
+        with CatalogueDatabase(args.db) as db:
+            if args.command == 'search':
+                for row in db.search(args.query, args.limit):
+                    print(f"{row['display_name']} [{row['category']}, {row['primary_role']}]")
+                    print(f"   {row['excerpt']}")
+            elif args.command == 'facets':
+                for facet, counts in db.facets(args.query).items():
+                    print(f"{facet}:")
+                    for value, count in counts:
+                        print(f"  {value}: {count}")
+            else:
+                db.conn.execute('PRAGMA query_only=ON')
+                cursor = db.conn.execute(sys.stdin.read())
+                for row in cursor:
+                    print(' | '.join(str(value) for value in row))
+    except sqlite3.Error as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+    print(f"({(time.perf_counter() - start) * 1000:.1f} ms)")
+
+
+if __name__ == '__main__':
+    main()
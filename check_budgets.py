@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Performance Budget Checker
+Measures each generated page and fails when it exceeds the limits in budgets.json
+"""
+
+import argparse
+import codecs
+import json
+import sys
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from fnmatch import fnmatch
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from site_paths import ROOT
+
+CHUNK_SIZE = 64 * 1024
+BUDGET_FILE = ROOT / 'budgets.json'
+
+METRICS = [
+    ('raw_bytes', 'Raw size'),
+    ('gzip_bytes', 'Gzip size'),
+    ('dom_nodes', 'DOM elements'),
+    ('inline_script_bytes', 'Inline script'),
+    ('inline_style_bytes', 'Inline style'),
+    ('data_uri_bytes', 'data: URIs'),
+    ('blocking_resources', 'Render-blocking resources'),
+]
+
+class _PageMetricsParser(HTMLParser):
+    """Accumulates page weight metrics from incrementally fed HTML"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=False)
+        self.metrics = {name: 0 for name, _ in METRICS if name not in ('raw_bytes', 'gzip_bytes')}
+        self.blocking: List[str] = []
+        self._in_head = False
+        self._inline = None  # 'script' or 'style' while inside an inline block
+
+    def handle_starttag(self, tag, attrs):
+        self.metrics['dom_nodes'] += 1
+        attributes = dict(attrs)
+
+        for value in attributes.values():
+            if value and value.startswith('data:'):
+                self.metrics['data_uri_bytes'] += len(value.encode('utf-8'))
+
+        if tag == 'head':
+            self._in_head = True
+        elif tag == 'body':
+            self._in_head = False
+        elif tag == 'script':
+            if 'src' in attributes:
+                if self._in_head and not ({'async', 'defer'} & attributes.keys()) \
+                        and attributes.get('type') != 'module':
+                    self.blocking.append(attributes['src'][:80])
+            else:
+                self._inline = 'script'
+        elif tag == 'style':
+            self._inline = 'style'
+        elif tag == 'link' and self._in_head:
+            rel = (attributes.get('rel') or '').lower().split()
+            media = (attributes.get('media') or 'all').lower()
+            if 'stylesheet' in rel and media in ('all', 'screen'):
+                self.blocking.append((attributes.get('href') or '')[:80])
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+
+    def handle_endtag(self, tag):
+        if tag == 'head':
+            self._in_head = False
+        elif tag in ('script', 'style'):
+            self._inline = None
+
+    def handle_data(self, data):
+        if self._inline:
+            self.metrics[f'inline_{self._inline}_bytes'] += len(data.encode('utf-8'))
+
+
+def measure_page(path: Path) -> Dict[str, Any]:
+    """Measure one page in a single streaming pass"""
+    parser = _PageMetricsParser()
+    compressor = zlib.compressobj(9, zlib.DEFLATED, 31)  # gzip container
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    raw_bytes = gzip_bytes = 0
+
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            raw_bytes += len(chunk)
+            gzip_bytes += len(compressor.compress(chunk))
+            parser.feed(decoder.decode(chunk))
+    gzip_bytes += len(compressor.flush())
+    parser.feed(decoder.decode(b'', final=True))
+    parser.close()
+
+    metrics = dict(parser.metrics, raw_bytes=raw_bytes, gzip_bytes=gzip_bytes)
+    metrics['blocking_resources'] = len(parser.blocking)
+    metrics['blocking_urls'] = parser.blocking
+    return metrics
+
+
+class BudgetChecker:
+    def __init__(self, budget_file: Path = BUDGET_FILE, root: Path = ROOT):
+        self.budget_file = budget_file
+        self.root = root
+        self.config = json.loads(budget_file.read_text(encoding='utf-8'))
+
+    def pages(self) -> List[str]:
+        """Pages named in the config, with glob patterns expanded"""
+        pages = set()
+        for pattern in self.config['pages']:
+            if any(char in pattern for char in '*?['):
+                pages.update(p.relative_to(self.root).as_posix() for p in self.root.glob(pattern) if p.is_file())
+            else:
+                pages.add(pattern)
+        return sorted(pages)
+
+    def limits_for(self, page: str) -> Dict[str, int]:
+        """Defaults, then matching glob entries, then the page's own entry"""
+        limits = dict(self.config.get('defaults', {}))
+        for pattern, page_limits in self.config['pages'].items():
+            if pattern != page and fnmatch(page, pattern):
+                limits.update(page_limits)
+        limits.update(self.config['pages'].get(page, {}))
+        return limits
+
+    def check(self) -> List[Tuple[str, Dict[str, Any], Dict[str, int]]]:
+        """Measure every budgeted page concurrently, returning (page, metrics, limits)"""
+        pages = self.pages()
+        with ThreadPoolExecutor() as executor:
+            measured = list(executor.map(lambda page: measure_page(self.root / page), pages))
+        return [(page, metrics, self.limits_for(page)) for page, metrics in zip(pages, measured)]
+
+
+def over_budget(metrics: Dict[str, Any], limits: Dict[str, int]) -> List[str]:
+    """Names of the metrics exceeding their limits"""
+    return [name for name, _ in METRICS if name in limits and metrics[name] > limits[name]]
+
+
+def format_report(results: List[Tuple[str, Dict[str, Any], Dict[str, int]]]) -> str:
+    """Per-page breakdown of every metric against its limit"""
+    lines = []
+    for page, metrics, limits in results:
+        failures = over_budget(metrics, limits)
+        lines.append(f"{'❌' if failures else '✅'} {page}")
+        for name, label in METRICS:
+            limit = limits.get(name)
+            marker = '  <-- over budget' if name in failures else ''
+            limit_text = f"{limit:,}" if limit is not None else 'no limit'
+            lines.append(f"   {label:<26} {metrics[name]:>12,} / {limit_text}{marker}")
+        if 'blocking_resources' in failures:
+            for url in metrics['blocking_urls']:
+                lines.append(f"      blocking: {url}")
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check generated pages against performance budgets')
+    parser.add_argument('--config', default=str(BUDGET_FILE),
+                       help='Path to budget file (default: budgets.json)')
+    parser.add_argument('--root', default='.',
+                       help='Directory the pages are measured in, relative to the site root, e.g. dist (default: .)')
+    parser.add_argument('--json', action='store_true',
+                       help='Print the raw measurements as JSON')
+
+    args = parser.parse_args()
+
+    try:
+        results = BudgetChecker(Path(args.config), ROOT / args.root).check()
+    except Exception as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+
+    if args.json:
+        print(json.dumps({page: metrics for page, metrics, _ in results}, indent=2))
+    else:
+        print(format_report(results))
+
+    failed = [page for page, metrics, limits in results if over_budget(metrics, limits)]
+    if failed:
+        print(f"\n❌ {len(failed)} page(s) over budget: {', '.join(failed)}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Link Integrity Checker
+Verifies that every relative href/src in the site's HTML resolves to a file in the tree
+"""
+
+import argparse
+import os
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+from urllib.parse import unquote, urlsplit
+
+from site_paths import ROOT
+
+CHUNK_SIZE = 256 * 1024
+# Longest attribute prefix (e.g. ' href  =  "') that may straddle two chunks
+CARRY_SIZE = 64
+MAX_URL_LENGTH = 4096
+
+# data-slide-src names a presentation slide fragment, and data-slide-anchors the ids it
+# brings into the shell page (see split_presentation.py)
+ATTRIBUTE_PATTERN = re.compile(rb'[\s"\'](href|src|id|data-slide-src|data-slide-anchors)\s*=\s*(["\'])',
+                               re.IGNORECASE)
+EXTERNAL_SCHEMES = ('http:', 'https:', 'mailto:', 'tel:', 'javascript:', 'data:', '//')
+
+DEFAULT_PAGES = ['*.html', 'ai/*.html', 'ai/presentation/**/*.html']
+
+
+class LinkScanner:
+    """Streams an HTML file and yields (attribute, value) pairs for href, src, id and the
+    slide attributes.
+
+    Values starting with ``data:`` are skipped in place, so multi-megabyte inlined
+    images are never copied out of the read buffer. This is why the checker does not use
+    html_stream's LinkCollector: its tokenizer buffers and decodes each whole tag, and on
+    ai/presentation.html takes about four times as long with ten times the peak memory.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+
+    def __iter__(self) -> Iterator[Tuple[str, str]]:
+        carry = b''
+        skip_until: Optional[bytes] = None  # closing quote of a data: URI being skipped
+        partial: Optional[Tuple[str, bytes, bytes]] = None  # attribute, quote, value so far
+
+        with open(self.path, 'rb') as f:
+            for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+                start = 0
+                if skip_until is not None:
+                    end = chunk.find(skip_until)
+                    if end < 0:
+                        continue
+                    skip_until, start = None, end + 1
+                elif partial is not None:
+                    attribute, quote, value = partial
+                    end = chunk.find(quote)
+                    if end < 0:
+                        partial = (attribute, quote, value + chunk) if len(value) < MAX_URL_LENGTH else None
+                        continue
+                    partial = None
+                    yield attribute, (value + chunk[:end]).decode('utf-8', 'replace')
+                    start = end + 1
+
+                buffer = carry + chunk[start:] if start == 0 else chunk[start:]
+                carry = b''
+                pos = 0
+                while True:
+                    match = ATTRIBUTE_PATTERN.search(buffer, pos)
+                    if not match:
+                        break
+                    attribute = match.group(1).decode('ascii').lower()
+                    quote = match.group(2)
+                    value_start = match.end()
+                    if buffer.startswith(b'data:', value_start):
+                        end = buffer.find(quote, value_start)
+                        if end < 0:
+                            skip_until = quote
+                            pos = len(buffer)
+                            break
+                        pos = end + 1
+                        continue
+                    end = buffer.find(quote, value_start)
+                    if end < 0:
+                        if len(buffer) - value_start < len('data:'):
+                            # Too little left to know whether this is a data: URI
+                            carry = buffer[match.start():]
+                        else:
+                            partial = (attribute, quote, buffer[value_start:])
+                        pos = len(buffer)
+                        break
+                    yield attribute, buffer[value_start:end].decode('utf-8', 'replace')
+                    pos = end + 1
+
+                if skip_until is None and partial is None and not carry:
+                    carry = buffer[max(pos, len(buffer) - CARRY_SIZE):]
+
+
+class LinkChecker:
+    def __init__(self, pages: List[str] = None, root: Path = ROOT, jobs: int = 0):
+        self.pages = pages or DEFAULT_PAGES
+        self.root = root
+        self.jobs = jobs or min(32, (os.cpu_count() or 1) * 4)
+        self._ids: Dict[Path, Set[str]] = {}
+
+    def discover(self) -> List[Path]:
+        """Find the HTML pages to check"""
+        paths = set()
+        for pattern in self.pages:
+            paths.update(p for p in self.root.glob(pattern) if p.is_file())
+        return sorted(paths)
+
+    def scan(self, page: Path) -> Tuple[Path, List[str], Set[str], List[str]]:
+        """Collect a page's link targets, element ids and slide fragments in one streaming pass"""
+        links, ids, fragments = [], set(), []
+        for attribute, value in LinkScanner(page):
+            if attribute == 'id':
+                ids.add(value)
+            elif attribute == 'data-slide-anchors':
+                # Ids inside a fragment that is not loaded yet, which the shell's loader
+                # fetches when one of them is navigated to
+                ids.update(value.split())
+            else:
+                links.append(value)
+                if attribute == 'data-slide-src':
+                    fragments.append(value)
+        return page, links, ids, fragments
+
+    def _page_ids(self, page: Path) -> Set[str]:
+        if page not in self._ids:
+            self._ids[page] = self.scan(page)[2]
+        return self._ids[page]
+
+    def resolve(self, page: Path, link: str) -> Optional[str]:
+        """Return a problem description for a link, or None if it resolves"""
+        link = link.strip()
+        if not link or link.lower().startswith(EXTERNAL_SCHEMES) or '${' in link:
+            return None
+
+        parts = urlsplit(link)
+        if parts.scheme or parts.netloc:
+            return None
+
+        if parts.path:
+            base = self.root if parts.path.startswith('/') else page.parent
+            target = (base / unquote(parts.path).lstrip('/')).resolve()
+            try:
+                target.relative_to(self.root)
+            except ValueError:
+                return f"{link} points outside the site"
+            if target.is_dir():
+                if not (target / 'index.html').is_file():
+                    return f"{link} is a directory without index.html"
+                target = target / 'index.html'
+            elif not target.is_file():
+                return f"{link} not found"
+        else:
+            target = page
+
+        if parts.fragment and target.suffix == '.html':
+            if unquote(parts.fragment) not in self._page_ids(target):
+                return f"{link} has no element with id '{parts.fragment}'"
+        return None
+
+    def check(self) -> Dict[str, List[str]]:
+        """Check every page concurrently, returning broken links keyed by page"""
+        pages = self.discover()
+        with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+            scanned = list(executor.map(self.scan, pages))
+        # A slide fragment is inserted into the shell page that names it, so its links
+        # resolve against the shell
+        shells = {}
+        for page, _, ids, fragments in scanned:
+            self._ids[page] = ids
+            shells.update(((page.parent / unquote(src)).resolve(), page) for src in fragments)
+
+        broken = {}
+        for page, links, _, _ in scanned:
+            base = shells.get(page.resolve(), page)
+            problems = [problem for problem in (self.resolve(base, link) for link in dict.fromkeys(links))
+                        if problem]
+            if problems:
+                broken[page.relative_to(self.root).as_posix()] = problems
+        return broken
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check relative links and assets in the site HTML')
+    parser.add_argument('pages', nargs='*',
+                       help=f'Glob patterns of pages to check (default: {" ".join(DEFAULT_PAGES)})')
+    parser.add_argument('--jobs', type=int, default=0,
+                       help='Worker threads (default: 4 per CPU, at most 32)')
+
+    args = parser.parse_args()
+
+    checker = LinkChecker(args.pages or None, jobs=args.jobs)
+    broken = checker.check()
+
+    for page, problems in broken.items():
+        print(f"❌ {page}")
+        for problem in problems:
+            print(f"   - {problem}")
+
+    if broken:
+        total = sum(len(problems) for problems in broken.values())
+        print(f"\n{total} broken link(s) in {len(broken)} page(s)")
+        sys.exit(1)
+    print(f"✅ All links resolve in {len(checker.discover())} pages")
+
+
+if __name__ == '__main__':
+    main()
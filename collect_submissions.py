@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Quiz Submission Collector
+Small asyncio HTTP endpoint the quiz beacons its answers and recommended tools to,
+stored in batched transactions in a WAL-mode SQLite file
+"""
+
+import argparse
+import asyncio
+import json
+import re
+import sqlite3
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List, Optional, Tuple
+
+DEFAULT_DB = 'submissions.db'
+DEFAULT_PORT = 8765
+QUESTIONS = [f'q{n}' for n in range(1, 9)]
+
+MAX_HEADER_BYTES = 8 * 1024
+MAX_BODY_BYTES = 16 * 1024
+MAX_TOOLS = 50
+VALUE_PATTERN = re.compile(r'^[\w.-]{1,64}$')
+
+SCHEMA = f'''
+CREATE TABLE IF NOT EXISTS submissions (
+    id INTEGER PRIMARY KEY,
+    received_at REAL NOT NULL,
+    {', '.join(f'{q} TEXT' for q in QUESTIONS)},
+    tools TEXT NOT NULL
+)
+'''
+INSERT = (f"INSERT INTO submissions (received_at, {', '.join(QUESTIONS)}, tools) "
+          f"VALUES ({', '.join('?' * (len(QUESTIONS) + 2))})")
+
+REASONS = {200: 'OK', 204: 'No Content', 400: 'Bad Request', 404: 'Not Found',
+           405: 'Method Not Allowed', 413: 'Payload Too Large', 503: 'Service Unavailable'}
+CORS_HEADERS = ('Access-Control-Allow-Origin: *\r\n'
+                'Access-Control-Allow-Methods: POST, OPTIONS\r\n'
+                'Access-Control-Allow-Headers: Content-Type\r\n')
+
+Row = Tuple[Any, ...]
+
+
+def connect(db_path: str) -> sqlite3.Connection:
+    """Open the submissions database in WAL mode, creating the table if needed"""
+    conn = sqlite3.connect(db_path, check_same_thread=False)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.execute(SCHEMA)
+    conn.commit()
+    return conn
+
+
+def parse_submission(body: bytes, received_at: float) -> Row:
+    """Validate a beaconed {"answers": {...}, "tools": [...]} payload into a table row"""
+    try:
+        payload = json.loads(body)
+    except (UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise ValueError(f"invalid JSON: {e}")
+    if not isinstance(payload, dict):
+        raise ValueError("payload must be an object")
+
+    answers = payload.get('answers')
+    tools = payload.get('tools')
+    if not isinstance(answers, dict) or not isinstance(tools, list):
+        raise ValueError("payload needs an 'answers' object and a 'tools' list")
+    if len(tools) > MAX_TOOLS:
+        raise ValueError(f"more than {MAX_TOOLS} tools")
+
+    values = [answers.get(q) for q in QUESTIONS]
+    for value in [v for v in values if v is not None] + tools:
+        if not isinstance(value, str) or not VALUE_PATTERN.match(value):
+            raise ValueError(f"invalid answer or tool id: {value!r}")
+    return (received_at, *values, ','.join(tools))
+
+
+class SubmissionCollector:
+    """Buffers submissions in memory and writes them in one transaction per batch"""
+
+    def __init__(self, db_path: str = DEFAULT_DB, batch_size: int = 500,
+                 flush_interval: float = 1.0, max_pending: int = 50000):
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.buffer: List[Row] = []
+        self.stats = {'received': 0, 'stored': 0, 'rejected': 0, 'batches': 0, 'write_errors': 0}
+        # SQLite work stays on one thread, off the event loop
+        self._writer = ThreadPoolExecutor(max_workers=1)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._flush_due: Optional[asyncio.Event] = None
+
+    def _write_batch(self, rows: List[Row]) -> None:
+        with self._conn:
+            self._conn.executemany(INSERT, rows)
+
+    async def flush(self) -> None:
+        async with self._flush_lock:
+            if not self.buffer:
+                return
+            rows, self.buffer = self.buffer, []
+            try:
+                await asyncio.get_running_loop().run_in_executor(self._writer, self._write_batch, rows)
+            except (sqlite3.Error, OSError):
+                # The transaction rolled back; requeue the batch ahead of anything newer
+                self.buffer[:0] = rows
+                self.stats['write_errors'] += 1
+                raise
+            self.stats['stored'] += len(rows)
+            self.stats['batches'] += 1
+
+    async def _flush_periodically(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._flush_due.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_due.clear()
+            try:
+                await self.flush()
+            except (sqlite3.Error, OSError) as e:
+                # Keep flushing; submit() sheds load with 503s while the backlog is full
+                print(f"⚠️  Flush failed, {len(self.buffer)} submissions kept for retry: {e}")
+
+    def submit(self, body: bytes) -> int:
+        """Queue one submission, returning the HTTP status for the response"""
+        if len(self.buffer) >= self.max_pending:
+            return 503
+        try:
+            row = parse_submission(body, time.time())
+        except ValueError:
+            self.stats['rejected'] += 1
+            return 400
+        self.buffer.append(row)
+        self.stats['received'] += 1
+        if len(self.buffer) >= self.batch_size:
+            self._flush_due.set()
+        return 204
+
+    def _respond(self, writer: asyncio.StreamWriter, status: int, body: bytes = b'',
+                 keep_alive: bool = True) -> None:
+        headers = (f"HTTP/1.1 {status} {REASONS[status]}\r\n{CORS_HEADERS}"
+                   f"Content-Length: {len(body)}\r\n")
+        if body:
+            headers += 'Content-Type: application/json\r\n'
+        if not keep_alive:
+            headers += 'Connection: close\r\n'
+        writer.write(headers.encode('ascii') + b'\r\n' + body)
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve HTTP/1.1 requests on one keep-alive connection"""
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b'\r\n\r\n')
+                except asyncio.IncompleteReadError:
+                    break
+                except asyncio.LimitOverrunError:
+                    self._respond(writer, 413, keep_alive=False)
+                    break
+
+                lines = head.decode('latin-1').split('\r\n')
+                method, path, version = (lines[0].split(' ') + ['', '', ''])[:3]
+                headers = {}
+                for line in lines[1:]:
+                    name, _, value = line.partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                keep_alive = (headers.get('connection', '').lower() != 'close'
+                              and version == 'HTTP/1.1')
+
+                length = int(headers.get('content-length') or 0)
+                if length > MAX_BODY_BYTES:
+                    self._respond(writer, 413, keep_alive=False)
+                    break
+                body = await reader.readexactly(length) if length else b''
+
+                path = path.split('?', 1)[0]
+                if path == '/submit' and method == 'POST':
+                    self._respond(writer, self.submit(body), keep_alive=keep_alive)
+                elif path == '/submit' and method == 'OPTIONS':
+                    self._respond(writer, 204, keep_alive=keep_alive)
+                elif path == '/stats' and method == 'GET':
+                    stats = dict(self.stats, pending=len(self.buffer))
+                    self._respond(writer, 200, json.dumps(stats).encode('utf-8'), keep_alive)
+                elif path in ('/submit', '/stats'):
+                    self._respond(writer, 405, keep_alive=keep_alive)
+                else:
+                    self._respond(writer, 404, keep_alive=keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host: str = '127.0.0.1', port: int = DEFAULT_PORT,
+                    ready: Optional[asyncio.Event] = None) -> None:
+        """Accept submissions until cancelled, then flush whatever is still buffered"""
+        loop = asyncio.get_running_loop()
+        self._conn = await loop.run_in_executor(self._writer, connect, self.db_path)
+        self._flush_lock = asyncio.Lock()
+        self._flush_due = asyncio.Event()
+        flusher = asyncio.create_task(self._flush_periodically())
+        server = await asyncio.start_server(self.handle, host, port, limit=MAX_HEADER_BYTES)
+        if ready:
+            ready.set()
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            flusher.cancel()
+            try:
+                await self.flush()
+            finally:
+                await loop.run_in_executor(self._writer, self._conn.close)
+                self._writer.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Collect quiz submissions into SQLite')
+    parser.add_argument('--db', default=DEFAULT_DB,
+                       help=f'SQLite database file (default: {DEFAULT_DB})')
+    parser.add_argument('--host', default='127.0.0.1',
+                       help='Address to listen on (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT,
+                       help=f'Port to listen on (default: {DEFAULT_PORT})')
+    parser.add_argument('--batch-size', type=int, default=500,
+                       help='Submissions per transaction (default: 500)')
+    parser.add_argument('--flush-interval', type=float, default=1.0,
+                       help='Seconds between flushes of a partial batch (default: 1.0)')
+
+    args = parser.parse_args()
+
+    collector = SubmissionCollector(args.db, args.batch_size, args.flush_interval)
+    print(f"✅ Collecting submissions at http://{args.host}:{args.port}/submit into {args.db}")
+    try:
+        asyncio.run(collector.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    except Exception as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+    print(f"Stored {collector.stats['stored']} submissions in {collector.stats['batches']} batches")
+
+
+if __name__ == '__main__':
+    main()
@@ -2,12 +2,18 @@
 """
 Tool Analysis Script for Educational Tools Quiz
 Analyzes all tools from index.html and categorizes them by teaching context
+with the shared rules in classifier_rules.json
 """
 
 import re
+import sys
 import json
+import argparse
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from tool_classifier import load_classifier
+
 def extract_tools_from_html(html_file):
     """Extract all tool information from index.html"""
     with open(html_file, 'r', encoding='utf-8') as f:
@@ -41,103 +47,26 @@ def extract_tools_from_html(html_file):
     
     return tools
 
-def categorize_for_teaching(tools):
+def classify_tools(tools, classifier):
+    """Classify each tool with the production rules in classifier_rules.json"""
+    return [classifier.classify({'topics': '', **tool, 'original_category': tool['category']}) for tool in tools]
+
+def categorize_for_teaching(tools, classifications, classifier):
     """Categorize tools by teaching context and use case"""
-    
-    # Define teaching context categories
     teaching_categories = {
-        'content_creation': {
-            'description': 'Tools for creating educational content, presentations, and materials',
-            'tools': []
-        },
-        'student_interaction': {
-            'description': 'Tools for engaging with students and interactive learning',
-            'tools': []
-        },
-        'assessment_feedback': {
-            'description': 'Tools for assessment, grading, and providing feedback',
-            'tools': []
-        },
-        'language_communication': {
-            'description': 'Tools for language learning and communication skills',
-            'tools': []
-        },
-        'data_analysis': {
-            'description': 'Tools for analyzing student data and educational insights',
-            'tools': []
-        },
-        'technical_development': {
-            'description': 'Tools for programming, development, and technical education',
-            'tools': []
-        },
-        'project_management': {
-            'description': 'Tools for managing educational projects and resources',
-            'tools': []
-        },
-        'infrastructure_setup': {
-            'description': 'Technical infrastructure and setup tools (mainly for educators)',
+        category: {
+            'description': classifier.category_descriptions.get(category, {}).get('description', ''),
             'tools': []
         }
+        for category in classifier.categories
     }
     
-    # Categorize each tool based on name and description
-    for tool in tools:
-        name_lower = tool['name'].lower()
-        desc_lower = tool['description'].lower()
-        
-        # Content Creation Tools
-        if any(keyword in name_lower or keyword in desc_lower for keyword in 
-               ['curriculum', 'content', 'presentation', 'case studies', 'brief', 'slide', 'docs']):
-            teaching_categories['content_creation']['tools'].append(tool)
-        
-        # Student Interaction Tools
-        elif any(keyword in name_lower or keyword in desc_lower for keyword in 
-                 ['interaction', 'poll', 'audience', 'pulse', 'engage', 'clone', 'buddy']):
-            teaching_categories['student_interaction']['tools'].append(tool)
-        
-        # Assessment & Feedback Tools
-        elif any(keyword in name_lower or keyword in desc_lower for keyword in 
-                 ['feedback', 'forward', 'insight', 'analysis', 'survey', 'quest']):
-            teaching_categories['assessment_feedback']['tools'].append(tool)
-        
-        # Language & Communication Tools
-        elif any(keyword in name_lower or keyword in desc_lower for keyword in 
-                 ['talk', 'conversation', 'english', 'communication', 'voice', 'transcription']):
-            teaching_categories['language_communication']['tools'].append(tool)
-        
-        # Data Analysis Tools
-        elif any(keyword in name_lower or keyword in desc_lower for keyword in 
-                 ['data', 'analysis', 'insights', 'trends', 'visualise', 'lens']):
-            teaching_categories['data_analysis']['tools'].append(tool)
-        
-        # Technical Development Tools
-        elif any(keyword in name_lower or keyword in desc_lower for keyword in 
-                 ['python', 'programming', 'code', 'dev', 'sim-lab', 'calculator', 'weather']):
-            teaching_categories['technical_development']['tools'].append(tool)
-        
-        # Project Management Tools
-        elif any(keyword in name_lower or keyword in desc_lower for keyword in 
-                 ['project', 'management', 'capstone', 'connect', 'venture', 'lab']):
-            teaching_categories['project_management']['tools'].append(tool)
-        
-        # Infrastructure Tools (mainly for educators/developers)
-        elif any(keyword in name_lower or keyword in desc_lower for keyword in 
-                 ['template', 'scaffold', 'kit', 'cms', 'infrastructure', 'docker', 'toolkit', 'utils']):
-            teaching_categories['infrastructure_setup']['tools'].append(tool)
-        
-        # Default category if no match
-        else:
-            # Try to guess based on category
-            if tool['category'] == 'learning-resource':
-                teaching_categories['technical_development']['tools'].append(tool)
-            elif tool['category'] == 'infrastructure-tool':
-                teaching_categories['infrastructure_setup']['tools'].append(tool)
-            else:
-                teaching_categories['content_creation']['tools'].append(tool)
+    for tool, classification in zip(tools, classifications):
+        teaching_categories[classification['category']]['tools'].append(tool)
     
     return teaching_categories
 
-def analyze_tool_complexity(tools):
+def analyze_tool_complexity(tools, classifications):
     """Analyze technical complexity of tools"""
     complexity_levels = {
         'beginner': [],
@@ -145,30 +74,25 @@ def analyze_tool_complexity(tools):
         'advanced': []
     }
     
-    for tool in tools:
-        name_lower = tool['name'].lower()
-        desc_lower = tool['description'].lower()
-        
-        # Beginner-friendly indicators
-        if any(keyword in name_lower or keyword in desc_lower for keyword in 
-               ['beginner', 'jumpstart', 'learn', 'tutorial', 'guide', 'minimum', 'buddy']):
-            complexity_levels['beginner'].append(tool)
-        
-        # Advanced technical indicators
-        elif any(keyword in name_lower or keyword in desc_lower for keyword in 
-                 ['docker', 'api', 'framework', 'infrastructure', 'electron', 'cms', 'ollama']):
-            complexity_levels['advanced'].append(tool)
-        
-        # Everything else is intermediate
-        else:
-            complexity_levels['intermediate'].append(tool)
+    for tool, classification in zip(tools, classifications):
+        complexity_levels.setdefault(classification['techLevel'], []).append(tool)
     
     return complexity_levels
 
 def main():
+    parser = argparse.ArgumentParser(description='Analyze tools from index.html')
+    parser.add_argument('--html-file', default='index.html',
+                       help='Path to HTML file (default: index.html)')
+    parser.add_argument('--output', default='tool_analysis.json',
+                       help='Path to analysis JSON file (default: tool_analysis.json)')
+    parser.add_argument('--rules', default=None,
+                       help='Classifier rules file (default: classifier_rules.json)')
+    args = parser.parse_args()
+    
     # Extract tools from HTML
-    html_file = 'index.html'
-    tools = extract_tools_from_html(html_file)
+    tools = extract_tools_from_html(args.html_file)
+    classifier = load_classifier(args.rules)
+    classifications = classify_tools(tools, classifier)
     
     print(f"Found {len(tools)} tools")
     print("\n=== ALL TOOLS ===")
@@ -176,7 +100,7 @@ def main():
         print(f"- {tool['name']} ({tool['category']}): {tool['description'][:80]}...")
     
     # Categorize by teaching context
-    teaching_cats = categorize_for_teaching(tools)
+    teaching_cats = categorize_for_teaching(tools, classifications, classifier)
     
     print("\n=== TEACHING CONTEXT CATEGORIZATION ===")
     for cat_name, cat_data in teaching_cats.items():
@@ -186,7 +110,7 @@ def main():
             print(f"  - {tool['name']}")
     
     # Analyze complexity
-    complexity = analyze_tool_complexity(tools)
+    complexity = analyze_tool_complexity(tools, classifications)
     
     print("\n=== COMPLEXITY ANALYSIS ===")
     for level, tool_list in complexity.items():
@@ -202,10 +126,10 @@ def main():
         'total_count': len(tools)
     }
     
-    with open('tool_analysis.json', 'w') as f:
+    with open(args.output, 'w') as f:
         json.dump(analysis, f, indent=2)
     
-    print(f"\nAnalysis saved to tool_analysis.json")
+    print(f"\nAnalysis saved to {args.output}")
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
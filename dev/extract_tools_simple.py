@@ -1,10 +1,16 @@
 #!/usr/bin/env python3
 """
 Simple tool extraction script
+Categorizes the known tool list with the shared rules in classifier_rules.json
 """
 
-import re
+import sys
 import json
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from tool_classifier import load_classifier
 
 def extract_tools():
     """Extract tools manually from the known structure"""
@@ -55,104 +61,28 @@ def extract_tools():
     
     return tools_data
 
-def categorize_for_teaching(tools):
+def classify_tools(tools, classifier):
+    """Classify each tool with the production rules in classifier_rules.json"""
+    return [classifier.classify({'topics': '', **tool, 'original_category': tool['category']}) for tool in tools]
+
+def categorize_for_teaching(tools, classifications, classifier):
     """Categorize tools by teaching context and use case"""
     
     teaching_categories = {
-        'content_creation': {
-            'description': 'Tools for creating educational content, presentations, and materials',
-            'tools': [],
-            'use_cases': ['Creating course content', 'Designing presentations', 'Building case studies', 'Documentation']
-        },
-        'student_interaction': {
-            'description': 'Tools for engaging with students and interactive learning',
-            'tools': [],
-            'use_cases': ['Live polling', 'Interactive sessions', 'Student engagement', 'Real-time feedback']
-        },
-        'assessment_feedback': {
-            'description': 'Tools for assessment, grading, and providing feedback',
-            'tools': [],
-            'use_cases': ['Analyzing student work', 'Providing feedback', 'Survey analysis', 'Performance insights']
-        },
-        'language_communication': {
-            'description': 'Tools for language learning and communication skills',
-            'tools': [],
-            'use_cases': ['Conversation practice', 'Language learning', 'Interview preparation', 'Audio transcription']
-        },
-        'technical_education': {
-            'description': 'Tools for programming, development, and technical education',
+        category: {
+            'description': classifier.category_descriptions.get(category, {}).get('description', ''),
             'tools': [],
-            'use_cases': ['Learning programming', 'Coding practice', 'Technical tutorials', 'Development skills']
-        },
-        'project_management': {
-            'description': 'Tools for managing educational projects and connecting with industry',
-            'tools': [],
-            'use_cases': ['Capstone projects', 'Industry connections', 'Project coordination', 'Business education']
-        },
-        'ai_tutoring': {
-            'description': 'AI-powered tutoring and personalized learning assistance',
-            'tools': [],
-            'use_cases': ['Personalized tutoring', 'AI assistance', 'Custom learning paths', 'Offline learning']
-        },
-        'infrastructure': {
-            'description': 'Technical infrastructure and development tools (mainly for educators)',
-            'tools': [],
-            'use_cases': ['Setting up environments', 'Template creation', 'Development scaffolding', 'Technical setup']
+            'use_cases': classifier.category_descriptions.get(category, {}).get('use_cases', [])
         }
+        for category in classifier.categories
     }
     
-    # Categorize each tool
-    for tool in tools:
-        name = tool['name'].lower()
-        desc = tool['description'].lower()
-        
-        # Content Creation
-        if any(keyword in name or keyword in desc for keyword in 
-               ['curriculum', 'docs', 'brief', 'slide', 'case studies', 'content']):
-            teaching_categories['content_creation']['tools'].append(tool)
-        
-        # Student Interaction
-        elif any(keyword in name or keyword in desc for keyword in 
-                 ['pulse', 'poll', 'interaction', 'audience', 'engage', 'clone']):
-            teaching_categories['student_interaction']['tools'].append(tool)
-        
-        # Assessment & Feedback
-        elif any(keyword in name or keyword in desc for keyword in 
-                 ['feedback', 'forward', 'insight', 'lens', 'analysis', 'survey']):
-            teaching_categories['assessment_feedback']['tools'].append(tool)
-        
-        # Language & Communication
-        elif any(keyword in name or keyword in desc for keyword in 
-                 ['talk', 'conversation', 'english', 'voice', 'transcription', 'deep-talk']):
-            teaching_categories['language_communication']['tools'].append(tool)
-        
-        # Technical Education
-        elif any(keyword in name or keyword in desc for keyword in 
-                 ['python', 'programming', 'code', 'dev', 'calculator', 'weather', 'paradigms']):
-            teaching_categories['technical_education']['tools'].append(tool)
-        
-        # Project Management
-        elif any(keyword in name or keyword in desc for keyword in 
-                 ['capstone', 'connect', 'project', 'venture', 'business', 'industry']):
-            teaching_categories['project_management']['tools'].append(tool)
-        
-        # AI Tutoring
-        elif any(keyword in name or keyword in desc for keyword in 
-                 ['buddy', 'tutor', 'ai', 'chatbot', 'quest', 'hands-on-ai']):
-            teaching_categories['ai_tutoring']['tools'].append(tool)
-        
-        # Infrastructure
-        elif any(keyword in name or keyword in desc for keyword in 
-                 ['template', 'kit', 'scaffold', 'cms', 'utils', 'toolkit', 'infrastructure']):
-            teaching_categories['infrastructure']['tools'].append(tool)
-        
-        # Default fallback
-        else:
-            teaching_categories['content_creation']['tools'].append(tool)
+    for tool, classification in zip(tools, classifications):
+        teaching_categories[classification['category']]['tools'].append(tool)
     
     return teaching_categories
 
-def analyze_target_users(tools):
+def analyze_target_users(tools, classifications):
     """Analyze target user groups"""
     user_groups = {
         'k12_teachers': [],
@@ -162,17 +92,14 @@ def analyze_target_users(tools):
         'general_educators': []
     }
     
-    for tool in tools:
-        name = tool['name'].lower()
-        desc = tool['description'].lower()
-        
-        if 'university' in desc or 'lecturer' in desc:
+    for tool, classification in zip(tools, classifications):
+        if 'university' in classification['contexts']:
             user_groups['university_educators'].append(tool)
-        elif any(keyword in name or keyword in desc for keyword in 
-                 ['python', 'programming', 'code', 'technical', 'dev']):
+        elif 'k12' in classification['contexts']:
+            user_groups['k12_teachers'].append(tool)
+        elif 'technology' in classification['subjects']:
             user_groups['technical_educators'].append(tool)
-        elif any(keyword in name or keyword in desc for keyword in 
-                 ['student', 'learn', 'study', 'jumpstart', 'beginner']):
+        elif classification['primary_role'] == 'student':
             user_groups['students'].append(tool)
         else:
             user_groups['general_educators'].append(tool)
@@ -180,14 +107,23 @@ def analyze_target_users(tools):
     return user_groups
 
 def main():
+    parser = argparse.ArgumentParser(description='Categorize the known tool list')
+    parser.add_argument('--output', default='comprehensive_tool_analysis.json',
+                       help='Path to analysis JSON file (default: comprehensive_tool_analysis.json)')
+    parser.add_argument('--rules', default=None,
+                       help='Classifier rules file (default: classifier_rules.json)')
+    args = parser.parse_args()
+    
     tools = extract_tools()
+    classifier = load_classifier(args.rules)
+    classifications = classify_tools(tools, classifier)
     
     print(f"=== EXTRACTED {len(tools)} TOOLS ===")
     for tool in tools:
         print(f"- {tool['name']} ({tool['category']})")
     
     # Categorize by teaching context
-    teaching_cats = categorize_for_teaching(tools)
+    teaching_cats = categorize_for_teaching(tools, classifications, classifier)
     
     print(f"\n=== TEACHING CONTEXT CATEGORIZATION ===")
     for cat_name, cat_data in teaching_cats.items():
@@ -197,7 +133,7 @@ def main():
             print(f"  - {tool['name']}")
     
     # Analyze target users
-    user_groups = analyze_target_users(tools)
+    user_groups = analyze_target_users(tools, classifications)
     
     print(f"\n=== TARGET USER ANALYSIS ===")
     for group, tool_list in user_groups.items():
@@ -214,7 +150,7 @@ def main():
         'category_distribution': {cat: len(data['tools']) for cat, data in teaching_cats.items()}
     }
     
-    with open('comprehensive_tool_analysis.json', 'w') as f:
+    with open(args.output, 'w') as f:
         json.dump(analysis, f, indent=2)
     
     print(f"\n=== SUMMARY ===")
@@ -224,7 +160,7 @@ def main():
     for cat_name, cat_data in sorted_cats[:5]:
         print(f"  - {cat_name.replace('_', ' ').title()}: {len(cat_data['tools'])} tools")
     
-    print("\nAnalysis complete! Saved to comprehensive_tool_analysis.json")
+    print(f"\nAnalysis complete! Saved to {args.output}")
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+File Transaction
+Writes a set of generated files all-or-nothing: contents are written concurrently to
+temp files, unchanged files are skipped by digest, and the rest are committed with
+atomic renames that are rolled back together if any of them fails. A journal next to
+the files lets the next commit roll back one interrupted by a crash
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+JOURNAL_SUFFIX = '.transaction.json'
+# Characters of text encoded and hashed at a time by compare()
+TEXT_CHUNK = 1 << 16
+
+Applied = List[Tuple[Path, Optional[Path]]]
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _file_digest(path: Path) -> str:
+    sha = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def compare(path: Path, content: Union[str, bytes, Path]) -> str:
+    """'unchanged', 'changed' or 'missing' for new content against the file at path.
+
+    Text is encoded and hashed a chunk at a time, so no encoded copy of it is built, and
+    the file is only read when the sizes match.
+    """
+    if not path.exists():
+        return 'missing'
+    if isinstance(content, Path):
+        size, digest = content.stat().st_size, None
+    elif isinstance(content, bytes):
+        size, digest = len(content), None
+    else:
+        sha, size = hashlib.sha256(), 0
+        for start in range(0, len(content), TEXT_CHUNK):
+            chunk = content[start:start + TEXT_CHUNK].encode('utf-8')
+            sha.update(chunk)
+            size += len(chunk)
+        digest = sha.hexdigest()
+    if path.stat().st_size != size:
+        return 'changed'
+    if digest is None:
+        digest = _file_digest(content) if isinstance(content, Path) else _digest(content)
+    return 'unchanged' if _file_digest(path) == digest else 'changed'
+
+
+def _sibling(path: Path, suffix: str) -> Path:
+    return path.with_name(path.name + suffix)
+
+
+def _fsync_directory(directory: Path) -> None:
+    """Make renames in a directory durable, where the platform allows it"""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        # Exists but belongs to someone else, or the platform cannot tell
+        return True
+    return True
+
+
+class FileTransaction:
+    """Staged writes and removals, applied by commit() to every file or to none"""
+
+    def __init__(self, jobs: int = 0):
+        self.jobs = jobs or min(8, (os.cpu_count() or 1) + 4)
+        # New content, or a file already written elsewhere (see stage())
+        self.writes: Dict[Path, Union[bytes, Path]] = {}
+        self.removals: List[Path] = []
+
+    def write(self, path: Union[str, Path], content: Union[str, bytes]) -> None:
+        self.writes[Path(path)] = content.encode('utf-8') if isinstance(content, str) else content
+
+    def stage(self, path: Union[str, Path], staged_file: Union[str, Path]) -> None:
+        """Replace path with a file its producer already wrote and flushed to disk, such as
+        a streamed page, which commit() moves into place or discards if it is unchanged"""
+        self.writes[Path(path)] = Path(staged_file)
+
+    def remove(self, path: Union[str, Path]) -> None:
+        self.removals.append(Path(path))
+
+    def verify(self) -> Dict[Path, str]:
+        """Compare the staged changes with the files on disk without applying any of them.
+
+        Each written path maps to 'unchanged', 'changed' or 'missing', and each removed path
+        that still exists to 'stale' (see compare()).
+        """
+        results = {path: compare(path, content) for path, content in self.writes.items()}
+        for path in self.removals:
+            if path.exists():
+                results[path] = 'stale'
+        return results
+
+    def _prepare(self, path: Path) -> Optional[Path]:
+        """Write path's new content to its temp file, or return None when it is unchanged"""
+        content = self.writes[path]
+        if isinstance(content, Path):
+            if path.exists() and _file_digest(path) == _file_digest(content):
+                content.unlink()
+                return None
+            tmp_file = content
+        else:
+            if path.exists() and _digest(path.read_bytes()) == _digest(content):
+                return None
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = _sibling(path, '.tmp')
+            with open(tmp_file, 'wb') as f:
+                f.write(content)
+                f.flush()
+                # The rename must never expose a file whose data has not reached the disk
+                os.fsync(f.fileno())
+        if path.exists():
+            shutil.copymode(path, tmp_file)
+        return tmp_file
+
+    def _discard(self) -> None:
+        """Delete every temp file _prepare may have written, and the staged files"""
+        for path, content in self.writes.items():
+            (content if isinstance(content, Path) else _sibling(path, '.tmp')).unlink(missing_ok=True)
+
+    def journal_directory(self) -> Path:
+        """Where commit() keeps its journal: the deepest directory holding every path"""
+        paths = [os.path.abspath(path) for path in [*self.writes, *self.removals]]
+        return Path(os.path.commonpath([os.path.dirname(path) for path in paths]))
+
+    @classmethod
+    def recover(cls, directory: Union[str, Path]) -> int:
+        """Roll back the commits in directory whose process died mid-way, returning how many.
+
+        A journal that still exists names a commit that never finished, since it is deleted
+        as soon as the last rename is done; commit() calls this before it starts.
+        """
+        recovered = 0
+        for journal in Path(directory).glob(f'.*{JOURNAL_SUFFIX}'):
+            try:
+                record = json.loads(journal.read_text(encoding='utf-8'))
+            except (OSError, ValueError):
+                continue
+            if record['pid'] == os.getpid() or _process_alive(record['pid']):
+                continue
+            cls._rollback([(Path(path), Path(backup) if backup else None)
+                           for path, backup in record['applied']], map(Path, record['temp']))
+            journal.unlink(missing_ok=True)
+            recovered += 1
+        return recovered
+
+    @staticmethod
+    def _write_journal(directory: Path, plan: Applied, temp_files: List[Path]) -> Path:
+        journal = directory / f'.{uuid.uuid4().hex[:12]}{JOURNAL_SUFFIX}'
+        tmp_file = _sibling(journal, '.tmp')
+        record = {'pid': os.getpid(),
+                  'applied': [[os.path.abspath(path), backup and os.path.abspath(backup)]
+                              for path, backup in plan],
+                  'temp': [os.path.abspath(tmp_file) for tmp_file in temp_files]}
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(record, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, journal)
+        # No rename below may reach the disk before the journal does
+        _fsync_directory(directory)
+        return journal
+
+    def commit(self) -> Dict[str, int]:
+        """Apply the staged changes, returning counts of written, unchanged and removed files"""
+        paths = list(self.writes)
+        if not paths and not self.removals:
+            return {'written': 0, 'unchanged': 0, 'removed': 0}
+        directory = self.journal_directory()
+        self.recover(directory)
+
+        prepared: List[Tuple[Path, Path]] = []
+        try:
+            with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+                futures = [executor.submit(self._prepare, path) for path in paths]
+            errors = []
+            for path, future in zip(paths, futures):
+                try:
+                    tmp_file = future.result()
+                except Exception as e:
+                    errors.append(e)
+                    continue
+                if tmp_file:
+                    prepared.append((path, tmp_file))
+            if errors:
+                raise errors[0]
+        except BaseException:
+            self._discard()
+            raise
+
+        removals = [path for path in self.removals if path.exists()]
+        # (path, backup or None when the path is new), in the order they are applied
+        plan: Applied = [(path, _sibling(path, '.bak') if path.exists() else None) for path, _ in prepared]
+        plan += [(path, _sibling(path, '.bak')) for path in removals]
+        if not plan:
+            return {'written': 0, 'unchanged': len(paths), 'removed': 0}
+        journal = None
+        applied: Applied = []
+        try:
+            # Backups left by a commit that died after its last rename would be restored
+            # over newer content if this one were rolled back
+            for _, backup in plan:
+                if backup:
+                    backup.unlink(missing_ok=True)
+            journal = self._write_journal(directory, plan, [tmp_file for _, tmp_file in prepared])
+            for (path, backup), (_, tmp_file) in zip(plan, prepared):
+                if backup:
+                    # Keep the old content reachable without the path ever going missing
+                    try:
+                        os.link(path, backup)
+                    except OSError:
+                        shutil.copy2(path, backup)
+                applied.append((path, backup))
+                os.replace(tmp_file, path)
+            for path, backup in plan[len(prepared):]:
+                os.replace(path, backup)
+                applied.append((path, backup))
+        except BaseException:
+            self._rollback(applied, [tmp_file for _, tmp_file in prepared])
+            if journal:
+                journal.unlink(missing_ok=True)
+            raise
+
+        # Deleting the journal is the commit point; the backups are only clean-up after it
+        journal.unlink()
+        for _, backup in applied:
+            if backup:
+                backup.unlink(missing_ok=True)
+        return {'written': len(prepared), 'unchanged': len(paths) - len(prepared), 'removed': len(removals)}
+
+    @staticmethod
+    def _rollback(applied: Applied, temp_files: Iterable[Path]) -> None:
+        """Put every applied path back the way it was and drop the remaining temp files"""
+        for path, backup in reversed(applied):
+            if backup and backup.exists():
+                os.replace(backup, path)
+                # A no-op when the backup is still a hard link to path
+                backup.unlink(missing_ok=True)
+            elif not backup:
+                path.unlink(missing_ok=True)
+        for tmp_file in temp_files:
+            tmp_file.unlink(missing_ok=True)
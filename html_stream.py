@@ -0,0 +1,530 @@
+#!/usr/bin/env python3
+"""
+Streaming HTML Transforms
+Tokenizes pages incrementally and streams them through a chain of filters, so a page is
+never held in memory as a whole; at most one token (a tag, a comment or the contents of a
+script or style element) is buffered at a time
+"""
+
+import argparse
+import base64
+import codecs
+import hashlib
+import html
+import mimetypes
+import os
+import re
+import sys
+import time
+import urllib.parse
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+from site_paths import ROOT
+from file_transaction import FileTransaction
+
+CHUNK_SIZE = 64 * 1024
+DEFAULT_PAGES = ['ai/*.html']
+
+TEXT, START, END, COMMENT, DECLARATION = 'text', 'start', 'end', 'comment', 'declaration'
+# Elements whose contents are text up to their end tag, never markup
+RAWTEXT_TAGS = frozenset({'script', 'style', 'textarea', 'title'})
+# Elements whose whitespace is significant
+PRESERVE_TAGS = frozenset({'pre', 'textarea', 'script', 'style'})
+
+_TAG_NAME = re.compile(r'[a-zA-Z][^\s/>]*')
+# Either the start of a quoted attribute value, which may contain '>', or the tag's end
+_TAG_SCAN = re.compile(r'''=[ \t\n\r\f]*(["'])|>''')
+_ATTRIBUTE = re.compile(r'''([^\s"'<>/=][^\s"'<>/=]*)(?:[ \t\n\r\f]*=[ \t\n\r\f]*(?:"([^"]*)"|'([^']*)'|([^\s>]+)))?''')
+_DATA_URI = re.compile(r'data:([^,;]*)((?:;[^,;]*)*?)(;base64)?,', re.I)
+_WHITESPACE = re.compile(r'[ \t\n\r\f]+')
+
+
+class Token:
+    """One piece of markup, kept as its exact source text until a filter changes it"""
+
+    __slots__ = ('kind', 'raw', 'name', '_attributes')
+
+    def __init__(self, kind: str, raw: str, name: str = ''):
+        self.kind = kind
+        self.raw = raw
+        self.name = name
+        self._attributes: Optional[List[Tuple[str, int, int, Optional[str]]]] = None
+
+    def __repr__(self) -> str:
+        return f"Token({self.kind!r}, {self.raw[:40]!r})"
+
+    @property
+    def self_closing(self) -> bool:
+        return self.kind == START and self.raw.endswith('/>')
+
+    def _parse(self) -> List[Tuple[str, int, int, Optional[str]]]:
+        """(name, value start, value end, raw value) per attribute; a bare attribute has no value"""
+        if self._attributes is None:
+            attributes = []
+            if self.kind == START:
+                for match in _ATTRIBUTE.finditer(self.raw, len(self.name) + 1, len(self.raw) - 1):
+                    for group in (2, 3, 4):
+                        if match.group(group) is not None:
+                            quoted = group != 4
+                            attributes.append((match.group(1).lower(), match.start(group) - quoted,
+                                               match.end(group) + quoted, match.group(group)))
+                            break
+                    else:
+                        attributes.append((match.group(1).lower(), match.end(1), match.end(1), None))
+            self._attributes = attributes
+        return self._attributes
+
+    @property
+    def attributes(self) -> Dict[str, str]:
+        return {name: html.unescape(value) if value else '' for name, _, _, value in reversed(self._parse())}
+
+    def has(self, name: str) -> bool:
+        return any(attribute == name for attribute, _, _, _ in self._parse())
+
+    def get(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        for attribute, _, _, value in self._parse():
+            if attribute == name:
+                return html.unescape(value) if value else ''
+        return default
+
+    def set(self, name: str, value: str) -> None:
+        """Give an attribute a new value in place, or append it to the tag"""
+        quoted = '"' + value.replace('&', '&amp;').replace('"', '&quot;') + '"'
+        for attribute, start, end, old in self._parse():
+            if attribute == name:
+                self.raw = self.raw[:start] + ('=' if old is None else '') + quoted + self.raw[end:]
+                break
+        else:
+            tail = '/>' if self.self_closing else '>'
+            self.raw = f"{self.raw[:-len(tail)].rstrip()} {name}={quoted}{tail}"
+        self._attributes = None
+
+
+def _construct_end(buffer: str, pos: int) -> Optional[int]:
+    """End of the markup construct at buffer[pos] == '<'; -1 if it is incomplete, None if
+    the '<' is literal text"""
+    following = buffer[pos + 1:pos + 2]
+    if not following:
+        return -1
+    if buffer.startswith('<!--', pos):
+        end = buffer.find('-->', pos + 4)
+        return end + 3 if end >= 0 else -1
+    if following in '!?':
+        end = buffer.find('>', pos)
+        return end + 1 if end >= 0 else -1
+    if following == '/':
+        if pos + 2 >= len(buffer):
+            return -1
+        if not buffer[pos + 2].isascii() or not buffer[pos + 2].isalpha():
+            return None
+        end = buffer.find('>', pos)
+        return end + 1 if end >= 0 else -1
+    if not following.isascii() or not following.isalpha():
+        return None
+
+    scan = pos + 1
+    while True:
+        match = _TAG_SCAN.search(buffer, scan)
+        if not match:
+            return -1
+        if not match.group(1):
+            return match.end()
+        close = buffer.find(match.group(1), match.end())
+        if close < 0:
+            return -1
+        scan = close + 1
+
+
+class Tokenizer:
+    """Incremental tokenizer; feed() returns the tokens completed by each piece of text"""
+
+    def __init__(self):
+        self.buffer = ''
+        self.rawtext: Optional[re.Pattern] = None
+
+    def feed(self, data: str, final: bool = False) -> List[Token]:
+        buffer = self.buffer + data if self.buffer else data
+        tokens: List[Token] = []
+        pos, length = 0, len(buffer)
+        while pos < length:
+            if self.rawtext:
+                match = self.rawtext.search(buffer, pos)
+                if not match:
+                    if final:
+                        tokens.append(Token(TEXT, buffer[pos:]))
+                        pos = length
+                    break
+                if match.start() > pos:
+                    tokens.append(Token(TEXT, buffer[pos:match.start()]))
+                pos, self.rawtext = match.start(), None
+
+            start = buffer.find('<', pos)
+            if start < 0:
+                tokens.append(Token(TEXT, buffer[pos:]))
+                pos = length
+                break
+            if start > pos:
+                tokens.append(Token(TEXT, buffer[pos:start]))
+                pos = start
+
+            end = _construct_end(buffer, pos)
+            if end is None:
+                tokens.append(Token(TEXT, '<'))
+                pos += 1
+                continue
+            if end < 0:
+                if final:
+                    tokens.append(Token(TEXT, buffer[pos:]))
+                    pos = length
+                break
+
+            raw = buffer[pos:end]
+            if raw.startswith('<!--'):
+                tokens.append(Token(COMMENT, raw))
+            elif raw[1] in '!?':
+                tokens.append(Token(DECLARATION, raw))
+            elif raw[1] == '/':
+                tokens.append(Token(END, raw, _TAG_NAME.match(raw, 2).group(0).lower()))
+            else:
+                name = _TAG_NAME.match(raw, 1).group(0)
+                tokens.append(Token(START, raw, name.lower()))
+                if name.lower() in RAWTEXT_TAGS and not raw.endswith('/>'):
+                    self.rawtext = re.compile(rf'</{re.escape(name)}[\s/>]', re.I)
+            pos = end
+
+        self.buffer = buffer[pos:]
+        return tokens
+
+    def close(self) -> List[Token]:
+        return self.feed('', final=True)
+
+
+def tokenize(chunks: Iterable[str]) -> Iterator[Token]:
+    tokenizer = Tokenizer()
+    for chunk in chunks:
+        yield from tokenizer.feed(chunk)
+    yield from tokenizer.close()
+
+
+def tokenize_file(path: Path, chunk_size: int = CHUNK_SIZE) -> Iterator[Token]:
+    decoder = codecs.getincrementaldecoder('utf-8')()
+
+    def chunks() -> Iterator[str]:
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(chunk_size), b''):
+                yield decoder.decode(chunk)
+        yield decoder.decode(b'', final=True)
+
+    return tokenize(chunks())
+
+
+def markup(text: str) -> List[Token]:
+    """Tokens for a literal snippet of HTML, for filters that insert markup"""
+    return list(tokenize([text]))
+
+
+def write_tokens(tokens: Iterable[Token], path: Path, chunk_size: int = CHUNK_SIZE) -> None:
+    """Stream tokens to path, flushed to disk before returning"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        pending: List[str] = []
+        size = 0
+        for token in tokens:
+            pending.append(token.raw)
+            size += len(token.raw)
+            if size >= chunk_size:
+                f.write(''.join(pending))
+                pending.clear()
+                size = 0
+        f.write(''.join(pending))
+        f.flush()
+        os.fsync(f.fileno())
+
+
+class Page:
+    """A page being streamed: its source, its destination, and the side files filters made"""
+
+    def __init__(self, source: Path, output: Optional[Path] = None):
+        self.source = Path(source)
+        self.output = Path(output) if output else None
+        self.files: Dict[Path, bytes] = {}
+        self.filters: List['Filter'] = []
+        self.staged: Optional[Path] = None
+
+
+class Filter:
+    """A stage of a pipeline; handle() maps each token to the tokens passed downstream"""
+
+    def __call__(self, tokens: Iterable[Token]) -> Iterator[Token]:
+        for token in tokens:
+            yield from self.handle(token)
+        yield from self.close()
+
+    def handle(self, token: Token) -> Iterable[Token]:
+        return (token,)
+
+    def close(self) -> Iterable[Token]:
+        return ()
+
+
+class LinkCollector(Filter):
+    """Records every href/src that is not a data: URI, and every element id"""
+
+    def __init__(self):
+        self.links: List[Tuple[str, str]] = []
+        self.ids: Set[str] = set()
+
+    def handle(self, token: Token) -> Iterable[Token]:
+        if token.kind == START:
+            for name, value in token.attributes.items():
+                if name == 'id':
+                    self.ids.add(value)
+                elif name in ('href', 'src') and not value.startswith('data:'):
+                    self.links.append((name, value))
+        return (token,)
+
+
+class AttributeRewriter(Filter):
+    """Rewrites attribute values; rewrite(token, name, value) returns the new value or None"""
+
+    def __init__(self, rewrite: Callable[[Token, str, str], Optional[str]],
+                 attributes: Sequence[str] = ('href', 'src')):
+        self.rewrite = rewrite
+        self.names = set(attributes)
+
+    def handle(self, token: Token) -> Iterable[Token]:
+        if token.kind == START:
+            for name, value in token.attributes.items():
+                if name in self.names:
+                    new_value = self.rewrite(token, name, value)
+                    if new_value is not None and new_value != value:
+                        token.set(name, new_value)
+        return (token,)
+
+
+def _asset(page: Page, directory: str, content: bytes, extension: str) -> str:
+    """Store content as a content-named side file next to the page's output, returning its URL"""
+    name = f"{directory}/{hashlib.sha256(content).hexdigest()[:16]}{extension}"
+    page.files[page.output.parent / name] = content
+    return name
+
+
+class DataUriExtractor(Filter):
+    """Moves data: URIs out to content-named files beside the output page"""
+
+    def __init__(self, page: Page, directory: str = 'assets', min_bytes: int = 0,
+                 mime_types: Optional[Sequence[str]] = None, attributes: Sequence[str] = ('src', 'href')):
+        self.page = page
+        self.directory = directory
+        self.min_bytes = min_bytes
+        self.mime_types = set(mime_types) if mime_types else None
+        self.names = set(attributes)
+
+    def handle(self, token: Token) -> Iterable[Token]:
+        if token.kind == START:
+            for name, value in token.attributes.items():
+                if name not in self.names:
+                    continue
+                match = _DATA_URI.match(value)
+                if not match or len(value) < self.min_bytes:
+                    continue
+                mime_type = match.group(1).lower() or 'text/plain'
+                if self.mime_types is not None and mime_type not in self.mime_types:
+                    continue
+                payload = value[match.end():]
+                content = base64.b64decode(payload) if match.group(3) else urllib.parse.unquote_to_bytes(payload)
+                extension = mimetypes.guess_extension(mime_type) or '.bin'
+                token.set(name, _asset(self.page, self.directory, content, extension))
+        return (token,)
+
+
+class InlineAssetExtractor(Filter):
+    """Moves large inline scripts and styles to content-named files beside the output page.
+
+    Each block is replaced where it stood, so execution and cascade order are unchanged.
+    """
+
+    def __init__(self, page: Page, directory: str = 'assets', min_bytes: int = 4096, head_only: bool = True):
+        self.page = page
+        self.directory = directory
+        self.min_bytes = min_bytes
+        self.in_scope = True
+        self.head_only = head_only
+        self.pending: Optional[Tuple[Token, List[Token]]] = None
+
+    def handle(self, token: Token) -> Iterable[Token]:
+        if self.pending:
+            opening, contents = self.pending
+            if token.kind == END and token.name == opening.name:
+                self.pending = None
+                return self._extract(opening, contents, token)
+            contents.append(token)
+            return ()
+        if token.kind == START:
+            if token.name == 'body' and self.head_only:
+                self.in_scope = False
+            elif (self.in_scope and token.name in ('script', 'style') and not token.has('src')
+                  and not token.self_closing):
+                self.pending = (token, [])
+                return ()
+        return (token,)
+
+    def _extract(self, opening: Token, contents: List[Token], closing: Token) -> List[Token]:
+        content = ''.join(token.raw for token in contents).encode('utf-8')
+        if len(content) < self.min_bytes:
+            return [opening, *contents, closing]
+        if opening.name == 'script':
+            opening.set('src', _asset(self.page, self.directory, content, '.js'))
+            return [opening, closing]
+        attributes = re.sub(r'\stype="text/css"', '', opening.raw[len('<style'):-1])
+        url = _asset(self.page, self.directory, content, '.css')
+        return [Token(START, f'<link rel="stylesheet"{attributes} href="{url}">', 'link')]
+
+    def close(self) -> Iterable[Token]:
+        if self.pending:
+            opening, contents = self.pending
+            self.pending = None
+            return [opening, *contents]
+        return ()
+
+
+class Minifier(Filter):
+    """Drops comments (except conditional ones) and collapses whitespace runs in text
+    outside pre, textarea, script and style"""
+
+    def __init__(self):
+        self.preserve = 0
+        self.after_space = False
+
+    def handle(self, token: Token) -> Iterable[Token]:
+        if token.kind == TEXT:
+            if self.preserve:
+                return (token,)
+            text = _WHITESPACE.sub(lambda match: '\n' if '\n' in match.group(0) else ' ', token.raw)
+            if self.after_space:
+                text = text.lstrip(' \n')
+            if not text:
+                return ()
+            self.after_space = text[-1] in ' \n'
+            token.raw = text
+            return (token,)
+
+        self.after_space = False
+        if token.kind == COMMENT:
+            return (token,) if token.raw.startswith('<!--[if') else ()
+        if token.name in PRESERVE_TAGS:
+            if token.kind == START and not token.self_closing:
+                self.preserve += 1
+            elif token.kind == END and self.preserve:
+                self.preserve -= 1
+        return (token,)
+
+
+class Pipeline:
+    """Streams pages through a chain of filters made fresh for each page, pages in parallel"""
+
+    def __init__(self, filters: Callable[[Page], List[Filter]], jobs: int = 0, chunk_size: int = CHUNK_SIZE):
+        self.filters = filters
+        self.jobs = jobs or min(8, (os.cpu_count() or 1) + 4)
+        self.chunk_size = chunk_size
+
+    def process(self, page: Page) -> Page:
+        """Stream one page; its output, if any, is left in a temp file for the transaction"""
+        page.filters = self.filters(page)
+        tokens: Iterable[Token] = tokenize_file(page.source, self.chunk_size)
+        for stage in page.filters:
+            tokens = stage(tokens)
+        if page.output is None:
+            deque(tokens, maxlen=0)
+        else:
+            page.staged = page.output.with_name(page.output.name + '.stream')
+            try:
+                write_tokens(tokens, page.staged, self.chunk_size)
+            except BaseException:
+                page.staged.unlink(missing_ok=True)
+                raise
+        return page
+
+    def run(self, pages: List[Page], transaction: Optional[FileTransaction] = None) -> List[Page]:
+        """Process every page, then stage the outputs and side files in a transaction.
+
+        The transaction is committed here unless the caller passes its own.
+        """
+        with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+            futures = [executor.submit(self.process, page) for page in pages]
+        errors = [future.exception() for future in futures if future.exception()]
+        if errors:
+            for page in pages:
+                if page.staged:
+                    page.staged.unlink(missing_ok=True)
+            raise errors[0]
+
+        owned = transaction is None
+        transaction = transaction or FileTransaction()
+        for page in pages:
+            if page.staged:
+                transaction.stage(page.output, page.staged)
+            for path, content in page.files.items():
+                transaction.write(path, content)
+        if owned:
+            transaction.commit()
+        return pages
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Stream pages through HTML transform filters')
+    parser.add_argument('pages', nargs='*', default=DEFAULT_PAGES,
+                       help=f'Pages or globs under the site root (default: {" ".join(DEFAULT_PAGES)})')
+    parser.add_argument('--minify', action='store_true',
+                       help='Drop comments and collapse whitespace')
+    parser.add_argument('--extract-data-uris', metavar='DIR',
+                       help='Move data: URIs to content-named files in DIR beside each output page')
+    parser.add_argument('--min-bytes', type=int, default=4096,
+                       help='Smallest data: URI to extract (default: 4096)')
+    parser.add_argument('--output-dir',
+                       help='Write transformed pages here instead of in place')
+    parser.add_argument('--links', action='store_true',
+                       help='List the links of each page')
+
+    args = parser.parse_args()
+
+    sources = set()
+    for pattern in args.pages:
+        matches = ROOT.glob(pattern) if any(char in pattern for char in '*?[') else [ROOT / pattern]
+        sources.update(path for path in matches if path.is_file())
+    transforming = args.minify or args.extract_data_uris
+
+    def filters(page: Page) -> List[Filter]:
+        chain: List[Filter] = [LinkCollector()]
+        if args.extract_data_uris:
+            chain.append(DataUriExtractor(page, args.extract_data_uris, args.min_bytes))
+        if args.minify:
+            chain.append(Minifier())
+        return chain
+
+    def output(source: Path) -> Optional[Path]:
+        if not transforming:
+            return None
+        return ROOT / args.output_dir / source.relative_to(ROOT) if args.output_dir else source
+
+    start = time.perf_counter()
+    try:
+        pages = Pipeline(filters).run([Page(source, output(source)) for source in sorted(sources)])
+    except (OSError, ValueError) as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+
+    for page in pages:
+        links = page.filters[0].links
+        print(f"   {page.source.relative_to(ROOT)}: {len(links)} links, {len(page.files)} extracted files")
+        if args.links:
+            for name, value in links:
+                print(f"      {name}={value}")
+    print(f"✅ Streamed {len(pages)} pages in {time.perf_counter() - start:.3f}s")
+
+
+if __name__ == '__main__':
+    main()
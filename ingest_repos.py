@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Repository Metadata Ingestion
+Streams JSON/JSONL repository exports (e.g. from gh-toolkit) through validation and
+de-duplication into repo-exports/, which the quiz-tools build stage merges with the
+index.html cards, then runs that pipeline so the engine and catalogue database include them
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO
+
+from catalogue_db import DEFAULT_DB, ORIGINAL_CATEGORIES
+from file_transaction import FileTransaction
+from tool_report import RENDERERS
+
+CHUNK_SIZE = 64 * 1024
+NAME_PATTERN = re.compile(r'^[A-Za-z0-9][A-Za-z0-9._-]{0,99}$')
+MAX_DESCRIPTION = 1000
+# Wrapper keys under which an export may nest its list of repositories
+LIST_KEYS = ('repositories', 'repos', 'items')
+# Validated exports, one JSONL file per ingested export; an input of the quiz-tools stage
+DEFAULT_EXPORT_DIR = 'repo-exports'
+
+
+class InvalidRecord(ValueError):
+    """A repository record that cannot become a tool"""
+
+
+def _iter_json_array(f: TextIO) -> Iterator[Any]:
+    """Yield the elements of a top-level JSON array without loading the whole file"""
+    decoder = json.JSONDecoder()
+    buffer = f.read(CHUNK_SIZE).lstrip()
+    if not buffer.startswith('['):
+        # A wrapper object has to be parsed whole
+        data = json.loads(buffer + f.read())
+        items = next((data[key] for key in LIST_KEYS if isinstance(data, dict) and key in data), None)
+        if not isinstance(items, list):
+            raise ValueError(f"expected a JSON array or an object with one of: {', '.join(LIST_KEYS)}")
+        yield from items
+        return
+
+    pos = 1
+    while True:
+        while pos < len(buffer) and buffer[pos] in ' \t\r\n,':
+            pos += 1
+        if pos == len(buffer):
+            more = f.read(CHUNK_SIZE)
+            if not more:
+                raise ValueError("unterminated JSON array")
+            buffer, pos = more, 0
+            continue
+        if buffer[pos] == ']':
+            return
+        try:
+            item, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            more = f.read(CHUNK_SIZE)
+            if not more:
+                raise
+            buffer, pos = buffer[pos:] + more, 0
+            continue
+        yield item
+        pos = end
+        if pos > CHUNK_SIZE:
+            buffer, pos = buffer[pos:], 0
+
+
+def read_records(path: str, errors: Counter) -> Iterator[Any]:
+    """Stream records from a .json array/wrapper or a .jsonl file ('-' reads JSONL from stdin)"""
+    if path == '-':
+        lines: Iterable[str] = sys.stdin
+    elif not path.endswith('.jsonl'):
+        with open(path, 'r', encoding='utf-8') as f:
+            yield from _iter_json_array(f)
+        return
+    else:
+        lines = open(path, 'r', encoding='utf-8')
+
+    try:
+        for line in lines:
+            if line.strip():
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    errors['invalid JSON line'] += 1
+    finally:
+        if lines is not sys.stdin:
+            lines.close()
+
+
+def normalize_record(record: Any, default_category: Optional[str] = None) -> Dict[str, str]:
+    """Turn one repository record into the raw tool shape extract_tools_from_html produces"""
+    if not isinstance(record, dict):
+        raise InvalidRecord("not an object")
+
+    name = record.get('name') or (record.get('full_name') or '').rsplit('/', 1)[-1]
+    if not isinstance(name, str) or not NAME_PATTERN.match(name.strip()):
+        raise InvalidRecord("missing or invalid name")
+
+    description = record.get('description')
+    if not isinstance(description, str) or not description.strip():
+        raise InvalidRecord("missing description")
+
+    topics = record.get('topics') or []
+    if isinstance(topics, str):
+        topics = topics.replace(',', ' ').split()
+    if not isinstance(topics, list) or not all(isinstance(topic, str) for topic in topics):
+        raise InvalidRecord("topics must be a list of strings")
+
+    # Kept as written for the card; a stored record carries it alongside the lowercased description
+    summary = record.get('summary') if isinstance(record.get('summary'), str) else description
+
+    category = record.get('category') or record.get('original_category') or default_category
+    if category not in ORIGINAL_CATEGORIES:
+        raise InvalidRecord("missing or unknown category")
+
+    tool = {
+        'name': name.strip(),
+        'original_category': category,
+        'description': ' '.join(description.split())[:MAX_DESCRIPTION].lower(),
+        'summary': ' '.join(summary.split())[:MAX_DESCRIPTION],
+        'topics': ' '.join(topic.strip().lower() for topic in topics if topic.strip()),
+    }
+    tool.update(_card_details(record))
+    return tool
+
+
+def _card_details(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Optional repository details for rendered cards, under GitHub API or gh-toolkit names"""
+    details = {}
+    url = record.get('html_url') or record.get('url')
+    if isinstance(url, str) and url.startswith('https://'):
+        details['url'] = url
+    for column, key in (('homepage', 'homepage'), ('docs', 'pages_url')):
+        link = record.get(key, record.get(column))
+        if isinstance(link, str) and link.startswith(('https://', 'http://')):
+            details[column] = link
+    for column, key in (('stars', 'stargazers_count'), ('forks', 'forks_count')):
+        count = record.get(key, record.get(column))
+        if isinstance(count, int) and count >= 0:
+            details[column] = count
+    license_info = record.get('license')
+    if isinstance(license_info, dict):
+        license_info = license_info.get('spdx_id') or license_info.get('name')
+    if isinstance(license_info, str) and license_info and license_info != 'NOASSERTION':
+        details['license'] = license_info
+    languages = record.get('languages') or ([record['language']] if record.get('language') else [])
+    if isinstance(languages, dict):
+        languages = list(languages)
+    if isinstance(languages, list) and languages and all(isinstance(language, str) for language in languages):
+        details['languages'] = languages
+    return details
+
+
+def export_files(directory: str = DEFAULT_EXPORT_DIR) -> List[str]:
+    """The stored exports in a directory, in the order the pipeline reads them"""
+    path = Path(directory)
+    if not path.is_dir():
+        return []
+    return sorted(str(file) for file in path.iterdir() if file.suffix in ('.json', '.jsonl'))
+
+
+class RepoIngester:
+    """Validates and deduplicates repository records on their way to the categorization pipeline"""
+
+    def __init__(self, default_category: Optional[str] = None):
+        self.default_category = default_category
+        self.stats = Counter()
+        self.errors = Counter()
+
+    def records(self, paths: List[str]) -> Iterator[Dict[str, Any]]:
+        """Valid raw tools from the exports, each repository only the first time it appears"""
+        seen = set()
+        for path in paths:
+            for record in read_records(path, self.errors):
+                self.stats['records'] += 1
+                try:
+                    tool = normalize_record(record, self.default_category)
+                except InvalidRecord as e:
+                    self.errors[str(e)] += 1
+                    continue
+                key = tool['name'].lower()
+                if key in seen:
+                    self.stats['duplicates'] += 1
+                    continue
+                seen.add(key)
+                self.stats['ingested'] += 1
+                yield tool
+
+    def raw_tools(self, paths: List[str], html_tools: Iterable[Dict[str, str]] = ()) -> Iterator[Dict[str, str]]:
+        """Valid, unique raw tools from the exports, then any index.html tools they did not replace"""
+        remaining_html = {tool['name'].lower(): tool for tool in html_tools}
+        for tool in self.records(paths):
+            if remaining_html.pop(tool['name'].lower(), None):
+                self.stats['replaced_html'] += 1
+            yield tool
+        self.stats['from_html'] = len(remaining_html)
+        yield from remaining_html.values()
+
+    def store(self, paths: List[str], export_dir: str = DEFAULT_EXPORT_DIR) -> List[Path]:
+        """Stream each export's valid, unique records into a JSONL file of the same name in
+        export_dir, replacing an earlier ingest of it; all files are committed together"""
+        directory = Path(export_dir)
+        directory.mkdir(parents=True, exist_ok=True)
+        transaction = FileTransaction()
+        stored = []
+        try:
+            for path in paths:
+                target = directory / (f"{Path(path).stem}.jsonl" if path != '-' else 'stdin.jsonl')
+                staged = target.with_name(target.name + '.tmp')
+                # Staged before it is written, so a failure part-way still discards it
+                transaction.stage(target, staged)
+                with open(staged, 'w', encoding='utf-8', newline='\n') as out:
+                    for tool in self.records([path]):
+                        out.write(json.dumps(tool, ensure_ascii=False) + '\n')
+                    out.flush()
+                    os.fsync(out.fileno())
+                stored.append(target)
+        except BaseException:
+            for staged in transaction.writes.values():
+                staged.unlink(missing_ok=True)
+            raise
+        transaction.commit()
+        return stored
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Ingest repository metadata exports into the tool catalogue')
+    parser.add_argument('exports', nargs='+',
+                       help='JSON array, wrapper object or JSONL files of repository metadata (- for JSONL on stdin)')
+    parser.add_argument('--export-dir', default=DEFAULT_EXPORT_DIR,
+                       help=f'Where validated exports are kept for the build (default: {DEFAULT_EXPORT_DIR})')
+    parser.add_argument('--default-category', choices=ORIGINAL_CATEGORIES,
+                       help='Category for records without one (default: reject them)')
+    parser.add_argument('--html-file', default='index.html',
+                       help='Cards merged with the exports (default: index.html)')
+    parser.add_argument('--js-file', default='recommendation_engine.js',
+                       help='Path to JavaScript file (default: recommendation_engine.js)')
+    parser.add_argument('--db', default=DEFAULT_DB,
+                       help=f'Catalogue database to sync (default: {DEFAULT_DB})')
+    parser.add_argument('--report-format', choices=sorted(RENDERERS), default='text',
+                       help='Report format (default: text)')
+
+    args = parser.parse_args()
+
+    from update_quiz_tools import QuizToolUpdater
+
+    try:
+        ingester = RepoIngester(args.default_category)
+        stored = ingester.store(args.exports, args.export_dir)
+        # The same run the quiz-tools build stage does, so the next build finds nothing to change
+        updater = QuizToolUpdater(args.html_file, args.js_file, cache_classifier=True,
+                                  export_files=export_files(args.export_dir))
+        outputs = updater.pipeline(*updater.read_sources())
+        stats = updater.write_outputs(outputs, args.db)
+    except Exception as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+
+    RENDERERS[args.report_format](outputs.report, sys.stdout,
+                                  [str(path) for path in stored] + [args.js_file, args.db])
+    if args.report_format != 'text':
+        return
+    counts = ingester.stats
+    print(f"\n✅ Ingested {counts['ingested']} of {counts['records']} records "
+          f"({counts['duplicates']} duplicates, {sum(ingester.errors.values())} invalid) "
+          f"into {', '.join(str(path) for path in stored)}")
+    for reason, count in ingester.errors.most_common():
+        print(f"   ❌ {reason}: {count}")
+    files, catalogue = stats['files'], stats['catalogue']
+    print(f"Wrote {files['written']} files ({files['unchanged']} unchanged, {files['removed']} removed)")
+    print(f"{args.db}: {catalogue['inserted']} inserted, {catalogue['updated']} updated, "
+          f"{catalogue['deleted']} deleted, {catalogue['unchanged']} unchanged")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,395 @@
+#!/usr/bin/env python3
+"""
+Site Minifier
+Builds a deployable copy of the site in dist/: the main pages have their comments and
+whitespace stripped, with their inline scripts and styles minified; the engine and RUM
+scripts are minified, and every minified script gets a source map pointing back at the
+sources. Everything else the site serves is hard-linked in unchanged.
+
+The sources stay readable because the updater and quiz_engine parse them.
+"""
+
+import argparse
+import gzip
+import json
+import os
+import re
+import shutil
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from site_paths import ROOT
+from build_service_worker import PRECACHE_ASSETS, RUNTIME_ASSETS
+from file_transaction import FileTransaction
+from html_stream import END, START, TEXT, Filter, Minifier, Page, Pipeline, Token
+
+DEFAULT_OUTPUT_DIR = 'dist'
+MINIFIED_PAGES = ['index.html', 'educational-tools-quiz.html']
+MINIFIED_SCRIPTS = ['recommendation_engine.js', 'rum.js']
+# Served from the site root besides the service worker's assets
+SITE_FILES = ['sw.js', 'precache-manifest.json', 'build-info.js', 'CNAME.txt', '.nojekyll']
+
+JS_TYPES = frozenset({'', 'text/javascript', 'application/javascript', 'module'})
+
+_JS_TOKEN = re.compile(r'''
+    (?P<space>[ \t\f\v\u00a0\ufeff]+)
+  | (?P<newline>\r\n?|[\n\u2028\u2029])
+  | (?P<comment>//[^\r\n\u2028\u2029]*|/\*[\s\S]*?\*/)
+  | (?P<string>"(?:[^"\\\r\n]|\\[\s\S])*"|'(?:[^'\\\r\n]|\\[\s\S])*')
+  | (?P<number>(?:0[xXoObB][0-9a-fA-F_]+|(?:\d[\d_]*(?:\.[\d_]*)?|\.\d[\d_]*)(?:[eE][+-]?\d+)?)n?)
+  | (?P<word>[\w$\\\u0080-\uffff]+)
+  | (?P<punct>>>>=?|\.\.\.|[=!]==|\*\*=|<<=|>>=|&&=|\|\|=|\?\?=|=>|[=!<>+\-*/%&|^]=|&&|\|\||\?\?
+              |\?\.(?!\d)|\+\+|--|\*\*|<<|>>|[{}()\[\];,<>+\-*/%&|^!~?:=.@#])
+''', re.X)
+_JS_REGEX = re.compile(r'/(?:[^/\\\[\r\n]|\\.|\[(?:[^\]\\\r\n]|\\.)*\])+/[A-Za-z]*')
+# After these a '/' starts a regular expression rather than a division
+_REGEX_AFTER_WORDS = frozenset({'return', 'typeof', 'instanceof', 'in', 'of', 'new', 'delete', 'void',
+                                'throw', 'case', 'do', 'else', 'yield', 'await'})
+_VALUE_END_PUNCT = frozenset({')', ']', '}'})
+# A line break after these always ends the statement (automatic semicolon insertion)
+_RESTRICTED_WORDS = frozenset({'return', 'break', 'continue', 'throw', 'yield', 'async', 'let'})
+# A line break between a token that can end a statement and one that can start the next
+# is kept; one before any other punctuator cannot end the statement, so it goes
+_STATEMENT_END_PUNCT = frozenset({')', ']', '}', '++', '--'})
+_STATEMENT_START_PUNCT = frozenset({'(', '[', '{', '++', '--', '!', '~', '#', '@', '...'})
+_LINE_BREAK = re.compile('[\r\n\u2028\u2029]')
+_SPACED_PAIRS = frozenset({('+', '+'), ('-', '-'), ('/', '/'), ('/', '*'), ('<', '!'), ('-', '>')})
+
+_CSS_TOKEN = re.compile(r'''("(?:[^"\\]|\\[\s\S])*"|'(?:[^'\\]|\\[\s\S])*')|/\*[\s\S]*?\*/|\s+''')
+_CSS_PUNCT_SPACE = re.compile(r' ?([{};,>]) ?')
+
+_BASE64 = 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/'
+
+# (generated line, generated column, source line, source column), zero-based
+Mapping = Tuple[int, int, int, int]
+
+
+def _utf16_length(text: str) -> int:
+    """Length as source maps count columns, in UTF-16 code units"""
+    return len(text) + sum(1 for char in text if ord(char) > 0xFFFF)
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char in '_$\\' or ord(char) > 0x7F
+
+
+def _template_end(source: str, pos: int) -> Tuple[int, bool]:
+    """End of the template literal text starting at pos, and whether it stops at a ${"""
+    length = len(source)
+    while pos < length:
+        char = source[pos]
+        if char == '\\':
+            pos += 2
+        elif char == '`':
+            return pos + 1, False
+        elif char == '$' and source.startswith('{', pos + 1):
+            return pos + 2, True
+        else:
+            pos += 1
+    raise ValueError("unterminated template literal")
+
+
+def js_tokens(source: str) -> Iterator[Tuple[str, str, int]]:
+    """(kind, text, offset) for every token of a script, whitespace and comments included"""
+    # Brace depth inside each open template ${ substitution
+    substitutions: List[int] = []
+    regex_allowed = True
+    pos, length = 0, len(source)
+    while pos < length:
+        char = source[pos]
+        if char == '`' or (char == '}' and substitutions and substitutions[-1] == 0):
+            if char == '}':
+                substitutions.pop()
+            end, opens = _template_end(source, pos + 1)
+            if opens:
+                substitutions.append(0)
+            yield 'template', source[pos:end], pos
+            regex_allowed = opens
+            pos = end
+            continue
+        if char == '/' and regex_allowed and source[pos + 1:pos + 2] not in ('/', '*'):
+            match = _JS_REGEX.match(source, pos)
+            if match:
+                yield 'regex', match.group(0), pos
+                regex_allowed = False
+                pos = match.end()
+                continue
+
+        match = _JS_TOKEN.match(source, pos)
+        if not match:
+            raise ValueError(f"unexpected {char!r} at offset {pos}")
+        kind, text = match.lastgroup, match.group(0)
+        if kind == 'punct':
+            if text == '{' and substitutions:
+                substitutions[-1] += 1
+            elif text == '}' and substitutions:
+                substitutions[-1] -= 1
+            regex_allowed = text not in _VALUE_END_PUNCT
+        elif kind == 'word':
+            regex_allowed = text in _REGEX_AFTER_WORDS
+        elif kind in ('string', 'number'):
+            regex_allowed = False
+        yield kind, text, pos
+        pos = match.end()
+
+
+def _separator(previous: Tuple[str, str], kind: str, text: str, gap: str) -> str:
+    """What the whitespace between two tokens shrinks to"""
+    previous_kind, previous_text = previous
+    if gap == '\n':
+        if previous_kind == 'word' and previous_text in _RESTRICTED_WORDS:
+            return '\n'
+        ends_statement = previous_kind != 'punct' or previous_text in _STATEMENT_END_PUNCT
+        if ends_statement and (kind != 'punct' or text in _STATEMENT_START_PUNCT):
+            return '\n'
+    first, last = text[0], previous_text[-1]
+    if _is_word_char(last) and _is_word_char(first):
+        return ' '
+    if previous_kind == 'number' and first == '.':
+        return ' '
+    return ' ' if (last, first) in _SPACED_PAIRS else ''
+
+
+def minify_js(source: str, line: int = 0, column: int = 0) -> Tuple[str, List[Mapping]]:
+    """Strip comments and redundant whitespace from a script, keeping statements that end at
+    a line break on their own line. Returns the result and a mapping per token back to the
+    source, which starts at the given line and column of its file."""
+    out: List[str] = []
+    mappings: List[Mapping] = []
+    generated_line = generated_column = 0
+    previous: Optional[Tuple[str, str]] = None
+    gap = ''
+
+    for kind, text, _ in js_tokens(source):
+        if kind in ('space', 'newline', 'comment'):
+            if kind == 'newline' or _LINE_BREAK.search(text):
+                gap = '\n'
+            elif not gap:
+                gap = ' '
+        else:
+            separator = _separator(previous, kind, text, gap) if previous and gap else ''
+            if separator == '\n':
+                generated_line, generated_column = generated_line + 1, 0
+            else:
+                generated_column += len(separator)
+            out.append(separator)
+            mappings.append((generated_line, generated_column, line, column))
+            out.append(text)
+            newlines = text.count('\n')
+            if newlines:
+                generated_line += newlines
+                generated_column = _utf16_length(text[text.rfind('\n') + 1:])
+            else:
+                generated_column += _utf16_length(text)
+            previous, gap = (kind, text), ''
+
+        newlines = text.count('\n')
+        if newlines:
+            line += newlines
+            column = _utf16_length(text[text.rfind('\n') + 1:])
+        else:
+            column += _utf16_length(text)
+    return ''.join(out), mappings
+
+
+def _minify_css_code(code: str) -> str:
+    code = _CSS_PUNCT_SPACE.sub(r'\1', re.sub(' {2,}', ' ', code))
+    return code.replace(': ', ':').replace(';}', '}')
+
+
+def minify_css(source: str) -> str:
+    """Strip comments and redundant whitespace from a stylesheet, leaving strings intact"""
+    parts: List[str] = []
+    code: List[str] = []
+    last = 0
+    for match in _CSS_TOKEN.finditer(source):
+        code.append(source[last:match.start()])
+        last = match.end()
+        if match.group(1):
+            parts.extend((_minify_css_code(''.join(code)), match.group(1)))
+            code = []
+        else:
+            code.append(' ')
+    code.append(source[last:])
+    parts.append(_minify_css_code(''.join(code)))
+    return ''.join(parts).strip()
+
+
+def _vlq(value: int) -> str:
+    value = (-value << 1) | 1 if value < 0 else value << 1
+    digits = ''
+    while True:
+        digit, value = value & 31, value >> 5
+        digits += _BASE64[digit | (32 if value else 0)]
+        if not value:
+            return digits
+
+
+def source_map(file: str, source: str, content: str, mappings: Iterable[Mapping]) -> bytes:
+    """A version 3 source map with one source, embedded so the map works wherever it is served"""
+    lines: List[List[str]] = [[]]
+    generated_column = source_line = source_column = 0
+    for generated_line, column, line, line_column in mappings:
+        while len(lines) <= generated_line:
+            lines.append([])
+            generated_column = 0
+        lines[generated_line].append(_vlq(column - generated_column) + 'A' + _vlq(line - source_line)
+                                     + _vlq(line_column - source_column))
+        generated_column, source_line, source_column = column, line, line_column
+    return json.dumps({
+        'version': 3,
+        'file': file,
+        'sources': [source],
+        'sourcesContent': [content],
+        'names': [],
+        'mappings': ';'.join(','.join(segments) for segments in lines),
+    }, ensure_ascii=False).encode('utf-8')
+
+
+def _relative_url(target: Path, start: Path) -> str:
+    return Path(os.path.relpath(target, start)).as_posix()
+
+
+class InlineCodeMinifier(Filter):
+    """Minifies inline scripts and styles; each script gets a source map beside the output
+    page that maps it back to its lines in the source page"""
+
+    def __init__(self, page: Page):
+        self.page = page
+        self.content: Optional[str] = None
+        self.line = self.column = 0
+        self.count = 0
+        self.opening: Optional[Token] = None
+
+    def _advance(self, raw: str) -> None:
+        newlines = raw.count('\n')
+        if newlines:
+            self.line += newlines
+            self.column = _utf16_length(raw[raw.rfind('\n') + 1:])
+        else:
+            self.column += _utf16_length(raw)
+
+    def handle(self, token: Token) -> Iterable[Token]:
+        line, column = self.line, self.column
+        self._advance(token.raw)
+        if token.kind == START and token.name in ('script', 'style') and not token.self_closing:
+            self.opening = token
+        elif token.kind == END:
+            self.opening = None
+        elif token.kind == TEXT and self.opening is not None:
+            opening, self.opening = self.opening, None
+            if opening.name == 'style':
+                token.raw = minify_css(token.raw)
+            elif not opening.has('src') and opening.get('type', '').lower() in JS_TYPES:
+                token.raw = self._minify_script(token.raw, line, column)
+        return (token,)
+
+    def _minify_script(self, script: str, line: int, column: int) -> str:
+        code, mappings = minify_js(script, line, column)
+        if not code:
+            return code
+        if self.content is None:
+            self.content = self.page.source.read_text(encoding='utf-8')
+        self.count += 1
+        map_file = self.page.output.with_name(f"{self.page.output.name}.{self.count}.map")
+        self.page.files[map_file] = source_map(self.page.output.name,
+                                               _relative_url(self.page.source, map_file.parent),
+                                               self.content, mappings)
+        return f"{code}\n//# sourceMappingURL={map_file.name}\n"
+
+
+class SiteMinifier:
+    """Writes the minified pages and scripts, and links the rest of the site, into one directory"""
+
+    def __init__(self, output_dir: str = DEFAULT_OUTPUT_DIR):
+        self.output_dir = ROOT / output_dir
+
+    @staticmethod
+    def site_files() -> List[str]:
+        """Every file the deployed site serves, relative to the site root"""
+        paths = set()
+        for pattern in [*PRECACHE_ASSETS, *RUNTIME_ASSETS, *MINIFIED_PAGES, *MINIFIED_SCRIPTS, *SITE_FILES]:
+            paths.update(path.relative_to(ROOT).as_posix() for path in ROOT.glob(pattern) if path.is_file())
+        return sorted(paths)
+
+    def _minify_script(self, name: str, transaction: FileTransaction) -> None:
+        source = ROOT / name
+        content = source.read_text(encoding='utf-8')
+        code, mappings = minify_js(content)
+        output = self.output_dir / name
+        map_file = output.with_name(output.name + '.map')
+        transaction.write(output, f"{code}\n//# sourceMappingURL={map_file.name}\n")
+        transaction.write(map_file, source_map(output.name, _relative_url(source, map_file.parent),
+                                               content, mappings))
+
+    def _link(self, name: str) -> bool:
+        """Hard-link a source file into the output, copying where links are unsupported;
+        returns whether anything changed"""
+        source, target = ROOT / name, self.output_dir / name
+        if target.exists() and os.path.samefile(source, target):
+            return False
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = target.with_name(target.name + '.tmp')
+        tmp_file.unlink(missing_ok=True)
+        try:
+            os.link(source, tmp_file)
+        except OSError:
+            shutil.copy2(source, tmp_file)
+        os.replace(tmp_file, target)
+        return True
+
+    def run(self) -> Dict[str, int]:
+        """Build the output directory, removing files the site no longer serves"""
+        files = self.site_files()
+        minified = set(MINIFIED_PAGES) | set(MINIFIED_SCRIPTS)
+        transaction = FileTransaction()
+        pages = [Page(ROOT / name, self.output_dir / name) for name in MINIFIED_PAGES if name in files]
+        Pipeline(lambda page: [InlineCodeMinifier(page), Minifier()]).run(pages, transaction)
+        for name in MINIFIED_SCRIPTS:
+            if name in files:
+                self._minify_script(name, transaction)
+
+        expected = {path for path in transaction.writes} | {self.output_dir / name for name in files}
+        if self.output_dir.exists():
+            for path in self.output_dir.rglob('*'):
+                if path.is_file() and path not in expected and not path.name.endswith('.stream'):
+                    transaction.remove(path)
+        result = transaction.commit()
+        result['linked'] = sum(self._link(name) for name in files if name not in minified)
+        return result
+
+    def sizes(self) -> List[Tuple[str, int, int, int, int]]:
+        """(name, source bytes, minified bytes, source gzip bytes, minified gzip bytes)"""
+        rows = []
+        for name in [*MINIFIED_PAGES, *MINIFIED_SCRIPTS]:
+            source, output = (ROOT / name).read_bytes(), (self.output_dir / name).read_bytes()
+            rows.append((name, len(source), len(output), len(gzip.compress(source, 9)),
+                         len(gzip.compress(output, 9))))
+        return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build a minified copy of the site with source maps')
+    parser.add_argument('--output-dir', default=DEFAULT_OUTPUT_DIR,
+                       help=f'Directory for the deployable site (default: {DEFAULT_OUTPUT_DIR})')
+
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    try:
+        minifier = SiteMinifier(args.output_dir)
+        result = minifier.run()
+    except (OSError, ValueError) as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+
+    for name, size, minified, gzip_size, gzip_minified in minifier.sizes():
+        print(f"   {name}: {size:,} -> {minified:,} bytes (gzip {gzip_size:,} -> {gzip_minified:,})")
+    print(f"✅ {args.output_dir}/: {result['written']} files written, {result['linked']} linked, "
+          f"{result['removed']} removed in {time.perf_counter() - start:.3f}s")
+
+
+if __name__ == '__main__':
+    main()
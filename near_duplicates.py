@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Near-Duplicate Tool Detection
+MinHash signatures over each tool's name, description and topics, banded into an LSH
+index so near-twins are clustered without comparing every pair of tools
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import re
+import sys
+from array import array
+from collections import defaultdict
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Set, Tuple
+
+NUM_PERM = 256
+DEFAULT_THRESHOLD = 0.3
+SEED = 1
+# Words whose permuted hashes are kept between signatures
+WORD_CACHE_SIZE = 8192
+# Mersenne prime for the (a * x + b) mod p permutation family
+_PRIME = (1 << 61) - 1
+_TOKEN = re.compile(r'[a-z0-9]+')
+STOP_WORDS = frozenset('''
+    a an and any are as at be by for from in into is it of on or that the this to
+    use using with without you your
+'''.split())
+
+
+def tool_shingles(tool: Dict[str, Any]) -> Set[str]:
+    """Words of the tool's name, description and topics, hyphenated names and topics split"""
+    name = tool.get('display_name') or tool['name']
+    text = f"{name} {tool.get('description', '')} {tool.get('topics', '')}".lower()
+    return {word for word in _TOKEN.findall(text) if word not in STOP_WORDS}
+
+
+def jaccard(a: Set[str], b: Set[str]) -> float:
+    return len(a & b) / len(a | b) if a or b else 0.0
+
+
+def band_layout(num_perm: int, threshold: float) -> Tuple[int, int]:
+    """(bands, rows) whose LSH S-curve rises just below the threshold.
+
+    Pairs at the threshold are then very likely to share a bucket, while the number of
+    rows keeps pairs well below it from becoming candidates.
+    """
+    best = (num_perm, 1)
+    for rows in range(1, num_perm + 1):
+        bands = num_perm // rows
+        if (1 / bands) ** (1 / rows) > threshold:
+            break
+        best = (bands, rows)
+    return best
+
+
+class MinHasher:
+    """Signatures from a fixed, seeded family of hash permutations"""
+
+    def __init__(self, num_perm: int = NUM_PERM, seed: int = SEED):
+        rng = random.Random(seed)
+        self.permutations = [(rng.randrange(1, _PRIME), rng.randrange(0, _PRIME)) for _ in range(num_perm)]
+        # Tool text shares most of its words, so each word is permuted once
+        self._permuted = lru_cache(maxsize=WORD_CACHE_SIZE)(self._permute)
+
+    def _permute(self, shingle: str) -> array:
+        # Stable across processes, unlike hash() on str
+        value = int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'big')
+        return array('Q', [(a * value + b) % _PRIME for a, b in self.permutations])
+
+    def signature(self, shingles: Iterable[str]) -> List[int]:
+        permuted = [self._permuted(shingle) for shingle in shingles]
+        if not permuted:
+            return [_PRIME] * len(self.permutations)
+        return list(map(min, zip(*permuted)))
+
+
+class NearDuplicateIndex:
+    """LSH index of MinHash signatures; only tools sharing a band bucket are ever compared"""
+
+    def __init__(self, threshold: float = DEFAULT_THRESHOLD, num_perm: int = NUM_PERM):
+        self.threshold = threshold
+        self.hasher = MinHasher(num_perm)
+        self.bands, self.rows = band_layout(num_perm, threshold)
+        self.buckets: Dict[Tuple[int, Tuple[int, ...]], List[str]] = defaultdict(list)
+        self.shingles: Dict[str, Set[str]] = {}
+
+    def add(self, key: str, shingles: Set[str]) -> None:
+        if key in self.shingles or not shingles:
+            return
+        self.shingles[key] = shingles
+        signature = self.hasher.signature(shingles)
+        for band in range(self.bands):
+            start = band * self.rows
+            self.buckets[(band, tuple(signature[start:start + self.rows]))].append(key)
+
+    def candidate_pairs(self) -> Set[Tuple[str, str]]:
+        pairs = set()
+        for keys in self.buckets.values():
+            for i, first in enumerate(keys):
+                for second in keys[i + 1:]:
+                    pairs.add((first, second) if first < second else (second, first))
+        return pairs
+
+    def pairs(self) -> List[Tuple[str, str, float]]:
+        """Candidate pairs confirmed at or above the threshold, most similar first"""
+        confirmed = []
+        for first, second in self.candidate_pairs():
+            similarity = jaccard(self.shingles[first], self.shingles[second])
+            if similarity >= self.threshold:
+                confirmed.append((first, second, similarity))
+        return sorted(confirmed, key=lambda pair: (-pair[2], pair[0], pair[1]))
+
+    def clusters(self) -> List[List[str]]:
+        """Connected groups of confirmed pairs, each in insertion order"""
+        parent = {key: key for key in self.shingles}
+
+        def find(key: str) -> str:
+            while parent[key] != key:
+                parent[key] = parent[parent[key]]
+                key = parent[key]
+            return key
+
+        for first, second, _ in self.pairs():
+            parent[find(first)] = find(second)
+
+        groups: Dict[str, List[str]] = defaultdict(list)
+        for key in self.shingles:
+            groups[find(key)].append(key)
+        return [members for members in groups.values() if len(members) > 1]
+
+
+def find_clusters(tools: Iterable[Dict[str, Any]], threshold: float = DEFAULT_THRESHOLD) -> Dict[str, str]:
+    """Map each engine tool id in a near-duplicate cluster to its cluster's first tool id"""
+    index = NearDuplicateIndex(threshold)
+    for tool in tools:
+        index.add(tool['name'].lower().replace(' ', ''), tool_shingles(tool))
+    return {member: members[0] for members in index.clusters() for member in members}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Find near-duplicate tools with MinHash/LSH')
+    parser.add_argument('--html-file', default='index.html',
+                       help='Path to HTML file (default: index.html)')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                       help=f'Word-set Jaccard similarity that makes two tools near-duplicates '
+                            f'(default: {DEFAULT_THRESHOLD})')
+    parser.add_argument('--json', action='store_true',
+                       help='Print pairs and clusters as JSON')
+
+    args = parser.parse_args()
+
+    try:
+        from update_quiz_tools import QuizToolUpdater
+
+        index = NearDuplicateIndex(args.threshold)
+        for tool in QuizToolUpdater(args.html_file).extract_tools_from_html():
+            index.add(tool['name'], tool_shingles(tool))
+    except Exception as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+
+    pairs, clusters = index.pairs(), index.clusters()
+    if args.json:
+        print(json.dumps({'pairs': [{'tools': [first, second], 'similarity': round(similarity, 3)}
+                                    for first, second, similarity in pairs],
+                          'clusters': clusters}, indent=2))
+        return
+
+    print(f"Indexed {len(index.shingles)} tools in {index.bands} bands of {index.rows} rows; "
+          f"{len(index.candidate_pairs())} candidate pairs compared")
+    for first, second, similarity in pairs:
+        print(f"   {similarity:.2f}  {first} ~ {second}")
+    print(f"✅ {len(clusters)} near-duplicate clusters" if clusters else "✅ No near-duplicates found")
+
+
+if __name__ == '__main__':
+    main()
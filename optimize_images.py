@@ -0,0 +1,426 @@
+#!/usr/bin/env python3
+"""
+Image Optimizer
+Losslessly recompresses the PNGs embedded in handout pages as data: URIs and stored in
+OOXML downloads, across a process pool with results cached by content hash
+"""
+
+import argparse
+import base64
+import hashlib
+import io
+import re
+import struct
+import sys
+import time
+import zipfile
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from site_paths import ROOT
+from file_transaction import FileTransaction
+from html_stream import START, Filter, Page, Pipeline, Token
+
+# Bump when the encoder changes, so cached results are recomputed
+OPTIMIZER_VERSION = 1
+CACHE_DIR = ROOT / '.build' / 'images'
+DEFAULT_TARGETS = ['ai/*.html', 'ai/downloads/*.docx', 'ai/downloads/*.pptx']
+# Adaptive filtering runs in pure Python, so only images up to this size try it
+ADAPTIVE_MAX_PIXELS = 1_000_000
+# Ancillary chunks that still describe the image after re-encoding; the rest are dropped
+KEEP_CHUNKS = (b'gAMA', b'cHRM', b'sRGB', b'iCCP', b'pHYs')
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+CHANNELS = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}
+_DATA_URI = re.compile(r'data:image/png;base64,([A-Za-z0-9+/=]+)')
+
+
+class Png:
+    """The header fields and chunks of a PNG file"""
+
+    def __init__(self, data: bytes):
+        if not data.startswith(PNG_SIGNATURE):
+            raise ValueError("not a PNG file")
+        self.chunks: List[Tuple[bytes, bytes]] = []
+        pos = len(PNG_SIGNATURE)
+        while pos + 8 <= len(data):
+            length, kind = struct.unpack('>I4s', data[pos:pos + 8])
+            self.chunks.append((kind, data[pos + 8:pos + 8 + length]))
+            pos += length + 12
+            if kind == b'IEND':
+                break
+        if not self.chunks or self.chunks[0][0] != b'IHDR':
+            raise ValueError("PNG without a header")
+        (self.width, self.height, self.bit_depth, self.color_type,
+         _, _, self.interlace) = struct.unpack('>IIBBBBB', self.chunks[0][1])
+
+    def chunk(self, kind: bytes) -> Optional[bytes]:
+        return next((body for chunk_kind, body in self.chunks if chunk_kind == kind), None)
+
+    @property
+    def filtered(self) -> bytes:
+        """The decompressed image data, each row still prefixed by its filter type"""
+        return zlib.decompress(b''.join(body for kind, body in self.chunks if kind == b'IDAT'))
+
+    @property
+    def row_bytes(self) -> int:
+        return (self.width * CHANNELS[self.color_type] * self.bit_depth + 7) // 8
+
+
+def _unfilter(filtered: bytes, row_bytes: int, bpp: int, height: int) -> bytearray:
+    """Undo the per-row PNG filters of non-interlaced image data"""
+    pixels = bytearray()
+    prev = bytearray(row_bytes)
+    stride = row_bytes + 1
+    for y in range(height):
+        kind = filtered[y * stride]
+        line = bytearray(filtered[y * stride + 1:(y + 1) * stride])
+        if kind == 1:
+            for i in range(bpp, row_bytes):
+                line[i] = (line[i] + line[i - bpp]) & 255
+        elif kind == 2:
+            line = bytearray((x + b) & 255 for x, b in zip(line, prev))
+        elif kind == 3:
+            for i in range(row_bytes):
+                line[i] = (line[i] + ((line[i - bpp] if i >= bpp else 0) + prev[i]) // 2) & 255
+        elif kind == 4:
+            for i in range(row_bytes):
+                a = line[i - bpp] if i >= bpp else 0
+                b = prev[i]
+                c = prev[i - bpp] if i >= bpp else 0
+                p = a + b - c
+                pa, pb, pc = abs(p - a), abs(p - b), abs(p - c)
+                line[i] = (line[i] + (a if pa <= pb and pa <= pc else b if pb <= pc else c)) & 255
+        elif kind != 0:
+            raise ValueError(f"unknown PNG filter type {kind}")
+        pixels += line
+        prev = line
+    return pixels
+
+
+def _filter(pixels: bytes, row_bytes: int, bpp: int, height: int, adaptive: bool) -> bytes:
+    """Filter rows with type 0, or with whichever type minimizes each row's absolute sum"""
+    if not adaptive:
+        return b''.join(b'\x00' + pixels[y * row_bytes:(y + 1) * row_bytes] for y in range(height))
+
+    out = bytearray()
+    prev = bytes(row_bytes)
+    for y in range(height):
+        line = pixels[y * row_bytes:(y + 1) * row_bytes]
+        left = bytes(bpp) + line[:-bpp]
+        up_left = bytes(bpp) + prev[:-bpp]
+        paeth = bytearray(row_bytes)
+        for i, (x, a, b, c) in enumerate(zip(line, left, prev, up_left)):
+            p = a + b - c
+            pa, pb, pc = abs(p - a), abs(p - b), abs(p - c)
+            paeth[i] = (x - (a if pa <= pb and pa <= pc else b if pb <= pc else c)) & 255
+        candidates = [
+            bytes(line),
+            bytes((x - a) & 255 for x, a in zip(line, left)),
+            bytes((x - b) & 255 for x, b in zip(line, prev)),
+            bytes((x - ((a + b) >> 1)) & 255 for x, a, b in zip(line, left, prev)),
+            bytes(paeth),
+        ]
+        kind = min(range(5), key=lambda k: sum(v if v < 128 else 256 - v for v in candidates[k]))
+        out.append(kind)
+        out += candidates[kind]
+        prev = line
+    return bytes(out)
+
+
+def _pack(indices: bytes, width: int, height: int, depth: int) -> bytes:
+    """Pack one palette index per byte into rows of depth-bit samples"""
+    if depth == 8:
+        return indices
+    per_byte = 8 // depth
+    rows = []
+    for y in range(height):
+        row = indices[y * width:(y + 1) * width]
+        packed = bytearray()
+        for start in range(0, width, per_byte):
+            group = row[start:start + per_byte]
+            value = 0
+            for index in group:
+                value = (value << depth) | index
+            packed.append(value << (depth * (per_byte - len(group))))
+        rows.append(bytes(packed))
+    return b''.join(rows)
+
+
+def _unpack(packed: bytes, width: int, height: int, depth: int) -> bytes:
+    if depth == 8:
+        return packed
+    row_bytes = (width * depth + 7) // 8
+    mask = (1 << depth) - 1
+    shifts = [8 - depth * (k + 1) for k in range(8 // depth)]
+    indices = bytearray()
+    for y in range(height):
+        row = packed[y * row_bytes:(y + 1) * row_bytes]
+        indices += bytes((byte >> shift) & mask for byte in row for shift in shifts)[:width]
+    return bytes(indices)
+
+
+def rgba_pixels(png: Png, samples: Optional[bytes] = None) -> bytes:
+    """8-bit RGBA samples of a non-interlaced, 8-bit or palette PNG, optionally already unfiltered"""
+    channels = CHANNELS[png.color_type]
+    if samples is None:
+        bpp = max(1, channels * png.bit_depth // 8)
+        samples = bytes(_unfilter(png.filtered, png.row_bytes, bpp, png.height))
+    if png.color_type == 3:
+        palette = png.chunk(b'PLTE')
+        alpha = png.chunk(b'tRNS') or b''
+        colors = [palette[i:i + 3] + (alpha[i // 3:i // 3 + 1] or b'\xff') for i in range(0, len(palette), 3)]
+        return b''.join(map(colors.__getitem__, _unpack(samples, png.width, png.height, png.bit_depth)))
+    if png.bit_depth != 8:
+        raise ValueError("only 8-bit samples are decoded")
+    rgba = bytearray(b'\xff') * (png.width * png.height * 4)
+    gray = png.color_type in (0, 4)
+    for channel in range(3):
+        rgba[channel::4] = samples[0 if gray else channel::channels]
+    if png.color_type in (4, 6):
+        rgba[3::4] = samples[channels - 1::channels]
+    return bytes(rgba)
+
+
+def _chunk(kind: bytes, body: bytes) -> bytes:
+    return struct.pack('>I', len(body)) + kind + body + struct.pack('>I', zlib.crc32(kind + body))
+
+
+def _deflate(filtered: bytes) -> bytes:
+    """The smallest zlib stream over the strategies that suit filtered image data"""
+    streams = []
+    for strategy in (zlib.Z_DEFAULT_STRATEGY, zlib.Z_FILTERED):
+        compressor = zlib.compressobj(9, zlib.DEFLATED, 15, 9, strategy)
+        streams.append(compressor.compress(filtered) + compressor.flush())
+    return min(streams, key=len)
+
+
+def _encode(png: Png, color_type: int, depth: int, idat: bytes, extra: List[Tuple[bytes, bytes]]) -> bytes:
+    header = struct.pack('>IIBBBBB', png.width, png.height, depth, color_type, 0, 0, 0)
+    chunks = [_chunk(b'IHDR', header)]
+    chunks += [_chunk(kind, body) for kind, body in png.chunks if kind in KEEP_CHUNKS]
+    chunks += [_chunk(kind, body) for kind, body in extra]
+    chunks += [_chunk(b'IDAT', idat), _chunk(b'IEND', b'')]
+    return PNG_SIGNATURE + b''.join(chunks)
+
+
+def optimize_png(data: bytes) -> bytes:
+    """The smallest lossless re-encoding of a PNG, or the PNG itself when nothing is smaller.
+
+    Candidates are the original filtered data recompressed and, for 8-bit non-interlaced
+    images, the pixels with an all-opaque alpha channel dropped or mapped to a palette of
+    up to 256 colors, filtered with type 0 or adaptively. Re-encoded pixels are decoded
+    again and compared with the original before a candidate is accepted.
+    """
+    try:
+        png = Png(data)
+        candidates = [_encode(png, png.color_type, png.bit_depth, _deflate(png.filtered),
+                              [(kind, body) for kind, body in png.chunks if kind in (b'PLTE', b'tRNS')])]
+    except (ValueError, zlib.error, struct.error):
+        return data
+
+    if png.bit_depth == 8 and png.interlace == 0 and png.color_type != 3 and not png.chunk(b'tRNS'):
+        channels = CHANNELS[png.color_type]
+        samples = _unfilter(png.filtered, png.row_bytes, channels, png.height)
+        original = bytes(samples)
+        color_type = png.color_type
+        if color_type in (4, 6) and samples[channels - 1::channels].count(255) == png.width * png.height:
+            # An alpha channel that is opaque everywhere carries no information
+            del samples[channels - 1::channels]
+            channels -= 1
+            color_type -= 4
+
+        extra: List[Tuple[bytes, bytes]] = []
+        depth = 8
+        pixels = list(zip(*[iter(samples)] * channels)) if color_type != 0 else []
+        colors = set(pixels)
+        if pixels and len(colors) <= 256:
+            alpha = color_type in (4, 6)
+            # Translucent entries first, so tRNS can stop at the last of them
+            ordered = sorted(colors, key=lambda color: (not alpha or color[-1] == 255, color))
+            index = {color: i for i, color in enumerate(ordered)}
+            depth = next(bits for bits in (1, 2, 4, 8) if len(ordered) <= 1 << bits)
+            extra.append((b'PLTE', b''.join(bytes(color[:3] if color_type in (2, 6) else color[:1] * 3)
+                                            for color in ordered)))
+            translucent = bytes(color[-1] for color in ordered if alpha and color[-1] != 255)
+            if translucent:
+                extra.append((b'tRNS', translucent))
+            samples = _pack(bytes(map(index.__getitem__, pixels)), png.width, png.height, depth)
+            color_type, channels = 3, 1
+
+        row_bytes = (png.width * channels * depth + 7) // 8
+        bpp = max(1, channels * depth // 8)
+        modes = [False] + ([True] if color_type != 3 and png.width * png.height <= ADAPTIVE_MAX_PIXELS else [])
+        encoded = [_encode(png, color_type, depth,
+                           _deflate(_filter(bytes(samples), row_bytes, bpp, png.height, adaptive)), extra)
+                   for adaptive in modes]
+        smallest = min(encoded, key=len)
+        if len(smallest) < len(candidates[0]) and rgba_pixels(Png(smallest)) == rgba_pixels(png, original):
+            candidates.append(smallest)
+
+    best = min(candidates, key=len)
+    return best if len(best) < len(data) else data
+
+
+class PngCollector(Filter):
+    """Collects the PNGs embedded as data: URIs in <img> tags"""
+
+    def __init__(self):
+        self.images: List[bytes] = []
+
+    def handle(self, token: Token) -> Iterable[Token]:
+        if token.kind == START and token.name == 'img':
+            uri = _DATA_URI.fullmatch(token.get('src', ''))
+            if uri:
+                self.images.append(base64.b64decode(uri.group(1)))
+        return (token,)
+
+
+class ImageRewriter(Filter):
+    """Swaps in optimized data: URIs and gives each embedded image its size and lazy decoding"""
+
+    def __init__(self, optimized: Dict[str, bytes]):
+        self.optimized = optimized
+
+    def handle(self, token: Token) -> Iterable[Token]:
+        if token.kind != START or token.name != 'img':
+            return (token,)
+        uri = _DATA_URI.fullmatch(token.get('src', ''))
+        if not uri:
+            return (token,)
+        data = base64.b64decode(uri.group(1))
+        data = self.optimized.get(hashlib.sha256(data).hexdigest(), data)
+        token.set('src', 'data:image/png;base64,' + base64.b64encode(data).decode('ascii'))
+
+        width = token.get('width')
+        if not token.has('height') and (width is None or width.isdigit()):
+            png = Png(data)
+            if width:
+                token.set('height', str(round(int(width) * png.height / png.width)))
+            else:
+                token.set('width', str(png.width))
+                token.set('height', str(png.height))
+        if not token.has('loading'):
+            token.set('loading', 'lazy')
+        if not token.has('decoding'):
+            token.set('decoding', 'async')
+        return (token,)
+
+
+class ImageOptimizer:
+    """Optimizes every PNG in a set of pages and OOXML files, once per distinct image"""
+
+    def __init__(self, jobs: int = 0, cache_dir: Optional[Path] = CACHE_DIR):
+        self.jobs = jobs or None
+        self.cache_dir = cache_dir
+        self.stats = {'images': 0, 'cached': 0, 'optimized': 0}
+
+    def _cache_file(self, digest: str) -> Optional[Path]:
+        return self.cache_dir / f"{OPTIMIZER_VERSION}-{digest}.png" if self.cache_dir else None
+
+    def optimize_all(self, images: List[bytes]) -> Dict[str, bytes]:
+        """Optimized bytes by SHA-256 of the original, from the cache or the process pool"""
+        unique = {hashlib.sha256(data).hexdigest(): data for data in images}
+        results, pending = {}, {}
+        for digest, data in unique.items():
+            cache_file = self._cache_file(digest)
+            if cache_file and cache_file.exists():
+                results[digest] = cache_file.read_bytes()
+            else:
+                pending[digest] = data
+        self.stats['images'] = len(unique)
+        self.stats['cached'] = len(unique) - len(pending)
+
+        if pending:
+            with ProcessPoolExecutor(max_workers=self.jobs) as executor:
+                for digest, optimized in zip(pending, executor.map(optimize_png, pending.values())):
+                    results[digest] = optimized
+                    if self.cache_dir:
+                        self.cache_dir.mkdir(parents=True, exist_ok=True)
+                        # The optimized image is its own result, so the next run finds it too
+                        for key in {digest, hashlib.sha256(optimized).hexdigest()}:
+                            self._cache_file(key).write_bytes(optimized)
+        self.stats['optimized'] = sum(len(results[digest]) < len(data) for digest, data in unique.items())
+        return results
+
+    @staticmethod
+    def ooxml_images(data: bytes) -> Iterator[bytes]:
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            for info in archive.infolist():
+                if info.filename.lower().endswith('.png'):
+                    yield archive.read(info)
+
+    @staticmethod
+    def rewrite_ooxml(data: bytes, optimized: Dict[str, bytes]) -> bytes:
+        """The package with its PNG members replaced, or data itself when none changed"""
+        source = zipfile.ZipFile(io.BytesIO(data))
+        out = io.BytesIO()
+        changed = False
+        with source, zipfile.ZipFile(out, 'w') as target:
+            for info in source.infolist():
+                member = source.read(info)
+                if info.filename.lower().endswith('.png'):
+                    replacement = optimized.get(hashlib.sha256(member).hexdigest(), member)
+                    changed |= replacement != member
+                    member = replacement
+                # The original entry keeps its order, timestamp and compression
+                target.writestr(info, member, compress_type=info.compress_type)
+        return out.getvalue() if changed else data
+
+    def run(self, paths: List[Path]) -> Dict[str, int]:
+        """Optimize the images of every file and commit the changed files together"""
+        pages = [path for path in paths if path.suffix == '.html']
+        collected = Pipeline(lambda page: [PngCollector()]).run([Page(path) for path in pages])
+        images: List[bytes] = [image for page in collected for image in page.filters[0].images]
+        contents: Dict[Path, bytes] = {path: path.read_bytes() for path in paths if path.suffix != '.html'}
+        for data in contents.values():
+            images.extend(self.ooxml_images(data))
+        optimized = self.optimize_all(images)
+
+        transaction = FileTransaction()
+        Pipeline(lambda page: [ImageRewriter(optimized)]).run([Page(path, path) for path in pages], transaction)
+        for path, data in contents.items():
+            transaction.write(path, self.rewrite_ooxml(data, optimized))
+        return transaction.commit()
+
+
+def expand_targets(patterns: List[str]) -> List[Path]:
+    paths = set()
+    for pattern in patterns:
+        matches = list(ROOT.glob(pattern)) if any(char in pattern for char in '*?[') else [ROOT / pattern]
+        paths.update(path for path in matches if path.is_file())
+    return sorted(paths)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Losslessly optimize PNGs embedded in pages and OOXML downloads')
+    parser.add_argument('targets', nargs='*', default=DEFAULT_TARGETS,
+                       help=f'Files or globs under the site root (default: {" ".join(DEFAULT_TARGETS)})')
+    parser.add_argument('--jobs', type=int, default=0,
+                       help='Worker processes (default: CPU count)')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Ignore and do not update the cache in .build/images')
+
+    args = parser.parse_args()
+
+    paths = expand_targets(args.targets)
+    before = sum(path.stat().st_size for path in paths)
+    start = time.perf_counter()
+    try:
+        optimizer = ImageOptimizer(args.jobs, None if args.no_cache else CACHE_DIR)
+        files = optimizer.run(paths)
+    except (OSError, ValueError, zipfile.BadZipFile) as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+
+    after = sum(path.stat().st_size for path in paths)
+    stats = optimizer.stats
+    print(f"✅ {stats['images']} distinct images ({stats['cached']} cached, {stats['optimized']} smaller) "
+          f"in {len(paths)} files, {files['written']} rewritten: {before:,} -> {after:,} bytes "
+          f"in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
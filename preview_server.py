@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+"""
+Preview Server
+Serves the generated site locally the way a production host would: bodies go straight from
+the page cache to the socket with sendfile, responses carry strong ETags from the build's
+content hashes, byte ranges and precompressed variants are honoured, and open pages reload
+whenever a build rewrites one of the files being served
+"""
+
+import argparse
+import asyncio
+import gzip
+import json
+import mimetypes
+import os
+import re
+import sys
+import threading
+import urllib.parse
+from http import HTTPStatus
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from build_site import STATE_FILE, FileHasher
+from collect_submissions import MAX_HEADER_BYTES
+from site_paths import ROOT
+
+DEFAULT_PORT = 8000
+DEFAULT_ROOT = '.'
+POLL_INTERVAL = 0.5
+RELOAD_PATH = '/__reload'
+# Gzip variants are made once per content hash and kept here
+VARIANT_DIR = ROOT / '.build' / 'preview'
+COMPRESS_MIN_BYTES = 1024
+COMPRESSIBLE_TYPES = ('text/', 'application/javascript', 'application/json', 'application/xml',
+                      'image/svg+xml', 'application/manifest+json')
+# Prebuilt siblings (page.html.br, page.html.gz) are preferred in this order
+PREBUILT_ENCODINGS = [('br', '.br'), ('gzip', '.gz')]
+
+# Appended to every HTML response; waits for a rebuilt service worker to take over first,
+# since the old one would answer the reload from its cache
+RELOAD_SCRIPT = b'''
+<script>
+(() => {
+  const events = new EventSource('/__reload');
+  events.addEventListener('reload', async () => {
+    const registration = 'serviceWorker' in navigator && await navigator.serviceWorker.getRegistration();
+    if (registration) {
+      await registration.update().catch(() => {});
+      if (registration.installing || registration.waiting) {
+        await new Promise(resolve => {
+          navigator.serviceWorker.addEventListener('controllerchange', resolve, { once: true });
+          setTimeout(resolve, 3000);
+        });
+      }
+    }
+    location.reload();
+  });
+})();
+</script>
+'''
+
+_RANGE = re.compile(r'bytes=(\d*)-(\d*)')
+
+
+def accepted_encodings(header: str) -> Set[str]:
+    """Content codings an Accept-Encoding header allows"""
+    encodings = set()
+    for item in header.split(','):
+        coding, _, params = item.strip().partition(';')
+        quality = re.search(r'q=([\d.]+)', params)
+        if coding and not (quality and float(quality.group(1)) == 0):
+            encodings.add(coding.strip().lower())
+    return encodings
+
+
+def byte_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """(first, last) byte of a single-range Range header; ValueError if it is unsatisfiable,
+    None when it is not a valid single byte range and the whole file should be sent"""
+    match = _RANGE.fullmatch(header.strip())
+    if not match or match.groups() == ('', ''):
+        return None
+    first, last = match.groups()
+    if not first:
+        length = int(last)
+        if not length or not size:
+            raise ValueError("empty suffix range")
+        return max(0, size - length), size - 1
+    # An inverted range (bytes=5-2) is syntactically invalid, so the header is ignored
+    if last and int(last) < int(first):
+        return None
+    if int(first) >= size:
+        raise ValueError("range starts past the end of the file")
+    return int(first), min(int(last), size - 1) if last else size - 1
+
+
+def etag_matches(header: str, etag: str) -> bool:
+    return any(tag.strip() in ('*', etag, 'W/' + etag) for tag in header.split(','))
+
+
+class PreviewServer:
+    """Static file server for a built site with live reload"""
+
+    def __init__(self, root: str = DEFAULT_ROOT, live_reload: bool = True,
+                 poll_interval: float = POLL_INTERVAL):
+        self.root = (ROOT / root).resolve()
+        self.live_reload = live_reload
+        self.poll_interval = poll_interval
+        self.hasher = FileHasher()
+        self.listeners: Set[asyncio.StreamWriter] = set()
+        self.stats = {'requests': 0, 'not_modified': 0, 'partial': 0, 'compressed': 0,
+                      'bytes_sent': 0, 'reloads': 0}
+        self._state_signature: Optional[Tuple[int, int]] = None
+        self._outputs: Dict[str, Optional[str]] = {}
+
+    def resolve(self, url_path: str) -> Tuple[Optional[Path], bool]:
+        """The file a URL path names, and whether it is a directory missing its trailing slash"""
+        parts = [part for part in urllib.parse.unquote(url_path).split('/') if part]
+        # Dot files and directories (.git, .build) are never served
+        if any(part.startswith('.') or '\\' in part or '\0' in part for part in parts):
+            return None, False
+        path = self.root.joinpath(*parts)
+        if path.is_dir():
+            if not url_path.endswith('/'):
+                return path, True
+            path = path / 'index.html'
+        if not path.is_file() or not path.resolve().is_relative_to(self.root):
+            return None, False
+        return path, False
+
+    def _hash_key(self, path: Path) -> str:
+        return path.relative_to(ROOT).as_posix() if path.is_relative_to(ROOT) else str(path)
+
+    def changed_outputs(self) -> List[str]:
+        """Served files the build recorded new content for since the last call"""
+        try:
+            stat = STATE_FILE.stat()
+        except FileNotFoundError:
+            return []
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if signature == self._state_signature:
+            return []
+        try:
+            state = json.loads(STATE_FILE.read_text(encoding='utf-8'))
+        except (OSError, json.JSONDecodeError):
+            # Caught mid-write; the next poll rereads it
+            return []
+        first_load = self._state_signature is None
+        self._state_signature = signature
+        # Reuse the build's digests for the ETags while size and mtime still match
+        for path, entry in state.get('files', {}).items():
+            self.hasher.cache.setdefault(path, entry)
+
+        outputs = {path: digest for stage in state.get('stages', {}).values()
+                   for path, digest in stage.get('outputs', {}).items()}
+        changed = [path for path, digest in outputs.items() if self._outputs.get(path) != digest]
+        self._outputs = outputs
+        if first_load:
+            return []
+        return [path for path in changed if (ROOT / path).resolve().is_relative_to(self.root)]
+
+    def _compressed(self, path: Path, digest: str, trailer: bytes) -> Path:
+        """A gzip variant of the file (plus trailer), made once per content hash"""
+        variant = VARIANT_DIR / f"{digest[:32]}{'-reload' if trailer else ''}.gz"
+        if not variant.exists():
+            VARIANT_DIR.mkdir(parents=True, exist_ok=True)
+            tmp_file = variant.with_name(f"{variant.name}.{os.getpid()}-{threading.get_ident()}.tmp")
+            with open(path, 'rb') as source, gzip.open(tmp_file, 'wb', compresslevel=9) as f:
+                for chunk in iter(lambda: source.read(1 << 20), b''):
+                    f.write(chunk)
+                f.write(trailer)
+            os.replace(tmp_file, variant)
+        return variant
+
+    def select(self, path: Path, digest: str, content_type: str,
+               headers: Dict[str, str]) -> Tuple[Path, Optional[str], bytes, str]:
+        """The file to send, its content coding, bytes appended after it and its ETag"""
+        trailer = RELOAD_SCRIPT if self.live_reload and content_type == 'text/html' else b''
+        etag = digest[:32] + ('-reload' if trailer else '')
+        encodings = accepted_encodings(headers.get('accept-encoding', ''))
+        if not trailer:
+            for encoding, suffix in PREBUILT_ENCODINGS:
+                prebuilt = path.with_name(path.name + suffix)
+                if (encoding in encodings and prebuilt.is_file()
+                        and prebuilt.stat().st_mtime_ns >= path.stat().st_mtime_ns):
+                    return prebuilt, encoding, b'', f'"{etag}-{encoding}"'
+        if ('gzip' in encodings and content_type.startswith(COMPRESSIBLE_TYPES)
+                and path.stat().st_size >= COMPRESS_MIN_BYTES):
+            return self._compressed(path, digest, trailer), 'gzip', b'', f'"{etag}-gzip"'
+        return path, None, trailer, f'"{etag}"'
+
+    def _head(self, writer: asyncio.StreamWriter, status: int, fields: Dict[str, str],
+              keep_alive: bool) -> None:
+        lines = [f"HTTP/1.1 {status} {HTTPStatus(status).phrase}"]
+        lines.extend(f"{name}: {value}" for name, value in fields.items())
+        if not keep_alive:
+            lines.append('Connection: close')
+        writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1'))
+
+    def _respond(self, writer: asyncio.StreamWriter, status: int, keep_alive: bool,
+                 fields: Optional[Dict[str, str]] = None) -> None:
+        fields = dict(fields or {})
+        if status != 304:
+            fields['Content-Length'] = '0'
+        self._head(writer, status, fields, keep_alive)
+
+    async def serve_file(self, writer: asyncio.StreamWriter, method: str, path: Path,
+                         headers: Dict[str, str], keep_alive: bool) -> None:
+        """Send one file, or the part of it a Range header asks for, with sendfile"""
+        loop = asyncio.get_running_loop()
+        digest = await loop.run_in_executor(None, self.hasher.digest, self._hash_key(path))
+        content_type = mimetypes.guess_type(path.name)[0] or 'application/octet-stream'
+
+        size = path.stat().st_size
+        span = None
+        if 'range' in headers and (('if-range' not in headers)
+                                   or headers['if-range'] == f'"{digest[:32]}"'):
+            try:
+                span = byte_range(headers['range'], size)
+            except ValueError:
+                self._respond(writer, 416, keep_alive, {'Content-Range': f"bytes */{size}"})
+                return
+
+        fields = {'Content-Type': content_type + ('; charset=utf-8' if content_type.startswith('text/') else ''),
+                  'Cache-Control': 'no-cache', 'Accept-Ranges': 'bytes', 'Vary': 'Accept-Encoding'}
+        if span:
+            # Ranges address the file as stored: no coding, no reload script
+            body, encoding, trailer, etag = path, None, b'', f'"{digest[:32]}"'
+        else:
+            body, encoding, trailer, etag = await loop.run_in_executor(
+                None, self.select, path, digest, content_type, headers)
+        fields['ETag'] = etag
+        if etag_matches(headers.get('if-none-match', ''), etag):
+            self.stats['not_modified'] += 1
+            self._respond(writer, 304, keep_alive, {'ETag': etag, 'Cache-Control': 'no-cache',
+                                                    'Vary': 'Accept-Encoding'})
+            return
+        if encoding:
+            fields['Content-Encoding'] = encoding
+            self.stats['compressed'] += 1
+
+        body_size = body.stat().st_size
+        offset, count = 0, body_size
+        status = 200
+        if span:
+            offset, count, status = span[0], span[1] - span[0] + 1, 206
+            fields['Content-Range'] = f"bytes {span[0]}-{span[1]}/{size}"
+            self.stats['partial'] += 1
+        fields['Content-Length'] = str(count + len(trailer))
+        self._head(writer, status, fields, keep_alive)
+        if method == 'HEAD':
+            return
+
+        await writer.drain()
+        with open(body, 'rb') as f:
+            # Falls back to read/write only where the transport cannot sendfile
+            sent = await loop.sendfile(writer.transport, f, offset, count)
+        writer.write(trailer)
+        self.stats['bytes_sent'] += sent + len(trailer)
+
+    async def listen_for_reloads(self, reader: asyncio.StreamReader,
+                                 writer: asyncio.StreamWriter) -> None:
+        """Hold an event stream open until the page goes away"""
+        self._head(writer, 200, {'Content-Type': 'text/event-stream', 'Cache-Control': 'no-cache'}, True)
+        writer.write(b'retry: 1000\n\n')
+        self.listeners.add(writer)
+        try:
+            while await reader.read(1024):
+                pass
+        finally:
+            self.listeners.discard(writer)
+
+    async def _watch_build(self) -> None:
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.changed_outputs)
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            changed = await loop.run_in_executor(None, self.changed_outputs)
+            if not changed:
+                continue
+            self.stats['reloads'] += 1
+            print(f"🔄 Build rewrote {len(changed)} served files; reloading {len(self.listeners)} pages")
+            message = f"event: reload\ndata: {json.dumps(changed[:20])}\n\n".encode('utf-8')
+            for writer in list(self.listeners):
+                writer.write(message)
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve HTTP/1.1 requests on one keep-alive connection"""
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b'\r\n\r\n')
+                except asyncio.IncompleteReadError:
+                    break
+                except asyncio.LimitOverrunError:
+                    self._respond(writer, 431, keep_alive=False)
+                    break
+
+                lines = head.decode('latin-1').split('\r\n')
+                method, target, version = (lines[0].split(' ') + ['', '', ''])[:3]
+                headers = {}
+                for line in lines[1:]:
+                    name, _, value = line.partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                keep_alive = (headers.get('connection', '').lower() != 'close'
+                              and version == 'HTTP/1.1')
+                self.stats['requests'] += 1
+
+                url_path = target.split('?', 1)[0]
+                if method not in ('GET', 'HEAD'):
+                    self._respond(writer, 405, keep_alive, {'Allow': 'GET, HEAD'})
+                elif url_path == RELOAD_PATH and self.live_reload:
+                    await self.listen_for_reloads(reader, writer)
+                    break
+                else:
+                    path, add_slash = self.resolve(url_path)
+                    if add_slash:
+                        self._respond(writer, 301, keep_alive, {'Location': url_path + '/'})
+                    elif path is None:
+                        self._respond(writer, 404, keep_alive)
+                    else:
+                        await self.serve_file(writer, method, path, headers, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host: str = '127.0.0.1', port: int = DEFAULT_PORT,
+                    ready: Optional[asyncio.Event] = None) -> None:
+        """Serve the site until cancelled"""
+        watcher = asyncio.create_task(self._watch_build()) if self.live_reload else None
+        server = await asyncio.start_server(self.handle, host, port, limit=MAX_HEADER_BYTES)
+        if ready:
+            ready.set()
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            if watcher:
+                watcher.cancel()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Preview the generated site with caching headers and live reload')
+    parser.add_argument('--root', default=DEFAULT_ROOT,
+                       help=f'Directory to serve, relative to the site root, e.g. dist (default: {DEFAULT_ROOT})')
+    parser.add_argument('--host', default='127.0.0.1',
+                       help='Address to listen on (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT,
+                       help=f'Port to listen on (default: {DEFAULT_PORT})')
+    parser.add_argument('--no-reload', action='store_true',
+                       help='Do not inject the live reload script or watch the build')
+
+    args = parser.parse_args()
+
+    server = PreviewServer(args.root, live_reload=not args.no_reload)
+    if not server.root.is_dir():
+        print(f"ERROR: {server.root} is not a directory")
+        sys.exit(1)
+    print(f"✅ Serving {server.root} at http://{args.host}:{args.port}/"
+          + ('' if args.no_reload else ' (reloading pages after each build)'))
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    except Exception as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+    print(f"Served {server.stats['requests']} requests, {server.stats['bytes_sent']:,} bytes")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Quiz Recommendation Engine
+Python port of ToolRecommendationEngine that reads its tools and answer weights from recommendation_engine.js
+"""
+
+import json
+import re
+from functools import lru_cache
+from itertools import product
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+MAX_RECOMMENDATIONS = 12
+MIN_RECOMMENDATIONS = 10
+# Points getToolScore awards; candidate rule sets may override any of them
+DEFAULT_SCORE_WEIGHTS = {
+    'priority': {'high': 3, 'medium': 2, 'low': 1},
+    'context': 2,
+    'subject': 2,
+    'tech_level': 1,
+}
+
+_IDENTIFIER_KEY = re.compile(r'[A-Za-z_$][\w$]*(?=\s*:)')
+_TRAILING_COMMA = re.compile(r',(\s*[}\]])')
+
+
+def _matching_brace(source: str, start: int) -> int:
+    """Index just past the brace that closes the one at start, skipping string contents"""
+    depth = 0
+    i = start
+    while i < len(source):
+        char = source[i]
+        if char in '\'"`':
+            i += 1
+            while source[i] != char:
+                i += 2 if source[i] == '\\' else 1
+        elif char in '{[':
+            depth += 1
+        elif char in '}]':
+            depth -= 1
+            if depth == 0:
+                return i + 1
+        i += 1
+    raise ValueError("Unbalanced braces in JavaScript source")
+
+
+def parse_js_literal(text: str) -> Any:
+    """Parse a JavaScript object literal made of strings, numbers, arrays and objects"""
+    pieces = []
+    i = 0
+    while i < len(text):
+        char = text[i]
+        if char in '\'"':
+            # Re-encode the string as JSON, decoding JavaScript escapes
+            j = i + 1
+            value = []
+            while text[j] != char:
+                if text[j] == '\\':
+                    j += 1
+                    value.append({'n': '\n', 't': '\t'}.get(text[j], text[j]))
+                else:
+                    value.append(text[j])
+                j += 1
+            pieces.append(json.dumps(''.join(value)))
+            i = j + 1
+            continue
+        match = _IDENTIFIER_KEY.match(text, i)
+        if match and (i == 0 or not (text[i - 1].isalnum() or text[i - 1] in '_$')):
+            pieces.append(json.dumps(match.group(0)))
+            i = match.end()
+            continue
+        pieces.append(char)
+        i += 1
+    return json.loads(_TRAILING_COMMA.sub(r'\1', ''.join(pieces)))
+
+
+def _literal_after(source: str, marker: str, start: int = 0) -> Tuple[Any, int]:
+    position = source.index(marker, start) + len(marker)
+    brace = source.index('{', position)
+    end = _matching_brace(source, brace)
+    return parse_js_literal(source[brace:end]), end
+
+
+def load_question_weights(source: str) -> Dict[str, Dict[str, Dict[str, int]]]:
+    """Per-question answer weights from the process* methods of the engine source"""
+    question_weights = {}
+    for method, question in re.findall(r'this\.(process\w+)\(answers\.(q\d+)\)', source):
+        weights, _ = _literal_after(source, 'const weights =', source.index(f'    {method}(answer) {{'))
+        question_weights[question] = weights
+    return question_weights
+
+
+def load_categories(source: str) -> Dict[str, str]:
+    """Category labels by name from initializeCategories in the engine source"""
+    categories, _ = _literal_after(source, 'initializeCategories() {')
+    return {name: data['label'] for name, data in categories.items()}
+
+
+def load_shard_tools(js_file: str, shards: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Merge the category shards listed in the engine's shard index, in catalogue order"""
+    entries = []
+    for shard in shards.values():
+        shard_file = Path(js_file).parent / shard['url'].split('?', 1)[0]
+        entries.extend(json.loads(shard_file.read_text(encoding='utf-8'))['tools'])
+    return {tool_id: tool for _, tool_id, tool in sorted(entries, key=lambda entry: entry[0])}
+
+
+def load_engine_data(js_file: str = 'recommendation_engine.js') -> Dict[str, Any]:
+    """Read tools, categories, per-question answer weights and profiles from the engine source"""
+    source = Path(js_file).read_text(encoding='utf-8')
+
+    tools, _ = _literal_after(source, 'initializeTools() {')
+    if not tools and 'initializeShards() {' in source:
+        tools = load_shard_tools(js_file, _literal_after(source, 'initializeShards() {')[0])
+    profiles, _ = _literal_after(source, 'const profiles =')
+
+    return {
+        'tools': tools,
+        'categories': load_categories(source),
+        'question_weights': load_question_weights(source),
+        'profiles': profiles,
+    }
+
+
+def merge_score_weights(overrides: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """DEFAULT_SCORE_WEIGHTS with overrides applied, priority points merged one level down.
+
+    Raises ValueError for unknown keys or points that are not numbers.
+    """
+    overrides = {} if overrides is None else overrides
+    if not isinstance(overrides, dict):
+        raise ValueError("score_weights must be an object")
+    priority = overrides.get('priority', {})
+    if not isinstance(priority, dict):
+        raise ValueError("score_weights.priority must map priorities to points")
+    unknown = ([key for key in overrides if key not in DEFAULT_SCORE_WEIGHTS]
+               + [f'priority.{key}' for key in priority if key not in DEFAULT_SCORE_WEIGHTS['priority']])
+    if unknown:
+        raise ValueError(f"unknown score_weights keys: {', '.join(sorted(unknown))}")
+
+    points = {f'priority.{key}': value for key, value in priority.items()}
+    points.update((key, value) for key, value in overrides.items() if key != 'priority')
+    for name, value in points.items():
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise ValueError(f"score_weights.{name} must be a number, not {value!r}")
+    weights = dict(DEFAULT_SCORE_WEIGHTS, **overrides)
+    weights['priority'] = dict(DEFAULT_SCORE_WEIGHTS['priority'], **priority)
+    return weights
+
+
+class RecommendationEngine:
+    """Mirrors calculateRecommendations in recommendation_engine.js"""
+
+    def __init__(self, tools: Dict[str, Dict[str, Any]], categories: Dict[str, str],
+                 question_weights: Dict[str, Dict[str, Dict[str, int]]],
+                 profiles: Dict[str, Dict[str, str]], score_weights: Optional[Dict[str, Any]] = None):
+        self.tools = tools
+        self.categories = categories
+        self.question_weights = question_weights
+        self.profiles = profiles
+        self.score_weights = merge_score_weights(score_weights)
+        self._ranked_tools = lru_cache(maxsize=None)(self._rank_tools)
+
+    @classmethod
+    def from_js_file(cls, js_file: str = 'recommendation_engine.js') -> 'RecommendationEngine':
+        return cls(**load_engine_data(js_file))
+
+    @property
+    def questions(self) -> List[str]:
+        return sorted(self.question_weights, key=lambda q: int(q[1:]))
+
+    def options(self, question: str) -> List[str]:
+        return list(self.question_weights[question])
+
+    def answer_space(self) -> Iterator[Dict[str, str]]:
+        """Every complete combination of answers"""
+        questions = self.questions
+        for values in product(*(self.options(q) for q in questions)):
+            yield dict(zip(questions, values))
+
+    def category_weights(self, answers: Dict[str, str]) -> Dict[str, int]:
+        weights = {category: 0 for category in self.categories}
+        for question, answer_weights in self.question_weights.items():
+            for category, weight in answer_weights.get(answers.get(question), {}).items():
+                weights[category] += weight
+        return weights
+
+    def is_tool_suitable(self, tool: Dict[str, Any], teaching_level: Optional[str],
+                         tech_level: Optional[str]) -> bool:
+        contexts = tool.get('contexts')
+        if contexts and teaching_level not in contexts and 'general' not in contexts:
+            return False
+        if tech_level == 'beginner' and tool.get('techLevel') == 'advanced':
+            return False
+        return True
+
+    def tool_score(self, tool: Dict[str, Any], teaching_level: Optional[str],
+                   subject_area: Optional[str], tech_level: Optional[str]) -> int:
+        weights = self.score_weights
+        score = weights['priority'].get(tool.get('priority'), 0)
+        if teaching_level in (tool.get('contexts') or []):
+            score += weights['context']
+        if subject_area in (tool.get('subjects') or []):
+            score += weights['subject']
+        if tool.get('techLevel') == tech_level:
+            score += weights['tech_level']
+        return score
+
+    def _rank_tools(self, teaching_level: Optional[str], subject_area: Optional[str],
+                    tech_level: Optional[str]) -> List[str]:
+        """Suitable tool ids, best score first, ties kept in catalogue order"""
+        suitable = [(tool_id, tool) for tool_id, tool in self.tools.items()
+                    if self.is_tool_suitable(tool, teaching_level, tech_level)]
+        suitable.sort(key=lambda item: -self.tool_score(item[1], teaching_level, subject_area, tech_level))
+        return [tool_id for tool_id, _ in suitable]
+
+    def _pick_diverse(self, tool_ids: List[str], count: int, picked_clusters: Set[str]) -> List[str]:
+        """Up to count tools in order, skipping near-duplicates of tools already picked"""
+        picked = []
+        for tool_id in tool_ids:
+            if len(picked) >= count:
+                break
+            cluster = self.tools[tool_id].get('cluster')
+            if cluster:
+                if cluster in picked_clusters:
+                    continue
+                picked_clusters.add(cluster)
+            picked.append(tool_id)
+        return picked
+
+    def recommend(self, answers: Dict[str, str]) -> Dict[str, Any]:
+        """Return recommended tool ids, the top three categories and the user profile"""
+        weights = self.category_weights(answers)
+        sorted_categories = sorted(self.categories, key=lambda category: -weights[category])
+        ranked = self._ranked_tools(answers.get('q1'), answers.get('q2'), answers.get('q3'))
+
+        recommendations: List[str] = []
+        picked_clusters: Set[str] = set()
+        for category in sorted_categories:
+            if len(recommendations) >= MAX_RECOMMENDATIONS:
+                break
+            weight = weights[category]
+            to_add = 3 if weight > 5 else 2 if weight > 2 else 1
+            in_category = [tool_id for tool_id in ranked if self.tools[tool_id]['category'] == category]
+            recommendations.extend(self._pick_diverse(in_category, to_add, picked_clusters))
+
+        if len(recommendations) < MIN_RECOMMENDATIONS:
+            chosen = set(recommendations)
+            remaining = [tool_id for tool_id in ranked if tool_id not in chosen]
+            recommendations.extend(self._pick_diverse(remaining, MAX_RECOMMENDATIONS - len(recommendations),
+                                                      picked_clusters))
+
+        top_category = sorted_categories[0]
+        return {
+            'recommendations': recommendations[:MAX_RECOMMENDATIONS],
+            'topCategories': [{'name': name, 'weight': weights[name], 'label': self.categories[name]}
+                              for name in sorted_categories[:3]],
+            'userProfile': self.profiles.get(top_category) or self.profiles['content_creation'],
+        }
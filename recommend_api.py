@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Recommendation API
+Small asyncio HTTP service answering POST /recommend with the quiz's recommendations, scored
+by quiz_engine from the generated engine and tool shards, with an LRU cache of rendered
+responses that is replaced whenever the updater regenerates those files
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import re
+import sys
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from collect_submissions import CORS_HEADERS, MAX_BODY_BYTES, MAX_HEADER_BYTES, REASONS
+from quiz_engine import RecommendationEngine
+
+DEFAULT_JS = 'recommendation_engine.js'
+DEFAULT_PORT = 8766
+# The full answer space is 4^8 combinations; this covers the popular ones
+CACHE_SIZE = 4096
+RELOAD_INTERVAL = 1.0
+SHARD_DIR = 'quiz-data'
+
+_SHARD_URL = re.compile(r"url: '([^'?]+)\?v=([0-9a-f]+)'")
+
+AnswerKey = Tuple[Optional[str], ...]
+Signature = Tuple[Tuple[str, int, int], ...]
+
+
+def answer_key(engine: RecommendationEngine, body: bytes) -> AnswerKey:
+    """Validate a {"answers": {...}} payload into one answer (or None) per question"""
+    try:
+        payload = json.loads(body)
+    except (UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise ValueError(f"invalid JSON: {e}")
+    answers = payload.get('answers') if isinstance(payload, dict) else None
+    if not isinstance(answers, dict):
+        raise ValueError("payload needs an 'answers' object")
+    unknown = sorted(question for question in answers if question not in engine.questions)
+    if unknown:
+        raise ValueError(f"unknown questions: {', '.join(unknown)}")
+
+    key = []
+    for question in engine.questions:
+        value = answers.get(question)
+        if value is not None and (not isinstance(value, str) or value not in engine.question_weights[question]):
+            raise ValueError(f"invalid answer for {question}: {value!r}")
+        key.append(value)
+    return tuple(key)
+
+
+def check_shards(js_file: Path) -> None:
+    """Raise ValueError unless every shard matches the version the engine was generated with"""
+    for url, version in _SHARD_URL.findall(js_file.read_text(encoding='utf-8')):
+        digest = hashlib.sha256((js_file.parent / url).read_bytes()).hexdigest()
+        if not digest.startswith(version):
+            raise ValueError(f"{url} does not match the engine (expected version {version})")
+
+
+class RecommendationService:
+    """Serves recommendations from an engine that is reloaded when its files change"""
+
+    def __init__(self, js_file: str = DEFAULT_JS, cache_size: int = CACHE_SIZE,
+                 reload_interval: float = RELOAD_INTERVAL):
+        self.js_file = Path(js_file)
+        self.cache_size = cache_size
+        self.reload_interval = reload_interval
+        self.engine: Optional[RecommendationEngine] = None
+        self.stats = {'requests': 0, 'rejected': 0, 'loads': 0, 'reload_errors': 0}
+        self._signature: Signature = ()
+        self._render: Optional[Callable[[AnswerKey], bytes]] = None
+
+    def signature(self) -> Signature:
+        """Size and mtime of the engine and every shard, to notice regenerated data"""
+        paths = [self.js_file, *sorted((self.js_file.parent / SHARD_DIR).glob('*.json'))]
+        signature = []
+        for path in paths:
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            signature.append((path.name, stat.st_mtime_ns, stat.st_size))
+        return tuple(signature)
+
+    def load_engine(self) -> Optional[Tuple[RecommendationEngine, Signature]]:
+        """Load the engine if its files changed since the last load, or return None"""
+        before = self.signature()
+        if before == self._signature:
+            return None
+        engine = RecommendationEngine.from_js_file(str(self.js_file))
+        check_shards(self.js_file)
+        # The updater replaces the engine and its shards one file at a time
+        if self.signature() != before:
+            raise ValueError("engine files changed while loading")
+        return engine, before
+
+    def use_engine(self, engine: RecommendationEngine, signature: Signature) -> None:
+        """Swap in a loaded engine with a fresh response cache"""
+        def render(key: AnswerKey) -> bytes:
+            result = engine.recommend({question: value for question, value in zip(engine.questions, key)
+                                       if value is not None})
+            result['tools'] = [dict(engine.tools[tool_id], id=tool_id) for tool_id in result['recommendations']]
+            return json.dumps(result, ensure_ascii=False).encode('utf-8')
+
+        self.engine, self._signature = engine, signature
+        self._render = lru_cache(maxsize=self.cache_size)(render)
+        self.stats['loads'] += 1
+
+    def recommend(self, body: bytes) -> Tuple[int, bytes]:
+        """Status and JSON body for one POST /recommend"""
+        self.stats['requests'] += 1
+        try:
+            key = answer_key(self.engine, body)
+        except ValueError as e:
+            self.stats['rejected'] += 1
+            return 400, json.dumps({'error': str(e)}).encode('utf-8')
+        return 200, self._render(key)
+
+    def cache_stats(self) -> Dict[str, Any]:
+        info = self._render.cache_info()
+        return dict(self.stats, tools=len(self.engine.tools), cache_hits=info.hits,
+                    cache_misses=info.misses, cache_entries=info.currsize, cache_size=info.maxsize)
+
+    async def _reload_periodically(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.reload_interval)
+            try:
+                loaded = await loop.run_in_executor(None, self.load_engine)
+            except (OSError, ValueError, KeyError) as e:
+                # Keep serving the previous engine; the next poll retries
+                self.stats['reload_errors'] += 1
+                print(f"⚠️  Reload skipped: {e}")
+                continue
+            if loaded:
+                self.use_engine(*loaded)
+                print(f"🔄 Reloaded {len(self.engine.tools)} tools from {self.js_file}")
+
+    def _respond(self, writer: asyncio.StreamWriter, status: int, body: bytes = b'',
+                 keep_alive: bool = True) -> None:
+        headers = (f"HTTP/1.1 {status} {REASONS[status]}\r\n{CORS_HEADERS}"
+                   f"Content-Length: {len(body)}\r\n")
+        if body:
+            headers += 'Content-Type: application/json\r\n'
+        if not keep_alive:
+            headers += 'Connection: close\r\n'
+        writer.write(headers.encode('ascii') + b'\r\n' + body)
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve HTTP/1.1 requests on one keep-alive connection"""
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b'\r\n\r\n')
+                except asyncio.IncompleteReadError:
+                    break
+                except asyncio.LimitOverrunError:
+                    self._respond(writer, 413, keep_alive=False)
+                    break
+
+                lines = head.decode('latin-1').split('\r\n')
+                method, path, version = (lines[0].split(' ') + ['', '', ''])[:3]
+                headers = {}
+                for line in lines[1:]:
+                    name, _, value = line.partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                keep_alive = (headers.get('connection', '').lower() != 'close'
+                              and version == 'HTTP/1.1')
+
+                length = int(headers.get('content-length') or 0)
+                if length > MAX_BODY_BYTES:
+                    self._respond(writer, 413, keep_alive=False)
+                    break
+                body = await reader.readexactly(length) if length else b''
+
+                path = path.split('?', 1)[0]
+                if path == '/recommend' and method == 'POST':
+                    self._respond(writer, *self.recommend(body), keep_alive=keep_alive)
+                elif path == '/recommend' and method == 'OPTIONS':
+                    self._respond(writer, 204, keep_alive=keep_alive)
+                elif path == '/stats' and method == 'GET':
+                    self._respond(writer, 200, json.dumps(self.cache_stats()).encode('utf-8'), keep_alive)
+                elif path in ('/recommend', '/stats'):
+                    self._respond(writer, 405, keep_alive=keep_alive)
+                else:
+                    self._respond(writer, 404, keep_alive=keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host: str = '127.0.0.1', port: int = DEFAULT_PORT,
+                    ready: Optional[asyncio.Event] = None) -> None:
+        """Load the engine, then answer requests until cancelled"""
+        self.use_engine(*self.load_engine())
+        reloader = asyncio.create_task(self._reload_periodically())
+        server = await asyncio.start_server(self.handle, host, port, limit=MAX_HEADER_BYTES)
+        if ready:
+            ready.set()
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            reloader.cancel()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve quiz recommendations over HTTP')
+    parser.add_argument('--js-file', default=DEFAULT_JS,
+                       help=f'Generated recommendation engine (default: {DEFAULT_JS})')
+    parser.add_argument('--host', default='127.0.0.1',
+                       help='Address to listen on (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT,
+                       help=f'Port to listen on (default: {DEFAULT_PORT})')
+    parser.add_argument('--cache-size', type=int, default=CACHE_SIZE,
+                       help=f'Answer combinations whose responses are kept (default: {CACHE_SIZE})')
+    parser.add_argument('--reload-interval', type=float, default=RELOAD_INTERVAL,
+                       help=f'Seconds between checks for regenerated data (default: {RELOAD_INTERVAL})')
+
+    args = parser.parse_args()
+
+    service = RecommendationService(args.js_file, args.cache_size, args.reload_interval)
+    print(f"✅ Serving recommendations at http://{args.host}:{args.port}/recommend from {args.js_file}")
+    try:
+        asyncio.run(service.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    except Exception as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+    print(f"Answered {service.stats['requests']} requests")
+
+
+if __name__ == '__main__':
+    main()
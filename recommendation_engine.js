@@ -6,325 +6,51 @@
 class ToolRecommendationEngine {
     constructor() {
         this.tools = this.initializeTools();
+        this.shards = this.initializeShards();
         this.categories = this.initializeCategories();
+        this.shardRequests = {};
+        this.loadedTools = [];
     }
 
     initializeTools() {
+        return {};
+    }
+
+    // Per category: the shard holding its tools, and how many tools isToolSuitable accepts
+    // for each teaching level as [beginner, any other technical level]
+    initializeShards() {
         return {
-            'deeptalk': {
-                name: 'Deep Talk',
-                category: 'language_communication',
-                description: 'Desktop app for ai-powered transcription and analysis of audio/video files with local processing and privacy-first design.',
-                priority: 'medium',
-                techLevel: 'intermediate',
-                contexts: ["general"],
-                subjects: ["general"]
-            },
-            'charactercraftlite': {
-                name: 'Character Craft Lite',
-                category: 'language_communication',
-                description: 'Create structured chatbot personalities for zero-shot prompts, rag pipelines, and conversational ai.',
-                priority: 'medium',
-                techLevel: 'intermediate',
-                contexts: ["self_directed"],
-                subjects: ["communication"]
-            },
-            'critiquequest': {
-                name: 'Critique Quest',
-                category: 'content_creation',
-                description: 'Desktop application for generating ai-powered educational case studies with support for   openai, anthropic, google gemini, and local ollama models.',
-                priority: 'high',
-                techLevel: 'advanced',
-                contexts: ["general"],
-                subjects: ["general"]
-            },
-            'curriculumcurator': {
-                name: 'Curriculum Curator',
-                category: 'content_creation',
-                description: '',
-                priority: 'high',
-                techLevel: 'intermediate',
-                contexts: ["general"],
-                subjects: ["general"]
-            },
-            'insightlens': {
-                name: 'Insight Lens',
-                category: 'assessment_feedback',
-                description: 'Desktop survey analysis tool for university lecturers. import pdf reports, visualise trends, and get ai-powered insights. built with electron for windows, macos, and linux.',
-                priority: 'high',
-                techLevel: 'advanced',
-                contexts: ["university"],
-                subjects: ["general"]
-            },
-            'studybuddy': {
-                name: 'Study Buddy',
-                category: 'ai_tutoring',
-                description: 'Study buddy is a desktop application that provides ai tutoring without requiring internet access or accounts.',
-                priority: 'high',
-                techLevel: 'beginner',
-                contexts: ["general"],
-                subjects: ["general"]
-            },
-            'swipeverse': {
-                name: 'Swipe Verse',
-                category: 'content_creation',
-                description: 'Configure, play, transform - enter a universe of your making.',
-                priority: 'medium',
-                techLevel: 'intermediate',
-                contexts: ["general"],
-                subjects: ["general"]
-            },
-            'talkbuddy': {
-                name: 'Talk Buddy',
-                category: 'language_communication',
-                description: 'Your ai talking partner. practice english conversations and ace interviews with real-time voice ai.',
-                priority: 'high',
-                techLevel: 'beginner',
-                contexts: ["general"],
-                subjects: ["communication"]
-            },
-            'venturelab': {
-                name: 'Venture Lab',
-                category: 'project_management',
-                description: 'Ai-powered tools for business innovation and entrepreneurship education.',
-                priority: 'high',
-                techLevel: 'intermediate',
-                contexts: ["corporate"],
-                subjects: ["business"]
-            },
-            'capstoneconnect': {
-                name: 'Capstone Connect',
-                category: 'project_management',
-                description: 'A web-based project management system that connects curtin university students with industry clients for capstone projects, featuring project browsing, interest tracking, and administrative oversight.',
-                priority: 'high',
-                techLevel: 'intermediate',
-                contexts: ["university"],
-                subjects: ["business"]
-            },
-            'classpulse': {
-                name: 'Class Pulse',
-                category: 'student_interaction',
-                description: 'A real-time audience interaction tool that allows presenters to create interactive polls, word clouds, and rating scales for audience engagement with instant visualised results.',
-                priority: 'high',
-                techLevel: 'intermediate',
-                contexts: ["general"],
-                subjects: ["general"]
-            },
-            'cloudcore': {
-                name: 'Cloudcore',
-                category: 'assessment_feedback',
-                description: 'A github repository for a fictional company's website, serving as an educational platform in security, web design, and systems analysis and design.',
-                priority: 'medium',
-                techLevel: 'intermediate',
-                contexts: ["general"],
-                subjects: ["general"]
-            },
-            'deepbrief': {
-                name: 'Deep Brief',
-                category: 'assessment_feedback',
-                description: 'A video analysis application that helps students, educators, and professionals analyze presentations by combining speech transcription, visual analysis, and ai-powered feedback. the app processes videos to provide actionable insights on speaking performance, visual effectiveness, and overall presentation quality.',
-                priority: 'high',
-                techLevel: 'advanced',
-                contexts: ["k12"],
-                subjects: ["communication"]
-            },
-            'docslanding': {
-                name: 'Docslanding',
-                category: 'content_creation',
-                description: 'Jekyll theme for script-generated landing pages + auto-docs.',
-                priority: 'medium',
-                techLevel: 'intermediate',
-                contexts: ["general"],
-                subjects: ["general"]
-            },
-            'feedforward': {
-                name: 'Feed Forward',
-                category: 'assessment_feedback',
-                description: 'Feedforward: elevate your learning. transforming feedback into a path to success.',
-                priority: 'high',
-                techLevel: 'beginner',
-                contexts: ["general"],
-                subjects: ["general"]
-            },
-            'lecturerclone': {
-                name: 'Lecturer Clone',
-                category: 'student_interaction',
-                description: '',
-                priority: 'medium',
-                techLevel: 'intermediate',
-                contexts: ["university"],
-                subjects: ["general"]
-            },
-            'slinkr': {
-                name: 'Slinkr',
-                category: 'utility',
-                description: 'A lightweight url toolkit that lets you shorten, expand, qr-ify, and validate links—all in one spot.',
-                priority: 'low',
-                techLevel: 'intermediate',
-                contexts: ["general"],
-                subjects: ["general"]
-            },
-            'simlab': {
-                name: 'Sim Lab',
-                category: 'assessment_feedback',
-                description: 'A set of classes for simulating various business-related scenarios. it is designed for educational use, allowing students to experiment with modeling, analysis, and decision-making in different contexts.',
-                priority: 'medium',
-                techLevel: 'intermediate',
-                contexts: ["k12"],
-                subjects: ["business"]
-            },
-            'fetchmyweather': {
-                name: 'Fetch My Weather',
-                category: 'technical_education',
-                description: 'A beginner-friendly python package for fetching weather data from wttr.in with built-in caching and error handling.',
-                priority: 'medium',
-                techLevel: 'beginner',
-                contexts: ["general"],
-                subjects: ["technology"]
-            },
-            'handsonai': {
-                name: 'Hands On Ai',
-                category: 'technical_education',
-                description: 'A lightweight python framework for building personality-driven ai bots in the classroom.',
-                priority: 'high',
-                techLevel: 'advanced',
-                contexts: ["k12"],
-                subjects: ["technology"]
-            },
-            'pythonjumpstart': {
-                name: 'Python Jumpstart',
-                category: 'ai_tutoring',
-                description: 'Learn just enough python to effectively work with ai coding assistants - a   beginner-friendly guide to coding fundamentals in the ai era.',
-                priority: 'high',
-                techLevel: 'beginner',
-                contexts: ["general"],
-                subjects: ["technology"]
-            },
-            'intentionalprompting': {
-                name: 'Intentional Prompting',
-                category: 'content_creation',
-                description: '',
-                priority: 'medium',
-                techLevel: 'intermediate',
-                contexts: ["general"],
-                subjects: ["general"]
-            },
-            'programmingparadigms': {
-                name: 'Programming Paradigms',
-                category: 'technical_education',
-                description: '',
-                priority: 'medium',
-                techLevel: 'intermediate',
-                contexts: ["general"],
-                subjects: ["technology"]
-            },
-            'pythondevbook': {
-                name: 'Python Dev Book',
-                category: 'technical_education',
-                description: 'A comprehensive guide to python development practices from zero to production.',
-                priority: 'medium',
-                techLevel: 'beginner',
-                contexts: ["general"],
-                subjects: ["technology"]
-            },
-            'theabsoluteminimumyoumustknow': {
-                name: 'The Absolute Minimum You Must Know',
-                category: 'content_creation',
-                description: '',
-                priority: 'medium',
-                techLevel: 'beginner',
-                contexts: ["general"],
-                subjects: ["general"]
-            },
-            'thecalculatorwalkthrough': {
-                name: 'The Calculator Walkthrough',
-                category: 'technical_education',
-                description: 'An exercise in programming to help hone your skills through practice and repetition.',
-                priority: 'medium',
-                techLevel: 'intermediate',
-                contexts: ["general"],
-                subjects: ["technology"]
-            },
-            'electronkit': {
-                name: 'Electron Kit',
-                category: 'content_creation',
-                description: 'Professional electron app template with modular architecture.',
-                priority: 'medium',
-                techLevel: 'advanced',
-                contexts: ["corporate"],
-                subjects: ["general"]
-            },
-            'headlesscmsreact': {
-                name: 'Headless Cms React',
-                category: 'project_management',
-                description: 'A minimal react project scaffold that builds on headless cms concepts, enabling students to implement wordpress api integration using react hooks.',
-                priority: 'medium',
-                techLevel: 'advanced',
-                contexts: ["k12"],
-                subjects: ["general"]
-            },
-            'headlesscmsvanilla': {
-                name: 'Headless Cms Vanilla',
-                category: 'project_management',
-                description: 'A scaffolded html/css/javascript project based on the headless wordpress proof of concept, providing structure for students to implement a retail product display.',
-                priority: 'medium',
-                techLevel: 'advanced',
-                contexts: ["k12"],
-                subjects: ["general"]
-            },
-            'secutils': {
-                name: 'Sec Utils',
-                category: 'ai_tutoring',
-                description: 'Provide security utilities in docker containers.',
-                priority: 'medium',
-                techLevel: 'advanced',
-                contexts: ["general"],
-                subjects: ["general"]
-            },
-            'weatherwisetemplate': {
-                name: 'Weatherwise Template',
-                category: 'technical_education',
-                description: '🌦️ kickstart your weatherwise assignment with this ready-to-use python template featuring ai prompts, weather data, and cool visualisations! 🧠📊.',
-                priority: 'medium',
-                techLevel: 'intermediate',
-                contexts: ["general"],
-                subjects: ["technology"]
-            },
-            'askdocs': {
-                name: 'Ask Docs',
-                category: 'ai_tutoring',
-                description: 'A general-purpose document assistant for any documentation using rag and llms like openai, claude, gemini, groq, and ollama.',
-                priority: 'medium',
-                techLevel: 'advanced',
-                contexts: ["general"],
-                subjects: ["general"]
-            },
-            'ghtoolkit': {
-                name: 'Gh Toolkit',
-                category: 'utility',
-                description: 'Github repository portfolio management and presentation toolkit with llm-powered categorization and beautiful site generation.',
-                priority: 'low',
-                techLevel: 'intermediate',
-                contexts: ["general"],
-                subjects: ["business"]
-            },
-            'markmate': {
-                name: 'Mark Mate',
-                category: 'ai_tutoring',
-                description: 'Your ai teaching assistant for assignments and assessment.',
-                priority: 'medium',
-                techLevel: 'intermediate',
-                contexts: ["general"],
-                subjects: ["general"]
-            },
-            'slidestream': {
-                name: 'Slide Stream',
-                category: 'content_creation',
-                description: 'Instantly turn your text, slides, or markdown notes into engaging videos with the power of ai.',
-                priority: 'medium',
-                techLevel: 'intermediate',
-                contexts: ["general"],
-                subjects: ["general"]
+            language_communication: {
+                url: 'quiz-data/language_communication.json?v=0296e6d21b',
+                suitable: {"k12": [2, 3], "university": [2, 2], "corporate": [2, 2], "self_directed": [2, 3]}
+            },
+            content_creation: {
+                url: 'quiz-data/content_creation.json?v=0da303a5bc',
+                suitable: {"k12": [4, 4], "university": [4, 4], "corporate": [4, 4], "self_directed": [4, 4]}
+            },
+            assessment_feedback: {
+                url: 'quiz-data/assessment_feedback.json?v=41933596dc',
+                suitable: {"k12": [3, 4], "university": [2, 3], "corporate": [2, 2], "self_directed": [2, 2]}
+            },
+            ai_tutoring: {
+                url: 'quiz-data/ai_tutoring.json?v=5e4bf0fe1e',
+                suitable: {"k12": [3, 4], "university": [3, 4], "corporate": [3, 5], "self_directed": [3, 4]}
+            },
+            technical_education: {
+                url: 'quiz-data/technical_education.json?v=b43b300072',
+                suitable: {"k12": [7, 7], "university": [7, 7], "corporate": [7, 7], "self_directed": [8, 8]}
+            },
+            project_management: {
+                url: 'quiz-data/project_management.json?v=ac82642233',
+                suitable: {"k12": [0, 1], "university": [1, 1], "corporate": [1, 1], "self_directed": [0, 0]}
+            },
+            student_interaction: {
+                url: 'quiz-data/student_interaction.json?v=6b1dfec0ae',
+                suitable: {"k12": [1, 1], "university": [1, 2], "corporate": [1, 1], "self_directed": [1, 1]}
+            },
+            utility: {
+                url: 'quiz-data/utility.json?v=fc81dc6632',
+                suitable: {"k12": [2, 3], "university": [2, 3], "corporate": [2, 3], "self_directed": [2, 3]}
             }
         };
     }
@@ -341,7 +67,76 @@ class ToolRecommendationEngine {
         };
     }
 
+    // Categories whose shards generateToolRecommendations will read for these answers
+    shardsNeeded(answers) {
+        const sortedCategories = this.weighCategories(answers);
+        const needed = [];
+        let count = 0;
+
+        for (const category of sortedCategories) {
+            if (count >= 12) return needed;
+            const shard = this.shards[category.name];
+            if (!shard) continue;
+            const suitable = shard.suitable[answers.q1];
+            if (!suitable) return Object.keys(this.shards);
+
+            needed.push(category.name);
+            const toAdd = category.weight > 5 ? 3 : category.weight > 2 ? 2 : 1;
+            count += Math.min(toAdd, suitable[answers.q3 === 'beginner' ? 0 : 1]);
+        }
+
+        // Too few picks means the remaining slots are filled from every category
+        return count < 10 ? Object.keys(this.shards) : needed;
+    }
+
+    loadShards(categories) {
+        return Promise.all(categories.map(category => {
+            if (!this.shardRequests[category]) {
+                this.shardRequests[category] = fetch(this.shards[category].url)
+                    .then(response => {
+                        if (!response.ok) throw new Error(`Failed to load ${category} tools: ${response.status}`);
+                        return response.json();
+                    })
+                    .then(shard => this.addShard(shard))
+                    .catch(error => {
+                        delete this.shardRequests[category];
+                        throw error;
+                    });
+            }
+            return this.shardRequests[category];
+        }));
+    }
+
+    // Keep this.tools in catalogue order so ties rank exactly as with the full catalogue
+    addShard(shard) {
+        this.loadedTools.push(...shard.tools);
+        this.loadedTools.sort((a, b) => a[0] - b[0]);
+        this.tools = {};
+        this.loadedTools.forEach(([_, id, tool]) => {
+            this.tools[id] = tool;
+        });
+    }
+
+    // Start fetching the shards the answers so far point at, while the quiz is still running
+    prefetch(answers) {
+        if (!answers.q1) return;
+        this.loadShards(this.shardsNeeded(answers)).catch(() => {});
+    }
+
+    async recommend(answers) {
+        await this.loadShards(this.shardsNeeded(answers));
+        return this.calculateRecommendations(answers);
+    }
+
     calculateRecommendations(answers) {
+        performance.mark('calculateRecommendations-start');
+        // Generate recommendations
+        const results = this.generateToolRecommendations(answers, this.weighCategories(answers));
+        performance.measure('calculateRecommendations', 'calculateRecommendations-start');
+        return results;
+    }
+
+    weighCategories(answers) {
         // Reset category weights
         Object.keys(this.categories).forEach(cat => {
             this.categories[cat].weight = 0;
@@ -357,8 +152,10 @@ class ToolRecommendationEngine {
         this.processTimeInvestment(answers.q7);
         this.processEducationalGoal(answers.q8);
 
-        // Generate recommendations
-        return this.generateToolRecommendations(answers);
+        // Sort categories by weight
+        return Object.entries(this.categories)
+            .sort((a, b) => b[1].weight - a[1].weight)
+            .map(([name, data]) => ({ name, ...data }));
     }
 
     processTeachingLevel(answer) {
@@ -587,12 +384,7 @@ class ToolRecommendationEngine {
         }
     }
 
-    generateToolRecommendations(answers) {
-        // Sort categories by weight
-        const sortedCategories = Object.entries(this.categories)
-            .sort((a, b) => b[1].weight - a[1].weight)
-            .map(([name, data]) => ({ name, ...data }));
-
+    generateToolRecommendations(answers, sortedCategories) {
         // Get user context for filtering
         const userContext = {
             teachingLevel: answers.q1,
@@ -604,6 +396,7 @@ class ToolRecommendationEngine {
         // Select tools based on category priorities
         const recommendations = [];
         const maxRecommendations = 12;
+        const pickedClusters = new Set();
 
         // Get top tools from highest weighted categories
         for (const category of sortedCategories) {
@@ -617,7 +410,7 @@ class ToolRecommendationEngine {
 
             // Add 2-3 tools from each high-weight category
             const toolsToAdd = category.weight > 5 ? 3 : category.weight > 2 ? 2 : 1;
-            recommendations.push(...categoryTools.slice(0, toolsToAdd));
+            recommendations.push(...this.pickDiverse(categoryTools, toolsToAdd, pickedClusters));
         }
 
         // Ensure we have enough recommendations
@@ -628,7 +421,7 @@ class ToolRecommendationEngine {
                 .sort((a, b) => this.getToolScore(b[1], userContext) - this.getToolScore(a[1], userContext))
                 .map(([name, tool]) => ({ id: name, ...tool }));
 
-            recommendations.push(...remainingTools.slice(0, 12 - recommendations.length));
+            recommendations.push(...this.pickDiverse(remainingTools, 12 - recommendations.length, pickedClusters));
         }
 
         return {
@@ -638,6 +431,20 @@ class ToolRecommendationEngine {
         };
     }
 
+    // Take up to count tools in order, skipping near-duplicates of tools already picked
+    pickDiverse(tools, count, pickedClusters) {
+        const picked = [];
+        for (const tool of tools) {
+            if (picked.length >= count) break;
+            if (tool.cluster) {
+                if (pickedClusters.has(tool.cluster)) continue;
+                pickedClusters.add(tool.cluster);
+            }
+            picked.push(tool);
+        }
+        return picked;
+    }
+
     isToolSuitable(tool, userContext) {
         // Filter by teaching context
         if (tool.contexts && !tool.contexts.includes(userContext.teachingLevel) && !tool.contexts.includes('general')) {
@@ -710,4 +517,25 @@ if (typeof module !== 'undefined' && module.exports) {
     module.exports = ToolRecommendationEngine;
 } else {
     window.ToolRecommendationEngine = ToolRecommendationEngine;
+
+    // The quiz page's engine, which starts fetching tool shards as soon as the answers point at them
+    window.recommendationEngine = new ToolRecommendationEngine();
+    document.addEventListener('change', event => {
+        if (event.target.type !== 'radio') return;
+        const answers = {};
+        document.querySelectorAll('input[type="radio"]:checked').forEach(input => {
+            answers[input.name] = input.value;
+        });
+        window.recommendationEngine.prefetch(answers);
+    });
+
+    // Report a completed quiz to the collect_submissions.py endpoint named by the quiz-collector meta tag
+    window.sendSubmission = (answers, results) => {
+        const collector = document.querySelector('meta[name="quiz-collector"]');
+        if (!collector || !collector.content || !navigator.sendBeacon) return;
+        navigator.sendBeacon(collector.content, JSON.stringify({
+            answers,
+            tools: results.recommendations.map(tool => tool.id)
+        }));
+    };
 }
\ No newline at end of file
@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+Repo Card Renderer
+Generates the repo-card sections of index.html with templates compiled once, from the
+updater's categorized tools (the quiz-tools build stage) or from the catalogue database
+"""
+
+import argparse
+import html
+import io
+import json
+import os
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Mapping, TextIO, Tuple
+
+from site_paths import ROOT
+from catalogue_db import DEFAULT_DB, CatalogueDatabase
+
+# Section order, icon and heading per data-category, as on index.html
+SECTIONS = [
+    ('desktop-application', 'fa-desktop', 'Desktop Application'),
+    ('web-application', 'fa-globe', 'Web Application'),
+    ('python-package', 'fa-python', 'Python Package'),
+    ('learning-resource', 'fa-graduation-cap', 'Learning Resource'),
+    ('infrastructure-tool', 'fa-tools', 'Infrastructure Tool'),
+    ('command-line-tool', 'fa-folder', 'Command Line Tool'),
+]
+DEFAULT_REPO_BASE = 'https://github.com/michael-borck/'
+MAX_TOPIC_TAGS = 5
+MAX_LANGUAGE_TAGS = 3
+# Shown on cards of repositories without a description, whose search text is then empty
+NO_DESCRIPTION = 'No description available'
+# Cards rendered between writes to the output file
+FLUSH_EVERY = 2000
+
+# The gh-toolkit card layout of index.html, blank lines included, so a page rendered from
+# the cards it was parsed from comes out byte for byte the same
+CARD_TEMPLATE = """                <div class="bg-white rounded-lg shadow-md p-6 hover:shadow-lg transition duration-300 repo-card" 
+                     data-category="{original_category}"
+                     data-name="{name}"
+                     data-description="{search_description}"
+                     data-topics="{topics}" data-roles="{roles}" data-primary-role="{primary_role}" data-role-confidence="{role_confidence}">
+                    
+                    
+                    
+                    <div class="flex items-start justify-between mb-3">
+                        <h3 class="text-xl font-semibold text-gray-800 flex items-center">
+                            <span class="text-2xl mr-2">🎓</span>
+                            <span class="repo-name">{name}</span>
+                        </h3>
+                        <div class="text-right">
+                            <div class="flex items-center text-sm text-gray-600">
+                                <i class="fas fa-star text-yellow-500 mr-1"></i>
+                                {stars}
+                            </div>
+                            {!forks_tag}
+                        </div>
+                    </div>
+                    
+                    <p class="text-gray-600 mb-3 repo-description">{description}</p>
+                    
+                    
+                    
+                    <div class="mt-4 flex flex-wrap gap-2">
+                        <a href="{url}" class="text-sm px-3 py-1 bg-purple-100 text-purple-700 rounded-full hover:bg-purple-200">
+                            <i class="fab fa-github mr-1"></i>GitHub
+                        </a>
+                        {!website_link}
+                        {!docs_link}
+                    </div>
+                    
+                    {!release}
+                    
+                    {!topic_tags}
+                    
+                    <div class="mt-3 flex items-center justify-between text-xs text-gray-500">
+                        <div class="flex gap-3">
+                            {!language_tags}
+                        </div>
+                        {!license_tag}
+                    </div>
+                </div>
+"""
+
+SECTION_START = """        <section id="{category}" class="mb-16">
+            <div class="flex items-center mb-8">
+                <i class="fas {icon} text-4xl text-purple-600 mr-4"></i>
+                <h2 class="text-3xl font-bold text-gray-800">{title}</h2>
+            </div>
+            
+            <div class="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-6">
+                
+"""
+SECTION_END = """            </div>
+        </section>
+"""
+MAIN_START = '\n        \n'
+MAIN_END = '    '
+
+WEBSITE_LINK = ('<a href="{homepage}" class="text-sm px-3 py-1 bg-blue-100 text-blue-700 rounded-full '
+                'hover:bg-blue-200"><i class="fas fa-globe mr-1"></i>Website</a>')
+DOCS_LINK = ('<a href="{docs}" class="text-sm px-3 py-1 bg-green-100 text-green-700 rounded-full '
+             'hover:bg-green-200"><i class="fas fa-book-open mr-1"></i>Docs</a>')
+DOWNLOAD_LINK = ('<a href="{url}" class="text-sm px-3 py-1 bg-gray-200 hover:bg-gray-300 rounded-full transition">'
+                 '<i class="fab fa-{platform}"></i></a>')
+TOPIC_TAG = '<span class="text-xs px-2 py-1 bg-purple-50 text-purple-600 rounded-full">#{topic}</span>'
+LANGUAGE_TAG = '<span class="px-2 py-1 bg-gray-100 text-gray-600 rounded">{language}</span>'
+FORKS_TAG = '<div class="text-xs text-gray-500 mt-1"><i class="fas fa-code-branch mr-1"></i>{forks}</div>'
+LICENSE_TAG = '<span class="text-green-600"><i class="fas fa-balance-scale mr-1"></i>{license}</span>'
+
+_PLACEHOLDER = re.compile(r'\{(!?)(\w+)\}')
+
+# Repository details in a rendered card body, read back by parse_card
+_CARD_URL = re.compile(r'<a href="([^"]*)"[^>]*>\s*<i class="fab fa-github')
+_CARD_HOMEPAGE = re.compile(r'<a href="([^"]*)"[^>]*><i class="fas fa-globe')
+_CARD_DOCS = re.compile(r'<a href="([^"]*)"[^>]*><i class="fas fa-book-open')
+_CARD_STARS = re.compile(r'fa-star[^>]*></i>\s*(\d+)')
+_CARD_FORKS = re.compile(r'fa-code-branch[^>]*></i>(\d+)')
+_CARD_SUMMARY = re.compile(r'<p class="[^"]*repo-description[^"]*">(.*?)</p>', re.DOTALL)
+_CARD_LANGUAGE = re.compile(r'<span class="px-2 py-1 bg-gray-100 text-gray-600 rounded">([^<]*)</span>')
+_CARD_LICENSE = re.compile(r'fa-balance-scale[^>]*></i>([^<]*)</span>')
+_CARD_RELEASE = re.compile(r'>Version ([^<]*)</div><div class="flex gap-2">(.*?)</div></div>')
+_CARD_DOWNLOAD = re.compile(r'<a href="([^"]*)"[^>]*><i class="fab fa-([\w-]+)"></i></a>')
+
+
+def escape(value: str) -> str:
+    """Escape text for element content or a double-quoted attribute, as gh-toolkit does"""
+    return html.escape(value, quote=False).replace('"', '&quot;')
+
+
+def compile_template(template: str, name: str = 'template') -> Callable[[Dict[str, Any]], str]:
+    """Compile a template into a function of a field mapping.
+
+    ``{field}`` is HTML-escaped and ``{!field}`` is inserted as-is. The template is
+    parsed once into generated code, so rendering is a single join per call.
+    """
+    parts, pos = [], 0
+    for match in _PLACEHOLDER.finditer(template):
+        if match.start() > pos:
+            parts.append(repr(template[pos:match.start()]))
+        raw, field = match.groups()
+        parts.append(f"str(fields[{field!r}])" if raw else f"escape(str(fields[{field!r}]))")
+        pos = match.end()
+    if pos < len(template):
+        parts.append(repr(template[pos:]))
+
+    source = f"def render(fields):\n    return ''.join(({', '.join(parts)},))\n"
+    namespace = {'escape': escape}
+    exec(compile(source, f'<{name}>', 'exec'), namespace)
+    return namespace['render']
+
+
+render_card = compile_template(CARD_TEMPLATE, 'card template')
+render_section_start = compile_template(SECTION_START, 'section template')
+render_website_link = compile_template(WEBSITE_LINK, 'website link')
+render_docs_link = compile_template(DOCS_LINK, 'docs link')
+render_download_link = compile_template(DOWNLOAD_LINK, 'download link')
+render_topic_tag = compile_template(TOPIC_TAG, 'topic tag')
+render_language_tag = compile_template(LANGUAGE_TAG, 'language tag')
+render_forks_tag = compile_template(FORKS_TAG, 'forks tag')
+render_license_tag = compile_template(LICENSE_TAG, 'license tag')
+
+
+def _json_field(value: Any) -> Any:
+    """A list or mapping as the pipeline holds it, or as catalogue.db stores it (JSON text)"""
+    return json.loads(value) if isinstance(value, str) else value
+
+
+def card_fields(tool: Mapping[str, Any], repo_base: str = DEFAULT_REPO_BASE) -> Dict[str, Any]:
+    """Template fields for a categorized tool from the updater pipeline or a catalogue row"""
+    keys = tool.keys()
+    slug = tool['slug'] if 'slug' in keys and tool['slug'] else tool['name']
+    summary = tool['summary'] if 'summary' in keys and tool['summary'] is not None else tool['description']
+    if isinstance(tool['roles'], list):
+        roles = ' '.join(role['role'] for role in tool['roles'])
+        role_confidence = ' '.join(f"{role['role']}:{role['confidence']}" for role in tool['roles'])
+    else:
+        roles, role_confidence = tool['roles'] or '', tool['role_confidence'] or ''
+    topics = tool['topics'].split()
+    languages = _json_field(tool['languages']) if 'languages' in keys and tool['languages'] else []
+    release = _json_field(tool['release']) if 'release' in keys and tool['release'] else None
+    homepage = tool['homepage'] if 'homepage' in keys else None
+    docs = tool['docs'] if 'docs' in keys else None
+    forks = tool['forks'] if 'forks' in keys else None
+    license_name = tool['license'] if 'license' in keys else None
+    url = tool['url'] if 'url' in keys else None
+
+    release_html = ''
+    if release:
+        downloads = ''.join(render_download_link({'url': link, 'platform': platform})
+                            for link, platform in release.get('downloads', []))
+        release_html = (f'<div class="mt-3"><div class="text-xs text-gray-500 mb-1">Version '
+                        f'{escape(release["version"])}</div><div class="flex gap-2">{downloads}</div></div>')
+    return {
+        'original_category': tool['original_category'],
+        'name': slug,
+        'search_description': summary.lower(),
+        'topics': tool['topics'],
+        'roles': roles,
+        'primary_role': tool['primary_role'],
+        'role_confidence': role_confidence,
+        'stars': (tool['stars'] if 'stars' in keys else None) or 0,
+        'description': summary or NO_DESCRIPTION,
+        'url': url or f"{repo_base}{slug}",
+        'forks_tag': render_forks_tag({'forks': forks}) if forks else '',
+        'website_link': render_website_link({'homepage': homepage}) if homepage else '',
+        'docs_link': render_docs_link({'docs': docs}) if docs else '',
+        'release': release_html,
+        'topic_tags': (f'<div class="mt-2 flex flex-wrap gap-1">'
+                       f'{" ".join(render_topic_tag({"topic": topic}) for topic in topics[:MAX_TOPIC_TAGS])}'
+                       f'</div>' if topics else ''),
+        'language_tags': ' '.join(render_language_tag({'language': language})
+                                  for language in languages[:MAX_LANGUAGE_TAGS]),
+        'license_tag': render_license_tag({'license': license_name}) if license_name else '',
+    }
+
+
+def parse_card(body: str) -> Dict[str, Any]:
+    """Repository details shown in the body of a rendered card, the fields card_fields renders"""
+    details: Dict[str, Any] = {}
+    for column, pattern in (('url', _CARD_URL), ('homepage', _CARD_HOMEPAGE), ('docs', _CARD_DOCS),
+                            ('summary', _CARD_SUMMARY), ('license', _CARD_LICENSE)):
+        match = pattern.search(body)
+        if match:
+            details[column] = html.unescape(match.group(1))
+    if details.get('summary') == NO_DESCRIPTION:
+        details['summary'] = ''
+    for column, pattern in (('stars', _CARD_STARS), ('forks', _CARD_FORKS)):
+        match = pattern.search(body)
+        if match:
+            details[column] = int(match.group(1))
+    languages = [html.unescape(language) for language in _CARD_LANGUAGE.findall(body)]
+    if languages:
+        details['languages'] = languages
+    release = _CARD_RELEASE.search(body)
+    if release:
+        details['release'] = {'version': html.unescape(release.group(1)),
+                              'downloads': [[html.unescape(url), platform]
+                                            for url, platform in _CARD_DOWNLOAD.findall(release.group(2))]}
+    return details
+
+
+def section_order(tools: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Tools grouped by category in page order, each category keeping its tools' order"""
+    order = {category: i for i, (category, _, _) in enumerate(SECTIONS)}
+    return sorted(tools, key=lambda tool: order.get(tool['original_category'], len(order)))
+
+
+def main_span(page: str) -> Tuple[int, int]:
+    """Start and end offsets of the contents of a page's <main> element"""
+    main_open = re.search(r'<main[^>]*>', page)
+    main_close = page.rfind('</main>')
+    if not main_open or main_close < main_open.end():
+        raise ValueError("page has no <main> element to fill")
+    return main_open.end(), main_close
+
+
+class CardRenderer:
+    """Writes the <main> of the tools page: one section of cards per category"""
+
+    def __init__(self, repo_base: str = DEFAULT_REPO_BASE):
+        self.repo_base = repo_base
+
+    def write_sections(self, out: TextIO, tools: Iterable[Mapping[str, Any]]) -> int:
+        """Render cards, already in section order, into out, buffering FLUSH_EVERY cards per write"""
+        icons = {category: (icon, title) for category, icon, title in SECTIONS}
+        buffer: List[str] = []
+        current, count = None, 0
+
+        for tool in tools:
+            category = tool['original_category']
+            if category != current:
+                if current is not None:
+                    buffer.append(SECTION_END + '\n')
+                icon, title = icons.get(category, ('fa-folder', category.replace('-', ' ').title()))
+                buffer.append(render_section_start({'category': category, 'icon': icon, 'title': title}))
+                current = category
+            elif count:
+                buffer.append('\n')
+            buffer.append(render_card(card_fields(tool, self.repo_base)))
+            count += 1
+            if len(buffer) >= FLUSH_EVERY:
+                out.write(''.join(buffer))
+                buffer.clear()
+
+        if current is not None:
+            buffer.append(SECTION_END)
+        out.write(''.join(buffer))
+        return count
+
+    def render_main(self, tools: Iterable[Mapping[str, Any]]) -> str:
+        """The contents of <main> for tools in section order"""
+        out = io.StringIO()
+        out.write(MAIN_START)
+        self.write_sections(out, tools)
+        out.write(MAIN_END)
+        return out.getvalue()
+
+    def replace_main(self, page: str, tools: Iterable[Mapping[str, Any]]) -> str:
+        """The page with its <main> contents replaced by cards for tools in section order"""
+        start, end = main_span(page)
+        return page[:start] + self.render_main(tools) + page[end:]
+
+    def write_page(self, shell_file: Path, output_file: Path, tools: Iterable[Mapping[str, Any]]) -> int:
+        """Stream the shell page with its <main> contents replaced by the rendered sections"""
+        shell = shell_file.read_text(encoding='utf-8')
+        start, end = main_span(shell)
+        tmp_file = output_file.with_name(output_file.name + '.tmp')
+        with open(tmp_file, 'w', encoding='utf-8', newline='') as out:
+            out.write(shell[:start])
+            out.write(MAIN_START)
+            count = self.write_sections(out, tools)
+            out.write(MAIN_END)
+            out.write(shell[end:])
+        os.replace(tmp_file, output_file)
+        return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Render repo cards from the catalogue database')
+    parser.add_argument('--db', default=DEFAULT_DB,
+                       help=f'Catalogue database (default: {DEFAULT_DB})')
+    parser.add_argument('--shell', default='index.html',
+                       help='Page whose <main> is replaced by the cards (default: index.html)')
+    parser.add_argument('--output', default='index.html',
+                       help='Page to write (default: index.html)')
+    parser.add_argument('--repo-base', default=DEFAULT_REPO_BASE,
+                       help=f'GitHub link prefix for tools without a URL (default: {DEFAULT_REPO_BASE})')
+
+    args = parser.parse_args()
+
+    if not Path(args.db).exists():
+        print(f"ERROR: {args.db} not found - run update_quiz_tools.py or ingest_repos.py first")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    try:
+        with CatalogueDatabase(args.db) as db:
+            cards = db.cards([category for category, _, _ in SECTIONS])
+            count = CardRenderer(args.repo_base).write_page(ROOT / args.shell, ROOT / args.output, cards)
+    except Exception as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+
+    print(f"✅ Rendered {count} cards into {args.output} in {time.perf_counter() - start:.3f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Quiz Session Replay
+Streams logged quiz answers through the current engine and candidate rule sets,
+reporting how much each candidate would change what people are recommended
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from functools import lru_cache
+from itertools import islice
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+from site_paths import ROOT
+from quiz_engine import RecommendationEngine, load_engine_data, merge_score_weights
+from tool_classifier import DEFAULT_RULES, RULE_TABLES, ToolClassifier, validate_rules
+
+CHUNK_LINES = 5000
+
+# (name, question ids, cached answers -> (tool ids, profile title)) per engine, current first
+_engines: List[Tuple[str, List[str], Callable]] = []
+
+
+def build_engine(spec: Dict[str, Any], html_file: str, js_file: str) -> RecommendationEngine:
+    """Engine for a candidate rule set, falling back to the current engine for anything it omits.
+
+    Spec keys: any of tool_classifier.RULE_TABLES (the tools are re-categorized from index.html
+    with them over the classifier_rules.json tables)
+    and 'score_weights' (getToolScore points, see quiz_engine.DEFAULT_SCORE_WEIGHTS).
+    """
+    data = load_engine_data(js_file)
+    rules = {name: spec[name] for name in RULE_TABLES if name in spec}
+    if rules:
+        from update_quiz_tools import QuizToolUpdater
+
+        updater = QuizToolUpdater(html_file, js_file)
+        base_rules = json.loads(DEFAULT_RULES.read_text(encoding='utf-8'))
+        updater.classifier = ToolClassifier.from_rules({**base_rules, **rules})
+        data['tools'] = updater.engine_tools(
+            [updater.categorize_tool(tool) for tool in updater.extract_tools_from_html()])
+    return RecommendationEngine(**data, score_weights=spec.get('score_weights'))
+
+
+def _init_worker(specs: List[Tuple[str, Dict[str, Any]]], html_file: str, js_file: str) -> None:
+    """Build every engine once per worker process"""
+    for name, spec in specs:
+        engine = build_engine(spec, html_file, js_file)
+        questions = engine.questions
+
+        @lru_cache(maxsize=65536)
+        def outcome(values: Tuple, engine=engine, questions=questions) -> Tuple[Tuple[str, ...], str]:
+            result = engine.recommend(dict(zip(questions, values)))
+            return tuple(result['recommendations']), result['userProfile']['title']
+
+        _engines.append((name, questions, outcome))
+
+
+def _replay_chunk(lines: List[str]) -> Dict[str, Any]:
+    """Replay one chunk of log lines, returning mergeable counters"""
+    baseline_name, questions, baseline = _engines[0]
+    stats = {'sessions': 0, 'invalid': 0,
+             'exposure': {name: Counter() for name, _, _ in _engines},
+             'candidates': {name: Counter() for name, _, _ in _engines[1:]}}
+
+    for line in lines:
+        try:
+            record = json.loads(line)
+            answers = record.get('answers', record)
+            values = tuple(answers.get(q) for q in questions)
+        except (ValueError, AttributeError):
+            values = None
+        if values is None or not all(value is None or isinstance(value, str) for value in values):
+            stats['invalid'] += 1
+            continue
+        stats['sessions'] += 1
+
+        base_tools, base_profile = baseline(values)
+        stats['exposure'][baseline_name].update(base_tools)
+        base_set = set(base_tools)
+        for name, _, outcome in _engines[1:]:
+            tools, profile = outcome(values)
+            stats['exposure'][name].update(tools)
+            counts = stats['candidates'][name]
+            replaced = len(base_set.difference(tools))
+            counts['tools_replaced'] += replaced
+            counts['changed'] += replaced > 0
+            counts['reordered'] += replaced == 0 and tools != base_tools
+            counts['profile_changed'] += profile != base_profile
+            counts['top_tool_changed'] += tools[:1] != base_tools[:1]
+    return stats
+
+
+def read_sessions(log_file: str) -> Iterator[str]:
+    """Yield one JSON answers record per session from a JSONL log or a collector database"""
+    if log_file.endswith('.db'):
+        conn = sqlite3.connect(f"file:{log_file}?mode=ro", uri=True)
+        try:
+            cursor = conn.execute('SELECT * FROM submissions')
+            columns = [column[0] for column in cursor.description]
+            for row in cursor:
+                record = dict(zip(columns, row))
+                yield json.dumps({'answers': {q: v for q, v in record.items()
+                                              if q.startswith('q') and q[1:].isdigit()}})
+        finally:
+            conn.close()
+        return
+
+    with open(log_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield line
+
+
+class SessionReplayer:
+    def __init__(self, candidates: Dict[str, Dict[str, Any]], html_file: str = 'index.html',
+                 js_file: str = 'recommendation_engine.js', jobs: int = 0):
+        self.specs = [('current', {})] + list(candidates.items())
+        self.html_file = str(ROOT / html_file)
+        self.js_file = str(ROOT / js_file)
+        self.jobs = jobs or os.cpu_count() or 1
+
+    def replay(self, sessions: Iterator[str]) -> Dict[str, Any]:
+        """Replay sessions in chunks across worker processes, keeping a bounded number in flight"""
+        totals = {'sessions': 0, 'invalid': 0,
+                  'exposure': {name: Counter() for name, _ in self.specs},
+                  'candidates': {name: Counter() for name, _ in self.specs[1:]}}
+        start = time.perf_counter()
+
+        def merge(stats: Dict[str, Any]) -> None:
+            totals['sessions'] += stats['sessions']
+            totals['invalid'] += stats['invalid']
+            for name, counts in stats['exposure'].items():
+                totals['exposure'][name].update(counts)
+            for name, counts in stats['candidates'].items():
+                totals['candidates'][name].update(counts)
+
+        with ProcessPoolExecutor(max_workers=self.jobs, initializer=_init_worker,
+                                 initargs=(self.specs, self.html_file, self.js_file)) as executor:
+            pending = set()
+            while True:
+                chunk = list(islice(sessions, CHUNK_LINES))
+                if chunk:
+                    pending.add(executor.submit(_replay_chunk, chunk))
+                if len(pending) >= self.jobs * 2 or (not chunk and pending):
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        merge(future.result())
+                if not chunk and not pending:
+                    break
+
+        totals['seconds'] = time.perf_counter() - start
+        return totals
+
+
+def summarize(totals: Dict[str, Any], top: int = 10) -> Dict[str, Any]:
+    """Churn rates and the largest per-tool exposure changes for each candidate"""
+    sessions = totals['sessions'] or 1
+    baseline = totals['exposure']['current']
+    summary = {
+        'sessions': totals['sessions'],
+        'invalid': totals['invalid'],
+        'seconds': round(totals['seconds'], 3),
+        'sessions_per_second': round(totals['sessions'] / totals['seconds']) if totals['seconds'] else 0,
+        'candidates': {},
+    }
+    for name, counts in totals['candidates'].items():
+        exposure = totals['exposure'][name]
+        deltas = {tool: exposure[tool] - baseline[tool] for tool in set(baseline) | set(exposure)}
+        changed = sorted((tool for tool in deltas if deltas[tool]), key=lambda tool: (-abs(deltas[tool]), tool))
+        summary['candidates'][name] = {
+            'changed_rate': counts['changed'] / sessions,
+            'reordered_rate': counts['reordered'] / sessions,
+            'profile_changed_rate': counts['profile_changed'] / sessions,
+            'top_tool_changed_rate': counts['top_tool_changed'] / sessions,
+            'tools_replaced_per_session': counts['tools_replaced'] / sessions,
+            'exposure_deltas': [
+                {'tool': tool, 'current': baseline[tool], 'candidate': exposure[tool], 'delta': deltas[tool]}
+                for tool in changed[:top]
+            ],
+        }
+    return summary
+
+
+def format_summary(summary: Dict[str, Any]) -> str:
+    lines = [f"Replayed {summary['sessions']:,} sessions in {summary['seconds']}s "
+             f"({summary['sessions_per_second']:,} sessions/s, {summary['invalid']} invalid lines)"]
+    for name, result in summary['candidates'].items():
+        lines.append(f"\n📊 {name}")
+        lines.append(f"   Toolkit changed:       {result['changed_rate']:.1%} of sessions "
+                     f"({result['tools_replaced_per_session']:.2f} tools replaced per session)")
+        lines.append(f"   Order-only changes:    {result['reordered_rate']:.1%}")
+        lines.append(f"   Top tool changed:      {result['top_tool_changed_rate']:.1%}")
+        lines.append(f"   Profile changed:       {result['profile_changed_rate']:.1%}")
+        if result['exposure_deltas']:
+            lines.append("   Exposure changes (sessions shown each tool):")
+            for entry in result['exposure_deltas']:
+                lines.append(f"      {entry['tool']:<28} {entry['current']:>10,} -> "
+                             f"{entry['candidate']:>10,} ({entry['delta']:+,})")
+    return '\n'.join(lines)
+
+
+def load_candidates(paths: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Read candidate rule sets from JSON files, named after the file"""
+    candidates = {}
+    base_rules = json.loads(DEFAULT_RULES.read_text(encoding='utf-8'))
+    for path in paths:
+        spec = json.loads(Path(path).read_text(encoding='utf-8'))
+        unknown = set(spec) - set(RULE_TABLES) - {'score_weights'}
+        if unknown:
+            raise ValueError(f"{path}: unknown keys {', '.join(sorted(unknown))}")
+        # Fail here rather than in every worker
+        try:
+            validate_rules({**base_rules, **{name: spec[name] for name in RULE_TABLES if name in spec}})
+            merge_score_weights(spec.get('score_weights'))
+        except ValueError as e:
+            raise ValueError(f"{path}: {e}") from e
+        candidates[Path(path).stem] = spec
+    return candidates
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay logged quiz sessions against candidate rule sets')
+    parser.add_argument('log', help='JSONL file of answers objects, or a collect_submissions.py database')
+    parser.add_argument('candidates', nargs='+',
+                       help='JSON rule set files overriding classifier_rules.json tables '
+                            '(context_rules, role_indicators, ...) and score_weights')
+    parser.add_argument('--jobs', type=int, default=0,
+                       help='Worker processes (default: CPU count)')
+    parser.add_argument('--top', type=int, default=10,
+                       help='Tools listed per candidate by exposure change (default: 10)')
+    parser.add_argument('--json', action='store_true',
+                       help='Print the summary as JSON')
+
+    args = parser.parse_args()
+
+    try:
+        replayer = SessionReplayer(load_candidates(args.candidates), jobs=args.jobs)
+        summary = summarize(replayer.replay(read_sessions(args.log)), args.top)
+    except Exception as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+
+    print(json.dumps(summary, indent=2) if args.json else format_summary(summary))
+
+
+if __name__ == '__main__':
+    main()
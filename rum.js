@@ -0,0 +1,49 @@
+/**
+ * Real-user timings
+ * Collects the performance.measure() entries the pages and the engine record around their
+ * hot paths, plus first contentful paint as 'first-render', and beacons them in batches to
+ * the rum_collector.py endpoint named by <meta name="rum-collector">; empty disables it
+ */
+
+(() => {
+    const collector = document.querySelector('meta[name="rum-collector"]');
+    if (!collector || !collector.content || !navigator.sendBeacon || !window.PerformanceObserver) return;
+
+    const BATCH_SIZE = 20;
+    const page = location.pathname.split('/').pop() || 'index.html';
+    const queue = [];
+
+    function flush() {
+        if (!queue.length) return;
+        navigator.sendBeacon(collector.content, JSON.stringify({
+            // Set by build-info.js, which the service worker caches with the rest of the build
+            build: window.SITE_BUILD || '',
+            page,
+            timings: queue.splice(0)
+        }));
+    }
+
+    function record(name, duration) {
+        queue.push([name, Math.round(duration * 1000) / 1000]);
+        if (queue.length >= BATCH_SIZE) flush();
+    }
+
+    try {
+        new PerformanceObserver(list => {
+            list.getEntries().forEach(entry => record(entry.name, entry.duration));
+        }).observe({ type: 'measure', buffered: true });
+        new PerformanceObserver(list => {
+            list.getEntries()
+                .filter(entry => entry.name === 'first-contentful-paint')
+                .forEach(entry => record('first-render', entry.startTime));
+        }).observe({ type: 'paint', buffered: true });
+    } catch (error) {
+        // Browsers without typed observers simply report nothing
+        return;
+    }
+
+    // Hiding is the last moment a page reliably gets to send anything
+    document.addEventListener('visibilitychange', () => {
+        if (document.visibilityState === 'hidden') flush();
+    });
+})();
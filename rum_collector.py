@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""
+Real-User Timing Collector
+Small asyncio HTTP endpoint the pages' rum.js beacons hot-path timings to. Each
+(page, path, build) series is folded into a fixed-size log-bucketed histogram, so memory
+and storage stay flat however many timings arrive; --report prints p50/p95/p99 per path
+and build hash
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import sqlite3
+import sys
+import time
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from collect_submissions import CORS_HEADERS, MAX_BODY_BYTES, MAX_HEADER_BYTES, REASONS, VALUE_PATTERN
+
+DEFAULT_DB = 'timings.db'
+DEFAULT_PORT = 8767
+MAX_TIMINGS = 100
+# Beyond this many series new ones are dropped, which bounds the collector's memory
+MAX_SERIES = 5000
+MAX_MS = 3_600_000.0
+
+# Buckets grow by 2^(1/8), about 9%, from 1 microsecond; bucket 0 holds anything faster
+# and the last anything slower than 2^32 microseconds (about 72 minutes)
+MIN_MS = 0.001
+BUCKETS_PER_DOUBLING = 8
+BUCKETS = BUCKETS_PER_DOUBLING * 32 + 2
+QUANTILES = (0.5, 0.95, 0.99)
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS histograms (
+    page TEXT NOT NULL,
+    path TEXT NOT NULL,
+    build TEXT NOT NULL,
+    counts BLOB NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (page, path, build)
+)
+'''
+UPSERT = ('INSERT INTO histograms (page, path, build, counts, updated_at) VALUES (?, ?, ?, ?, ?) '
+          'ON CONFLICT (page, path, build) DO UPDATE SET counts = excluded.counts, '
+          'updated_at = excluded.updated_at')
+
+SeriesKey = Tuple[str, str, str]
+
+
+class LogHistogram:
+    """Counts of values in fixed log-spaced buckets, so quantiles are within one bucket
+    (about 9%) of the exact value however many values were added"""
+
+    __slots__ = ('counts',)
+
+    def __init__(self, counts: Optional[bytes] = None):
+        self.counts = array('Q', bytes(8 * BUCKETS))
+        if counts:
+            if len(counts) != 8 * BUCKETS:
+                raise ValueError(f"expected {BUCKETS} buckets")
+            self.counts = array('Q', counts)
+
+    @staticmethod
+    def bucket(value: float) -> int:
+        if value < MIN_MS:
+            return 0
+        return min(BUCKETS - 1, 1 + int(math.log2(value / MIN_MS) * BUCKETS_PER_DOUBLING))
+
+    @staticmethod
+    def bucket_value(index: int) -> float:
+        """A representative value for a bucket: the geometric middle of its bounds"""
+        if index == 0:
+            return MIN_MS
+        return MIN_MS * 2 ** ((index - 0.5) / BUCKETS_PER_DOUBLING)
+
+    def add(self, value: float) -> None:
+        self.counts[self.bucket(value)] += 1
+
+    @property
+    def count(self) -> int:
+        return sum(self.counts)
+
+    def quantile(self, q: float) -> Optional[float]:
+        total = self.count
+        if not total:
+            return None
+        rank = max(1, math.ceil(q * total))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return self.bucket_value(index)
+        return self.bucket_value(BUCKETS - 1)
+
+    def to_bytes(self) -> bytes:
+        return self.counts.tobytes()
+
+
+def connect(db_path: str) -> sqlite3.Connection:
+    """Open the timings database in WAL mode, creating the table if needed"""
+    conn = sqlite3.connect(db_path, check_same_thread=False)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.execute(SCHEMA)
+    conn.commit()
+    return conn
+
+
+def parse_beacon(body: bytes) -> Tuple[str, str, List[Tuple[str, float]]]:
+    """Validate a beaconed {"build", "page", "timings": [[path, ms], ...]} payload"""
+    try:
+        payload = json.loads(body)
+    except (UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise ValueError(f"invalid JSON: {e}")
+    if not isinstance(payload, dict):
+        raise ValueError("payload must be an object")
+
+    build, page, timings = payload.get('build') or 'unknown', payload.get('page'), payload.get('timings')
+    for value in (build, page):
+        if not isinstance(value, str) or not VALUE_PATTERN.match(value):
+            raise ValueError(f"invalid build or page: {value!r}")
+    if not isinstance(timings, list) or len(timings) > MAX_TIMINGS:
+        raise ValueError(f"payload needs a 'timings' list of at most {MAX_TIMINGS} entries")
+
+    parsed = []
+    for timing in timings:
+        if not (isinstance(timing, list) and len(timing) == 2 and isinstance(timing[0], str)
+                and VALUE_PATTERN.match(timing[0]) and isinstance(timing[1], (int, float))
+                and not isinstance(timing[1], bool) and 0 <= timing[1] <= MAX_MS):
+            raise ValueError(f"invalid timing: {timing!r}")
+        parsed.append((timing[0], float(timing[1])))
+    return build, page, parsed
+
+
+def load_histograms(conn: sqlite3.Connection, build: Optional[str] = None) -> Dict[SeriesKey, LogHistogram]:
+    query = 'SELECT page, path, build, counts FROM histograms'
+    rows = conn.execute(query + ' WHERE build = ?', (build,)) if build else conn.execute(query)
+    histograms = {}
+    for page, path, series_build, counts in rows:
+        try:
+            histograms[(page, path, series_build)] = LogHistogram(counts)
+        except ValueError:
+            # Written with another bucket layout; it is replaced as new timings arrive
+            continue
+    return histograms
+
+
+def report(db_path: str, build: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Count and p50/p95/p99 in milliseconds for every series, slowest p95 first per page"""
+    conn = connect(db_path)
+    try:
+        updated = dict(((page, path, series_build), updated_at) for page, path, series_build, updated_at
+                       in conn.execute('SELECT page, path, build, updated_at FROM histograms'))
+        histograms = load_histograms(conn, build)
+    finally:
+        conn.close()
+
+    rows = []
+    for (page, path, series_build), histogram in histograms.items():
+        row = {'page': page, 'path': path, 'build': series_build, 'count': histogram.count,
+               'updated_at': updated[(page, path, series_build)]}
+        for q in QUANTILES:
+            row[f"p{round(q * 100)}"] = histogram.quantile(q)
+        rows.append(row)
+    rows.sort(key=lambda row: (row['page'], row['path'], -row['updated_at']))
+    return rows
+
+
+def format_report(rows: List[Dict[str, Any]]) -> str:
+    if not rows:
+        return 'No timings collected yet'
+    lines = [f"{'page':<28} {'path':<26} {'build':<18} {'count':>8} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10}"]
+    for row in rows:
+        lines.append(f"{row['page']:<28} {row['path']:<26} {row['build']:<18} {row['count']:>8,} "
+                     f"{row['p50']:>10.2f} {row['p95']:>10.2f} {row['p99']:>10.2f}")
+    return '\n'.join(lines)
+
+
+class TimingCollector:
+    """Folds beaconed timings into in-memory histograms, writing changed ones periodically"""
+
+    def __init__(self, db_path: str = DEFAULT_DB, flush_interval: float = 5.0,
+                 max_series: int = MAX_SERIES):
+        self.db_path = db_path
+        self.flush_interval = flush_interval
+        self.max_series = max_series
+        self.histograms: Dict[SeriesKey, LogHistogram] = {}
+        self.dirty: Set[SeriesKey] = set()
+        self.stats = {'beacons': 0, 'timings': 0, 'rejected': 0, 'dropped': 0, 'flushes': 0}
+        # SQLite work stays on one thread, off the event loop
+        self._writer = ThreadPoolExecutor(max_workers=1)
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _write(self, rows: List[Tuple[str, str, str, bytes, float]]) -> None:
+        with self._conn:
+            self._conn.executemany(UPSERT, rows)
+
+    async def flush(self) -> None:
+        if not self.dirty:
+            return
+        now = time.time()
+        rows = [(*key, self.histograms[key].to_bytes(), now) for key in self.dirty]
+        self.dirty = set()
+        await asyncio.get_running_loop().run_in_executor(self._writer, self._write, rows)
+        self.stats['flushes'] += 1
+
+    async def _flush_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    def collect(self, body: bytes) -> int:
+        """Fold one beacon into the histograms, returning the HTTP status for the response"""
+        try:
+            build, page, timings = parse_beacon(body)
+        except ValueError:
+            self.stats['rejected'] += 1
+            return 400
+        self.stats['beacons'] += 1
+        for path, duration in timings:
+            key = (page, path, build)
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                if len(self.histograms) >= self.max_series:
+                    self.stats['dropped'] += 1
+                    continue
+                histogram = self.histograms[key] = LogHistogram()
+            histogram.add(duration)
+            self.dirty.add(key)
+            self.stats['timings'] += 1
+        return 204
+
+    def _respond(self, writer: asyncio.StreamWriter, status: int, body: bytes = b'',
+                 keep_alive: bool = True) -> None:
+        headers = (f"HTTP/1.1 {status} {REASONS[status]}\r\n{CORS_HEADERS}"
+                   f"Content-Length: {len(body)}\r\n")
+        if body:
+            headers += 'Content-Type: application/json\r\n'
+        if not keep_alive:
+            headers += 'Connection: close\r\n'
+        writer.write(headers.encode('ascii') + b'\r\n' + body)
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve HTTP/1.1 requests on one keep-alive connection"""
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b'\r\n\r\n')
+                except asyncio.IncompleteReadError:
+                    break
+                except asyncio.LimitOverrunError:
+                    self._respond(writer, 413, keep_alive=False)
+                    break
+
+                lines = head.decode('latin-1').split('\r\n')
+                method, path, version = (lines[0].split(' ') + ['', '', ''])[:3]
+                headers = {}
+                for line in lines[1:]:
+                    name, _, value = line.partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                keep_alive = (headers.get('connection', '').lower() != 'close'
+                              and version == 'HTTP/1.1')
+
+                length = int(headers.get('content-length') or 0)
+                if length > MAX_BODY_BYTES:
+                    self._respond(writer, 413, keep_alive=False)
+                    break
+                body = await reader.readexactly(length) if length else b''
+
+                path = path.split('?', 1)[0]
+                if path == '/timings' and method == 'POST':
+                    self._respond(writer, self.collect(body), keep_alive=keep_alive)
+                elif path == '/timings' and method == 'OPTIONS':
+                    self._respond(writer, 204, keep_alive=keep_alive)
+                elif path == '/stats' and method == 'GET':
+                    stats = dict(self.stats, series=len(self.histograms), pending=len(self.dirty))
+                    self._respond(writer, 200, json.dumps(stats).encode('utf-8'), keep_alive)
+                elif path in ('/timings', '/stats'):
+                    self._respond(writer, 405, keep_alive=keep_alive)
+                else:
+                    self._respond(writer, 404, keep_alive=keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host: str = '127.0.0.1', port: int = DEFAULT_PORT,
+                    ready: Optional[asyncio.Event] = None) -> None:
+        """Collect timings until cancelled, then write whatever changed since the last flush"""
+        loop = asyncio.get_running_loop()
+        self._conn = await loop.run_in_executor(self._writer, connect, self.db_path)
+        self.histograms = await loop.run_in_executor(self._writer, load_histograms, self._conn)
+        flusher = asyncio.create_task(self._flush_periodically())
+        server = await asyncio.start_server(self.handle, host, port, limit=MAX_HEADER_BYTES)
+        if ready:
+            ready.set()
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            flusher.cancel()
+            await self.flush()
+            await loop.run_in_executor(self._writer, self._conn.close)
+            self._writer.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Collect real-user timings into log-bucketed histograms')
+    parser.add_argument('--db', default=DEFAULT_DB,
+                       help=f'SQLite database file (default: {DEFAULT_DB})')
+    parser.add_argument('--host', default='127.0.0.1',
+                       help='Address to listen on (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT,
+                       help=f'Port to listen on (default: {DEFAULT_PORT})')
+    parser.add_argument('--flush-interval', type=float, default=5.0,
+                       help='Seconds between writes of changed histograms (default: 5.0)')
+    parser.add_argument('--report', action='store_true',
+                       help='Print p50/p95/p99 per page, path and build instead of collecting')
+    parser.add_argument('--build',
+                       help='Only report this build hash (see build-info.js)')
+    parser.add_argument('--format', choices=['text', 'json'], default='text',
+                       help='Report format (default: text)')
+
+    args = parser.parse_args()
+
+    if args.report:
+        try:
+            rows = report(args.db, args.build)
+        except sqlite3.Error as e:
+            print(f"ERROR: {e}")
+            sys.exit(1)
+        print(json.dumps(rows, indent=2) if args.format == 'json' else format_report(rows))
+        return
+
+    collector = TimingCollector(args.db, args.flush_interval)
+    print(f"✅ Collecting timings at http://{args.host}:{args.port}/timings into {args.db}")
+    try:
+        asyncio.run(collector.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    except Exception as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+    print(f"Folded {collector.stats['timings']} timings from {collector.stats['beacons']} beacons "
+          f"into {len(collector.histograms)} histograms")
+
+
+if __name__ == '__main__':
+    main()
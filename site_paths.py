@@ -0,0 +1,10 @@
+#!/usr/bin/env python3
+"""
+Site Paths
+The repository root, for the build scripts and the libraries they share, so that a
+library like tool_classifier.py can locate its files without importing build_site.py
+"""
+
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
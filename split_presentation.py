@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Presentation Splitter
+Splits the rendered presentation into a light shell page holding the title and first
+slide, per-slide fragments that are fetched as the reader reaches them, and content-hashed
+script and style assets that the browser can cache across visits
+"""
+
+import argparse
+import re
+import sys
+import time
+from typing import Dict, Iterable, List, Optional
+
+from site_paths import ROOT
+from file_transaction import FileTransaction
+from html_stream import (END, START, TEXT, AttributeRewriter, DataUriExtractor, Filter,
+                         InlineAssetExtractor, Page, Pipeline, Token, markup)
+
+DEFAULT_SOURCE = 'ai/presentation.html'
+DEFAULT_OUTPUT_DIR = 'ai/presentation'
+# Inline <script> and <style> blocks at least this large move to asset files
+INLINE_LIMIT = 4096
+
+_NOT_RELATIVE = re.compile(r'[a-z][a-z0-9+.-]*:|[#/?]', re.I)
+_HEADING_TAG = re.compile(r'h[1-6]')
+
+SHELL_STYLE = '''<style>
+section.slide-pending{min-height:100vh}
+</style>
+'''
+
+# Fetches a slide when it nears the viewport or its anchor is navigated to, and
+# prefetches the slide after it so the next one is usually ready on arrival
+LOADER_SCRIPT = '''<script>
+(() => {
+  const slides = [...document.querySelectorAll('section[data-slide-src]')];
+  const requests = new Map();
+
+  const fetchSlide = slide => {
+    const src = slide.dataset.slideSrc;
+    if (!requests.has(src)) {
+      requests.set(src, fetch(src).then(response => {
+        if (!response.ok) throw new Error(`${src}: ${response.status}`);
+        return response.text();
+      }));
+    }
+    return requests.get(src);
+  };
+
+  const show = async slide => {
+    const src = slide.dataset.slideSrc;
+    if (!src) return;
+    const template = document.createElement('template');
+    try {
+      template.innerHTML = await fetchSlide(slide);
+    } catch (error) {
+      requests.delete(src);
+      console.warn('Slide failed to load', error);
+      return;
+    }
+    // Another navigation may have filled the slide in while this one was waiting
+    if (slide.dataset.slideSrc !== src) return;
+    slide.replaceChildren(...template.content.firstElementChild.childNodes);
+    slide.classList.remove('slide-pending');
+    delete slide.dataset.slideSrc;
+    delete slide.dataset.slideAnchors;
+
+    const next = slides[slides.indexOf(slide) + 1];
+    if (next && next.dataset.slideSrc) fetchSlide(next).catch(() => requests.delete(next.dataset.slideSrc));
+  };
+
+  const navigate = async () => {
+    const id = decodeURIComponent(location.hash.slice(1));
+    const slide = id && slides.find(slide =>
+      slide.id === id || (slide.dataset.slideAnchors || '').split(' ').includes(id));
+    if (!slide || !slide.dataset.slideSrc) return;
+    await show(slide);
+    const target = document.getElementById(id);
+    if (target) target.scrollIntoView();
+  };
+
+  if ('IntersectionObserver' in window) {
+    const observer = new IntersectionObserver(entries => {
+      for (const entry of entries) {
+        if (!entry.isIntersecting) continue;
+        observer.unobserve(entry.target);
+        show(entry.target);
+      }
+    }, { rootMargin: '50% 0px' });
+    slides.forEach(slide => observer.observe(slide));
+  } else {
+    slides.forEach(show);
+  }
+  window.addEventListener('hashchange', navigate);
+  navigate();
+  if (slides.length) fetchSlide(slides[0]).catch(() => requests.delete(slides[0].dataset.slideSrc));
+})();
+</script>
+'''
+
+
+def relocate(token: Token, name: str, value: str) -> Optional[str]:
+    """Prefix a relative URL so it resolves from a page one directory deeper"""
+    if not value or _NOT_RELATIVE.match(value):
+        return None
+    return '../' + value
+
+
+def _slide_file(index: int, opening: Token) -> str:
+    slug = re.sub(r'[^a-z0-9-]+', '-', opening.get('id', '').lower()).strip('-') or 'slide'
+    return f"slides/{index:02d}-{slug}.html"
+
+
+class SlideSplitter(Filter):
+    """Keeps the first top-level <section> of <main> inline and diverts each later one to a
+    fragment file, leaving a placeholder with its own tag, its heading and a link to the full
+    deck; also adds the shell's style and loader script"""
+
+    def __init__(self, page: Page, source_name: str):
+        self.page = page
+        self.source_name = source_name
+        self.in_main = False
+        self.depth = 0
+        self.count = 0
+        # Tokens, ids and heading of the slide being diverted
+        self.slide: Optional[List[Token]] = None
+        self.ids: List[str] = []
+        self.heading: List[Token] = []
+        self.in_heading = False
+
+    def handle(self, token: Token) -> Iterable[Token]:
+        if token.kind == END and token.name == 'head':
+            return [*markup(SHELL_STYLE), token]
+        if token.kind == END and token.name == 'body':
+            return [*markup(LOADER_SCRIPT), token]
+        if token.name == 'main' and token.kind in (START, END):
+            self.in_main = token.kind == START
+        elif self.in_main and token.name == 'section':
+            if token.kind == START:
+                if self.depth == 0:
+                    self.count += 1
+                    if self.count > 1:
+                        self.slide, self.ids, self.heading = [], [], []
+                self.depth += 1
+            elif token.kind == END and self.depth:
+                self.depth -= 1
+
+        if self.slide is None:
+            return (token,)
+        self.slide.append(token)
+        if token.kind == START and token.has('id'):
+            self.ids.append(token.get('id'))
+        if token.kind == START and _HEADING_TAG.fullmatch(token.name) and not self.heading:
+            self.in_heading = True
+        if self.in_heading:
+            self.heading.append(token)
+            self.in_heading = not (token.kind == END and token.name == self.heading[0].name)
+        if self.depth:
+            return ()
+        return self._divert()
+
+    def _divert(self) -> List[Token]:
+        slide, self.slide = self.slide, None
+        opening = slide[0]
+        src = _slide_file(self.count, opening)
+        self.page.files[self.page.output.parent / src] = ''.join(token.raw for token in slide).encode('utf-8')
+
+        placeholder = Token(START, opening.raw, opening.name)
+        placeholder.set('class', f"slide-pending {opening.get('class')}" if opening.has('class') else 'slide-pending')
+        placeholder.set('data-slide-src', src)
+        if len(self.ids) > 1:
+            placeholder.set('data-slide-anchors', ' '.join(self.ids[1:]))
+        own_id = self.ids[0] if self.ids else ''
+        link = (f'<p><a href="../{self.source_name}#{own_id}">'
+                f'Open this slide in the full presentation</a></p>\n</section>')
+        return [placeholder, Token(TEXT, '\n'), *self.heading, Token(TEXT, '\n'), *markup(link)]
+
+
+class PresentationSplitter:
+    """Splits a Quarto-rendered page into a shell, slide fragments and cached assets"""
+
+    def __init__(self, source: str = DEFAULT_SOURCE, output_dir: str = DEFAULT_OUTPUT_DIR):
+        self.source = ROOT / source
+        self.output_dir = ROOT / output_dir
+
+    def filters(self, page: Page) -> List[Filter]:
+        # The shell and its fragments are served from one directory below the source
+        return [AttributeRewriter(relocate),
+                InlineAssetExtractor(page, 'assets', INLINE_LIMIT),
+                DataUriExtractor(page, 'assets', mime_types=['text/css']),
+                SlideSplitter(page, self.source.name)]
+
+    def run(self) -> Dict[str, int]:
+        """Write the split files together, removing ones a previous split left behind"""
+        transaction = FileTransaction()
+        page = Page(self.source, self.output_dir / 'index.html')
+        Pipeline(self.filters).run([page], transaction)
+        splitter = page.filters[-1]
+        if splitter.count == 0:
+            page.staged.unlink(missing_ok=True)
+            raise ValueError(f"{self.source.name} has no <main> element with slides to split")
+
+        files = set(page.files) | {page.output}
+        if self.output_dir.exists():
+            for path in self.output_dir.rglob('*'):
+                if path.is_file() and path not in files and not path.name.endswith('.stream'):
+                    transaction.remove(path)
+        result = transaction.commit()
+        result['slides'] = splitter.count
+        return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Split the presentation into a shell page and lazily loaded slides')
+    parser.add_argument('--source', default=DEFAULT_SOURCE,
+                       help=f'Rendered presentation under the site root (default: {DEFAULT_SOURCE})')
+    parser.add_argument('--output-dir', default=DEFAULT_OUTPUT_DIR,
+                       help=f'Directory for the shell, slides and assets (default: {DEFAULT_OUTPUT_DIR})')
+
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    try:
+        splitter = PresentationSplitter(args.source, args.output_dir)
+        result = splitter.run()
+    except (OSError, ValueError) as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+
+    shell = splitter.output_dir / 'index.html'
+    print(f"✅ {result['slides']} slides: {args.output_dir}/index.html is {shell.stat().st_size:,} bytes "
+          f"(was {splitter.source.stat().st_size:,}); {result['written']} files written, "
+          f"{result['removed']} removed in {time.perf_counter() - start:.3f}s")
+
+
+if __name__ == '__main__':
+    main()
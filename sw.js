@@ -0,0 +1,72 @@
+/**
+ * Generated by build_service_worker.py - do not edit by hand
+ * Serves site assets cache-first and refetches only files whose content hash changed
+ */
+
+const MANIFEST_VERSION = '5b1d4be7925f367b';
+const CACHE_NAME = 'site-assets';
+const MANIFEST = [{"url":"ai/index.html","revision":"2e961e3eaa384965","precache":true},{"url":"ai/search-index.json","revision":"07c9e1352b4d1085","precache":true},{"url":"ai/search.js","revision":"729e5c180f0460d9","precache":true},{"url":"educational-tools-quiz.html","revision":"c69a1a1df3088df0","precache":true},{"url":"index.html","revision":"e0129d7991ac8bd9","precache":true},{"url":"recommendation_engine.js","revision":"0888907e5856146b","precache":true},{"url":"rum.js","revision":"283de6d439c47c04","precache":true},{"url":"ai/agentic_workflow_handout.html","revision":"52b869a3faff431d","precache":false},{"url":"ai/agi_reality_check_handout.html","revision":"d83401be03f4e9d5","precache":false},{"url":"ai/ai_breakthroughs_2025_handout.html","revision":"219d2d7184919a4f","precache":false},{"url":"ai/ai_collaborative_partner_handout.html","revision":"ab8d0f8d36e86b43","precache":false},{"url":"ai/ai_education_faq.html","revision":"e5f78d09f3cdc7c9","precache":false},{"url":"ai/downloads/agentic_workflow_handout.docx","revision":"2f681d446619066b","precache":false},{"url":"ai/downloads/agentic_workflow_handout.pdf","revision":"011f575a5376b387","precache":false},{"url":"ai/downloads/agi_reality_check_handout.docx","revision":"76875a99f1cd1167","precache":false},{"url":"ai/downloads/agi_reality_check_handout.pdf","revision":"310a67fc3dfc5a38","precache":false},{"url":"ai/downloads/ai_breakthroughs_2025_handout.docx","revision":"2ecb5093175be99c","precache":false},{"url":"ai/downloads/ai_breakthroughs_2025_handout.pdf","revision":"9ffb111c1715fd4c","precache":false},{"url":"ai/downloads/ai_collaborative_partner_handout.docx","revision":"2d1721c92988f970","precache":false},{"url":"ai/downloads/ai_collaborative_partner_handout.pdf","revision":"8bea653ec99e2131","precache":false},{"url":"ai/downloads/ai_education_faq.docx","revision":"9fbdb2fe7e2599e2","precache":false},{"url":"ai/downloads/ai_education_faq.pdf","revision":"e81b17c561543dc7","precache":false},{"url":"ai/downloads/from_gaps_to_gains.txt","revision":"fe018e8a7c6fef90","precache":false},{"url":"ai/downloads/ms_copilot_agent_handout.docx","revision":"3036892d33205187","precache":false},{"url":"ai/downloads/ms_copilot_agent_handout.pdf","revision":"93723909923d3c11","precache":false},{"url":"ai/downloads/presentation.docx","revision":"d74744373609bb18","precache":false},{"url":"ai/downloads/presentation.pdf","revision":"f5b39f3e7d4c2452","precache":false},{"url":"ai/downloads/presentation.pptx","revision":"8630bd160a47bf29","precache":false},{"url":"ai/downloads/prompt_engineering_guide.docx","revision":"049c0ffbfffd936b","precache":false},{"url":"ai/downloads/prompt_engineering_guide.pdf","revision":"ef56b60cf3f04e65","precache":false},{"url":"ai/ms_copilot_agent_handout.html","revision":"48305f013c4f80d9","precache":false},{"url":"ai/presentation.html","revision":"3b4d0af390434434","precache":false},{"url":"ai/presentation/assets/222edd3b02307deb.css","revision":"222edd3b02307deb","precache":false},{"url":"ai/presentation/assets/41181eeec6d7ba64.js","revision":"41181eeec6d7ba64","precache":false},{"url":"ai/presentation/assets/4d50586b184724d3.js","revision":"4d50586b184724d3","precache":false},{"url":"ai/presentation/assets/69098e105d990f83.js","revision":"69098e105d990f83","precache":false},{"url":"ai/presentation/assets/a589c6af43d07a48.css","revision":"a589c6af43d07a48","precache":false},{"url":"ai/presentation/assets/caf90641b0a01eee.js","revision":"caf90641b0a01eee","precache":false},{"url":"ai/presentation/assets/cf920ebb1ef560f2.css","revision":"cf920ebb1ef560f2","precache":false},{"url":"ai/presentation/assets/d2ea6c1e0cabca20.js","revision":"d2ea6c1e0cabca20","precache":false},{"url":"ai/presentation/assets/e17a1d816e13c082.js","revision":"e17a1d816e13c082","precache":false},{"url":"ai/presentation/index.html","revision":"503e718e3785e5d4","precache":false},{"url":"ai/presentation/slides/02-todays-journey.html","revision":"abd4f0b3a40aab96","precache":false},{"url":"ai/presentation/slides/03-from-gaps-to-gains.html","revision":"0966dad4742b5a85","precache":false},{"url":"ai/presentation/slides/04-talk-buddy-conversation-practice.html","revision":"5552a8c12a53b61d","precache":false},{"url":"ai/presentation/slides/05-insight-lens-your-feedback-actionable.html","revision":"980267a010279f97","precache":false},{"url":"ai/presentation/slides/06-quick-win-static-interactive.html","revision":"ca3d9937eaf8e5d2","precache":false},{"url":"ai/presentation/slides/07-common-concerns-quick-answers.html","revision":"abe68203a6b3f4cc","precache":false},{"url":"ai/presentation/slides/08-beyond-today-other-tools-in-the-toolkit.html","revision":"19d8601ad39ba40f","precache":false},{"url":"ai/presentation/slides/09-beyond-teaching-ai-in-research.html","revision":"a89e2e2769360b88","precache":false},{"url":"ai/presentation/slides/10-shaping-our-support.html","revision":"b5a24f1d7b601ebb","precache":false},{"url":"ai/presentation/slides/11-closing-reflection.html","revision":"b739c853382b8795","precache":false},{"url":"ai/presentation/slides/12-discussion-next-steps.html","revision":"6f358c576061d6c6","precache":false},{"url":"ai/prompt_engineering_guide.html","revision":"d08d8e11eae0a7bf","precache":false},{"url":"quiz-data/ai_tutoring.json","revision":"5e4bf0fe1ea2aa38","precache":false},{"url":"quiz-data/assessment_feedback.json","revision":"41933596dcf2b53b","precache":false},{"url":"quiz-data/content_creation.json","revision":"0da303a5bcaf9930","precache":false},{"url":"quiz-data/language_communication.json","revision":"0296e6d21b96a5cc","precache":false},{"url":"quiz-data/project_management.json","revision":"ac82642233e5d668","precache":false},{"url":"quiz-data/student_interaction.json","revision":"6b1dfec0ae4b7cc4","precache":false},{"url":"quiz-data/technical_education.json","revision":"b43b300072c049b6","precache":false},{"url":"quiz-data/utility.json","revision":"fc81dc663279a423","precache":false},{"url":"build-info.js","revision":"5b1d4be7925f367b","precache":true}];
+
+const scopeUrl = new URL(self.registration.scope);
+const entries = new Map(MANIFEST.map(entry => [new URL(entry.url, scopeUrl).href, entry]));
+
+// Cache keys carry the revision, so a changed file simply misses the cache
+function cacheKey(href, entry) {
+    return `${href}?__rev=${entry.revision}`;
+}
+
+self.addEventListener('install', event => {
+    event.waitUntil((async () => {
+        const cache = await caches.open(CACHE_NAME);
+        await Promise.all([...entries]
+            .filter(([_, entry]) => entry.precache)
+            .map(async ([href, entry]) => {
+                const key = cacheKey(href, entry);
+                if (await cache.match(key)) return;
+                const response = await fetch(href, { cache: 'no-cache' });
+                if (!response.ok) throw new Error(`Precache failed for ${entry.url}: ${response.status}`);
+                await cache.put(key, response);
+            }));
+        await self.skipWaiting();
+    })());
+});
+
+self.addEventListener('activate', event => {
+    event.waitUntil((async () => {
+        const cache = await caches.open(CACHE_NAME);
+        const current = new Set([...entries].map(([href, entry]) => cacheKey(href, entry)));
+
+        // Drop files that left the site or changed since they were cached
+        for (const request of await cache.keys()) {
+            if (!current.has(request.url)) await cache.delete(request);
+        }
+        await self.clients.claim();
+    })());
+});
+
+function manifestHref(request) {
+    const url = new URL(request.url);
+    url.search = '';
+    url.hash = '';
+    if (url.pathname.endsWith('/')) url.pathname += 'index.html';
+    return url.href;
+}
+
+self.addEventListener('fetch', event => {
+    if (event.request.method !== 'GET' || event.request.headers.has('range')) return;
+
+    const href = manifestHref(event.request);
+    const entry = entries.get(href);
+    if (!entry) return;
+
+    event.respondWith((async () => {
+        const cache = await caches.open(CACHE_NAME);
+        const key = cacheKey(href, entry);
+        const cached = await cache.match(key);
+        if (cached) return cached;
+
+        const response = await fetch(href);
+        if (response.status === 200) await cache.put(key, response.clone());
+        return response;
+    })());
+});
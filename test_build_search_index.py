@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Tests for text extraction, incremental re-indexing and the compact index format
+"""
+
+import json
+import shutil
+import subprocess
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from build_search_index import (SearchIndexBuilder, index_document, iter_html_text, iter_ooxml_text,
+                                iter_plain_text)
+
+ROOT = Path(__file__).resolve().parent
+SOURCES = ['ai/downloads/*.txt', 'ai/downloads/presentation.pptx', 'ai/ai_education_faq.*']
+
+WORD = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+DRAWING = 'http://schemas.openxmlformats.org/drawingml/2006/main'
+
+
+def extract(extractor, path):
+    meta = {}
+    return ''.join(extractor(path, meta)), meta
+
+
+def test_html_text_skips_scripts_and_prefers_the_first_heading(tmp_path):
+    page = tmp_path / 'page.html'
+    page.write_text('<title>page.qmd</title><nav>Menu</nav><h1>Real  Title</h1><script>var x;</script>'
+                    '<p>Body &amp; text</p><h1>Second</h1>', encoding='utf-8')
+    text, meta = extract(iter_html_text, page)
+    assert meta == {'title': 'Real Title'}
+    assert 'Menu' not in text and 'var x' not in text and 'Body & text' in text
+
+
+def test_docx_and_pptx_text(tmp_path):
+    docx = tmp_path / 'notes.docx'
+    with zipfile.ZipFile(docx, 'w') as archive:
+        archive.writestr('word/document.xml', f'<w:document xmlns:w="{WORD}"><w:body>'
+                         '<w:p><w:r><w:t>Opening </w:t></w:r><w:r><w:t>line</w:t></w:r></w:p>'
+                         '<w:p><w:r><w:t>Second</w:t></w:r></w:p></w:body></w:document>')
+    assert extract(iter_ooxml_text, docx) == ('Opening line\nSecond\n', {'title': 'Opening line'})
+
+    pptx = tmp_path / 'deck.pptx'
+    with zipfile.ZipFile(pptx, 'w') as archive:
+        # Slides are read in number order, not archive order
+        for number in (10, 2):
+            archive.writestr(f'ppt/slides/slide{number}.xml',
+                             f'<p:sld xmlns:p="p" xmlns:a="{DRAWING}"><a:p><a:t>Slide {number}</a:t></a:p></p:sld>')
+    assert extract(iter_ooxml_text, pptx)[0] == 'Slide 2\nSlide 10\n'
+
+
+def test_plain_text_front_matter_title(tmp_path):
+    notes = tmp_path / 'notes.txt'
+    notes.write_text('---\ntitle: "Gaps"\n---\nBody\n', encoding='utf-8')
+    assert extract(iter_plain_text, notes)[1] == {'title': 'Gaps'}
+
+
+def test_index_document_positions():
+    document = index_document('ai/downloads/from_gaps_to_gains.txt')
+    assert document['title'] == 'From Gaps to Gains'
+    positions = document['postings']['gaps']
+    assert any(position + 2 in document['postings']['gains'] for position in positions)
+    assert document['length'] == sum(len(p) for p in document['postings'].values())
+
+
+@pytest.fixture
+def build(tmp_path):
+    def run():
+        builder = SearchIndexBuilder(SOURCES, output_file=str(tmp_path / 'index.json'),
+                                     cache_file=tmp_path / 'cache.json', jobs=2)
+        return builder.build(), json.loads((tmp_path / 'index.json').read_text(encoding='utf-8'))
+    return run
+
+
+def test_rebuild_reextracts_nothing(build, tmp_path):
+    stats, index = build()
+    assert stats == {'documents': len(index['docs']), 'reindexed': len(index['docs'])}
+    assert build() == ({'documents': stats['documents'], 'reindexed': 0}, index)
+
+    (tmp_path / 'cache.json').write_text('{', encoding='utf-8')
+    assert build()[0]['reindexed'] == stats['documents']
+
+
+def test_index_rows_decode_to_the_document_positions(build):
+    _, index = build()
+    doc_id = next(i for i, doc in enumerate(index['docs']) if doc[0].endswith('from_gaps_to_gains.txt'))
+    document = index_document('ai/downloads/from_gaps_to_gains.txt')
+    for term in ('gaps', 'gains', 'ai'):
+        [row] = [row for row in index['terms'][term] if row[0] == doc_id]
+        positions, position = [], 0
+        for delta in row[1:]:
+            position += delta
+            positions.append(position)
+        assert positions == document['postings'][term]
+    assert list(index['terms']) == sorted(index['terms'])
+
+
+@pytest.mark.skipif(not shutil.which('node'), reason='node is not installed')
+def test_handout_search_ranks_the_phrase_match_first(build, tmp_path):
+    build()
+    script = f'''
+        const HandoutSearch = require({json.dumps(str(ROOT / 'ai' / 'search.js'))});
+        const index = require({json.dumps(str(tmp_path / 'index.json'))});
+        global.fetch = async () => ({{ json: async () => index }});
+        const search = new HandoutSearch();
+        search.load().then(() => console.log(JSON.stringify(search.search('gaps to gai').map(r => r.url))));
+    '''
+    urls = json.loads(subprocess.run(['node', '-e', script], capture_output=True, text=True, check=True).stdout)
+    assert urls[0].endswith('ai/downloads/from_gaps_to_gains.txt')
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Tests for the precache manifest and the generated service worker's caching
+"""
+
+import json
+import shutil
+import subprocess
+
+import pytest
+
+import build_service_worker
+import build_site
+from build_service_worker import ServiceWorkerBuilder
+
+# Runs sw.js against in-memory caches and a counting fetch, then reports what happened
+HARNESS = r'''
+const fs = require('fs');
+const vm = require('vm');
+const store = new Map();
+const fetched = [];
+const listeners = {};
+const response = body => ({ ok: true, status: 200, body, clone() { return this; } });
+const cache = {
+    match: async key => store.get(typeof key === 'string' ? key : key.url),
+    put: async (key, value) => { store.set(key, value); },
+    keys: async () => [...store.keys()].map(url => ({ url })),
+    delete: async request => store.delete(request.url),
+};
+// A fresh global per worker version, sharing the caches like the browser does
+const worker = () => ({
+    URL, Map, Set, Promise, Error,
+    caches: { open: async () => cache },
+    fetch: async href => { fetched.push(href); return response(href); },
+    self: {
+        registration: { scope: 'https://site.test/' },
+        addEventListener: (type, listener) => { listeners[type] = listener; },
+        skipWaiting: async () => {}, clients: { claim: async () => {} },
+    },
+});
+const run = async source => {
+    vm.runInNewContext(source, worker());
+    let done;
+    listeners.install({ waitUntil: promise => { done = promise; } });
+    await done;
+    listeners.activate({ waitUntil: promise => { done = promise; } });
+    await done;
+};
+const get = async url => {
+    let answer = null;
+    listeners.fetch({
+        request: { url, method: 'GET', headers: { has: () => false } },
+        respondWith: promise => { answer = promise; },
+    });
+    return answer ? (await answer).body : 'network';
+};
+(async () => {
+    const [first, second] = process.argv.slice(1).map(file => fs.readFileSync(file, 'utf8'));
+    await run(first);
+    const installed = [...fetched];
+    const answers = [await get('https://site.test/quiz-data/a.json'), await get('https://site.test/quiz-data/a.json?x=1'),
+                     await get('https://site.test/'), await get('https://site.test/other.txt')];
+    const afterFirst = [...fetched];
+    fetched.length = 0;
+    await run(second);
+    console.log(JSON.stringify({ installed, answers, afterFirst, reinstalled: fetched, keys: [...store.keys()].sort() }));
+})();
+'''
+
+
+@pytest.fixture
+def site(tmp_path, monkeypatch):
+    for name, text in {'index.html': '<p>home</p>', 'rum.js': '//rum', 'ai/index.html': '<p>ai</p>',
+                       'ai/handout.html': '<p>big</p>', 'quiz-data/a.json': '[]', 'quiz-data/b.json': '[1]',
+                       'other.txt': 'not served'}.items():
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding='utf-8')
+    monkeypatch.setattr(build_service_worker, 'ROOT', tmp_path)
+    monkeypatch.setattr(build_site, 'ROOT', tmp_path)
+    return tmp_path
+
+
+def build(site):
+    stats = ServiceWorkerBuilder().build()
+    return stats, json.loads((site / 'precache-manifest.json').read_text(encoding='utf-8'))
+
+
+def test_manifest_lists_precached_then_runtime_assets(site):
+    stats, manifest = build(site)
+    assert [(entry['url'], entry['precache']) for entry in manifest] == [
+        ('ai/index.html', True), ('index.html', True), ('rum.js', True),
+        ('ai/handout.html', False), ('quiz-data/a.json', False), ('quiz-data/b.json', False),
+        ('build-info.js', True)]
+    assert stats == {'entries': 7, 'precached': 4,
+                     'precache_bytes': sum(entry['size'] for entry in manifest if entry['precache'])}
+    version = manifest[-1]['revision']
+    assert f"window.SITE_BUILD = '{version}';" in (site / 'build-info.js').read_text(encoding='utf-8')
+    assert f"const MANIFEST_VERSION = '{version}';" in (site / 'sw.js').read_text(encoding='utf-8')
+
+
+def test_rebuild_changes_only_with_content(site):
+    _, manifest = build(site)
+    sw = (site / 'sw.js').read_text(encoding='utf-8')
+    assert build(site)[1] == manifest and (site / 'sw.js').read_text(encoding='utf-8') == sw
+
+    (site / 'quiz-data' / 'b.json').write_text('[2]', encoding='utf-8')
+    _, changed = build(site)
+    assert [entry['url'] for entry, new in zip(manifest, changed) if entry != new] == [
+        'quiz-data/b.json', 'build-info.js']
+
+
+@pytest.mark.skipif(not shutil.which('node'), reason='node is not installed')
+def test_service_worker_serves_from_cache_and_refetches_changed_files(site, tmp_path_factory):
+    build(site)
+    first = tmp_path_factory.mktemp('sw') / 'first.js'
+    shutil.copy(site / 'sw.js', first)
+    (site / 'index.html').write_text('<p>home, edited</p>', encoding='utf-8')
+    build(site)
+
+    result = subprocess.run(['node', '-e', HARNESS, str(first), str(site / 'sw.js')],
+                            capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    outcome = json.loads(result.stdout)
+    base = 'https://site.test/'
+    assert sorted(outcome['installed']) == [base + name for name in
+                                            ('ai/index.html', 'build-info.js', 'index.html', 'rum.js')]
+    # Runtime assets are fetched once; the directory URL is the cached index page; unlisted URLs
+    # are left to the network
+    assert outcome['answers'] == [base + 'quiz-data/a.json', base + 'quiz-data/a.json', base + 'index.html',
+                                  'network']
+    assert outcome['afterFirst'][len(outcome['installed']):] == [base + 'quiz-data/a.json']
+    # The next version refetches only what changed and drops the superseded cache entries
+    assert sorted(outcome['reinstalled']) == [base + 'build-info.js', base + 'index.html']
+    assert len(outcome['keys']) == 5 and all('?__rev=' in key for key in outcome['keys'])
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Tests for stage staleness, ordering and state in the dependency-tracked site build
+"""
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import build_site
+from build_site import SiteBuilder, Stage
+
+
+class SiteBuilderTest(unittest.TestCase):
+    """Two chained stages in a scratch site: notes.txt -> upper.txt -> report.txt"""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name)
+        patcher = mock.patch.object(build_site, 'ROOT', self.root)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        (self.root / 'notes.txt').write_text('hello', encoding='utf-8')
+        self.runs = []
+        self.failing = set()
+
+    def action(self, name, source, target, transform):
+        def run():
+            if name in self.failing:
+                raise OSError(f"{name} broke")
+            self.runs.append(name)
+            text = (self.root / source).read_text(encoding='utf-8')
+            (self.root / target).write_text(transform(text), encoding='utf-8')
+        return run
+
+    def builder(self):
+        # The report stage comes first so that ordering has to come from the dependencies
+        stages = [
+            Stage('report', ['upper.txt'], ['report.txt'],
+                  self.action('report', 'upper.txt', 'report.txt', lambda text: f"{len(text)} chars")),
+            Stage('upper', ['notes.txt'], ['upper.txt'],
+                  self.action('upper', 'notes.txt', 'upper.txt', str.upper)),
+        ]
+        return SiteBuilder(stages, state_file=self.root / '.build' / 'state.json', jobs=2)
+
+    def test_first_build_runs_stages_in_dependency_order(self):
+        self.assertEqual(self.builder().build(), {'upper': 'built', 'report': 'built'})
+        self.assertEqual(self.runs, ['upper', 'report'])
+        self.assertEqual((self.root / 'report.txt').read_text(encoding='utf-8'), '5 chars')
+
+    def test_unchanged_content_is_fresh_even_when_touched(self):
+        self.builder().build()
+        notes = self.root / 'notes.txt'
+        stat = notes.stat()
+        os.utime(notes, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        self.assertEqual(self.builder().build(), {'upper': 'fresh', 'report': 'fresh'})
+        self.assertEqual(self.runs, ['upper', 'report'])
+
+    def test_changed_input_rebuilds_downstream(self):
+        self.builder().build()
+        (self.root / 'notes.txt').write_text('hello, world', encoding='utf-8')
+        self.assertEqual(self.builder().build(), {'upper': 'built', 'report': 'built'})
+        self.assertEqual((self.root / 'report.txt').read_text(encoding='utf-8'), '12 chars')
+
+    def test_output_that_rebuilds_identically_leaves_downstream_fresh(self):
+        self.builder().build()
+        (self.root / 'notes.txt').write_text('HELLO', encoding='utf-8')
+        self.assertEqual(self.builder().build(), {'upper': 'built', 'report': 'fresh'})
+
+    def test_missing_or_edited_output_is_stale(self):
+        self.builder().build()
+        (self.root / 'report.txt').unlink()
+        self.assertEqual(self.builder().build(), {'upper': 'fresh', 'report': 'built'})
+        (self.root / 'upper.txt').write_text('edited by hand', encoding='utf-8')
+        self.assertEqual(self.builder().build(['upper']), {'upper': 'built'})
+
+    def test_dry_run_reports_without_building(self):
+        self.assertEqual(self.builder().build(dry_run=True), {'upper': 'stale', 'report': 'stale'})
+        self.assertEqual(self.runs, [])
+        self.assertFalse((self.root / '.build' / 'state.json').exists())
+
+    def test_targets_pull_in_upstream_stages_and_force_rebuilds(self):
+        self.builder().build()
+        self.assertEqual(self.builder().build(['report'], force=True), {'upper': 'built', 'report': 'built'})
+        with self.assertRaisesRegex(ValueError, 'Unknown stage'):
+            self.builder().build(['nope'])
+
+    def test_failed_stage_keeps_the_state_of_finished_ones(self):
+        self.failing.add('report')
+        with self.assertRaisesRegex(RuntimeError, "Stage 'report' failed: report broke"):
+            self.builder().build()
+        self.failing.clear()
+        self.assertEqual(self.builder().build(), {'upper': 'fresh', 'report': 'built'})
+
+    def test_corrupt_state_rebuilds_everything(self):
+        self.builder().build()
+        (self.root / '.build' / 'state.json').write_text('{', encoding='utf-8')
+        self.assertEqual(self.builder().build(), {'upper': 'built', 'report': 'built'})
+
+    def test_cycles_are_rejected(self):
+        builder = SiteBuilder([Stage('a', ['b.txt'], ['a.txt'], lambda: None),
+                               Stage('b', ['a.txt'], ['b.txt'], lambda: None)],
+                              state_file=self.root / 'state.json')
+        with self.assertRaisesRegex(ValueError, 'Dependency cycle'):
+            builder.build()
+
+
+class DefaultStagesTest(unittest.TestCase):
+    def test_every_stage_is_reachable_without_cycles(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            builder = SiteBuilder(build_site.default_stages(), state_file=Path(tmp) / 'state.json')
+        deps = builder.dependencies()
+        builder._check_acyclic(list(builder.stages), deps)
+        self.assertIn('minify', deps['budgets'])
+        self.assertIn('service-worker', deps['minify'])
+
+
+if __name__ == '__main__':
+    unittest.main()
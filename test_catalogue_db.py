@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Tests for catalogue database syncing, its FTS5 index and the query command
+"""
+
+import copy
+import sqlite3
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from catalogue_db import CARD_COLUMNS, CatalogueDatabase
+
+ROOT = Path(__file__).resolve().parent
+
+
+def make_tool(name, description, category='assessment_feedback', roles=(('lecturer', 'high'),), **extra):
+    return dict({
+        'name': name, 'display_name': name.replace('-', ' ').title(), 'category': category,
+        'description': description, 'topics': '', 'priority': 'medium', 'techLevel': 'beginner',
+        'contexts': [], 'subjects': [], 'original_category': 'web-application',
+        'primary_role': roles[0][0],
+        'roles': [{'role': role, 'confidence': confidence, 'score': 3} for role, confidence in roles],
+    }, **extra)
+
+
+TOOLS = [
+    make_tool('quiz-maker', 'generates practice quizzes from lecture notes',
+              roles=(('lecturer', 'high'), ('student', 'medium'))),
+    make_tool('talk-buddy', 'conversation practice with an AI partner', 'language_communication',
+              roles=(('student', 'high'),), stars=4, languages=['Python']),
+    make_tool('grade-lens', 'rubric analytics for marking', roles=(('lecturer', 'medium'),)),
+]
+
+
+@pytest.fixture
+def db(tmp_path):
+    with CatalogueDatabase(str(tmp_path / 'catalogue.db')) as db:
+        db.sync(TOOLS, {'assessment_feedback': 'Assessment', 'language_communication': 'Language'})
+        yield db
+
+
+def matches(db, query):
+    return [row['id'] for row in db.search(query)]
+
+
+def test_resync_only_writes_what_changed(db):
+    assert db.sync(TOOLS) == {'inserted': 0, 'updated': 0, 'deleted': 0, 'unchanged': 3}
+
+    tools = copy.deepcopy(TOOLS)
+    tools[0]['description'] = 'builds flashcards from slides'
+    tools[2]['roles'][0]['confidence'] = 'high'
+    del tools[1]
+    assert db.sync(tools) == {'inserted': 0, 'updated': 2, 'deleted': 1, 'unchanged': 0}
+
+    assert matches(db, 'flashcards') == ['quiz-maker'] and matches(db, 'quizzes') == []
+    assert matches(db, 'conversation') == []
+    # Roles follow the tool: replaced on update, removed with it on delete
+    assert [tuple(row) for row in db.conn.execute(
+        "SELECT confidence FROM tool_roles WHERE tool_id = 'grade-lens'")] == [('high',)]
+    assert db.conn.execute("SELECT COUNT(*) FROM tool_roles WHERE tool_id = 'talk-buddy'").fetchone()[0] == 0
+
+
+def test_search_ranks_and_highlights(db):
+    [row] = db.search('practi* AND quiz*')
+    assert row['id'] == 'quiz-maker' and '[practice]' in row['excerpt']
+    assert set(matches(db, 'practice')) == {'quiz-maker', 'talk-buddy'}
+    with pytest.raises(sqlite3.OperationalError):
+        db.search('"unbalanced')
+
+
+def test_facets(db):
+    facets = db.facets()
+    assert facets['category'] == [('assessment_feedback', 2), ('language_communication', 1)]
+    assert facets['role'] == [('lecturer', 2), ('student', 2)]
+    assert db.facets('rubric')['primary_role'] == [('lecturer', 1)]
+
+
+def test_categories_follow_the_latest_sync(db):
+    db.sync(TOOLS, {'assessment_feedback': 'Assessment & Feedback'})
+    assert [tuple(row) for row in db.conn.execute('SELECT name, label FROM categories')] == [
+        ('assessment_feedback', 'Assessment & Feedback')]
+
+
+def test_card_details_round_trip(db):
+    row = db.conn.execute("SELECT stars, languages, license FROM tools WHERE id = 'talk-buddy'").fetchone()
+    assert tuple(row) == (4, '["Python"]', None)
+
+
+def test_databases_without_card_columns_are_upgraded(tmp_path):
+    db_file = str(tmp_path / 'old.db')
+    with sqlite3.connect(db_file) as conn:
+        conn.execute('CREATE TABLE tools (rowid INTEGER PRIMARY KEY, id TEXT NOT NULL UNIQUE, name TEXT NOT NULL, '
+                     'display_name TEXT NOT NULL, category TEXT NOT NULL, description TEXT NOT NULL, '
+                     'topics TEXT NOT NULL, priority TEXT NOT NULL, tech_level TEXT NOT NULL, '
+                     'contexts TEXT NOT NULL, subjects TEXT NOT NULL, original_category TEXT NOT NULL, '
+                     'primary_role TEXT NOT NULL, content_hash TEXT NOT NULL)')
+    with CatalogueDatabase(db_file) as db:
+        columns = {row['name'] for row in db.conn.execute('PRAGMA table_info(tools)')}
+        assert set(CARD_COLUMNS) <= columns
+        assert db.sync(TOOLS)['inserted'] == 3
+
+
+def query(db_file, *args, stdin=''):
+    return subprocess.run([sys.executable, str(ROOT / 'catalogue_db.py'), '--db', db_file, *args],
+                          input=stdin, capture_output=True, text=True)
+
+
+def test_command_line(db):
+    db_file = str(db.db_file)
+    result = query(db_file, 'search', 'rubric')
+    assert result.returncode == 0 and result.stdout.startswith('Grade Lens [assessment_feedback, lecturer]')
+    assert query(db_file, 'sql', stdin='SELECT COUNT(*) FROM tools').stdout.startswith('3\n')
+
+    read_only = query(db_file, 'sql', stdin="DELETE FROM tools")
+    assert read_only.returncode == 1 and read_only.stdout.startswith('ERROR: ')
+    missing = query(db_file + '.missing', 'facets')
+    assert missing.returncode == 1 and 'run update_quiz_tools.py first' in missing.stdout
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Tests for page measurements, budget lookup and the budget checker's exit status
+"""
+
+import gzip
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import check_budgets
+from check_budgets import BudgetChecker, format_report, measure_page, over_budget
+
+ROOT = Path(__file__).resolve().parent
+
+PAGE = '''<!DOCTYPE html>
+<html><head>
+<link rel="stylesheet" href="site.css">
+<link rel="stylesheet" href="print.css" media="print">
+<script src="blocking.js"></script>
+<script src="deferred.js" defer></script>
+<script type="module" src="module.js"></script>
+<style>body { margin: 0 }</style>
+</head><body>
+<img src="data:image/png;base64,QUJD" alt="">
+<p>Café</p>
+<script>console.log("hi")</script>
+<script src="late.js"></script>
+</body></html>
+'''
+
+
+def write_site(root, pages, budgets):
+    for name, text in pages.items():
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding='utf-8')
+    config = root / 'budgets.json'
+    config.write_text(json.dumps(budgets), encoding='utf-8')
+    return config
+
+
+def test_measure_page(tmp_path, monkeypatch):
+    page = tmp_path / 'page.html'
+    page.write_text(PAGE, encoding='utf-8')
+    # Small chunks split the multi-byte character and the tags between reads
+    monkeypatch.setattr(check_budgets, 'CHUNK_SIZE', 7)
+    metrics = measure_page(page)
+
+    raw = PAGE.encode('utf-8')
+    assert metrics['raw_bytes'] == len(raw)
+    assert abs(metrics['gzip_bytes'] - len(gzip.compress(raw, 9))) < 32
+    assert metrics['dom_nodes'] == 13
+    assert metrics['inline_script_bytes'] == len('console.log("hi")')
+    assert metrics['inline_style_bytes'] == len('body { margin: 0 }')
+    assert metrics['data_uri_bytes'] == len('data:image/png;base64,QUJD')
+    assert metrics['blocking_urls'] == ['site.css', 'blocking.js']
+    assert metrics['blocking_resources'] == 2
+
+
+def test_limits_layer_defaults_globs_and_the_page(tmp_path):
+    config = write_site(tmp_path, {'a.html': '', 'docs/b.html': '', 'docs/c.html': ''}, {
+        'defaults': {'raw_bytes': 100, 'dom_nodes': 10},
+        'pages': {'docs/*.html': {'raw_bytes': 50}, 'docs/c.html': {'raw_bytes': 5}, 'a.html': {}},
+    })
+    checker = BudgetChecker(config, tmp_path)
+    assert checker.pages() == ['a.html', 'docs/b.html', 'docs/c.html']
+    assert checker.limits_for('a.html') == {'raw_bytes': 100, 'dom_nodes': 10}
+    assert checker.limits_for('docs/b.html') == {'raw_bytes': 50, 'dom_nodes': 10}
+    assert checker.limits_for('docs/c.html') == {'raw_bytes': 5, 'dom_nodes': 10}
+
+    results = {page: over_budget(metrics, limits) for page, metrics, limits in checker.check()}
+    assert results == {'a.html': [], 'docs/b.html': [], 'docs/c.html': []}
+
+
+def test_report_marks_failures_and_lists_blocking_urls():
+    metrics = dict(measure_page(ROOT / 'educational-tools-quiz.html'), blocking_resources=1,
+                   blocking_urls=['slow.js'])
+    report = format_report([('quiz.html', metrics, {'blocking_resources': 0, 'raw_bytes': 10 ** 9})])
+    assert report.startswith('❌ quiz.html')
+    assert 'Render-blocking resources' in report and '<-- over budget' in report
+    assert report.endswith('      blocking: slow.js')
+
+
+def run_checker(*args):
+    return subprocess.run([sys.executable, str(ROOT / 'check_budgets.py'), *args],
+                          capture_output=True, text=True)
+
+
+def test_exit_status(tmp_path):
+    config = write_site(tmp_path, {'dist/page.html': PAGE},
+                        {'pages': {'page.html': {'raw_bytes': len(PAGE.encode('utf-8'))}}})
+    passing = run_checker('--config', str(config), '--root', str(tmp_path / 'dist'))
+    assert passing.returncode == 0 and passing.stdout.startswith('✅ page.html')
+
+    config.write_text(json.dumps({'pages': {'page.html': {'raw_bytes': 10}}}), encoding='utf-8')
+    failing = run_checker('--config', str(config), '--root', str(tmp_path / 'dist'), '--json')
+    assert failing.returncode == 1
+    measured, _, summary = failing.stdout.rpartition('\n\n')
+    assert json.loads(measured)['page.html']['raw_bytes'] == len(PAGE.encode('utf-8'))
+    assert summary.strip() == '❌ 1 page(s) over budget: page.html'
+
+    missing = run_checker('--config', str(config), '--root', str(tmp_path / 'nowhere'))
+    assert missing.returncode == 1 and missing.stdout.startswith('ERROR: ')
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Tests for the streaming link scanner and the site link checker
+"""
+
+from pathlib import Path
+
+import pytest
+
+import check_links
+from check_links import LinkChecker, LinkScanner
+
+SHELL = '''<html><body>
+<nav><a href="#intro">Intro</a> <a href="#deep-dive">Deep dive</a> <a href="#nowhere">Gone</a></nav>
+<section id="intro">Intro</section>
+<section id="talk" class="slide-pending" data-slide-src="slides/02-talk.html" data-slide-anchors="deep-dive q-and-a">
+<h2>Talk</h2></section>
+<section id="missing" data-slide-src="slides/03-missing.html"></section>
+</body></html>
+'''
+# Relocated by the splitter: relative to the shell's directory, not slides/
+FRAGMENT = '''<section id="talk"><section id="deep-dive"><h3>Deep dive</h3>
+<img src="assets/chart.png"><a href="#intro">Back to the intro</a><a href="slides/gone.html">x</a>
+</section></section>
+'''
+
+
+def make_site(root: Path, files):
+    for name, text in files.items():
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding='utf-8')
+    return root
+
+
+@pytest.fixture
+def site(tmp_path):
+    return make_site(tmp_path, {
+        'ai/presentation/index.html': SHELL,
+        'ai/presentation/slides/02-talk.html': FRAGMENT,
+        'ai/presentation/assets/chart.png': '',
+    })
+
+
+def test_slide_anchors_and_fragments_resolve_against_the_shell(site):
+    broken = LinkChecker(['ai/presentation/**/*.html'], root=site).check()
+    assert broken == {
+        'ai/presentation/index.html': ["#nowhere has no element with id 'nowhere'",
+                                       'slides/03-missing.html not found'],
+        'ai/presentation/slides/02-talk.html': ['slides/gone.html not found'],
+    }
+
+
+def test_default_pages_include_the_split_presentation(site):
+    pages = LinkChecker(root=site).discover()
+    assert [page.relative_to(site).as_posix() for page in pages] == [
+        'ai/presentation/index.html', 'ai/presentation/slides/02-talk.html']
+
+
+def test_scanner_skips_data_uris_across_chunks(tmp_path, monkeypatch):
+    monkeypatch.setattr(check_links, 'CHUNK_SIZE', 16)
+    page = tmp_path / 'page.html'
+    page.write_text('<p id="top"><img src="data:image/png;base64,' + 'A' * 200 + '">'
+                    '<a  href = "other.html#x">x</a><img src="a-rather-long/path/to/an/image.png"></p>',
+                    encoding='utf-8')
+    assert list(LinkScanner(page)) == [('id', 'top'), ('href', 'other.html#x'),
+                                       ('src', 'a-rather-long/path/to/an/image.png')]
+
+
+def test_directories_and_escapes(tmp_path):
+    site = make_site(tmp_path, {
+        'index.html': '<a href="docs/">Docs</a> <a href="empty/">Empty</a> <a href="../outside.html">Out</a>'
+                      '<a href="https://example.org/">Ext</a> <a href="${url}">Template</a>'
+                      '<a href="my%20page.html#a%20b">Space</a>',
+        'docs/index.html': '',
+        'empty/readme.txt': '',
+        'my page.html': '<p id="a b"></p>',
+    })
+    assert LinkChecker(['index.html'], root=site).check() == {
+        'index.html': ['empty/ is a directory without index.html', '../outside.html points outside the site']}
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Tests for submission validation and batched writes in collect_submissions
+"""
+
+import asyncio
+import json
+import sqlite3
+
+import pytest
+
+from collect_submissions import MAX_TOOLS, QUESTIONS, SubmissionCollector, connect, parse_submission
+
+ANSWERS = {'q1': 'university', 'q2': 'technology', 'q3': 'advanced', 'q4': 'technical',
+           'q5': 'project_based', 'q6': 'data_analysis', 'q7': 'significant', 'q8': 'technical_skills'}
+
+
+def body(answers=None, tools=None, **extra) -> bytes:
+    payload = {'answers': ANSWERS if answers is None else answers,
+               'tools': ['codex', 'quiz-gen'] if tools is None else tools}
+    payload.update(extra)
+    return json.dumps(payload).encode('utf-8')
+
+
+def stored_rows(db_path):
+    with sqlite3.connect(db_path) as conn:
+        return conn.execute('SELECT * FROM submissions ORDER BY id').fetchall()
+
+
+def run_collector(db_path, steps, **options):
+    """Run steps(collector) against an open collector, without starting the HTTP server"""
+    collector = SubmissionCollector(str(db_path), **options)
+
+    async def run():
+        collector._conn = connect(str(db_path))
+        collector._flush_lock = asyncio.Lock()
+        collector._flush_due = asyncio.Event()
+        try:
+            await steps(collector)
+        finally:
+            collector._conn.close()
+            collector._writer.shutdown()
+
+    asyncio.run(run())
+    return collector
+
+
+def test_parse_submission_builds_row():
+    row = parse_submission(body(), 12.5)
+    assert row == (12.5, *(ANSWERS[q] for q in QUESTIONS), 'codex,quiz-gen')
+
+
+def test_parse_submission_allows_skipped_questions():
+    answers = {q: v for q, v in ANSWERS.items() if q not in ('q4', 'q6')}
+    row = parse_submission(body(answers=answers), 0)
+    assert row[QUESTIONS.index('q4') + 1] is None
+    assert row[QUESTIONS.index('q6') + 1] is None
+
+
+@pytest.mark.parametrize('payload', [
+    b'{not json',
+    b'\xff\xfe',
+    b'[1, 2]',
+    json.dumps({'answers': ANSWERS}).encode(),
+    json.dumps({'answers': [], 'tools': []}).encode(),
+    body(tools=['tool'] * (MAX_TOOLS + 1)),
+    body(tools=['bad id']),
+    body(tools=[7]),
+    body(answers=dict(ANSWERS, q1='<script>')),
+    body(answers=dict(ANSWERS, q2='x' * 65)),
+])
+def test_parse_submission_rejects_bad_payloads(payload):
+    with pytest.raises(ValueError):
+        parse_submission(payload, 0)
+
+
+def test_submit_rejects_and_sheds_load(tmp_path):
+    async def steps(collector):
+        assert collector.submit(b'{}') == 400
+        assert collector.submit(body()) == 204
+        assert collector.submit(body()) == 503
+
+    collector = run_collector(tmp_path / 'db.sqlite', steps, max_pending=1)
+    assert collector.stats['rejected'] == 1
+    assert collector.stats['received'] == 1
+
+
+def test_flush_writes_one_batch(tmp_path):
+    async def steps(collector):
+        for _ in range(3):
+            assert collector.submit(body()) == 204
+        assert not collector._flush_due.is_set()
+        assert collector.submit(body()) == 204
+        assert collector._flush_due.is_set()
+        await collector.flush()
+
+    db_path = tmp_path / 'db.sqlite'
+    collector = run_collector(db_path, steps, batch_size=4)
+    assert collector.stats['stored'] == 4
+    assert collector.stats['batches'] == 1
+    assert collector.buffer == []
+    assert len(stored_rows(db_path)) == 4
+
+
+def test_failed_flush_requeues_rows(tmp_path):
+    async def steps(collector):
+        collector.submit(body(tools=['first']))
+        write_batch = collector._write_batch
+
+        def failing_write(rows):
+            raise sqlite3.OperationalError('database is locked')
+
+        collector._write_batch = failing_write
+        with pytest.raises(sqlite3.OperationalError):
+            await collector.flush()
+        collector.submit(body(tools=['second']))
+        assert [row[-1] for row in collector.buffer] == ['first', 'second']
+
+        collector._write_batch = write_batch
+        await collector.flush()
+
+    db_path = tmp_path / 'db.sqlite'
+    collector = run_collector(db_path, steps)
+    assert collector.stats['write_errors'] == 1
+    assert collector.stats['stored'] == 2
+    assert [row[-1] for row in stored_rows(db_path)] == ['first', 'second']
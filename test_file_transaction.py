@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Tests for FileTransaction commits, rollback and crash recovery
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+import file_transaction
+from file_transaction import JOURNAL_SUFFIX, FileTransaction, compare
+
+
+def write_files(directory, contents):
+    for name, text in contents.items():
+        (directory / name).write_text(text, encoding='utf-8')
+
+
+def read_files(directory):
+    return {path.name: path.read_text(encoding='utf-8')
+            for path in sorted(directory.iterdir()) if path.is_file()}
+
+
+def dead_pid():
+    process = subprocess.Popen([sys.executable, '-c', 'pass'])
+    process.wait()
+    return process.pid
+
+
+def test_commit_writes_skips_unchanged_and_removes(tmp_path):
+    write_files(tmp_path, {'same.txt': 'same', 'old.txt': 'old', 'stale.txt': 'stale'})
+    transaction = FileTransaction()
+    transaction.write(tmp_path / 'same.txt', 'same')
+    transaction.write(tmp_path / 'old.txt', 'new')
+    transaction.write(tmp_path / 'sub' / 'added.txt', b'added')
+    transaction.remove(tmp_path / 'stale.txt')
+    transaction.remove(tmp_path / 'gone.txt')
+
+    assert transaction.commit() == {'written': 2, 'unchanged': 1, 'removed': 1}
+    assert read_files(tmp_path) == {'old.txt': 'new', 'same.txt': 'same'}
+    assert (tmp_path / 'sub' / 'added.txt').read_bytes() == b'added'
+
+
+def test_verify_reports_without_writing(tmp_path):
+    write_files(tmp_path, {'same.txt': 'same', 'old.txt': 'old', 'stale.txt': 'stale'})
+    transaction = FileTransaction()
+    transaction.write(tmp_path / 'same.txt', 'same')
+    transaction.write(tmp_path / 'old.txt', 'new')
+    transaction.write(tmp_path / 'added.txt', 'added')
+    transaction.remove(tmp_path / 'stale.txt')
+
+    assert transaction.verify() == {tmp_path / 'same.txt': 'unchanged', tmp_path / 'old.txt': 'changed',
+                                    tmp_path / 'added.txt': 'missing', tmp_path / 'stale.txt': 'stale'}
+    assert read_files(tmp_path) == {'old.txt': 'old', 'same.txt': 'same', 'stale.txt': 'stale'}
+
+
+@pytest.mark.parametrize('error', [OSError('disk full'), KeyboardInterrupt()])
+def test_failed_rename_rolls_back_every_file(tmp_path, monkeypatch, error):
+    write_files(tmp_path, {'a.txt': 'a', 'b.txt': 'b', 'stale.txt': 'stale'})
+    real_replace = os.replace
+    failures = [error]
+
+    def failing_replace(src, dst):
+        # Only the commit's rename of b.txt fails, not the rollback's
+        if str(dst) == str(tmp_path / 'b.txt') and failures:
+            raise failures.pop()
+        real_replace(src, dst)
+
+    monkeypatch.setattr(file_transaction.os, 'replace', failing_replace)
+    transaction = FileTransaction()
+    transaction.write(tmp_path / 'a.txt', 'new a')
+    transaction.write(tmp_path / 'new.txt', 'new')
+    transaction.write(tmp_path / 'b.txt', 'new b')
+    transaction.remove(tmp_path / 'stale.txt')
+
+    with pytest.raises(type(error)):
+        transaction.commit()
+    # No backups, temp files or journal are left behind
+    assert read_files(tmp_path) == {'a.txt': 'a', 'b.txt': 'b', 'stale.txt': 'stale'}
+
+
+def test_failed_prepare_discards_temp_files(tmp_path, monkeypatch):
+    write_files(tmp_path, {'a.txt': 'a'})
+    transaction = FileTransaction()
+    transaction.write(tmp_path / 'a.txt', 'new a')
+    transaction.write(tmp_path / 'missing' / 'b.txt', 'b')
+    monkeypatch.setattr(file_transaction.Path, 'mkdir', lambda *args, **kwargs: None)
+
+    with pytest.raises(OSError):
+        transaction.commit()
+    assert read_files(tmp_path) == {'a.txt': 'a'}
+
+
+def test_recover_rolls_back_a_crashed_commit(tmp_path):
+    # The state a commit leaves when it dies after renaming a.txt and before b.txt
+    write_files(tmp_path, {'a.txt': 'new a', 'a.txt.bak': 'a', 'b.txt': 'b', 'b.txt.tmp': 'new b',
+                           'c.txt.tmp': 'new c'})
+    record = {'pid': dead_pid(),
+              'applied': [[str(tmp_path / 'a.txt'), str(tmp_path / 'a.txt.bak')],
+                          [str(tmp_path / 'c.txt'), None]],
+              'temp': [str(tmp_path / name) for name in ('a.txt.tmp', 'b.txt.tmp', 'c.txt.tmp')]}
+    (tmp_path / f'.crashed{JOURNAL_SUFFIX}').write_text(json.dumps(record), encoding='utf-8')
+
+    assert FileTransaction.recover(tmp_path) == 1
+    assert read_files(tmp_path) == {'a.txt': 'a', 'b.txt': 'b'}
+
+
+def test_recover_leaves_live_commits_alone(tmp_path):
+    write_files(tmp_path, {'a.txt': 'new a', 'a.txt.bak': 'a'})
+    record = {'pid': os.getpid(), 'applied': [[str(tmp_path / 'a.txt'), str(tmp_path / 'a.txt.bak')]],
+              'temp': []}
+    journal = tmp_path / f'.running{JOURNAL_SUFFIX}'
+    journal.write_text(json.dumps(record), encoding='utf-8')
+
+    assert FileTransaction.recover(tmp_path) == 0
+    assert journal.exists()
+    assert (tmp_path / 'a.txt').read_text(encoding='utf-8') == 'new a'
+
+
+def test_compare(tmp_path, monkeypatch):
+    monkeypatch.setattr(file_transaction, 'TEXT_CHUNK', 3)
+    path = tmp_path / 'page.html'
+    path.write_text('héllo wörld', encoding='utf-8')
+    staged = tmp_path / 'staged.html'
+    staged.write_bytes(path.read_bytes())
+
+    assert compare(path, 'héllo wörld') == 'unchanged'
+    assert compare(path, 'héllo world') == 'changed'
+    assert compare(path, 'héllo wörlds') == 'changed'
+    assert compare(path, 'héllo wörld'.encode('utf-8')) == 'unchanged'
+    assert compare(path, staged) == 'unchanged'
+    assert compare(tmp_path / 'missing.html', 'x') == 'missing'
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Tests for the streaming HTML tokenizer, Token attribute editing and the filters
+"""
+
+from pathlib import Path
+
+import pytest
+
+from html_stream import (COMMENT, END, START, TEXT, LinkCollector, Minifier, Page, Pipeline, markup,
+                         tokenize, tokenize_file)
+
+ROOT = Path(__file__).resolve().parent
+
+SAMPLE = '''<!DOCTYPE html>
+<html><head><title>a < b</title>
+<script>if (a<b && c>d) document.write("</div>");</script>
+<style>p > a { color: red }</style></head>
+<body class=plain data-x='1>0'>
+<!-- a comment with <tags> --><p id="top" title="x > y">Tom &amp; Jerry < 3</p>
+<textarea><b>not bold</b></textarea><img src="data:image/png;base64,AAAA"/>
+<a href="#top">up</a><br/>
+</body></html>
+'''
+
+
+def chunked(text, size):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+def kinds(tokens):
+    return [(token.kind, token.raw) for token in tokens]
+
+
+class TestTokenizer:
+    @pytest.mark.parametrize('size', [1, 2, 3, 5, 8, 13, len(SAMPLE)])
+    def test_tokens_join_back_to_the_source(self, size):
+        tokens = list(tokenize(chunked(SAMPLE, size)))
+        assert ''.join(token.raw for token in tokens) == SAMPLE
+        # Where the chunks fall does not change the markup tokens
+        assert [t for t in kinds(tokens) if t[0] != TEXT] == \
+            [t for t in kinds(tokenize([SAMPLE])) if t[0] != TEXT]
+
+    def test_real_page_round_trips(self):
+        page = ROOT / 'educational-tools-quiz.html'
+        tokens = tokenize_file(page, chunk_size=7)
+        assert ''.join(token.raw for token in tokens) == page.read_text(encoding='utf-8')
+
+    def test_quoted_greater_than_stays_in_the_tag(self):
+        tokens = list(tokenize(chunked('<a title="x > y" href=\'b>c\'>t</a>', 3)))
+        assert kinds(tokens) == [(START, '<a title="x > y" href=\'b>c\'>'), (TEXT, 't'), (END, '</a>')]
+        assert tokens[0].get('href') == 'b>c'
+
+    def test_script_and_textarea_contents_are_text(self):
+        source = '<script>if (a<b) x = "</div>";</script><textarea><b>x</b></TEXTAREA>'
+        assert kinds(tokenize(chunked(source, 2))) == [
+            (START, '<script>'), (TEXT, 'if (a<b) x = "</div>";'), (END, '</script>'),
+            (START, '<textarea>'), (TEXT, '<b>x</b>'), (END, '</TEXTAREA>')]
+
+    def test_unterminated_comment_ends_as_text(self):
+        tokens = list(tokenize(chunked('text <!-- never closed <p>hi</p>', 4)))
+        assert tokens[-1].kind == TEXT and tokens[-1].raw == '<!-- never closed <p>hi</p>'
+        assert not any(token.kind in (START, COMMENT) for token in tokens)
+
+    def test_literal_less_than_is_text(self):
+        assert all(token.kind == TEXT for token in tokenize(chunked('a < b and <3', 1)))
+
+
+class TestTokenSet:
+    def test_bare_attribute_gets_a_value(self):
+        token = markup('<input disabled value="a">')[0]
+        token.set('disabled', 'yes')
+        assert token.raw == '<input disabled="yes" value="a">'
+        assert token.get('value') == 'a'
+
+    def test_quoted_and_unquoted_values_are_replaced_and_escaped(self):
+        token = markup("<img src=plain.png alt='it'>")[0]
+        token.set('src', 'new.png')
+        token.set('alt', 'say "hi" & bye')
+        assert token.raw == '<img src="new.png" alt="say &quot;hi&quot; &amp; bye">'
+        assert token.attributes == {'src': 'new.png', 'alt': 'say "hi" & bye'}
+
+    def test_new_attributes_are_appended(self):
+        token = markup('<br/>')[0]
+        token.set('class', 'c')
+        assert token.raw == '<br class="c"/>' and token.self_closing
+        token = markup('<p  >')[0]
+        token.set('id', 'x')
+        assert token.raw == '<p id="x">'
+
+
+class TestFilters:
+    def test_minifier_leaves_pre_and_script_alone(self):
+        source = ('<div>\n   <p>a   b</p>\n<!-- drop --><!--[if IE]>keep<![endif]-->\n'
+                  '<pre>  x\n   y</pre> <script>  let a  =  1\n</script>\n</div>')
+        assert ''.join(token.raw for token in Minifier()(tokenize([source]))) == (
+            '<div>\n<p>a b</p>\n<!--[if IE]>keep<![endif]-->\n'
+            '<pre>  x\n   y</pre> <script>  let a  =  1\n</script>\n</div>')
+
+    def test_link_collector(self):
+        collector = LinkCollector()
+        for _ in collector(tokenize(chunked(SAMPLE, 5))):
+            pass
+        assert collector.links == [('href', '#top')]
+        assert collector.ids == {'top'}
+
+    def test_pipeline_writes_outputs_and_leaves_sources(self, tmp_path):
+        source = tmp_path / 'page.html'
+        source.write_text(SAMPLE, encoding='utf-8')
+        pages = [Page(source, tmp_path / 'out' / 'page.html')]
+        Pipeline(lambda page: [Minifier()], chunk_size=16).run(pages)
+        assert source.read_text(encoding='utf-8') == SAMPLE
+        output = (tmp_path / 'out' / 'page.html').read_text(encoding='utf-8')
+        assert '<!-- a comment' not in output and '<b>not bold</b>' in output
+        assert not list(tmp_path.glob('out/*.stream'))
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Tests for repository export ingestion and its place in the quiz-tools build
+"""
+
+import json
+import shutil
+import sqlite3
+from collections import Counter
+from pathlib import Path
+
+import pytest
+
+import ingest_repos
+from ingest_repos import InvalidRecord, RepoIngester, export_files, normalize_record, read_records
+from update_quiz_tools import QuizToolUpdater
+
+ROOT = Path(__file__).resolve().parent
+
+EXPORT = [
+    {'name': 'zorblax-tutor', 'description': 'An AI tutor for Python beginners',
+     'topics': ['python', 'tutoring'], 'category': 'web-application',
+     'html_url': 'https://github.com/example/zorblax-tutor', 'stargazers_count': 12,
+     'license': {'spdx_id': 'MIT'}},
+    {'full_name': 'example/grade-lens', 'description': 'Assessment  analytics\nfor lecturers',
+     'topics': 'assessment,analytics', 'category': 'web-application', 'stars': 3},
+    {'name': 'grade-lens', 'description': 'A second copy', 'category': 'web-application'},
+    {'name': 'bad name!', 'description': 'Rejected', 'category': 'web-application'},
+]
+
+
+@pytest.fixture
+def site(tmp_path):
+    """A copy of the page, engine and shards the updater can rewrite"""
+    for name in ('index.html', 'recommendation_engine.js'):
+        shutil.copy(ROOT / name, tmp_path / name)
+    shutil.copytree(ROOT / 'quiz-data', tmp_path / 'quiz-data')
+    return tmp_path
+
+
+def updater_for(site):
+    return QuizToolUpdater(str(site / 'index.html'), str(site / 'recommendation_engine.js'),
+                           export_files=export_files(str(site / 'repo-exports')))
+
+
+def catalogue(db_file):
+    with sqlite3.connect(db_file) as conn:
+        conn.row_factory = sqlite3.Row
+        return {row['id']: dict(row) for row in conn.execute('SELECT * FROM tools')}
+
+
+def test_read_records_streams_arrays_across_chunks(tmp_path, monkeypatch):
+    monkeypatch.setattr(ingest_repos, 'CHUNK_SIZE', 16)
+    path = tmp_path / 'export.json'
+    path.write_text(json.dumps(EXPORT, indent=2), encoding='utf-8')
+    assert list(read_records(str(path), Counter())) == EXPORT
+
+
+def test_read_records_wrapper_and_jsonl(tmp_path):
+    wrapped = tmp_path / 'wrapped.json'
+    wrapped.write_text(json.dumps({'repositories': EXPORT[:2]}), encoding='utf-8')
+    assert list(read_records(str(wrapped), Counter())) == EXPORT[:2]
+
+    lines = tmp_path / 'export.jsonl'
+    lines.write_text(json.dumps(EXPORT[0]) + '\n{broken\n\n' + json.dumps(EXPORT[1]) + '\n', encoding='utf-8')
+    errors = Counter()
+    assert list(read_records(str(lines), errors)) == EXPORT[:2]
+    assert errors == {'invalid JSON line': 1}
+
+
+def test_normalize_record():
+    tool = normalize_record(EXPORT[1])
+    assert tool == {'name': 'grade-lens', 'original_category': 'web-application',
+                    'description': 'assessment analytics for lecturers',
+                    'summary': 'Assessment analytics for lecturers',
+                    'topics': 'assessment analytics', 'stars': 3}
+    assert normalize_record(dict(EXPORT[1], category=None), 'python-package')['original_category'] == 'python-package'
+    # Stored records are read back through the same function unchanged
+    assert normalize_record(normalize_record(EXPORT[0])) == normalize_record(EXPORT[0])
+
+
+@pytest.mark.parametrize('record', [
+    [],
+    {'description': 'No name', 'category': 'web-application'},
+    {'name': 'no-description', 'category': 'web-application'},
+    {'name': 'bad-topics', 'description': 'x', 'topics': [1], 'category': 'web-application'},
+    {'name': 'no-category', 'description': 'x'},
+    {'name': 'unknown-category', 'description': 'x', 'category': 'mobile-app'},
+])
+def test_normalize_record_rejects(record):
+    with pytest.raises(InvalidRecord):
+        normalize_record(record)
+
+
+def test_store_replaces_an_earlier_ingest(tmp_path):
+    export = tmp_path / 'export.json'
+    export.write_text(json.dumps(EXPORT), encoding='utf-8')
+    export_dir = tmp_path / 'repo-exports'
+
+    ingester = RepoIngester()
+    assert ingester.store([str(export)], str(export_dir)) == [export_dir / 'export.jsonl']
+    assert ingester.stats['ingested'] == 2 and ingester.stats['duplicates'] == 1
+    assert ingester.errors == {'missing or invalid name': 1}
+
+    export.write_text(json.dumps(EXPORT[:1]), encoding='utf-8')
+    RepoIngester().store([str(export)], str(export_dir))
+    stored = (export_dir / 'export.jsonl').read_text(encoding='utf-8').splitlines()
+    assert [json.loads(line)['name'] for line in stored] == ['zorblax-tutor']
+    assert export_files(str(export_dir)) == [str(export_dir / 'export.jsonl')]
+
+
+def test_exports_replace_cards_of_the_same_name(tmp_path):
+    export = tmp_path / 'export.jsonl'
+    export.write_text(json.dumps(EXPORT[1]) + '\n', encoding='utf-8')
+    html_tools = [{'name': 'Grade-Lens', 'original_category': 'web-application', 'description': 'old', 'topics': ''},
+                  {'name': 'kept', 'original_category': 'web-application', 'description': 'x', 'topics': ''}]
+
+    ingester = RepoIngester()
+    tools = list(ingester.raw_tools([str(export)], html_tools))
+    assert [(tool['name'], tool['description']) for tool in tools] == [
+        ('grade-lens', 'assessment analytics for lecturers'), ('kept', 'x')]
+    assert ingester.stats['replaced_html'] == 1 and ingester.stats['from_html'] == 1
+
+
+def test_ingested_tools_survive_the_next_build(site, tmp_path):
+    export = tmp_path / 'export.json'
+    export.write_text(json.dumps(EXPORT), encoding='utf-8')
+    db_file = str(site / 'catalogue.db')
+    RepoIngester().store([str(export)], str(site / 'repo-exports'))
+
+    updater = updater_for(site)
+    stats = updater.write_outputs(updater.pipeline(*updater.read_sources()), db_file)
+    assert stats['catalogue']['inserted'] == len(catalogue(db_file))
+    assert catalogue(db_file)['zorblaxtutor']['url'] == 'https://github.com/example/zorblax-tutor'
+
+    # What the quiz-tools build stage runs next: nothing to delete, write or blank out
+    updater = updater_for(site)
+    assert set(updater.check_outputs(*updater.read_sources()).values()) == {'unchanged'}
+    stats = updater.write_outputs(updater.pipeline(*updater.read_sources()), db_file)
+    assert stats['files']['written'] == 0
+    assert stats['catalogue']['deleted'] == 0 and stats['catalogue']['updated'] == 0
+
+    rows = catalogue(db_file)
+    assert (rows['zorblaxtutor']['stars'], rows['zorblaxtutor']['license']) == (12, 'MIT')
+    assert rows['gradelens']['stars'] == 3
+    engine = (site / 'recommendation_engine.js').read_text(encoding='utf-8')
+    shards = ''.join(path.read_text(encoding='utf-8') for path in (site / 'quiz-data').glob('*.json'))
+    assert 'zorblaxtutor' in shards and 'quiz-data/' in engine
+    # The page shows the ingested repositories, read back from their cards on every build
+    page = (site / 'index.html').read_text(encoding='utf-8')
+    assert page.count('data-name="zorblax-tutor"') == 1
+    assert 'fa-balance-scale mr-1"></i>MIT</span>' in page
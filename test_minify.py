@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Tests for the script minifier and the source maps it writes
+"""
+
+import json
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from minify import _BASE64, js_tokens, minify_css, minify_js, source_map
+
+ROOT = Path(__file__).resolve().parent
+
+
+def decode_mappings(mappings):
+    """(generated line, generated column, source line, source column) for each segment"""
+    segments = []
+    source_line = source_column = 0
+    for generated_line, line in enumerate(mappings.split(';')):
+        generated_column = 0
+        for segment in filter(None, line.split(',')):
+            values, value, shift = [], 0, 0
+            for char in segment:
+                digit = _BASE64.index(char)
+                value += (digit & 31) << shift
+                shift += 5
+                if not digit & 32:
+                    values.append(-(value >> 1) if value & 1 else value >> 1)
+                    value = shift = 0
+            generated_column += values[0]
+            source_line += values[2]
+            source_column += values[3]
+            segments.append((generated_line, generated_column, source_line, source_column))
+    return segments
+
+
+@pytest.mark.parametrize('source, expected', [
+    # A line break that ends a statement stays; one inside an expression goes
+    ('let a = 1\nlet b = a\n++b', 'let a=1\nlet b=a\n++b'),
+    ('a = b\n(c)', 'a=b\n(c)'),
+    ('value\n  .trim()\n  .length', 'value.trim().length'),
+    ('items = [1,\n  2,\n  3]', 'items=[1,2,3]'),
+    # return, break and friends end their statement at a line break whatever follows
+    ('return\nx', 'return\nx'),
+    ('throw\n(error)', 'throw\n(error)'),
+    # A comment containing a line break counts as one
+    ('a = 1 /* one\n two */ b = 2', 'a=1\nb=2'),
+    ('const ratio = total / count // per item\n/* note */ const next = 2',
+     'const ratio=total/count\nconst next=2'),
+])
+def test_line_breaks_follow_semicolon_insertion(source, expected):
+    assert minify_js(source)[0] == expected
+
+
+@pytest.mark.parametrize('source, kinds', [
+    ('x = a / b / c', ['word', 'punct', 'word', 'punct', 'word', 'punct', 'word']),
+    ('x = (a) / 2 / (b)', ['word', 'punct', 'punct', 'word', 'punct', 'punct', 'number', 'punct', 'punct',
+                           'word', 'punct']),
+    ('x = y.replace(/\\/+/g, "/")', ['word', 'punct', 'word', 'punct', 'word', 'punct', 'regex', 'punct',
+                                     'string', 'punct']),
+    ('if (a) return /[/]x/.test(s)', ['word', 'punct', 'word', 'punct', 'word', 'regex', 'punct', 'word',
+                                      'punct', 'word', 'punct']),
+    ('total++ / 2', ['word', 'punct', 'punct', 'number']),
+])
+def test_regex_or_division(source, kinds):
+    assert [kind for kind, _, _ in js_tokens(source) if kind not in ('space', 'comment')] == kinds
+
+
+def test_tokens_that_must_stay_apart():
+    assert minify_js('x = a + +b; y = a - -b')[0] == 'x=a+ +b;y=a- -b'
+    assert minify_js('n = 1 .toString()')[0] == 'n=1 .toString()'
+    assert minify_js('if (a < !b) c--  > d')[0] == 'if(a< !b)c-- >d'
+
+
+def test_nested_template_literals_are_kept_verbatim():
+    source = 'const t = `a  ${ `b ${ {k: 1}.k }  c` }  /* not a comment */ d`\nnext()'
+    code, _ = minify_js(source)
+    assert code == 'const t=`a  ${`b ${{k:1}.k}  c`}  /* not a comment */ d`\nnext()'
+    assert [text for kind, text, _ in js_tokens(source) if kind == 'template'] == [
+        '`a  ${', '`b ${', '}  c`', '}  /* not a comment */ d`']
+    with pytest.raises(ValueError):
+        minify_js('x = `open ${ y }')
+
+
+def test_source_map_segments_point_at_the_same_tokens():
+    source = ('// header\nfunction greet(name) {\n    const text = `Hi ${name} 😀`;\n'
+              '    return text\n        .trim();\n}\n')
+    code, mappings = minify_js(source, line=3, column=2)
+    assert decode_mappings(json.loads(source_map('out.js', 'src.js', source, mappings))['mappings']) == mappings
+
+    # The script starts two columns into the fourth line of its page
+    source_lines = ('\n\n\n  ' + source).split('\n')
+    code_lines = code.split('\n')
+    for generated_line, generated_column, line, column in mappings:
+        # Columns count UTF-16 units; the emoji is the only character outside the BMP
+        generated = code_lines[generated_line].encode('utf-16-le')[generated_column * 2:].decode('utf-16-le')
+        original = source_lines[line].encode('utf-16-le')[column * 2:].decode('utf-16-le')
+        token = next(text for kind, text, _ in js_tokens(generated) if kind not in ('space', 'newline'))
+        assert original.startswith(token.split('\n')[0])
+
+
+def test_minify_css_keeps_strings_and_descendant_pseudo_classes():
+    assert minify_css('a  >  b { content: "  x ; y  " ;  color: red ; }\n/* c */ p :hover{}') == \
+        'a>b{content:"  x ; y  ";color:red}p :hover{}'
+
+
+@pytest.mark.skipif(not shutil.which('node'), reason='node is not installed')
+def test_minified_engine_still_parses(tmp_path):
+    code, _ = minify_js((ROOT / 'recommendation_engine.js').read_text(encoding='utf-8'))
+    script = tmp_path / 'engine.min.js'
+    script.write_text(code, encoding='utf-8')
+    subprocess.run(['node', '--check', str(script)], check=True)
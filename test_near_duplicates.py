@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Tests for MinHash signatures and the LSH band layout in near_duplicates
+"""
+
+import os
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+from near_duplicates import (NUM_PERM, MinHasher, NearDuplicateIndex, band_layout, find_clusters, jaccard,
+                             tool_shingles)
+
+ROOT = Path(__file__).resolve().parent
+WORDS = {'adaptive', 'quiz', 'maker', 'students', 'python'}
+
+
+def twin_sets(prefix, shared, only_first, only_second):
+    """Two word sets with `shared` words in common and the rest unique to each"""
+    common = {f'{prefix}-shared{i}' for i in range(shared)}
+    return (common | {f'{prefix}-first{i}' for i in range(only_first)},
+            common | {f'{prefix}-second{i}' for i in range(only_second)})
+
+
+class SignatureTest(unittest.TestCase):
+
+    def test_signature_is_deterministic(self):
+        signature = MinHasher().signature(WORDS)
+        self.assertEqual(len(signature), NUM_PERM)
+        self.assertEqual(MinHasher().signature(sorted(WORDS, reverse=True)), signature)
+        self.assertNotEqual(MinHasher(seed=2).signature(WORDS), signature)
+
+    def test_signature_is_stable_across_processes(self):
+        # str hashing is salted per process; signatures must not be
+        code = ("from near_duplicates import MinHasher; "
+                f"print(MinHasher().signature({sorted(WORDS)!r})[:8])")
+        env = dict(os.environ, PYTHONHASHSEED='12345')
+        output = subprocess.run([sys.executable, '-c', code], cwd=ROOT, env=env,
+                                capture_output=True, text=True, check=True).stdout
+        self.assertEqual(output.strip(), str(MinHasher().signature(WORDS)[:8]))
+
+    def test_empty_signature_matches_nothing_real(self):
+        hasher = MinHasher(num_perm=16)
+        self.assertNotEqual(hasher.signature([]), hasher.signature({'quiz'}))
+
+
+class BandLayoutTest(unittest.TestCase):
+
+    def test_default_layout(self):
+        self.assertEqual(band_layout(NUM_PERM, 0.3), (85, 3))
+
+    def test_curve_rises_just_below_the_threshold(self):
+        for threshold in (0.1, 0.3, 0.5, 0.8):
+            bands, rows = band_layout(NUM_PERM, threshold)
+            self.assertLessEqual(bands * rows, NUM_PERM)
+            self.assertLessEqual((1 / bands) ** (1 / rows), threshold)
+            # One more row per band would move the rise past the threshold
+            more_rows = NUM_PERM // (rows + 1)
+            self.assertGreater((1 / more_rows) ** (1 / (rows + 1)), threshold)
+
+    def test_similar_pairs_share_a_bucket_and_dissimilar_ones_rarely_do(self):
+        similar, dissimilar = NearDuplicateIndex(), NearDuplicateIndex()
+        for i in range(100):
+            first, second = twin_sets(f'near{i}', 6, 2, 2)       # Jaccard 0.6
+            similar.add(f'{i}a', first)
+            similar.add(f'{i}b', second)
+            first, second = twin_sets(f'far{i}', 1, 10, 9)       # Jaccard 0.05
+            dissimilar.add(f'{i}a', first)
+            dissimilar.add(f'{i}b', second)
+        self.assertEqual(len(similar.pairs()), 100)
+        self.assertLess(len(dissimilar.candidate_pairs()), 5)
+        self.assertEqual(dissimilar.pairs(), [])
+
+    def test_candidates_are_confirmed_at_the_threshold(self):
+        index = NearDuplicateIndex(threshold=0.3)
+        at, below = twin_sets('at', 3, 3, 4), twin_sets('below', 3, 4, 4)
+        self.assertEqual(jaccard(*at), 0.3)
+        for key, words in (('at-a', at[0]), ('at-b', at[1]), ('below-a', below[0]), ('below-b', below[1])):
+            index.add(key, words)
+        # Whatever the buckets yield, only pairs at or above the threshold are kept
+        confirmed = {(first, second) for first, second, _ in index.pairs()}
+        self.assertNotIn(('below-a', 'below-b'), confirmed)
+        self.assertTrue(confirmed <= {('at-a', 'at-b')})
+
+
+class ClusterTest(unittest.TestCase):
+
+    def test_clusters_join_chains_in_insertion_order(self):
+        index = NearDuplicateIndex()
+        base = {'quiz', 'maker', 'for', 'lecturers', 'grading'}
+        index.add('b', base)
+        index.add('a', base | {'python'})
+        index.add('c', base | {'python', 'export'})
+        index.add('lonely', {'slide', 'deck'})
+        index.add('empty', set())
+        self.assertEqual(index.clusters(), [['b', 'a', 'c']])
+
+    def test_find_clusters_uses_engine_ids(self):
+        tools = [{'name': 'Headless CMS React', 'description': 'A headless CMS with a React admin',
+                  'topics': 'cms headless'},
+                 {'name': 'Headless CMS Vanilla', 'description': 'A headless CMS with a vanilla JS admin',
+                  'topics': 'cms headless'}]
+        self.assertEqual(tool_shingles(tools[0]), {'headless', 'cms', 'react', 'admin'})
+        self.assertEqual(find_clusters(tools), {'headlesscmsreact': 'headlesscmsreact',
+                                                'headlesscmsvanilla': 'headlesscmsreact'})
+
+
+if __name__ == '__main__':
+    unittest.main()
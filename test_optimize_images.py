@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Tests for lossless PNG re-encoding and rewriting the images in pages and OOXML packages
+"""
+
+import base64
+import random
+import re
+import struct
+import zipfile
+import zlib
+
+import pytest
+
+from optimize_images import ImageOptimizer, Png, optimize_png, rgba_pixels
+
+
+def png_bytes(width, height, color_type, samples, extra=()):
+    """A deliberately loose PNG: filter type 0 on every row, stored without compression"""
+    def chunk(kind, body):
+        return struct.pack('>I', len(body)) + kind + body + struct.pack('>I', zlib.crc32(kind + body))
+    row = len(samples) // height
+    raw = b''.join(b'\x00' + samples[y * row:(y + 1) * row] for y in range(height))
+    return (b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, color_type, 0, 0, 0))
+            + b''.join(chunk(kind, body) for kind, body in extra)
+            + chunk(b'IDAT', zlib.compress(raw, 0)) + chunk(b'IEND', b''))
+
+
+def scatter(colors, count=48 * 32):
+    """RGBA pixels drawn from a few colors in a seeded order, too noisy to compress well unpaletted"""
+    rng = random.Random(43)
+    return b''.join(bytes(rng.choice(colors)) for _ in range(count))
+
+
+OPAQUE = scatter([(255, 0, 0, 255), (0, 0, 255, 255), (0, 128, 0, 255)])
+TRANSLUCENT = scatter([(255, 0, 0, 255), (0, 0, 0, 0), (0, 0, 255, 128)])
+GRADIENT = b''.join(bytes((x * 8, y * 8, (x * y) % 256, 255)) for y in range(32) for x in range(32))
+
+
+def drop_alpha(rgba):
+    return bytes(byte for i, byte in enumerate(rgba) if i % 4 != 3)
+
+
+@pytest.mark.parametrize('width, height, color_type, samples, rgba, palette', [
+    (48, 32, 6, OPAQUE, OPAQUE, True),
+    (48, 32, 6, TRANSLUCENT, TRANSLUCENT, True),
+    (48, 32, 2, drop_alpha(OPAQUE), OPAQUE, True),
+    (32, 32, 6, GRADIENT, GRADIENT, False),
+    (16, 8, 0, bytes(range(0, 256, 2)), b''.join(bytes((v, v, v, 255)) for v in range(0, 256, 2)), False),
+], ids=['opaque-rgba', 'translucent-rgba', 'rgb', 'gradient', 'gray'])
+def test_reencoding_is_smaller_and_lossless(width, height, color_type, samples, rgba, palette):
+    original = png_bytes(width, height, color_type, samples)
+    optimized = optimize_png(original)
+    assert len(optimized) < len(original)
+
+    png = Png(optimized)
+    assert (png.width, png.height) == (width, height)
+    assert (png.color_type == 3) == palette
+    assert rgba_pixels(png) == rgba
+    # A second pass has nothing left to gain
+    assert optimize_png(optimized) == optimized
+
+
+def test_descriptive_chunks_survive_and_the_rest_are_dropped():
+    physical = struct.pack('>IIB', 2835, 2835, 1)
+    optimized = optimize_png(png_bytes(48, 32, 6, OPAQUE, [(b'pHYs', physical), (b'tEXt', b'Comment\x00hello')]))
+    kinds = [kind for kind, _ in Png(optimized).chunks]
+    assert Png(optimized).chunk(b'pHYs') == physical
+    assert b'tEXt' not in kinds and kinds[0] == b'IHDR' and kinds[-1] == b'IEND'
+
+
+@pytest.mark.parametrize('data', [b'GIF89a', png_bytes(4, 4, 6, OPAQUE[:64])[:40], b''],
+                         ids=['gif', 'truncated', 'empty'])
+def test_unreadable_images_are_left_alone(data):
+    assert optimize_png(data) is data
+
+
+def data_uri(data):
+    return 'data:image/png;base64,' + base64.b64encode(data).decode('ascii')
+
+
+def test_run_rewrites_pages_and_packages_then_hits_the_cache(tmp_path):
+    image = png_bytes(48, 32, 6, OPAQUE)
+    page = tmp_path / 'handout.html'
+    page.write_text(f'<p>Figures</p><img src="{data_uri(image)}" alt="a">'
+                    f'<img src="{data_uri(image)}" width="96" loading="eager"><img src="photo.png">',
+                    encoding='utf-8')
+    package = tmp_path / 'notes.docx'
+    with zipfile.ZipFile(package, 'w', zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('word/document.xml', '<w:document/>')
+        archive.writestr('word/media/image1.png', image)
+        archive.writestr('word/media/image2.png', b'not really a png')
+
+    optimizer = ImageOptimizer(jobs=1, cache_dir=tmp_path / 'cache')
+    assert optimizer.run([page, package])['written'] == 2
+    assert optimizer.stats == {'images': 2, 'cached': 0, 'optimized': 1}
+
+    html = page.read_text(encoding='utf-8')
+    first, second = re.findall(r'<img [^>]*src="data:[^>]*>', html)
+    assert 'width="48" height="32" loading="lazy" decoding="async"' in first
+    assert 'width="96" loading="eager" height="64" decoding="async"' in second
+    assert '<img src="photo.png">' in html
+    [uri] = set(re.findall(r'data:image/png;base64,[^"]+', html))
+    assert rgba_pixels(Png(base64.b64decode(uri.split(',')[1]))) == OPAQUE
+
+    with zipfile.ZipFile(package) as archive:
+        assert archive.namelist() == ['word/document.xml', 'word/media/image1.png', 'word/media/image2.png']
+        assert archive.read('word/media/image1.png') == base64.b64decode(uri.split(',')[1])
+        assert archive.read('word/media/image2.png') == b'not really a png'
+        assert archive.getinfo('word/media/image1.png').compress_type == zipfile.ZIP_DEFLATED
+
+    # The optimized images are cached under their own hashes, so nothing is recomputed or rewritten
+    rerun = ImageOptimizer(jobs=1, cache_dir=tmp_path / 'cache')
+    assert rerun.run([page, package])['written'] == 0
+    assert rerun.stats['cached'] == rerun.stats['images'] == 2
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Tests for Range, If-Range and ETag handling in the preview server
+"""
+
+import asyncio
+import hashlib
+import tempfile
+import unittest
+from pathlib import Path
+
+from preview_server import PreviewServer, byte_range, etag_matches
+
+BODY = bytes(range(256)) * 8
+
+
+class ByteRangeTest(unittest.TestCase):
+    def test_satisfiable_ranges(self):
+        self.assertEqual(byte_range('bytes=0-9', 100), (0, 9))
+        self.assertEqual(byte_range('bytes=90-', 100), (90, 99))
+        self.assertEqual(byte_range('bytes=90-500', 100), (90, 99))
+        self.assertEqual(byte_range('bytes=-10', 100), (90, 99))
+        self.assertEqual(byte_range('bytes=-500', 100), (0, 99))
+        self.assertEqual(byte_range(' bytes=5-5 ', 100), (5, 5))
+
+    def test_headers_that_mean_the_whole_file(self):
+        for header in ('bytes=5-2', 'bytes=-', 'bytes=0-1,5-6', 'items=0-9', 'bytes=a-b', ''):
+            with self.subTest(header=header):
+                self.assertIsNone(byte_range(header, 100))
+
+    def test_unsatisfiable_ranges(self):
+        for header, size in (('bytes=100-', 100), ('bytes=100-200', 100), ('bytes=-0', 100), ('bytes=-5', 0)):
+            with self.subTest(header=header, size=size):
+                with self.assertRaises(ValueError):
+                    byte_range(header, size)
+
+    def test_etag_matches(self):
+        self.assertTrue(etag_matches('"a", "b"', '"b"'))
+        self.assertTrue(etag_matches('W/"b"', '"b"'))
+        self.assertTrue(etag_matches('*', '"b"'))
+        self.assertFalse(etag_matches('', '"b"'))
+        self.assertFalse(etag_matches('"b-gzip"', '"b"'))
+
+
+class ServeFileTest(unittest.IsolatedAsyncioTestCase):
+    """Requests against a live server on a free port"""
+
+    async def asyncSetUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        root = Path(self.tmp.name)
+        (root / 'data.bin').write_bytes(BODY)
+        self.etag = f'"{hashlib.sha256(BODY).hexdigest()[:32]}"'
+        self.preview = PreviewServer(str(root), live_reload=False)
+        self.server = await asyncio.start_server(self.preview.handle, '127.0.0.1', 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def asyncTearDown(self):
+        self.server.close()
+        await self.server.wait_closed()
+        self.tmp.cleanup()
+
+    async def get(self, **headers):
+        reader, writer = await asyncio.open_connection('127.0.0.1', self.port)
+        lines = ['GET /data.bin HTTP/1.1', 'Host: localhost', 'Connection: close']
+        lines.extend(f"{name.replace('_', '-')}: {value}" for name, value in headers.items())
+        writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1'))
+        response = await reader.read()
+        writer.close()
+        head, _, body = response.partition(b'\r\n\r\n')
+        status_line, *fields = head.decode('latin-1').split('\r\n')
+        fields = dict(field.split(': ', 1) for field in fields)
+        return int(status_line.split(' ')[1]), fields, body
+
+    async def test_full_file_carries_the_content_etag(self):
+        status, fields, body = await self.get()
+        self.assertEqual((status, body), (200, BODY))
+        self.assertEqual(fields['ETag'], self.etag)
+        self.assertEqual(fields['Accept-Ranges'], 'bytes')
+
+    async def test_range_is_sent_as_partial_content(self):
+        status, fields, body = await self.get(Range='bytes=10-19')
+        self.assertEqual((status, body), (206, BODY[10:20]))
+        self.assertEqual(fields['Content-Range'], f'bytes 10-19/{len(BODY)}')
+        self.assertEqual(self.preview.stats['partial'], 1)
+
+    async def test_inverted_range_serves_the_whole_file(self):
+        status, fields, body = await self.get(Range='bytes=5-2')
+        self.assertEqual((status, int(fields['Content-Length']), body), (200, len(BODY), BODY))
+
+    async def test_range_past_the_end_is_unsatisfiable(self):
+        status, fields, body = await self.get(Range=f'bytes={len(BODY)}-')
+        self.assertEqual((status, body), (416, b''))
+        self.assertEqual(fields['Content-Range'], f'bytes */{len(BODY)}')
+
+    async def test_if_range_only_honours_the_current_etag(self):
+        status, _, body = await self.get(Range='bytes=0-3', If_Range=self.etag)
+        self.assertEqual((status, body), (206, BODY[:4]))
+        status, _, body = await self.get(Range='bytes=0-3', If_Range='"stale"')
+        self.assertEqual((status, body), (200, BODY))
+
+    async def test_if_none_match(self):
+        status, fields, body = await self.get(If_None_Match=self.etag)
+        self.assertEqual((status, body), (304, b''))
+        self.assertEqual(fields['ETag'], self.etag)
+        self.assertEqual(self.preview.stats['not_modified'], 1)
+
+        status, _, _ = await self.get(If_None_Match='"stale"')
+        self.assertEqual(status, 200)
+
+
+if __name__ == '__main__':
+    unittest.main()
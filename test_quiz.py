@@ -186,11 +186,11 @@ def verify_file_integrity():
     if quiz_file.exists():
         content = quiz_file.read_text()
         required_elements = [
-            "ToolRecommendationEngine",
+            '<script src="recommendation_engine.js" defer>',
             "question-1",
             "question-8", 
             "results",
-            "calculateRecommendations"
+            "recommendationEngine.recommend("
         ]
         
         missing_elements = [elem for elem in required_elements if elem not in content]
@@ -210,6 +210,16 @@ def verify_file_integrity():
             print("❌ Index HTML missing quiz links")
             all_files_ok = False
     
+    # Check that relative links and assets resolve across the site
+    from check_links import LinkChecker
+    broken_links = LinkChecker().check()
+    if broken_links:
+        for page, problems in broken_links.items():
+            print(f"❌ {page} has broken links: {problems}")
+        all_files_ok = False
+    else:
+        print("✅ All relative links and assets resolve")
+    
     print(f"\nFile integrity: {'✅ PASSED' if all_files_ok else '❌ FAILED'}")
     return all_files_ok
 
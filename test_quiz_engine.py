@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Tests that quiz_engine ranks tools exactly as recommendation_engine.js does
+"""
+
+import json
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from quiz_engine import DEFAULT_SCORE_WEIGHTS, RecommendationEngine, merge_score_weights
+
+ROOT = Path(__file__).resolve().parent
+
+# Loads every shard up front, then prints one JSON result per line of answers read from stdin
+NODE_HARNESS = r"""
+const fs = require('fs');
+const path = require('path');
+global.performance = global.performance || { mark() {}, measure() {} };
+const Engine = require(path.join(process.argv[1], 'recommendation_engine.js'));
+const engine = new Engine();
+for (const shard of Object.values(engine.shards)) {
+    const file = path.join(process.argv[1], shard.url.split('?')[0]);
+    engine.addShard(JSON.parse(fs.readFileSync(file, 'utf8')));
+}
+const out = [];
+for (const line of fs.readFileSync(0, 'utf8').split('\n')) {
+    if (!line) continue;
+    const result = engine.calculateRecommendations(JSON.parse(line));
+    out.push(JSON.stringify({
+        recommendations: result.recommendations.map(tool => tool.id),
+        topCategories: result.topCategories.map(category => [category.name, category.weight]),
+        profile: result.userProfile.title
+    }));
+}
+process.stdout.write(out.join('\n') + '\n');
+"""
+
+
+@pytest.fixture(scope='module')
+def engine():
+    return RecommendationEngine.from_js_file(str(ROOT / 'recommendation_engine.js'))
+
+
+def run_js_engine(answer_sets):
+    stdin = ''.join(json.dumps(answers) + '\n' for answers in answer_sets)
+    result = subprocess.run(['node', '-e', NODE_HARNESS, str(ROOT)], input=stdin,
+                            capture_output=True, text=True, check=True)
+    return [json.loads(line) for line in result.stdout.splitlines()]
+
+
+@pytest.mark.skipif(shutil.which('node') is None, reason="node is not installed")
+def test_python_engine_matches_js_engine(engine):
+    answer_sets = list(engine.answer_space())
+    js_results = run_js_engine(answer_sets)
+    assert len(js_results) == len(answer_sets)
+
+    for answers, js in zip(answer_sets, js_results):
+        py = engine.recommend(answers)
+        assert py['recommendations'] == js['recommendations'], answers
+        assert [[c['name'], c['weight']] for c in py['topCategories']] == js['topCategories'], answers
+        assert py['userProfile']['title'] == js['profile'], answers
+
+
+def test_merge_score_weights_defaults():
+    assert merge_score_weights(None) == DEFAULT_SCORE_WEIGHTS
+
+
+def test_merge_score_weights_keeps_unset_priorities():
+    weights = merge_score_weights({'priority': {'high': 10}, 'context': 1})
+    assert weights['priority'] == dict(DEFAULT_SCORE_WEIGHTS['priority'], high=10)
+    assert weights['context'] == 1
+    assert DEFAULT_SCORE_WEIGHTS['priority']['high'] != 10
+
+
+@pytest.mark.parametrize('overrides', [
+    {'unknown': 1},
+    {'priority': {'urgent': 1}},
+    {'priority': 3},
+    {'context': '2'},
+    {'subject': True},
+    {'priority': {'high': None}},
+])
+def test_merge_score_weights_rejects_bad_overrides(overrides):
+    with pytest.raises(ValueError):
+        merge_score_weights(overrides)
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Tests for answer validation, the response cache and engine reloads in recommend_api
+"""
+
+import asyncio
+import hashlib
+import json
+import re
+import shutil
+from pathlib import Path
+
+import pytest
+
+from recommend_api import RecommendationService, answer_key, check_shards
+
+ROOT = Path(__file__).resolve().parent
+
+ANSWERS = {'q1': 'university', 'q2': 'technology', 'q3': 'advanced', 'q4': 'technical',
+           'q5': 'project_based', 'q6': 'data_analysis', 'q7': 'significant', 'q8': 'technical_skills'}
+
+
+@pytest.fixture
+def js_file(tmp_path):
+    """A copy of the engine and its shards that tests can regenerate"""
+    shutil.copy(ROOT / 'recommendation_engine.js', tmp_path / 'recommendation_engine.js')
+    shutil.copytree(ROOT / 'quiz-data', tmp_path / 'quiz-data')
+    return tmp_path / 'recommendation_engine.js'
+
+
+@pytest.fixture
+def service(js_file):
+    service = RecommendationService(str(js_file), cache_size=2)
+    service.use_engine(*service.load_engine())
+    return service
+
+
+def request(answers):
+    return json.dumps({'answers': answers}).encode('utf-8')
+
+
+def rewrite_shard(js_file, name, fix_version):
+    """Change one shard as a regeneration would; optionally update the engine's ?v= to match"""
+    shard = js_file.parent / 'quiz-data' / name
+    tools = json.loads(shard.read_text(encoding='utf-8'))
+    shard.write_text(json.dumps(tools, indent=1), encoding='utf-8')
+    if fix_version:
+        version = hashlib.sha256(shard.read_bytes()).hexdigest()[:10]
+        engine = js_file.read_text(encoding='utf-8')
+        js_file.write_text(re.sub(rf"(quiz-data/{re.escape(name)}\?v=)[0-9a-f]+", rf"\g<1>{version}", engine),
+                           encoding='utf-8')
+
+
+def test_answer_key_orders_answers_by_question(service):
+    key = answer_key(service.engine, request({'q3': 'advanced', 'q1': 'university'}))
+    assert key == ('university', None, 'advanced', None, None, None, None, None)
+    assert answer_key(service.engine, request(dict(ANSWERS, q2=None)))[1] is None
+
+
+@pytest.mark.parametrize('body, message', [
+    (b'{nope', 'invalid JSON'),
+    (b'\xff', 'invalid JSON'),
+    (b'[]', "needs an 'answers' object"),
+    (request([]), "needs an 'answers' object"),
+    (request(dict(ANSWERS, q9='x', extra='y')), 'unknown questions: extra, q9'),
+    (request({'q1': 'castle'}), "invalid answer for q1: 'castle'"),
+    (request({'q1': ['university']}), 'invalid answer for q1'),
+])
+def test_bad_requests_are_rejected(service, body, message):
+    status, response = service.recommend(body)
+    assert status == 400 and message in json.loads(response)['error']
+    assert service.stats['rejected'] == 1
+
+
+def test_equal_answers_share_a_cached_response(service):
+    status, first = service.recommend(request(ANSWERS))
+    assert status == 200 and json.loads(first)['tools']
+    # Key order and explicit nulls do not make a different entry
+    reordered = dict(reversed(list(ANSWERS.items())))
+    assert service.recommend(request(reordered)) == (200, first)
+    service.recommend(request({'q1': 'university'}))
+    service.recommend(request({'q1': 'university', 'q2': None}))
+
+    stats = service.cache_stats()
+    assert (stats['cache_hits'], stats['cache_misses'], stats['cache_entries']) == (2, 2, 2)
+
+
+def test_shard_version_mismatch_keeps_the_loaded_engine(service, js_file):
+    rewrite_shard(js_file, 'utility.json', fix_version=False)
+    with pytest.raises(ValueError, match='utility.json does not match the engine'):
+        check_shards(js_file)
+
+    async def poll_once():
+        service.reload_interval = 0
+        task = asyncio.create_task(service._reload_periodically())
+        while not service.stats['reload_errors']:
+            await asyncio.sleep(0.01)
+        task.cancel()
+
+    engine = service.engine
+    asyncio.run(poll_once())
+    assert service.engine is engine and service.stats['loads'] == 1
+    assert service.recommend(request(ANSWERS))[0] == 200
+
+    # Once the engine names the new version the next poll swaps it in with an empty cache
+    rewrite_shard(js_file, 'utility.json', fix_version=True)
+    service.use_engine(*service.load_engine())
+    assert service.engine is not engine and service.stats['loads'] == 2
+    assert service.cache_stats()['cache_entries'] == 0
+    assert service.load_engine() is None
+
+
+def test_http_keep_alive(service):
+    async def exchange():
+        server = await asyncio.start_server(service.handle, '127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        responses = []
+        for method, path, body in [('POST', '/recommend', request(ANSWERS)),
+                                   ('POST', '/recommend', request({'q0': 'x'})),
+                                   ('GET', '/stats', b''), ('GET', '/recommend', b'')]:
+            writer.write(f"{method} {path} HTTP/1.1\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body)
+            head = (await reader.readuntil(b'\r\n\r\n')).decode('latin-1')
+            length = int(re.search(r'Content-Length: (\d+)', head).group(1))
+            responses.append((int(head.split(' ')[1]), await reader.readexactly(length)))
+        writer.close()
+        server.close()
+        await server.wait_closed()
+        return responses
+
+    responses = asyncio.run(exchange())
+    assert [status for status, _ in responses] == [200, 400, 200, 405]
+    assert json.loads(responses[2][1])['rejected'] == 1
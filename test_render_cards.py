@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Tests that repo cards survive parse -> categorize -> render, from the page and from catalogue.db
+"""
+
+from pathlib import Path
+
+import pytest
+
+from catalogue_db import CatalogueDatabase
+from render_cards import (NO_DESCRIPTION, SECTIONS, CardRenderer, card_fields, main_span, parse_card,
+                          render_card)
+from update_quiz_tools import QuizToolUpdater
+
+ROOT = Path(__file__).resolve().parent
+PAGE = (ROOT / 'index.html').read_text(encoding='utf-8')
+
+
+@pytest.fixture(scope='module')
+def tools():
+    updater = QuizToolUpdater(str(ROOT / 'index.html'))
+    return list(updater.categorize_tools(updater.parse_tools(PAGE)))
+
+
+def test_page_renders_back_byte_for_byte(tools):
+    start, end = main_span(PAGE)
+    assert CardRenderer().render_main(tools) == PAGE[start:end]
+
+
+def test_catalogue_renders_the_same_page(tools, tmp_path):
+    with CatalogueDatabase(str(tmp_path / 'catalogue.db')) as db:
+        db.sync(tools, {})
+        page = CardRenderer().replace_main(PAGE, db.cards([category for category, _, _ in SECTIONS]))
+    assert page == PAGE
+
+
+def test_parse_card_reads_repository_details(tools):
+    by_slug = {tool['slug']: tool for tool in tools}
+    deep_talk = by_slug['deep-talk']
+    assert deep_talk['url'] == 'https://github.com/michael-borck/deep-talk'
+    assert deep_talk['docs'] == 'https://michael-borck.github.io/deep-talk/'
+    assert deep_talk['stars'] == 1 and deep_talk['languages'] == ['TypeScript', 'JavaScript', 'HTML']
+    assert deep_talk['release']['version'] == 'v0.1.1'
+    assert [platform for _, platform in deep_talk['release']['downloads']] == ['linux', 'apple', 'windows']
+
+    assert by_slug['insight-lens']['homepage'] == 'https://michael-borck.github.io/insight-lens/'
+    assert by_slug['curriculum-curator']['summary'] == ''
+    assert sum('license' in tool for tool in tools) == PAGE.count('fa-balance-scale')
+    assert sum('forks' in tool for tool in tools) == PAGE.count('fa-code-branch')
+
+
+def test_new_card_round_trips_through_its_own_markup():
+    tool = {'name': 'Quote "Lab"', 'slug': 'quote-lab', 'original_category': 'python-package',
+            'summary': 'Parses <b>quotes</b> & "citations"', 'topics': 'citations nlp',
+            'roles': [{'role': 'researcher', 'confidence': 'high'}], 'primary_role': 'researcher',
+            'stars': 7, 'forks': 2, 'license': 'MIT', 'languages': ['Python'],
+            'homepage': 'https://example.org/?a=1&b=2',
+            'release': {'version': 'v1.0', 'downloads': [['https://example.org/q.whl', 'python']]}}
+    card = render_card(card_fields(tool))
+    assert 'data-description="parses &lt;b&gt;quotes&lt;/b&gt; &amp; &quot;citations&quot;"' in card
+
+    details = parse_card(card)
+    assert details == {key: tool[key] for key in ('summary', 'stars', 'forks', 'license', 'languages',
+                                                  'homepage', 'release')} | {
+        'url': 'https://github.com/michael-borck/quote-lab'}
+
+
+def test_missing_description_keeps_empty_search_text():
+    tool = {'name': 'bare', 'original_category': 'web-application', 'summary': '', 'description': '',
+            'topics': '', 'roles': [], 'primary_role': 'lecturer'}
+    card = render_card(card_fields(tool))
+    assert 'data-description=""' in card and f'>{NO_DESCRIPTION}</p>' in card
+    assert parse_card(card)['summary'] == ''
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Tests for replaying logged sessions against candidate rule sets
+"""
+
+import json
+import random
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from collect_submissions import QUESTIONS, connect
+from quiz_engine import RecommendationEngine
+from replay_sessions import SessionReplayer, load_candidates, read_sessions, summarize
+
+ROOT = Path(__file__).resolve().parent
+
+
+@pytest.fixture(scope='module')
+def sessions():
+    """A seeded mix of full and partial answer sets"""
+    engine = RecommendationEngine.from_js_file(str(ROOT / 'recommendation_engine.js'))
+    rng = random.Random(33)
+    records = []
+    for _ in range(300):
+        answers = {q: rng.choice(sorted(engine.question_weights[q])) for q in engine.questions
+                   if rng.random() < 0.9}
+        records.append(json.dumps({'answers': answers}) + '\n')
+    return records
+
+
+def write_candidate(directory, name, spec):
+    path = directory / f"{name}.json"
+    path.write_text(json.dumps(spec), encoding='utf-8')
+    return str(path)
+
+
+def test_sessions_come_from_jsonl_or_the_collector_database(tmp_path, sessions):
+    log = tmp_path / 'sessions.jsonl'
+    log.write_text(sessions[0] + '\n  \n' + sessions[1], encoding='utf-8')
+    assert list(read_sessions(str(log))) == sessions[:2]
+
+    db_path = str(tmp_path / 'submissions.db')
+    conn = connect(db_path)
+    answers = json.loads(sessions[0])['answers']
+    conn.execute(f"INSERT INTO submissions (received_at, {', '.join(QUESTIONS)}, tools) "
+                 f"VALUES (0, {', '.join('?' * len(QUESTIONS))}, 'a,b')",
+                 [answers.get(q) for q in QUESTIONS])
+    conn.commit()
+    conn.close()
+    [record] = read_sessions(db_path)
+    assert json.loads(record)['answers'] == {q: answers.get(q) for q in QUESTIONS}
+
+
+def test_candidates_are_validated_before_replay(tmp_path):
+    assert load_candidates([write_candidate(tmp_path, 'flat', {'score_weights': {'context': 0}})]) == {
+        'flat': {'score_weights': {'context': 0}}}
+    for name, spec, message in [
+        ('typo', {'scroe_weights': {}}, 'unknown keys scroe_weights'),
+        ('weights', {'score_weights': {'context': 'high'}}, 'weights.json'),
+        ('rules', {'context_rules': 'not a table'}, 'rules.json'),
+    ]:
+        with pytest.raises(ValueError, match=message):
+            load_candidates([write_candidate(tmp_path, name, spec)])
+
+
+def test_replay_measures_churn_against_the_current_engine(tmp_path, sessions):
+    candidates = load_candidates([
+        write_candidate(tmp_path, 'same', {}),
+        write_candidate(tmp_path, 'priority_only', {'score_weights': {'context': 0, 'subject': 0, 'tech_level': 0}}),
+        write_candidate(tmp_path, 'one_favourite', {'high_priority_tools': ['hands-on-ai']}),
+    ])
+    lines = iter(sessions + ['{not json\n', '{"answers": {"q1": 7}}\n', '[1]\n'])
+    totals = SessionReplayer(candidates, jobs=2).replay(lines)
+    assert (totals['sessions'], totals['invalid']) == (300, 3)
+
+    summary = summarize(totals, top=3)['candidates']
+    assert summary['same']['changed_rate'] == 0 and summary['same']['exposure_deltas'] == []
+    assert summary['priority_only']['changed_rate'] > 0.5
+    assert 0 < summary['one_favourite']['changed_rate'] < 1
+    # Every session shows the same number of tools, so exposure moves between tools
+    for name in ('priority_only', 'one_favourite'):
+        assert sum(totals['exposure'][name].values()) == sum(totals['exposure']['current'].values())
+        assert len(summary[name]['exposure_deltas']) == 3
+
+
+def test_cli_exit_status(tmp_path, sessions):
+    log = tmp_path / 'sessions.jsonl'
+    log.write_text(''.join(sessions[:20]), encoding='utf-8')
+    command = [sys.executable, str(ROOT / 'replay_sessions.py'), str(log), '--jobs', '1']
+
+    result = subprocess.run(command + [write_candidate(tmp_path, 'same', {}), '--json'],
+                            capture_output=True, text=True, cwd=tmp_path)
+    assert result.returncode == 0
+    assert json.loads(result.stdout)['candidates']['same']['changed_rate'] == 0
+
+    result = subprocess.run(command + [write_candidate(tmp_path, 'bad', {'extra': 1})],
+                            capture_output=True, text=True, cwd=tmp_path)
+    assert result.returncode == 1 and result.stdout.startswith('ERROR: ') and 'unknown keys extra' in result.stdout
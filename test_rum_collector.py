@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Tests for the timing histograms, beacon validation and series cap in rum_collector
+"""
+
+import asyncio
+import json
+import math
+import random
+
+import pytest
+
+from rum_collector import (BUCKETS, BUCKETS_PER_DOUBLING, MAX_MS, MAX_TIMINGS, MIN_MS, LogHistogram,
+                           TimingCollector, connect, parse_beacon, report)
+
+STEP = 2 ** (1 / BUCKETS_PER_DOUBLING)
+
+
+def beacon(timings, page='quiz', build='abc123', **extra) -> bytes:
+    return json.dumps(dict({'build': build, 'page': page, 'timings': timings}, **extra)).encode('utf-8')
+
+
+@pytest.mark.parametrize('index', [1, 2, 8, 9, 100, BUCKETS - 2])
+def test_bucket_boundaries(index):
+    lower = MIN_MS * STEP ** (index - 1)
+    assert LogHistogram.bucket(lower * 1.0001) == index
+    assert LogHistogram.bucket(lower * STEP * 0.9999) == index
+    assert LogHistogram.bucket(lower * 0.9999) == index - 1
+    # The representative value lies inside its own bucket
+    assert LogHistogram.bucket(LogHistogram.bucket_value(index)) == index
+
+
+def test_out_of_range_values_land_in_the_end_buckets():
+    assert LogHistogram.bucket(0) == 0 and LogHistogram.bucket(MIN_MS / 2) == 0
+    assert LogHistogram.bucket(MIN_MS) == 1
+    assert LogHistogram.bucket(MAX_MS) < BUCKETS - 1
+    assert LogHistogram.bucket(MIN_MS * 2 ** 40) == BUCKETS - 1
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_quantiles_are_within_one_bucket(seed):
+    rng = random.Random(seed)
+    values = [rng.lognormvariate(math.log(20), 1.5) for _ in range(rng.randint(1, 5000))]
+    histogram = LogHistogram()
+    for value in values:
+        histogram.add(value)
+
+    values.sort()
+    for q in (0.01, 0.5, 0.95, 0.99, 1.0):
+        exact = values[max(1, math.ceil(q * len(values))) - 1]
+        assert 1 / STEP <= histogram.quantile(q) / exact <= STEP
+
+
+def test_histogram_bytes_round_trip():
+    histogram = LogHistogram()
+    for value in (0.5, 3, 3, 250):
+        histogram.add(value)
+    restored = LogHistogram(histogram.to_bytes())
+    assert restored.count == 4 and restored.quantile(0.5) == histogram.quantile(0.5)
+    assert LogHistogram().quantile(0.5) is None
+    with pytest.raises(ValueError):
+        LogHistogram(b'\0' * 8)
+
+
+def test_parse_beacon():
+    assert parse_beacon(beacon([['first-render', 12], ['shard-load', 3.25]])) == (
+        'abc123', 'quiz', [('first-render', 12.0), ('shard-load', 3.25)])
+    assert parse_beacon(beacon([], build=None))[0] == 'unknown'
+
+
+@pytest.mark.parametrize('body', [
+    b'{"build": ',
+    b'"quiz"',
+    beacon([['render', 1]], page=None),
+    beacon([['render', 1]], page='../etc'),
+    beacon([['render', 1]], build=7),
+    beacon({'render': 1}),
+    beacon([['render', 1]] * (MAX_TIMINGS + 1)),
+    beacon([['render']]),
+    beacon([['bad path', 1]]),
+    beacon([['render', '1']]),
+    beacon([['render', True]]),
+    beacon([['render', -1]]),
+    beacon([['render', MAX_MS * 2]]),
+])
+def test_parse_beacon_rejects(body):
+    with pytest.raises(ValueError):
+        parse_beacon(body)
+
+
+def test_series_cap_drops_new_series_only():
+    collector = TimingCollector(':memory:', max_series=2)
+    assert collector.collect(beacon([['a', 1], ['b', 2], ['c', 3]])) == 204
+    assert collector.collect(beacon([['a', 4], ['c', 5]], build='next')) == 204
+    assert collector.collect(b'[]') == 400
+    assert collector.collect(beacon([['a', 6]])) == 204
+
+    assert set(collector.histograms) == {('quiz', 'a', 'abc123'), ('quiz', 'b', 'abc123')}
+    assert collector.histograms[('quiz', 'a', 'abc123')].count == 2
+    assert collector.stats == {'beacons': 3, 'timings': 3, 'rejected': 1, 'dropped': 3, 'flushes': 0}
+    collector._writer.shutdown()
+
+
+def test_flushed_histograms_are_reported(tmp_path):
+    db_path = str(tmp_path / 'timings.db')
+    collector = TimingCollector(db_path)
+
+    async def collect_and_flush():
+        collector._conn = connect(db_path)
+        try:
+            collector.collect(beacon([['render', value] for value in range(1, 101)]))
+            await collector.flush()
+            await collector.flush()
+        finally:
+            collector._conn.close()
+            collector._writer.shutdown()
+
+    asyncio.run(collect_and_flush())
+    assert collector.stats['flushes'] == 1 and not collector.dirty
+
+    [row] = report(db_path)
+    assert (row['page'], row['path'], row['build'], row['count']) == ('quiz', 'render', 'abc123', 100)
+    assert 1 / STEP <= row['p50'] / 50 <= STEP and 1 / STEP <= row['p99'] / 99 <= STEP
+    assert report(db_path, build='other') == []
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Tests that the quiz engine's on-demand shard loading recommends what the full catalogue does
+"""
+
+import json
+import random
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from quiz_engine import RecommendationEngine
+
+ROOT = Path(__file__).resolve().parent
+
+pytestmark = pytest.mark.skipif(shutil.which('node') is None, reason="node is not installed")
+
+# For each line of answers: a fresh engine that fetches shards on demand (with a prefetch racing
+# the recommendation), compared with one holding every shard
+LAZY_HARNESS = r"""
+const fs = require('fs');
+const path = require('path');
+global.performance = { mark() {}, measure() {} };
+const Engine = require(path.join(process.argv[1], 'recommendation_engine.js'));
+const read = url => JSON.parse(fs.readFileSync(path.join(process.argv[1], url.split('?')[0]), 'utf8'));
+
+const full = new Engine();
+Object.values(full.shards).forEach(shard => full.addShard(read(shard.url)));
+
+(async () => {
+    const out = [];
+    for (const line of fs.readFileSync(0, 'utf8').split('\n').filter(Boolean)) {
+        const answers = JSON.parse(line);
+        const fetched = [];
+        global.fetch = async url => {
+            fetched.push(url.split('/').pop().split('.')[0]);
+            return { ok: true, json: async () => read(url) };
+        };
+        const engine = new Engine();
+        engine.prefetch(answers);
+        const result = await engine.recommend(answers);
+        out.push({
+            lazy: result.recommendations.map(tool => tool.id),
+            full: full.calculateRecommendations(answers).recommendations.map(tool => tool.id),
+            fetched,
+            needed: engine.shardsNeeded(answers),
+        });
+    }
+    console.log(JSON.stringify(out));
+})();
+"""
+
+# One category whose first fetch fails: the failure reaches the caller and the next call retries
+RETRY_HARNESS = r"""
+const path = require('path');
+global.performance = { mark() {}, measure() {} };
+const Engine = require(path.join(process.argv[1], 'recommendation_engine.js'));
+const engine = new Engine();
+const attempts = [];
+global.fetch = async url => {
+    attempts.push(url);
+    return attempts.length === 1 ? { ok: false, status: 503 }
+                                 : { ok: true, json: async () => ({ tools: [[0, 'only-tool', { name: 'Only' }]] }) };
+};
+(async () => {
+    const [category] = Object.keys(engine.shards);
+    let error = null;
+    await engine.loadShards([category]).catch(e => { error = e.message; });
+    await engine.loadShards([category]);
+    await engine.loadShards([category]);
+    console.log(JSON.stringify({ error, attempts: attempts.length, tools: Object.keys(engine.tools) }));
+})();
+"""
+
+
+def node(script, stdin=''):
+    result = subprocess.run(['node', '-e', script, str(ROOT)], input=stdin, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout)
+
+
+@pytest.fixture(scope='module')
+def outcomes():
+    engine = RecommendationEngine.from_js_file(str(ROOT / 'recommendation_engine.js'))
+    answer_sets = list(engine.answer_space())
+    sample = random.Random(38).sample(answer_sets, 300)
+    return node(LAZY_HARNESS, ''.join(json.dumps(answers) + '\n' for answers in sample))
+
+
+def test_lazy_engine_recommends_what_the_full_catalogue_does(outcomes):
+    for outcome in outcomes:
+        assert outcome['lazy'] == outcome['full']
+
+
+def test_each_needed_shard_is_fetched_once(outcomes):
+    for outcome in outcomes:
+        assert sorted(outcome['fetched']) == sorted(outcome['needed'])
+    # The answers usually narrow the fetch to a few categories rather than the whole catalogue
+    partial = sum(len(outcome['needed']) < 8 for outcome in outcomes)
+    assert partial > len(outcomes) // 2
+
+
+def test_failed_shard_fetch_is_retried():
+    outcome = node(RETRY_HARNESS)
+    assert outcome['error'].endswith('tools: 503')
+    assert outcome['attempts'] == 2
+    assert outcome['tools'] == ['only-tool']
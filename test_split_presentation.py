@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Tests for splitting the presentation into a shell page, slide fragments and cached assets
+"""
+
+import base64
+import re
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from check_links import LinkChecker
+from split_presentation import INLINE_LIMIT, PresentationSplitter
+
+THEME = 'section{padding:1em}\n' * (INLINE_LIMIT // 20 + 1)
+PRINT = base64.b64encode(b'@media print{nav{display:none}}').decode('ascii')
+
+METHODS = '''<section id="methods" class="level2">
+<h2>Methods</h2>
+<p>How it was done; <a href="#results-table">see the table</a>.</p>
+</section>'''
+
+RESULTS = '''<section id="results" class="level2">
+<h2>Results <em>so far</em></h2>
+<section id="results-table" class="level3">
+<h3>Table</h3>
+<img src="images/chart.png" alt="Chart">
+</section>
+</section>'''
+
+SOURCE = f'''<!DOCTYPE html>
+<html><head><title>Deck</title>
+<link rel="stylesheet" href="site_libs/deck.css">
+<link rel="stylesheet" href="data:text/css;base64,{PRINT}">
+<style>{THEME}</style>
+</head><body>
+<nav><a href="#title-slide">Start</a> <a href="#methods">Methods</a> <a href="#results-table">Table</a></nav>
+<main>
+<section id="title-slide" class="title"><h1>Deck</h1><img src="images/logo.png" alt=""></section>
+{METHODS}
+{RESULTS}
+</main>
+</body></html>
+'''
+
+
+class SplitPresentationTest(unittest.TestCase):
+    def setUp(self):
+        directory = TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.root = Path(directory.name)
+        for name, text in {'presentation.html': SOURCE, 'site_libs/deck.css': '', 'images/logo.png': '',
+                           'images/chart.png': ''}.items():
+            path = self.root / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(text, encoding='utf-8')
+        self.output = self.root / 'deck'
+
+    def split(self):
+        return PresentationSplitter(str(self.root / 'presentation.html'), str(self.output)).run()
+
+    def read(self, name):
+        return (self.output / name).read_text(encoding='utf-8')
+
+    def outputs(self):
+        return sorted(path.relative_to(self.output).as_posix() for path in self.output.rglob('*') if path.is_file())
+
+    def test_shell_keeps_the_first_slide_and_placeholders(self):
+        self.assertEqual(self.split()['slides'], 3)
+        shell = self.read('index.html')
+
+        self.assertIn('<h1>Deck</h1><img src="../images/logo.png" alt="">', shell)
+        self.assertIn('<section id="methods" class="slide-pending level2" data-slide-src="slides/02-methods.html">'
+                      '\n<h2>Methods</h2>', shell)
+        self.assertIn('data-slide-src="slides/03-results.html" data-slide-anchors="results-table">'
+                      '\n<h2>Results <em>so far</em></h2>', shell)
+        self.assertIn('<a href="../presentation.html#results">Open this slide in the full presentation</a>', shell)
+        self.assertNotIn('How it was done', shell)
+        self.assertNotIn('<h3>Table</h3>', shell)
+        self.assertEqual(shell.count('</section>'), 3)
+        self.assertIn("document.querySelectorAll('section[data-slide-src]')", shell)
+
+    def test_fragments_and_assets_hold_what_left_the_shell(self):
+        self.split()
+        self.assertEqual(self.read('slides/02-methods.html'), METHODS)
+        self.assertEqual(self.read('slides/03-results.html'),
+                         RESULTS.replace('src="images/', 'src="../images/'))
+
+        shell = self.read('index.html')
+        # Both stylesheets become content-named links where they stood, in the same order
+        print_css, theme = re.findall(r'<link rel="stylesheet" href="(assets/[0-9a-f]+\.css)">', shell)
+        self.assertEqual(self.read(theme), THEME)
+        self.assertNotIn('<style>' + THEME[:20], shell)
+        self.assertEqual((self.output / print_css).read_bytes(), base64.b64decode(PRINT))
+        self.assertIn('href="../site_libs/deck.css"', shell)
+        self.assertEqual(len(self.outputs()), 5)
+
+    def test_split_output_has_no_broken_links(self):
+        self.split()
+        self.assertEqual(LinkChecker(['deck/**/*.html'], root=self.root).check(), {})
+
+        # Every anchor of the source is still reachable from the shell, inline or through a placeholder
+        checker = LinkChecker(root=self.root)
+        for anchor in ('title-slide', 'methods', 'results', 'results-table'):
+            self.assertIsNone(checker.resolve(self.output / 'index.html', f'#{anchor}'), anchor)
+
+    def test_rerun_is_idempotent_and_drops_vanished_slides(self):
+        self.split()
+        files = {name: self.read(name) for name in self.outputs()}
+        self.assertEqual(self.split(), {'written': 0, 'unchanged': 5, 'removed': 0, 'slides': 3})
+        self.assertEqual({name: self.read(name) for name in self.outputs()}, files)
+
+        (self.root / 'presentation.html').write_text(SOURCE.replace(METHODS, ''), encoding='utf-8')
+        result = self.split()
+        self.assertEqual((result['slides'], result['removed']), (2, 2))
+        self.assertEqual(self.outputs(), sorted(name for name in files if 'slides/' not in name)
+                         + ['slides/02-results.html'])
+
+    def test_page_without_slides_is_rejected_and_leaves_nothing(self):
+        (self.root / 'presentation.html').write_text('<html><body><p>No deck</p></body></html>', encoding='utf-8')
+        with self.assertRaisesRegex(ValueError, 'no <main> element'):
+            self.split()
+        self.assertFalse(self.output.exists() and any(self.output.rglob('*.*')))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Tests for the compiled classifier cache and rule validation in tool_classifier
+"""
+
+import json
+import pickle
+import shutil
+
+import pytest
+
+import tool_classifier
+from tool_classifier import DEFAULT_RULES, RuleError, ToolClassifier, load_classifier, validate_rules
+
+
+@pytest.fixture
+def rules_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(tool_classifier, '_loaded', {})
+    path = tmp_path / 'classifier_rules.json'
+    shutil.copy(DEFAULT_RULES, path)
+    return path
+
+
+def read_rules(path):
+    return json.loads(path.read_text(encoding='utf-8'))
+
+
+def write_rules(path, rules):
+    path.write_text(json.dumps(rules), encoding='utf-8')
+
+
+def test_compiled_classifier_is_cached(rules_file, tmp_path, monkeypatch):
+    cache_file = tmp_path / '.build' / 'classifier.json'
+    classifier = load_classifier(str(rules_file), cache_file)
+    assert json.loads(cache_file.read_text(encoding='utf-8'))['classifier'] == classifier.artifact
+    assert load_classifier(str(rules_file), cache_file) is classifier
+
+    # A new process reads the artifact back instead of compiling the rules again
+    monkeypatch.setattr(tool_classifier, '_loaded', {})
+    monkeypatch.setattr(tool_classifier, 'compile_rules', lambda rules: pytest.fail("recompiled"))
+    assert load_classifier(str(rules_file), cache_file).artifact == classifier.artifact
+
+
+def test_changed_rules_invalidate_the_cache(rules_file, tmp_path):
+    cache_file = tmp_path / 'classifier.json'
+    tool = {'name': 'Zorblax', 'description': 'A zorblax for everyone', 'topics': '', 'original_category': 'library'}
+    before = load_classifier(str(rules_file), cache_file)
+    digest = json.loads(cache_file.read_text(encoding='utf-8'))['digest']
+
+    rules = read_rules(rules_file)
+    rules['context_rules']['technical_education'].append('zorblax')
+    write_rules(rules_file, rules)
+    after = load_classifier(str(rules_file), cache_file)
+
+    assert after is not before
+    assert json.loads(cache_file.read_text(encoding='utf-8'))['digest'] != digest
+    assert 'zorblax' in after.keywords and 'zorblax' not in before.keywords
+    assert after.classify(tool)['category'] == 'technical_education'
+
+
+def test_corrupt_cache_is_rebuilt(rules_file, tmp_path):
+    cache_file = tmp_path / 'classifier.json'
+    cache_file.write_text('{not json', encoding='utf-8')
+    classifier = load_classifier(str(rules_file), cache_file)
+    assert json.loads(cache_file.read_text(encoding='utf-8'))['classifier'] == classifier.artifact
+
+
+def test_no_cache_file_writes_nothing(rules_file, tmp_path):
+    load_classifier(str(rules_file), cache_file=None)
+    assert sorted(path.name for path in tmp_path.iterdir()) == ['classifier_rules.json']
+
+
+def test_invalid_rules_file_raises_rule_error(rules_file, tmp_path):
+    cache_file = tmp_path / 'classifier.json'
+    rules_file.write_text('{"default_category": ', encoding='utf-8')
+    with pytest.raises(RuleError):
+        load_classifier(str(rules_file), cache_file)
+    assert not cache_file.exists()
+
+
+@pytest.mark.parametrize('change', [
+    lambda rules: rules.pop('context_rules'),
+    lambda rules: rules.update(default_category='unknown'),
+    lambda rules: rules['context_rules'].update(utility=[]),
+    lambda rules: rules['context_rules'].update(utility=['Upper']),
+    lambda rules: rules['context_rules'].update(utility=['tool', 'tool']),
+    lambda rules: rules.update(low_priority_categories=['unknown']),
+])
+def test_validate_rules_rejects_bad_rules(change):
+    rules = json.loads(DEFAULT_RULES.read_text(encoding='utf-8'))
+    change(rules)
+    with pytest.raises(RuleError):
+        validate_rules(rules)
+
+
+def test_classifier_pickles_as_its_artifact(rules_file):
+    classifier = load_classifier(str(rules_file), cache_file=None)
+    tool = {'name': 'Quiz Maker', 'description': 'Create quizzes and grade assessments', 'topics': 'education',
+            'original_category': 'web-application'}
+    copy = pickle.loads(pickle.dumps(classifier))
+    assert isinstance(copy, ToolClassifier)
+    assert copy.classify(tool) == classifier.classify(tool)
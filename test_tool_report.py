@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Tests for the catalogue report formats and that update_quiz_tools.py prints them cleanly
+"""
+
+import csv
+import io
+import json
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from tool_report import RENDERERS, ToolReport
+
+ROOT = Path(__file__).resolve().parent
+
+
+def tool(name, category, primary_role, roles, tech_level='beginner', priority='medium'):
+    return {'display_name': name, 'category': category, 'primary_role': primary_role,
+            'roles': [{'role': role} for role in roles], 'techLevel': tech_level, 'priority': priority}
+
+
+TOOLS = [
+    tool('Quiz Maker', 'assessment_feedback', 'lecturer', ['lecturer', 'student'], priority='high'),
+    tool('Talk Buddy', 'language_communication', 'student', ['student']),
+    tool('Paper "Lens"', 'assessment_feedback', 'researcher', ['researcher', 'lecturer'], 'advanced'),
+]
+
+
+def render(report_format):
+    out = io.StringIO()
+    RENDERERS[report_format](ToolReport().consume(TOOLS), out, ['recommendation_engine.js'])
+    return out.getvalue()
+
+
+def test_tally_passes_tools_through_and_counts_them():
+    report = ToolReport()
+    assert list(report.tally(iter(TOOLS))) == TOOLS
+    assert report.to_dict() == {
+        'total': 3,
+        'category': {'assessment_feedback': 2, 'language_communication': 1},
+        'primary_role': {'lecturer': 1, 'researcher': 1, 'student': 1},
+        'role': {'lecturer': 2, 'researcher': 1, 'student': 2},
+        'tech_level': {'advanced': 1, 'beginner': 2},
+        'priority': {'high': 1, 'medium': 2},
+        'high_priority': [{'name': 'Quiz Maker', 'primary_role': 'lecturer'}],
+    }
+
+
+def test_machine_formats_parse():
+    assert json.loads(render('json'))['total'] == 3
+
+    rows = list(csv.reader(io.StringIO(render('csv'))))
+    assert rows[:2] == [['metric', 'value', 'tools'], ['total', '', '3']]
+    assert ['role', 'student', '2'] in rows
+
+    samples = [line for line in render('prometheus').splitlines() if not line.startswith('#')]
+    assert 'quiz_tools 3' in samples
+    assert 'quiz_tools_by_category{category="assessment_feedback"} 2' in samples
+    assert all(line.rsplit(' ', 1)[1].isdigit() for line in samples)
+
+
+def test_text_report_lists_files():
+    text = render('text')
+    assert 'Updated: 3 tools' in text and '  Assessment Feedback: 2 tools' in text
+    assert text.endswith('FILES UPDATED:\n  - recommendation_engine.js\n')
+
+
+@pytest.fixture(scope='module')
+def site(tmp_path_factory):
+    site = tmp_path_factory.mktemp('site')
+    for name in ('index.html', 'recommendation_engine.js'):
+        shutil.copy(ROOT / name, site / name)
+    shutil.copytree(ROOT / 'quiz-data', site / 'quiz-data')
+    return site
+
+
+def run_updater(site, *args):
+    return subprocess.run([sys.executable, str(ROOT / 'update_quiz_tools.py'), '--dry-run', '--db', '', *args],
+                          cwd=site, capture_output=True, text=True, check=True)
+
+
+@pytest.mark.parametrize('report_format', ['json', 'csv', 'prometheus'])
+def test_stdout_holds_only_the_report(site, report_format):
+    result = run_updater(site, '--report-format', report_format)
+    if report_format == 'json':
+        assert json.loads(result.stdout)['total'] > 0
+    else:
+        assert result.stdout.startswith(('metric,value,tools\n', '# HELP quiz_tools '))
+    assert 'Extracting tools' in result.stderr and 'DRY RUN' in result.stderr
+
+
+def test_text_report_keeps_progress_on_stdout(site):
+    result = run_updater(site)
+    assert result.stdout.startswith('Extracting tools from index.html...\nFound ')
+    assert '=== QUIZ TOOL UPDATE REPORT ===' in result.stdout
+    assert result.stderr == ''
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Tests for the quiz tool updater's in-memory pipeline and its single write step
+"""
+
+import asyncio
+import hashlib
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from update_quiz_tools import QuizToolUpdater
+
+ROOT = Path(__file__).resolve().parent
+
+
+def snapshot(directory):
+    """Relative path -> (mtime, content hash) for every file under a directory"""
+    return {str(path.relative_to(directory)): (path.stat().st_mtime_ns, hashlib.sha256(path.read_bytes()).hexdigest())
+            for path in sorted(directory.rglob('*')) if path.is_file()}
+
+
+@pytest.fixture
+def updater(tmp_path, monkeypatch):
+    for name in ('index.html', 'recommendation_engine.js'):
+        shutil.copy(ROOT / name, tmp_path / name)
+    shutil.copytree(ROOT / 'quiz-data', tmp_path / 'quiz-data')
+    # Anything written relative to the working directory lands in the snapshot too
+    monkeypatch.chdir(tmp_path)
+    return QuizToolUpdater(str(tmp_path / 'index.html'), str(tmp_path / 'recommendation_engine.js'))
+
+
+def test_pipeline_touches_no_files(updater, tmp_path):
+    before = snapshot(tmp_path)
+    sources = updater.read_sources()
+    outputs = updater.pipeline(*sources)
+    updater.check_outputs(*sources)
+    assert snapshot(tmp_path) == before
+
+    files = list(outputs.files)
+    assert files[-2:] == [updater.js_file, updater.html_file]
+    assert all(path.parent == tmp_path / 'quiz-data' for path in files[:-2])
+    assert outputs.report.total == len(outputs.tools) > 0
+
+
+def test_async_pipeline_matches_the_sync_one(updater, monkeypatch):
+    sources = updater.read_sources()
+    expected = updater.pipeline(*sources)
+    # Several batches, so the next one is classified while the last is consumed
+    monkeypatch.setattr(updater, 'ASYNC_BATCH_SIZE', 7)
+
+    async def both():
+        with ThreadPoolExecutor(2) as executor:
+            return await asyncio.gather(updater.pipeline_async(*sources, executor),
+                                        updater.pipeline_async(*sources))
+
+    for outputs in asyncio.run(both()):
+        assert outputs.tools == expected.tools
+        assert outputs.files == expected.files
+        assert outputs.categories == expected.categories
+
+
+def test_written_outputs_are_current_and_rewrite_nothing(updater, tmp_path):
+    outputs = updater.pipeline(*updater.read_sources())
+    stats = updater.write_outputs(outputs, db_file=None)
+    assert stats['catalogue'] is None and not (tmp_path / 'catalogue.db').exists()
+    assert set(updater.check_outputs(*updater.read_sources()).values()) == {'unchanged'}
+
+    written = snapshot(tmp_path)
+    again = updater.write_outputs(updater.pipeline(*updater.read_sources()), db_file=None)
+    assert again['files'] == {'written': 0, 'unchanged': len(outputs.files), 'removed': 0}
+    assert snapshot(tmp_path) == written
+
+
+def test_empty_page_is_an_error(updater):
+    with pytest.raises(ValueError, match='No tools found'):
+        updater.pipeline('<html></html>', updater.read_sources()[1])
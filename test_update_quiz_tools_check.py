@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Tests for update_quiz_tools.py --check: its exit status, its report, and that it writes nothing
+"""
+
+import re
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent
+SCRIPT = ROOT / 'update_quiz_tools.py'
+
+
+def edit_engine_shard_version(site):
+    engine = site / 'recommendation_engine.js'
+    text = engine.read_text(encoding='utf-8')
+    engine.write_text(re.sub(r'\?v=[0-9a-f]+', '?v=0000000000', text, count=1), encoding='utf-8')
+    return 'recommendation_engine.js differs from the generated output'
+
+
+def edit_shard(site):
+    shard = site / 'quiz-data' / 'utility.json'
+    shard.write_text(shard.read_text(encoding='utf-8') + '\n', encoding='utf-8')
+    return 'utility.json differs from the generated output'
+
+
+def delete_shard(site):
+    (site / 'quiz-data' / 'ai_tutoring.json').unlink()
+    return 'ai_tutoring.json is missing'
+
+
+def add_stray_shard(site):
+    (site / 'quiz-data' / 'retired.json').write_text('[]', encoding='utf-8')
+    return 'retired.json belongs to no category and would be removed'
+
+
+@pytest.fixture
+def site(tmp_path):
+    for name in ('index.html', 'recommendation_engine.js'):
+        shutil.copy(ROOT / name, tmp_path / name)
+    shutil.copytree(ROOT / 'quiz-data', tmp_path / 'quiz-data')
+    return tmp_path
+
+
+def files_in(site):
+    return {path: path.read_bytes() for path in site.rglob('*') if path.is_file()}
+
+
+def check(site, *args):
+    # Run from the copy, so the default export directory and database are looked up there
+    return subprocess.run([sys.executable, str(SCRIPT), '--check', *args], cwd=site,
+                          capture_output=True, text=True)
+
+
+def test_current_site_passes(site):
+    result = check(site)
+    assert result.returncode == 0, result.stdout
+    assert '❌' not in result.stdout
+    assert result.stdout.rstrip().endswith('All 10 generated files are current')
+
+
+@pytest.mark.parametrize('damage', [edit_engine_shard_version, edit_shard, delete_shard, add_stray_shard])
+def test_outdated_site_fails_and_is_left_as_found(site, damage):
+    message = damage(site)
+    before = files_in(site)
+    result = check(site)
+
+    assert result.returncode == 1
+    [failure] = [line for line in result.stdout.splitlines() if line.startswith('❌')]
+    assert failure.endswith(message)
+    assert '1 of ' in result.stdout and 'run update_quiz_tools.py to regenerate them' in result.stdout
+    assert files_in(site) == before
+    assert not (site / 'catalogue.db').exists() and not (site / '.build').exists()
+
+
+def test_regenerating_makes_the_check_pass_again(site):
+    edit_shard(site)
+    delete_shard(site)
+    assert check(site).returncode == 1
+
+    build = subprocess.run([sys.executable, str(SCRIPT), '--db', ''], cwd=site, capture_output=True, text=True)
+    assert build.returncode == 0, build.stdout
+    assert check(site).returncode == 0
+
+
+def test_missing_page_is_an_error(site):
+    result = check(site, '--html-file', 'nowhere.html')
+    assert result.returncode == 1
+    assert result.stdout.startswith('ERROR: HTML file not found: nowhere.html')
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Tool Classifier
+Compiles the keyword rules in classifier_rules.json into a validated classifier, cached
+under .build/ by the rules file's hash, shared by update_quiz_tools.py and the dev/ analyses
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from site_paths import ROOT
+
+DEFAULT_RULES = ROOT / 'classifier_rules.json'
+CACHE_FILE = ROOT / '.build' / 'classifier.json'
+# Bump when the compiled format or matching logic changes, so stale artifacts are rebuilt
+COMPILER_VERSION = 1
+
+# Keyword tables, each mapping a label to keywords matched as substrings of the tool text
+KEYWORD_TABLES = ['context_rules', 'tech_level_rules', 'context_indicators',
+                  'subject_indicators', 'role_indicators']
+# Everything a candidate rule set (see replay_sessions.py) may override
+RULE_TABLES = KEYWORD_TABLES + ['high_priority_tools', 'low_priority_categories']
+# Words whose keyword matches are kept between tools
+WORD_CACHE_SIZE = 16384
+_WORD = re.compile(r'[a-z0-9]+')
+
+
+class RuleError(ValueError):
+    """A rules file that cannot be compiled"""
+
+
+def _keyword_list(value: Any, where: str) -> List[str]:
+    if not isinstance(value, list) or not value:
+        raise RuleError(f"{where}: expected a non-empty list of keywords")
+    for keyword in value:
+        if not isinstance(keyword, str) or not keyword.strip():
+            raise RuleError(f"{where}: keywords must be non-empty strings")
+        if keyword != keyword.lower():
+            raise RuleError(f"{where}: keyword {keyword!r} must be lowercase")
+    if len(set(value)) != len(value):
+        raise RuleError(f"{where}: duplicate keywords")
+    return value
+
+
+def validate_rules(rules: Any) -> Dict[str, Any]:
+    """Check a rules mapping and return it, raising RuleError on the first problem"""
+    if not isinstance(rules, dict):
+        raise RuleError("rules must be a JSON object")
+    missing = [key for key in RULE_TABLES + ['default_category', 'default_tech_level'] if key not in rules]
+    if missing:
+        raise RuleError(f"missing {', '.join(missing)}")
+
+    for table in KEYWORD_TABLES:
+        if not isinstance(rules[table], dict) or not rules[table]:
+            raise RuleError(f"{table}: expected an object of keyword lists")
+        for label, keywords in rules[table].items():
+            _keyword_list(keywords, f"{table}.{label}")
+
+    categories = set(rules['context_rules'])
+    if rules['default_category'] not in categories:
+        raise RuleError(f"default_category {rules['default_category']!r} is not in context_rules")
+    if rules['default_tech_level'] in rules['tech_level_rules']:
+        raise RuleError("default_tech_level must not also be a tech_level_rules level")
+    _keyword_list(rules['high_priority_tools'], 'high_priority_tools')
+    if not isinstance(rules['low_priority_categories'], list):
+        raise RuleError("low_priority_categories: expected a list of categories")
+    unknown = set(rules['low_priority_categories']) - categories
+    if unknown:
+        raise RuleError(f"low_priority_categories: unknown categories {', '.join(sorted(map(str, unknown)))}")
+
+    descriptions = rules.get('category_descriptions', {})
+    if not isinstance(descriptions, dict) or set(descriptions) - categories:
+        raise RuleError("category_descriptions: keys must be context_rules categories")
+    return rules
+
+
+def compile_rules(rules: Dict[str, Any]) -> Dict[str, Any]:
+    """Compile validated rules into the JSON-serializable classifier artifact.
+
+    Every keyword of every table gets a bit, and each table label the mask of its
+    keywords, so a tool's text is scanned once and every table is read off that mask.
+    """
+    keywords = sorted({keyword for table in KEYWORD_TABLES for keywords in rules[table].values()
+                       for keyword in keywords})
+    bit = {keyword: 1 << i for i, keyword in enumerate(keywords)}
+
+    return {
+        'version': COMPILER_VERSION,
+        'keywords': keywords,
+        'tables': {table: [[label, sum(bit[keyword] for keyword in keywords)]
+                           for label, keywords in rules[table].items()] for table in KEYWORD_TABLES},
+        'default_category': rules['default_category'],
+        'default_tech_level': rules['default_tech_level'],
+        'high_priority_tools': rules['high_priority_tools'],
+        'low_priority_categories': rules['low_priority_categories'],
+        'category_descriptions': rules.get('category_descriptions', {}),
+    }
+
+
+class ToolClassifier:
+    """Teaching category, technical level, contexts, subjects, priority and roles for a tool"""
+
+    def __init__(self, artifact: Dict[str, Any]):
+        self.artifact = artifact
+        self.keywords: List[str] = artifact['keywords']
+        # A keyword made only of word characters can only occur inside one word of the
+        # text, so words are matched once and remembered; the rest are looked up directly
+        self._word_keywords = [(keyword, 1 << i) for i, keyword in enumerate(self.keywords)
+                               if _WORD.fullmatch(keyword)]
+        self._phrase_keywords = [(keyword, 1 << i) for i, keyword in enumerate(self.keywords)
+                                 if not _WORD.fullmatch(keyword)]
+        self._word_mask = lru_cache(maxsize=WORD_CACHE_SIZE)(self._match_word)
+        self.tables: Dict[str, List[Tuple[str, int]]] = {
+            table: [(label, mask) for label, mask in entries] for table, entries in artifact['tables'].items()}
+        self.high_priority_tools = set(artifact['high_priority_tools'])
+        self.category_descriptions: Dict[str, Dict[str, Any]] = artifact['category_descriptions']
+
+    def __reduce__(self):
+        # Pickled as its artifact, so process pool workers rebuild the word cache
+        return type(self), (self.artifact,)
+
+    @classmethod
+    def from_rules(cls, rules: Dict[str, Any]) -> 'ToolClassifier':
+        return cls(compile_rules(validate_rules(rules)))
+
+    @property
+    def categories(self) -> List[str]:
+        return [label for label, _ in self.tables['context_rules']]
+
+    def _match_word(self, word: str) -> int:
+        return sum(bit for keyword, bit in self._word_keywords if keyword in word)
+
+    def _words(self, text: str) -> int:
+        mask = 0
+        for word in set(_WORD.findall(text)):
+            mask |= self._word_mask(word)
+        return mask
+
+    def matched(self, text: str, split: int = 0) -> Tuple[int, int]:
+        """Bitmasks of the keywords occurring in text and in text[split:]"""
+        head, rest = text[:split], text[split:]
+        tail = self._words(rest)
+        mask = tail | self._words(head)
+        for keyword, bit in self._phrase_keywords:
+            if keyword in rest:
+                tail |= bit
+            elif keyword in text:
+                mask |= bit
+        return mask | tail, tail
+
+    def _first(self, table: str, mask: int, default: str) -> str:
+        return next((label for label, keywords in self.tables[table] if mask & keywords), default)
+
+    def classify_role(self, tool: Dict[str, Any], mask: Optional[int] = None) -> Dict[str, Any]:
+        """Classify tool by target user roles with confidence scoring"""
+        text_to_analyze = f"{tool['description']} {tool['topics']}"
+        if mask is None:
+            mask = self.matched(text_to_analyze)[0]
+        role_scores = {role: bin(mask & keywords).count('1') for role, keywords in self.tables['role_indicators']}
+
+        # Determine primary roles (with confidence levels)
+        max_score = max(role_scores.values()) if role_scores else 0
+        roles = []
+        for role, score in role_scores.items():
+            if score > 0:
+                # Calculate confidence: high (75%+), medium (50%+), low (<50%)
+                confidence_ratio = score / max_score
+                if confidence_ratio >= 0.75:
+                    confidence = 'high'
+                elif confidence_ratio >= 0.5:
+                    confidence = 'medium'
+                else:
+                    confidence = 'low'
+                roles.append({'role': role, 'confidence': confidence, 'score': score})
+
+        # Default fallback - if no clear role indicators, assign based on category
+        if not roles:
+            if tool['original_category'] in ['desktop-application', 'infrastructure-tool']:
+                roles.append({'role': 'lecturer', 'confidence': 'low', 'score': 0})
+            elif 'python-package' in tool['original_category'] or 'learning' in text_to_analyze:
+                roles.append({'role': 'student', 'confidence': 'low', 'score': 0})
+            else:
+                roles.append({'role': 'lecturer', 'confidence': 'low', 'score': 0})
+
+        return {
+            'roles': roles,
+            'primary_role': roles[0]['role']
+        }
+
+    def classify(self, tool: Dict[str, Any]) -> Dict[str, Any]:
+        """Classify a raw tool (name, description, topics, original_category)"""
+        name = tool['name'].lower()
+        description = tool['description'].lower()
+        mask, role_mask = self.matched(f"{name} {description} {tool['topics']}", len(name) + 1)
+        # Roles are matched on the description as given, which is usually already lowercase
+        if description != tool['description']:
+            role_mask = None
+
+        # Highest keyword count wins, earlier categories on ties
+        category, max_score = self.artifact['default_category'], 0
+        for label, keywords in self.tables['context_rules']:
+            score = bin(mask & keywords).count('1')
+            if score > max_score:
+                category, max_score = label, score
+
+        if tool['name'] in self.high_priority_tools:
+            priority = 'high'
+        elif category in self.artifact['low_priority_categories']:
+            priority = 'low'
+        else:
+            priority = 'medium'
+
+        return {
+            'category': category,
+            'priority': priority,
+            'techLevel': self._first('tech_level_rules', mask, self.artifact['default_tech_level']),
+            'contexts': [self._first('context_indicators', mask, 'general')],
+            'subjects': [self._first('subject_indicators', mask, 'general')],
+            **self.classify_role(tool, role_mask),
+        }
+
+
+def _rules_digest(rules_file: Path) -> Tuple[bytes, str]:
+    content = rules_file.read_bytes()
+    return content, f"{COMPILER_VERSION}:{hashlib.sha256(content).hexdigest()}"
+
+
+_loaded: Dict[str, Tuple[str, ToolClassifier]] = {}
+
+
+def load_classifier(rules_file: Optional[str] = None, cache_file: Optional[Path] = CACHE_FILE) -> ToolClassifier:
+    """The classifier for a rules file, compiled only when the file's hash has changed"""
+    rules_path = Path(rules_file) if rules_file else DEFAULT_RULES
+    content, digest = _rules_digest(rules_path)
+    key = str(rules_path.resolve())
+    if key in _loaded and _loaded[key][0] == digest:
+        return _loaded[key][1]
+
+    artifact = None
+    if cache_file and cache_file.exists():
+        try:
+            cached = json.loads(cache_file.read_text(encoding='utf-8'))
+            if cached.get('digest') == digest:
+                artifact = cached['classifier']
+        except (ValueError, KeyError):
+            artifact = None
+
+    if artifact is None:
+        try:
+            rules = json.loads(content.decode('utf-8'))
+        except ValueError as e:
+            raise RuleError(f"{rules_path}: {e}") from e
+        artifact = compile_rules(validate_rules(rules))
+        if cache_file:
+            cache_file.parent.mkdir(exist_ok=True)
+            tmp_file = cache_file.with_name(cache_file.name + '.tmp')
+            tmp_file.write_text(json.dumps({'digest': digest, 'classifier': artifact}), encoding='utf-8')
+            os.replace(tmp_file, cache_file)
+
+    classifier = ToolClassifier(artifact)
+    _loaded[key] = (digest, classifier)
+    return classifier
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Validate and compile the tool classifier rules')
+    parser.add_argument('--rules', default=str(DEFAULT_RULES),
+                       help='Rules file (default: classifier_rules.json)')
+    parser.add_argument('--force', action='store_true',
+                       help='Recompile even if the cached classifier is current')
+
+    args = parser.parse_args()
+
+    if args.force and CACHE_FILE.exists():
+        CACHE_FILE.unlink()
+    start = time.perf_counter()
+    try:
+        classifier = load_classifier(args.rules)
+    except (OSError, RuleError) as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+
+    print(f"✅ {args.rules}: {len(classifier.keywords)} keywords in {len(classifier.tables)} tables, "
+          f"{len(classifier.categories)} categories ({(time.perf_counter() - start) * 1000:.1f} ms)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Tool Catalogue Report
+Counts categorized tools in a single streaming pass and renders the distributions
+as text, JSON, CSV or Prometheus exposition format
+"""
+
+import csv
+import json
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, Iterator, List, TextIO
+
+# (key, text report heading, Prometheus label, Prometheus help) for each distribution
+DISTRIBUTIONS = [
+    ('category', 'CATEGORY DISTRIBUTION', 'category', 'Tools per teaching category.'),
+    ('primary_role', 'ROLE DISTRIBUTION (Primary)', 'role', 'Tools per primary user role.'),
+    ('role', 'ROLE DISTRIBUTION (All Assignments)', 'role',
+     'Tools assigned to each user role, counting multi-role tools once per role.'),
+    ('tech_level', 'TECHNICAL LEVEL DISTRIBUTION', 'level', 'Tools per technical level.'),
+    ('priority', 'PRIORITY DISTRIBUTION', 'priority', 'Tools per priority.'),
+]
+
+
+class ToolReport:
+    """Running distributions over categorized tools from QuizToolUpdater.categorize_tool"""
+
+    def __init__(self):
+        self.total = 0
+        self.counts: Dict[str, Counter] = {key: Counter() for key, _, _, _ in DISTRIBUTIONS}
+        self.high_priority: List[Dict[str, str]] = []
+
+    def add(self, tool: Dict[str, Any]) -> None:
+        self.total += 1
+        self.counts['category'][tool['category']] += 1
+        self.counts['primary_role'][tool['primary_role']] += 1
+        self.counts['role'].update(role_info['role'] for role_info in tool['roles'])
+        self.counts['tech_level'][tool['techLevel']] += 1
+        self.counts['priority'][tool['priority']] += 1
+        if tool['priority'] == 'high':
+            self.high_priority.append({'name': tool['display_name'], 'primary_role': tool['primary_role']})
+
+    def tally(self, tools: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """Pass tools through to the next stage, adding each one as it goes by"""
+        for tool in tools:
+            self.add(tool)
+            yield tool
+
+    def consume(self, tools: Iterable[Dict[str, Any]]) -> 'ToolReport':
+        """Add every tool from an iterable, without holding on to it"""
+        for tool in tools:
+            self.add(tool)
+        return self
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'total': self.total,
+            **{key: dict(sorted(self.counts[key].items())) for key, _, _, _ in DISTRIBUTIONS},
+            'high_priority': self.high_priority,
+        }
+
+
+def _label(key: str, value: str) -> str:
+    return value.replace('_', ' ').title() if key == 'category' else value.title()
+
+
+def render_text(report: ToolReport, out: TextIO, files: Iterable[str] = ()) -> None:
+    out.write("=== QUIZ TOOL UPDATE REPORT ===\n")
+    out.write(f"Updated: {report.total} tools\n")
+    for key, heading, _, _ in DISTRIBUTIONS:
+        out.write(f"\n{heading}:\n")
+        for value, count in sorted(report.counts[key].items()):
+            out.write(f"  {_label(key, value)}: {count} tools\n")
+    out.write("\nHIGH PRIORITY TOOLS:\n")
+    for tool in report.high_priority:
+        out.write(f"  - {tool['name']} (Primary: {tool['primary_role']})\n")
+    files = list(files)
+    if files:
+        out.write("\nFILES UPDATED:\n")
+        for path in files:
+            out.write(f"  - {path}\n")
+
+
+def render_json(report: ToolReport, out: TextIO, files: Iterable[str] = ()) -> None:
+    json.dump(report.to_dict(), out, indent=2)
+    out.write('\n')
+
+
+def render_csv(report: ToolReport, out: TextIO, files: Iterable[str] = ()) -> None:
+    writer = csv.writer(out, lineterminator='\n')
+    writer.writerow(['metric', 'value', 'tools'])
+    writer.writerow(['total', '', report.total])
+    for key, _, _, _ in DISTRIBUTIONS:
+        for value, count in sorted(report.counts[key].items()):
+            writer.writerow([key, value, count])
+
+
+def _escape_label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def render_prometheus(report: ToolReport, out: TextIO, files: Iterable[str] = ()) -> None:
+    out.write("# HELP quiz_tools Tools in the quiz catalogue.\n")
+    out.write("# TYPE quiz_tools gauge\n")
+    out.write(f"quiz_tools {report.total}\n")
+    for key, _, label, help_text in DISTRIBUTIONS:
+        metric = f"quiz_tools_by_{key}"
+        out.write(f"# HELP {metric} {help_text}\n")
+        out.write(f"# TYPE {metric} gauge\n")
+        for value, count in sorted(report.counts[key].items()):
+            out.write(f'{metric}{{{label}="{_escape_label(value)}"}} {count}\n')
+
+
+RENDERERS: Dict[str, Callable[..., None]] = {
+    'text': render_text,
+    'json': render_json,
+    'csv': render_csv,
+    'prometheus': render_prometheus,
+}
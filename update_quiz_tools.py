@@ -5,99 +5,59 @@ Automatically parses index.html and updates the recommendation engine with curre
 """
 
 import re
+import io
 import json
+import asyncio
+import hashlib
 import argparse
+from concurrent.futures import Executor
+from itertools import islice
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import AsyncIterator, Dict, Iterable, Iterator, List, Any, Optional, TextIO, Tuple
 import sys
 
+from catalogue_db import CARD_COLUMNS, DEFAULT_DB, ORIGINAL_CATEGORIES, CatalogueDatabase
+from file_transaction import FileTransaction, compare
+from ingest_repos import DEFAULT_EXPORT_DIR, RepoIngester, export_files
+from near_duplicates import find_clusters
+from quiz_engine import load_categories, load_question_weights
+from render_cards import CardRenderer, parse_card, section_order
+from tool_classifier import CACHE_FILE, load_classifier
+from tool_report import RENDERERS, ToolReport
+
+class CatalogueOutputs:
+    """Everything one pipeline run generates, held in memory until written"""
+
+    def __init__(self, tools: List[Dict[str, Any]], report: ToolReport, files: Dict[Path, str],
+                 categories: Dict[str, str]):
+        self.tools = tools
+        self.report = report
+        # Generated file contents by target path: the shards, the engine, then the page
+        self.files = files
+        self.categories = categories
+
+
 class QuizToolUpdater:
-    def __init__(self, html_file: str = "index.html", js_file: str = "recommendation_engine.js"):
+    # data-category values of the repo cards in index.html
+    ORIGINAL_CATEGORIES = ORIGINAL_CATEGORIES
+
+    # Directory, next to the engine, holding one JSON shard of tools per category
+    SHARD_DIR = 'quiz-data'
+
+    # Tools per executor job in categorize_tools_async
+    ASYNC_BATCH_SIZE = 64
+
+    def __init__(self, html_file: str = "index.html", js_file: str = "recommendation_engine.js",
+                 rules_file: Optional[str] = None, cache_classifier: bool = False,
+                 export_files: Iterable[str] = ()):
         self.html_file = Path(html_file)
         self.js_file = Path(js_file)
+        # Repository exports stored by ingest_repos.py, catalogued alongside the page's cards
+        self.export_files = list(export_files)
         
-        # Teaching context mapping rules
-        self.context_rules = {
-            'content_creation': [
-                'curriculum', 'content', 'presentation', 'case studies', 'brief', 'slide', 'docs',
-                'docslanding', 'curator', 'creative', 'material'
-            ],
-            'student_interaction': [
-                'interaction', 'poll', 'audience', 'pulse', 'engage', 'clone', 'real-time',
-                'interactive', 'live', 'participation'
-            ],
-            'assessment_feedback': [
-                'feedback', 'forward', 'insight', 'analysis', 'survey', 'lens', 'assessment',
-                'evaluation', 'analytics', 'performance', 'grade'
-            ],
-            'language_communication': [
-                'talk', 'conversation', 'english', 'communication', 'voice', 'transcription',
-                'language', 'speech', 'pronunciation', 'chat'
-            ],
-            'technical_education': [
-                'python', 'programming', 'code', 'dev', 'calculator', 'weather', 'paradigms',
-                'technical', 'tutorial', 'coding', 'algorithm', 'software'
-            ],
-            'project_management': [
-                'project', 'management', 'capstone', 'connect', 'venture', 'business', 'industry',
-                'enterprise', 'collaboration', 'workflow'
-            ],
-            'ai_tutoring': [
-                'ai', 'tutor', 'buddy', 'intelligent', 'personalized', 'adaptive', 'smart',
-                'chatbot', 'assistant', 'guide'
-            ],
-            'utility': [
-                'toolkit', 'utils', 'helper', 'tool', 'utility', 'link', 'url', 'general'
-            ]
-        }
-        
-        # Technical level indicators
-        self.tech_level_rules = {
-            'beginner': [
-                'beginner', 'jumpstart', 'learn', 'tutorial', 'guide', 'minimum', 'buddy',
-                'simple', 'easy', 'basic', 'intro'
-            ],
-            'advanced': [
-                'docker', 'api', 'framework', 'infrastructure', 'electron', 'cms', 'ollama',
-                'advanced', 'expert', 'complex', 'professional'
-            ]
-            # Everything else defaults to 'intermediate'
-        }
-        
-        # Teaching context indicators
-        self.context_indicators = {
-            'university': ['university', 'lecturer', 'college', 'academic', 'higher education'],
-            'k12': ['k12', 'school', 'classroom', 'student', 'primary', 'secondary'],
-            'corporate': ['corporate', 'business', 'professional', 'workplace', 'enterprise'],
-            'self_directed': ['self', 'independent', 'personal', 'individual']
-        }
-        
-        # Subject area indicators
-        self.subject_indicators = {
-            'technology': ['python', 'programming', 'code', 'tech', 'software', 'development'],
-            'business': ['business', 'venture', 'enterprise', 'management', 'entrepreneurship'],
-            'communication': ['communication', 'language', 'speech', 'conversation', 'presentation'],
-            'general': ['general', 'multi', 'broad', 'diverse', 'various']
-        }
-        
-        # Role-based classification rules
-        self.role_indicators = {
-            'lecturer': [
-                'teaching', 'instructor', 'classroom', 'curriculum', 'assessment', 'grading', 
-                'presentation', 'lecture', 'course', 'educational', 'pedagogy', 'feedback',
-                'management', 'analysis', 'evaluation', 'design', 'create', 'develop'
-            ],
-            'student': [
-                'learning', 'study', 'practice', 'tutorial', 'buddy', 'guide', 'beginner',
-                'jumpstart', 'learn', 'self-directed', 'training', 'skill', 'exercise',
-                'interactive', 'help', 'support', 'personal'
-            ],
-            'researcher': [
-                'analysis', 'data', 'research', 'survey', 'insight', 'analytics', 'modeling',
-                'simulation', 'processing', 'investigation', 'exploration', 'discovery',
-                'evaluation', 'measurement', 'statistical', 'scientific'
-            ]
-        }
+        # Keyword rules from classifier_rules.json; the compiled form is only written to
+        # .build/ when asked, so library use has no side effects
+        self.classifier = load_classifier(rules_file, CACHE_FILE if cache_classifier else None)
 
     def extract_tools_from_html(self) -> List[Dict[str, Any]]:
         """Extract all tools from the HTML file"""
@@ -107,33 +67,52 @@ class QuizToolUpdater:
         with open(self.html_file, 'r', encoding='utf-8') as f:
             content = f.read()
         
-        tools = []
-        
+        return list(self.parse_tools(content))
+
+    def parse_tools(self, content: str) -> Iterator[Dict[str, Any]]:
+        """Yield the raw tools of the repo cards in an HTML page"""
         # Find all repo-card blocks using a more flexible pattern
-        card_pattern = r'<div[^>]*class="[^"]*repo-card[^"]*"[^>]*data-category="([^"]*)"[^>]*data-name="([^"]*)"[^>]*data-description="([^"]*)"[^>]*(?:data-topics="([^"]*)")?[^>]*>'
+        card_pattern = r'<div[^>]*class="[^"]*repo-card[^"]*"[^>]*data-category="([^"]*)"[^>]*data-name="([^"]*)"[^>]*data-description="([^"]*)"(?:[^>]*?data-topics="([^"]*)")?[^>]*>'
         
-        matches = re.findall(card_pattern, content, re.DOTALL)
+        # A card's body runs to the next card, or to the end of <main> for the last one
+        main_end = content.rfind('</main>')
+        main_end = main_end if main_end != -1 else len(content)
         
-        for match in matches:
-            category, name, description, topics = match
-            
+        found = False
+        previous = None
+        for match in re.finditer(card_pattern, content, re.DOTALL):
             # Skip category filter buttons
-            if name in ['all', 'desktop-application', 'web-application', 'python-package', 
-                       'learning-resource', 'infrastructure-tool', 'command-line-tool']:
+            if match.group(2) == 'all' or match.group(2) in self.ORIGINAL_CATEGORIES:
                 continue
             
-            tools.append({
-                'name': name,
-                'original_category': category,
-                'description': description.lower().strip(),
-                'topics': topics.lower().strip() if topics else ''
-            })
+            found = True
+            if previous:
+                yield self._card_tool(previous, content[previous.end():match.start()])
+            previous = match
+        if previous:
+            yield self._card_tool(previous, content[previous.end():main_end])
         
         # If regex fails, try alternative extraction
-        if not tools:
-            tools = self._extract_tools_alternative(content)
-        
-        return tools
+        if not found:
+            yield from self._extract_tools_alternative(content)
+
+    def _card_tool(self, match: re.Match, body: str) -> Dict[str, Any]:
+        """The raw tool of a repo card: its data attributes and the repository details it shows"""
+        category, name, description, topics = match.groups()
+        return {
+            'name': name,
+            'original_category': category,
+            'description': description.lower().strip(),
+            'topics': topics.lower().strip() if topics else '',
+            **parse_card(body)
+        }
+
+    def raw_tools(self, html_source: str) -> Iterator[Dict[str, Any]]:
+        """The page's repo cards merged with this updater's exports, whose records replace
+        cards of the same name (see ingest_repos.RepoIngester)"""
+        if not self.export_files:
+            return self.parse_tools(html_source)
+        return RepoIngester().raw_tools(self.export_files, self.parse_tools(html_source))
 
     def _extract_tools_alternative(self, content: str) -> List[Dict[str, Any]]:
         """Alternative extraction method using line-by-line parsing"""
@@ -163,9 +142,7 @@ class QuizToolUpdater:
                     current_tool['topics'] = topics_match.group(1).lower() if topics_match else ''
                     
                     # Skip category buttons
-                    if current_tool['name'] not in ['all', 'desktop-application', 'web-application', 
-                                                   'python-package', 'learning-resource', 
-                                                   'infrastructure-tool', 'command-line-tool']:
+                    if current_tool['name'] != 'all' and current_tool['name'] not in self.ORIGINAL_CATEGORIES:
                         tools.append(current_tool)
                     
                     in_card = False
@@ -174,114 +151,55 @@ class QuizToolUpdater:
 
     def classify_role(self, tool: Dict[str, Any]) -> Dict[str, Any]:
         """Classify tool by target user roles with confidence scoring"""
-        text_to_analyze = f"{tool['description']} {tool['topics']}"
-        role_scores = {}
-        
-        for role, keywords in self.role_indicators.items():
-            score = 0
-            for keyword in keywords:
-                if keyword in text_to_analyze:
-                    score += 1
-            role_scores[role] = score
-        
-        # Determine primary roles (with confidence levels)
-        max_score = max(role_scores.values()) if role_scores.values() else 0
-        roles = []
-        
-        for role, score in role_scores.items():
-            if score > 0:
-                # Calculate confidence: high (75%+), medium (50%+), low (<50%)
-                confidence_ratio = score / max_score if max_score > 0 else 0
-                if confidence_ratio >= 0.75:
-                    confidence = 'high'
-                elif confidence_ratio >= 0.5:
-                    confidence = 'medium'
-                else:
-                    confidence = 'low'
-                
-                roles.append({'role': role, 'confidence': confidence, 'score': score})
-        
-        # Default fallback - if no clear role indicators, assign based on category
-        if not roles:
-            if tool['original_category'] in ['desktop-application', 'infrastructure-tool']:
-                roles.append({'role': 'lecturer', 'confidence': 'low', 'score': 0})
-            elif 'python-package' in tool['original_category'] or 'learning' in text_to_analyze:
-                roles.append({'role': 'student', 'confidence': 'low', 'score': 0})
-            else:
-                roles.append({'role': 'lecturer', 'confidence': 'low', 'score': 0})
-        
-        return {
-            'roles': roles,
-            'primary_role': roles[0]['role'] if roles else 'lecturer'
-        }
+        return self.classifier.classify_role(tool)
 
     def categorize_tool(self, tool: Dict[str, Any]) -> Dict[str, Any]:
         """Categorize a tool based on its name and description"""
-        name_lower = tool['name'].lower()
-        desc_lower = tool['description'].lower()
-        text_to_analyze = f"{name_lower} {desc_lower} {tool['topics']}"
-        
-        # Determine teaching category
-        teaching_category = 'content_creation'  # default
-        max_score = 0
-        
-        for category, keywords in self.context_rules.items():
-            score = sum(1 for keyword in keywords if keyword in text_to_analyze)
-            if score > max_score:
-                max_score = score
-                teaching_category = category
-        
-        # Determine technical level
-        tech_level = 'intermediate'  # default
-        for level, keywords in self.tech_level_rules.items():
-            if any(keyword in text_to_analyze for keyword in keywords):
-                tech_level = level
-                break
-        
-        # Determine teaching contexts
-        contexts = ['general']  # default
-        for context, keywords in self.context_indicators.items():
-            if any(keyword in text_to_analyze for keyword in keywords):
-                contexts = [context]
-                break
-        
-        # Determine subjects
-        subjects = ['general']  # default
-        for subject, keywords in self.subject_indicators.items():
-            if any(keyword in text_to_analyze for keyword in keywords):
-                subjects = [subject]
-                break
-        
-        # Determine priority based on category and usefulness
-        priority = 'medium'  # default
-        high_priority_tools = [
-            'critique-quest', 'curriculum-curator', 'deep-brief', 'python-jumpstart',
-            'hands-on-ai', 'insight-lens', 'feed-forward', 'capstone-connect',
-            'venture-lab', 'study-buddy', 'talk-buddy', 'class-pulse'
-        ]
-        
-        if tool['name'] in high_priority_tools:
-            priority = 'high'
-        elif teaching_category in ['utility', 'infrastructure']:
-            priority = 'low'
-        
-        # Classify by user roles
-        role_classification = self.classify_role(tool)
+        classification = self.classifier.classify(tool)
         
         return {
             'name': tool['name'].replace('-', ' ').title().replace(' ', ''),
             'display_name': tool['name'].replace('-', ' ').title(),
-            'category': teaching_category,
+            'category': classification['category'],
             'description': self._clean_description(tool['description']),
-            'priority': priority,
-            'techLevel': tech_level,
-            'contexts': contexts,
-            'subjects': subjects,
+            'priority': classification['priority'],
+            'techLevel': classification['techLevel'],
+            'contexts': classification['contexts'],
+            'subjects': classification['subjects'],
             'original_category': tool['original_category'],
-            'roles': role_classification['roles'],
-            'primary_role': role_classification['primary_role']
+            'topics': tool['topics'],
+            'roles': classification['roles'],
+            'primary_role': classification['primary_role'],
+            'slug': tool['name'],
+            # Repository details for the rendered cards, where the source has them
+            **{column: tool[column] for column in CARD_COLUMNS if column in tool}
         }
 
+    def categorize_tools(self, raw_tools: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """Yield each raw tool categorized, as the next stage asks for it"""
+        for tool in raw_tools:
+            yield self.categorize_tool(tool)
+
+    def _categorize_batch(self, raw_tools: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return [self.categorize_tool(tool) for tool in raw_tools]
+
+    async def categorize_tools_async(self, raw_tools: Iterable[Dict[str, Any]],
+                                     executor: Optional[Executor] = None) -> AsyncIterator[Dict[str, Any]]:
+        """categorize_tools() as an async generator: batches are classified on the executor,
+        the next batch already running while the current one is consumed"""
+        loop = asyncio.get_running_loop()
+        raw_tools = iter(raw_tools)
+        pending = None
+        for batch in iter(lambda: list(islice(raw_tools, self.ASYNC_BATCH_SIZE)), []):
+            running = loop.run_in_executor(executor, self._categorize_batch, batch)
+            if pending is not None:
+                for tool in await pending:
+                    yield tool
+            pending = running
+        if pending is not None:
+            for tool in await pending:
+                yield tool
+
     def _clean_description(self, description: str) -> str:
         """Clean and format the description"""
         # Capitalize first letter and ensure proper sentence structure
@@ -292,9 +210,17 @@ class QuizToolUpdater:
                 desc += '.'
         return desc
 
-    def generate_js_tools_object(self, tools: List[Dict[str, Any]]) -> str:
-        """Generate the JavaScript tools object string"""
+    def _js_string(self, value: str) -> str:
+        """Escape a value for use inside a single-quoted JavaScript string"""
+        return value.replace('\\', '\\\\').replace("'", "\\'").replace('\n', '\\n')
+
+    def engine_tools(self, tools: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """Map categorized tools to the entries of the engine's tools object, keyed by tool id.
+
+        Near-duplicates carry the id of their cluster, so the engine recommends one of them.
+        """
         js_tools = {}
+        clusters = find_clusters(tools)
         
         for tool in tools:
             tool_id = tool['name'].lower().replace(' ', '')
@@ -307,67 +233,147 @@ class QuizToolUpdater:
                 'contexts': tool['contexts'],
                 'subjects': tool['subjects']
             }
+            if tool_id in clusters:
+                js_tools[tool_id]['cluster'] = clusters[tool_id]
         
-        # Convert to JavaScript object format
+        return js_tools
+
+    def generate_shards(self, tools: List[Dict[str, Any]],
+                        js_source: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """Split the engine's tools into one shard per category.
+
+        Each shard lists [catalogue position, tool id, tool] so the quiz can rebuild the
+        catalogue order, and counts the tools isToolSuitable accepts per teaching level
+        as [beginner, any other technical level], at most one per near-duplicate cluster.
+        """
+        if js_source is None:
+            js_source = self.js_file.read_text(encoding='utf-8')
+        teaching_levels = list(load_question_weights(js_source)['q1'])
+        js_tools = self.engine_tools(tools)
+        cluster_categories = {}
+        for tool in js_tools.values():
+            if 'cluster' in tool:
+                cluster_categories.setdefault(tool['cluster'], set()).add(tool['category'])
+
+        shards = {}
+        for position, (tool_id, tool) in enumerate(js_tools.items()):
+            shard = shards.setdefault(tool['category'], {
+                'tools': [], 'suitable': {level: [0, 0] for level in teaching_levels}})
+            shard['tools'].append([position, tool_id, tool])
+
+        # Counts must never exceed what the engine can pick, so a cluster counts once and
+        # not at all when a twin in another category may already have been picked
+        for category, shard in shards.items():
+            for level, counts in shard['suitable'].items():
+                for beginner in (True, False):
+                    seen = set()
+                    for _, _, tool in shard['tools']:
+                        if level not in tool['contexts'] and 'general' not in tool['contexts']:
+                            continue
+                        if beginner and tool['techLevel'] == 'advanced':
+                            continue
+                        cluster = tool.get('cluster')
+                        if cluster:
+                            if cluster in seen or len(cluster_categories[cluster]) > 1:
+                                continue
+                            seen.add(cluster)
+                        counts[0 if beginner else 1] += 1
+        return shards
+
+    def render_shards(self, tools: List[Dict[str, Any]], js_source: str) -> Tuple[str, Dict[str, str]]:
+        """The JavaScript shard index and the content of each category's shard file"""
+        shards = self.generate_shards(tools, js_source)
+        contents = {}
+
         js_code = "{\n"
-        for tool_id, tool_data in js_tools.items():
-            js_code += f"            '{tool_id}': {{\n"
-            js_code += f"                name: '{tool_data['name']}',\n"
-            js_code += f"                category: '{tool_data['category']}',\n"
-            js_code += f"                description: '{tool_data['description']}',\n"
-            js_code += f"                priority: '{tool_data['priority']}',\n"
-            js_code += f"                techLevel: '{tool_data['techLevel']}',\n"
-            js_code += f"                contexts: {json.dumps(tool_data['contexts'])},\n"
-            js_code += f"                subjects: {json.dumps(tool_data['subjects'])}\n"
+        for category, shard in shards.items():
+            content = json.dumps({'category': category, 'tools': shard['tools']},
+                                 separators=(',', ':'), ensure_ascii=False)
+            contents[category] = content
+            version = hashlib.sha256(content.encode('utf-8')).hexdigest()[:10]
+            js_code += f"            {category}: {{\n"
+            js_code += f"                url: '{self.SHARD_DIR}/{category}.json?v={version}',\n"
+            js_code += f"                suitable: {json.dumps(shard['suitable'])}\n"
             js_code += "            },\n"
         js_code = js_code.rstrip(',\n') + "\n        }"
+        return js_code, contents
+
+    def shard_file(self, category: str) -> Path:
+        """Where a category's shard lives, next to the engine"""
+        return self.js_file.parent / self.SHARD_DIR / f"{category}.json"
+
+    def stale_shards(self, files: Iterable[Path]) -> List[Path]:
+        """Shards on disk that are not among the generated files"""
+        files = set(files)
+        return sorted(path for path in (self.js_file.parent / self.SHARD_DIR).glob('*.json')
+                      if path not in files)
+
+    def stage_shards(self, transaction: FileTransaction, shards: Dict[str, str]) -> None:
+        """Stage the category shards next to the engine, removing those of vanished categories"""
+        for category, content in shards.items():
+            transaction.write(self.shard_file(category), content)
+
+        # Categories that lost all their tools must not linger in the service worker cache
+        for stale in self.stale_shards(self.shard_file(category) for category in shards):
+            transaction.remove(stale)
+
+    def render_js(self, js_content: str, tools: List[Dict[str, Any]]) -> Tuple[str, Dict[str, str]]:
+        """The engine source with the shard index for the tools, and the shard contents"""
+        # Tools now live in the category shards, leaving an empty inline tools object
+        new_shards_js, shards = self.render_shards(tools, js_content)
         
-        return js_code
+        # Replace the return statements of initializeTools() and initializeShards()
+        pattern = r'(initializeTools\(\) \{[\s\n]*return )(\{.*?\});'
+        updated_content = re.sub(pattern, '\\1{};', js_content, flags=re.DOTALL)
+        pattern = r'(initializeShards\(\) \{[\s\n]*return )(\{.*?\});'
+        updated_content = re.sub(pattern, lambda match: f'{match.group(1)}{new_shards_js};',
+                                 updated_content, flags=re.DOTALL)
+        return updated_content, shards
 
     def update_js_file(self, tools: List[Dict[str, Any]]) -> None:
-        """Update the JavaScript file with new tools"""
+        """Update the JavaScript file with the shard index and write the tools to quiz-data/"""
         if not self.js_file.exists():
             raise FileNotFoundError(f"JavaScript file not found: {self.js_file}")
         
         with open(self.js_file, 'r', encoding='utf-8') as f:
             js_content = f.read()
         
-        # Generate new tools object
-        new_tools_js = self.generate_js_tools_object(tools)
-        
-        # Replace the tools object in the JavaScript file
-        # Find the initializeTools() method and replace its return statement
-        pattern = r'(initializeTools\(\) \{[\s\n]*return )(\{.*?\});'
-        replacement = f'\\1{new_tools_js};'
+        updated_content, shards = self.render_js(js_content, tools)
         
-        updated_content = re.sub(pattern, replacement, js_content, flags=re.DOTALL)
-        
-        # Write updated content back to file
-        with open(self.js_file, 'w', encoding='utf-8') as f:
-            f.write(updated_content)
+        # The engine and its shards are replaced together or not at all
+        transaction = FileTransaction()
+        self.stage_shards(transaction, shards)
+        transaction.write(self.js_file, updated_content)
+        transaction.commit()
 
-    def update_html_file(self, tools: List[Dict[str, Any]]) -> None:
-        """Update HTML file with role data attributes and remove redundant quiz button"""
-        if not self.html_file.exists():
-            raise FileNotFoundError(f"HTML file not found: {self.html_file}")
-        
-        with open(self.html_file, 'r', encoding='utf-8') as f:
-            html_content = f.read()
-        
+    def render_html(self, html_content: str, tools: List[Dict[str, Any]]) -> str:
+        """The page with role data attributes and filters, and without the redundant quiz button"""
         # Remove redundant "Take Quiz" button from navigation
         html_content = self._remove_redundant_quiz_button(html_content)
         
         # Add role filter buttons
         html_content = self._add_role_filter_buttons(html_content)
         
-        # Add role data attributes to tool cards
-        html_content = self._add_role_attributes(html_content, tools)
+        # Render the repo cards, role data attributes included
+        html_content = CardRenderer().replace_main(html_content, section_order(tools))
         
         # Add JavaScript for role filtering
         html_content = self._add_role_filtering_javascript(html_content)
         
-        with open(self.html_file, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+        # Register the generated service worker for offline and repeat visits
+        return self._add_service_worker_registration(html_content)
+
+    def update_html_file(self, tools: List[Dict[str, Any]]) -> None:
+        """Update HTML file with role data attributes and remove redundant quiz button"""
+        if not self.html_file.exists():
+            raise FileNotFoundError(f"HTML file not found: {self.html_file}")
+        
+        with open(self.html_file, 'r', encoding='utf-8') as f:
+            html_content = f.read()
+        
+        transaction = FileTransaction()
+        transaction.write(self.html_file, self.render_html(html_content, tools))
+        transaction.commit()
 
     def _remove_redundant_quiz_button(self, html_content: str) -> str:
         """Remove the redundant Take Quiz button from navigation filters"""
@@ -378,6 +384,10 @@ class QuizToolUpdater:
 
     def _add_role_filter_buttons(self, html_content: str) -> str:
         """Add role-based filter buttons to navigation"""
+        # Already present from a previous run
+        if 'class="role-btn' in html_content:
+            return html_content
+        
         # Find the navigation section and add role buttons
         role_buttons = '''
                 <div class="mt-2 flex flex-wrap gap-2 justify-center border-t pt-2">
@@ -394,45 +404,19 @@ class QuizToolUpdater:
         updated_content = re.sub(pattern, replacement, html_content)
         return updated_content
 
-    def _add_role_attributes(self, html_content: str, tools: List[Dict[str, Any]]) -> str:
-        """Add role data attributes to tool cards"""
-        # Create a mapping of tool names to their role data
-        tool_roles = {}
-        for tool in tools:
-            tool_name = tool['name'].replace(' ', '').lower().replace('-', '')
-            original_name = tool['display_name'].lower().replace(' ', '-')
-            
-            # Create role strings for data attributes
-            role_list = [role['role'] for role in tool['roles']]
-            confidence_list = [f"{role['role']}:{role['confidence']}" for role in tool['roles']]
-            
-            tool_roles[original_name] = {
-                'roles': ' '.join(role_list),
-                'primary_role': tool['primary_role'],
-                'role_confidence': ' '.join(confidence_list)
-            }
-        
-        # Add role attributes to each tool card
-        for tool_name, role_data in tool_roles.items():
-            # Pattern to find the specific tool card
-            pattern = rf'(<div[^>]*class="[^"]*repo-card[^"]*"[^>]*data-name="{re.escape(tool_name)}"[^>]*)(>)'
-            
-            # Add role data attributes
-            role_attrs = f' data-roles="{role_data["roles"]}" data-primary-role="{role_data["primary_role"]}" data-role-confidence="{role_data["role_confidence"]}"'
-            replacement = f'\\1{role_attrs}\\2'
-            
-            html_content = re.sub(pattern, replacement, html_content)
-        
-        return html_content
-
     def _add_role_filtering_javascript(self, html_content: str) -> str:
         """Add JavaScript function for role-based filtering"""
+        # Already present from a previous run
+        if 'function filterByRole(' in html_content:
+            return html_content
+        
         role_filter_js = '''
         
         // Role filtering functionality
         let currentRole = 'all';
         
         function filterByRole(role) {
+            performance.mark('filterByRole-start');
             currentRole = role;
             
             // Update button styles
@@ -476,6 +460,8 @@ class QuizToolUpdater:
                 }
             });
             
+            performance.measure('filterByRole', 'filterByRole-start');
+
             // Smooth scroll to results
             document.querySelector('main').scrollIntoView({ behavior: 'smooth', block: 'start' });
         }
@@ -483,6 +469,7 @@ class QuizToolUpdater:
         // Update existing filterByCategory to respect role filters
         const originalFilterByCategory = filterByCategory;
         filterByCategory = function(category) {
+            performance.mark('filterByCategory-start');
             currentCategory = category;
             
             // Update button styles
@@ -526,6 +513,8 @@ class QuizToolUpdater:
                 }
             });
             
+            performance.measure('filterByCategory', 'filterByCategory-start');
+
             // Smooth scroll to results
             document.querySelector('main').scrollIntoView({ behavior: 'smooth', block: 'start' });
         };'''
@@ -536,107 +525,181 @@ class QuizToolUpdater:
         updated_content = re.sub(pattern, replacement, html_content)
         return updated_content
 
-    def generate_report(self, tools: List[Dict[str, Any]]) -> str:
-        """Generate a summary report of the tools analysis"""
-        category_counts = {}
-        tech_level_counts = {}
-        priority_counts = {}
-        role_counts = {}
-        primary_role_counts = {}
-        
-        for tool in tools:
-            # Count categories
-            cat = tool['category']
-            category_counts[cat] = category_counts.get(cat, 0) + 1
-            
-            # Count tech levels
-            tech = tool['techLevel']
-            tech_level_counts[tech] = tech_level_counts.get(tech, 0) + 1
-            
-            # Count priorities
-            pri = tool['priority']
-            priority_counts[pri] = priority_counts.get(pri, 0) + 1
-            
-            # Count primary roles
-            primary_role = tool['primary_role']
-            primary_role_counts[primary_role] = primary_role_counts.get(primary_role, 0) + 1
-            
-            # Count all roles (including multi-role tools)
-            for role_info in tool['roles']:
-                role = role_info['role']
-                role_counts[role] = role_counts.get(role, 0) + 1
+    def _add_service_worker_registration(self, html_content: str) -> str:
+        """Add the script that registers sw.js from build_service_worker.py"""
+        # Already present from a previous run
+        if 'serviceWorker.register(' in html_content:
+            return html_content
+        
+        registration_js = '''    <script>
+        if ('serviceWorker' in navigator) {
+            navigator.serviceWorker.register('sw.js');
+        }
+    </script>
+'''
         
-        report = f"""
-=== QUIZ TOOL UPDATE REPORT ===
-Updated: {len(tools)} tools
+        # Insert as the last script before the closing body tag
+        pattern = r'(</body>)'
+        replacement = f'{registration_js}\\1'
+        updated_content = re.sub(pattern, replacement, html_content, count=1)
+        return updated_content
+
+    def generate_report(self, tools: Iterable[Dict[str, Any]], report_format: str = 'text') -> str:
+        """Generate a summary report of the tools analysis"""
+        out = io.StringIO()
+        self.write_report(ToolReport().consume(tools), out, report_format)
+        return out.getvalue().strip()
+
+    def write_report(self, report: ToolReport, out: TextIO, report_format: str = 'text') -> None:
+        """Render a report as text, json, csv or prometheus"""
+        files = [str(self.js_file), f"{self.html_file} (repo cards and navigation)"]
+        RENDERERS[report_format](report, out, files)
+        if report_format == 'text':
+            out.write(f"\nThe quiz recommendation engine and HTML have been updated with "
+                      f"role-based filtering from {self.html_file}.\n")
 
-CATEGORY DISTRIBUTION:
-{chr(10).join(f"  {cat.replace('_', ' ').title()}: {count} tools" for cat, count in sorted(category_counts.items()))}
+    def update_catalogue_db(self, tools: Iterable[Dict[str, Any]], db_file: str = DEFAULT_DB,
+                            categories: Optional[Dict[str, str]] = None) -> Dict[str, int]:
+        """Upsert changed tools, their roles and the engine's categories into the catalogue database"""
+        if categories is None:
+            categories = load_categories(self.js_file.read_text(encoding='utf-8'))
+        with CatalogueDatabase(db_file) as db:
+            return db.sync(tools, categories)
 
-ROLE DISTRIBUTION (Primary):
-{chr(10).join(f"  {role.title()}: {count} tools" for role, count in sorted(primary_role_counts.items()))}
+    def emit(self, tools: Iterable[Dict[str, Any]], html_source: str,
+             js_source: str) -> Iterator[Tuple[Path, str]]:
+        """Yield (target path, content) for each generated file: the shards, the engine, then the page.
 
-ROLE DISTRIBUTION (All Assignments):
-{chr(10).join(f"  {role.title()}: {count} tools" for role, count in sorted(role_counts.items()))}
+        Near-duplicate clusters and shard counts span the whole catalogue, so the tools are
+        gathered first; each file is then rendered only when the consumer asks for it.
+        """
+        tools = tools if isinstance(tools, list) else list(tools)
+        if not tools:
+            raise ValueError("No tools found in HTML file. Check the file format.")
+        js, shards = self.render_js(js_source, tools)
+        for category, content in shards.items():
+            yield self.shard_file(category), content
+        yield self.js_file, js
+        yield self.html_file, self.render_html(html_source, tools)
 
-TECHNICAL LEVEL DISTRIBUTION:
-{chr(10).join(f"  {level.title()}: {count} tools" for level, count in sorted(tech_level_counts.items()))}
+    def collect(self, tools: Iterable[Dict[str, Any]], html_source: str, js_source: str) -> CatalogueOutputs:
+        """Report on and emit a stream of categorized tools, holding the results in memory"""
+        report = ToolReport()
+        tools = list(report.tally(tools))
+        return CatalogueOutputs(tools, report, dict(self.emit(tools, html_source, js_source)),
+                                load_categories(js_source))
 
-PRIORITY DISTRIBUTION:
-{chr(10).join(f"  {pri.title()}: {count} tools" for pri, count in sorted(priority_counts.items()))}
+    def pipeline(self, html_source: str, js_source: str) -> CatalogueOutputs:
+        """Extract, categorize and emit a catalogue from page and engine sources (and this
+        updater's export files, streamed) without writing anything"""
+        return self.collect(self.categorize_tools(self.raw_tools(html_source)), html_source, js_source)
 
-HIGH PRIORITY TOOLS:
-{chr(10).join(f"  - {tool['display_name']} (Primary: {tool['primary_role']})" for tool in tools if tool['priority'] == 'high')}
+    async def pipeline_async(self, html_source: str, js_source: str,
+                             executor: Optional[Executor] = None) -> CatalogueOutputs:
+        """pipeline() with classification and emission on an executor, so one event loop can build
+        several catalogues at once (a ProcessPoolExecutor spreads them across cores)"""
+        tools = [tool async for tool in self.categorize_tools_async(self.raw_tools(html_source), executor)]
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, self.collect, tools, html_source, js_source)
 
-FILES UPDATED:
-  - {self.js_file}
-  - {self.html_file} (role attributes and navigation)
+    def stage_outputs(self, outputs: CatalogueOutputs) -> FileTransaction:
+        """A transaction writing a pipeline's shards, engine and page to this updater's files"""
+        transaction = FileTransaction()
+        for path, content in outputs.files.items():
+            transaction.write(path, content)
+        for stale in self.stale_shards(outputs.files):
+            transaction.remove(stale)
+        return transaction
 
-The quiz recommendation engine and HTML have been updated with role-based filtering from {self.html_file}.
+    def write_outputs(self, outputs: CatalogueOutputs,
+                      db_file: Optional[str] = DEFAULT_DB) -> Dict[str, Optional[Dict[str, int]]]:
+        """Commit a pipeline's outputs to this updater's files in one transaction, then sync the database.
+
+        Returns the file counts and the database sync stats (None without a database).
         """
-        
-        return report.strip()
+        stats = {'files': self.stage_outputs(outputs).commit(), 'catalogue': None}
+        if db_file:
+            stats['catalogue'] = self.update_catalogue_db(outputs.tools, db_file, outputs.categories)
+        return stats
+
+    def check_outputs(self, html_source: str, js_source: str) -> Dict[Path, str]:
+        """Compare each file the pipeline generates with the one on disk, writing nothing.
+
+        Files are hashed one at a time as emit() renders them and dropped straight after;
+        see file_transaction.compare() for the statuses, plus 'stale' for leftover shards.
+        """
+        tools = self.categorize_tools(self.raw_tools(html_source))
+        results = {path: compare(path, content) for path, content in self.emit(tools, html_source, js_source)}
+        results.update((path, 'stale') for path in self.stale_shards(results))
+        return results
+
+    def check(self) -> bool:
+        """Run the pipeline in memory and print whether each generated file on disk is current"""
+        results = self.check_outputs(*self.read_sources())
+        messages = {
+            'unchanged': '✅ {} is current',
+            'changed': '❌ {} differs from the generated output',
+            'missing': '❌ {} is missing',
+            'stale': '❌ {} belongs to no category and would be removed',
+        }
+        for path, status in sorted(results.items()):
+            print(messages[status].format(path))
 
-    def run(self, dry_run: bool = False) -> None:
+        outdated = sum(status != 'unchanged' for status in results.values())
+        if outdated:
+            print(f"\n{outdated} of {len(results)} generated files are out of date; "
+                  f"run update_quiz_tools.py to regenerate them")
+        else:
+            print(f"\nAll {len(results)} generated files are current")
+        return not outdated
+
+    def read_sources(self) -> Tuple[str, str]:
+        """The page and engine sources this updater's files hold"""
+        if not self.html_file.exists():
+            raise FileNotFoundError(f"HTML file not found: {self.html_file}")
+        if not self.js_file.exists():
+            raise FileNotFoundError(f"JavaScript file not found: {self.js_file}")
+        return self.html_file.read_text(encoding='utf-8'), self.js_file.read_text(encoding='utf-8')
+
+    def run(self, dry_run: bool = False, report_format: str = 'text',
+            report_file: Optional[str] = None, db_file: Optional[str] = DEFAULT_DB) -> None:
         """Main execution method"""
-        print(f"Extracting tools from {self.html_file}...")
-        
-        # Extract tools from HTML
-        raw_tools = self.extract_tools_from_html()
-        print(f"Found {len(raw_tools)} tools")
-        
-        if not raw_tools:
-            print("ERROR: No tools found in HTML file. Check the file format.")
-            return
-        
-        # Categorize each tool
-        categorized_tools = []
-        for tool in raw_tools:
-            categorized = self.categorize_tool(tool)
-            categorized_tools.append(categorized)
-        
-        # Generate report
-        report = self.generate_report(categorized_tools)
-        print(report)
+        # Progress goes to stderr when stdout carries a json, csv or prometheus report
+        log = sys.stdout if report_format == 'text' or report_file else sys.stderr
+        print(f"Extracting tools from {self.html_file}...", file=log)
+        
+        outputs = self.pipeline(*self.read_sources())
+        print(f"Found {len(outputs.tools)} tools", file=log)
+        
+        # Write report
+        if report_file:
+            with open(report_file, 'w', encoding='utf-8', newline='') as f:
+                self.write_report(outputs.report, f, report_format)
+            print(f"📊 Report saved to {report_file}", file=log)
+        else:
+            self.write_report(outputs.report, sys.stdout, report_format)
         
         if not dry_run:
-            # Update JavaScript file
-            print(f"\\nUpdating {self.js_file}...")
-            self.update_js_file(categorized_tools)
+            print(f"\nUpdating {self.js_file} and {self.html_file}...", file=log)
+            stats = self.write_outputs(outputs, db_file)
+            files = stats['files']
+            print(f"Wrote {files['written']} files ({files['unchanged']} unchanged, {files['removed']} removed)",
+                  file=log)
             
-            # Update HTML file with role data and remove redundant button
-            print(f"\\nUpdating {self.html_file}...")
-            self.update_html_file(categorized_tools)
+            catalogue = stats['catalogue']
+            if catalogue:
+                print(f"Updated {db_file}: {catalogue['inserted']} inserted, {catalogue['updated']} updated, "
+                      f"{catalogue['deleted']} deleted, {catalogue['unchanged']} unchanged", file=log)
             
-            print("✅ Quiz tools and HTML updated successfully!")
+            print("✅ Quiz tools and HTML updated successfully!", file=log)
         else:
-            print("\\n🔍 DRY RUN - No files were modified")
+            print("\n🔍 DRY RUN - No files were modified", file=log)
             
             # Save analysis to JSON for inspection
             analysis_file = "tool_analysis_preview.json"
             with open(analysis_file, 'w') as f:
-                json.dump(categorized_tools, f, indent=2)
-            print(f"📊 Analysis saved to {analysis_file}")
+                json.dump(outputs.tools, f, indent=2)
+            print(f"📊 Analysis saved to {analysis_file}", file=log)
 
 def main():
     parser = argparse.ArgumentParser(description='Update quiz tools from index.html')
@@ -646,15 +709,35 @@ def main():
                        help='Path to JavaScript file (default: recommendation_engine.js)')
     parser.add_argument('--dry-run', action='store_true',
                        help='Preview changes without modifying files')
+    parser.add_argument('--check', action='store_true',
+                       help='Exit non-zero unless the engine, its shards and the page match what '
+                            'the pipeline generates; writes nothing')
+    parser.add_argument('--report-format', choices=sorted(RENDERERS), default='text',
+                       help='Report format (default: text)')
+    parser.add_argument('--report-file',
+                       help='Write the report to this file instead of stdout')
+    parser.add_argument('--db', default=DEFAULT_DB,
+                       help=f'SQLite catalogue database to keep in sync (default: {DEFAULT_DB}, '
+                            f'empty to skip)')
+    parser.add_argument('--export-dir', default=DEFAULT_EXPORT_DIR,
+                       help=f'Repository exports stored by ingest_repos.py (default: {DEFAULT_EXPORT_DIR})')
     
     args = parser.parse_args()
     
     try:
-        updater = QuizToolUpdater(args.html_file, args.js_file)
-        updater.run(dry_run=args.dry_run)
+        updater = QuizToolUpdater(args.html_file, args.js_file, cache_classifier=not args.check,
+                                  export_files=export_files(args.export_dir))
+        if args.check:
+            current = updater.check()
+        else:
+            updater.run(dry_run=args.dry_run, report_format=args.report_format,
+                        report_file=args.report_file, db_file=args.db)
+            current = True
     except Exception as e:
         print(f"ERROR: {e}")
         sys.exit(1)
+    if not current:
+        sys.exit(1)
 
 if __name__ == '__main__':
     main()
\ No newline at end of file